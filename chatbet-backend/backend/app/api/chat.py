@@ -6,7 +6,7 @@ including message processing, conversation management, and streaming responses.
 """
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import AsyncGenerator, Dict, Any, Optional
 import json
 import asyncio
@@ -87,13 +87,30 @@ async def send_message(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-"""
 @router.post("/stream")
-async def stream_message(request: ChatRequest) -> StreamingResponse:
-    # Streaming functionality commented out until conversation manager is fully implemented
-    # This would require complex conversation manager integration
-    pass
-"""
+async def stream_message(
+    request: ChatRequest,
+    current_user: OptionalUser = None
+) -> StreamingResponse:
+    """
+    Send a message and stream the answer as Server-Sent Events.
+    
+    Each event is a `StreamingChatResponse` as JSON; the last one has
+    `is_final` set and carries the response metadata.
+    """
+    conversation_manager = get_conversation_manager()
+    if current_user:
+        request.user_id = current_user.user_id
+    
+    async def events() -> AsyncGenerator[str, None]:
+        async for chunk in conversation_manager.process_message_stream(request):
+            yield f"data: {chunk.model_dump_json()}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.get("/conversations/{user_id}")
@@ -102,12 +119,16 @@ async def get_conversation_history(
     current_user: CurrentUser,
     session_id: Optional[str] = None,
     limit: int = 20,
-    offset: int = 0
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Get conversation history for a user.
     
-    Returns the conversation history, optionally filtered by session.
+    Without `session_id`, lists the user's conversations under
+    `"conversations"`. With it, returns a page of that session's messages
+    under `"messages"`, or 404 if the session doesn't exist. Both pages
+    carry `cursor` and `next_cursor`: pass `next_cursor` as `cursor` for
+    the next page; it is null on the last one.
     Requires authentication - users can only access their own conversations.
     """
     try:
@@ -120,33 +141,43 @@ async def get_conversation_history(
         
         conversation_manager = get_conversation_manager()
         
-        # If no session_id provided, return empty result for now
-        # In a full implementation, we'd list all sessions for the user
         if not session_id:
+            if cursor is not None and not cursor.isdigit():
+                raise ValueError(f"Invalid conversations cursor: {cursor!r}")
+            offset = int(cursor or 0)
+            summaries = await conversation_manager.list_conversations(user_id, limit=limit, offset=offset)
             return {
                 "user_id": user_id,
                 "session_id": None,
-                "conversations": None,
+                "conversations": [summary.model_dump(mode="json") for summary in summaries],
                 "limit": limit,
-                "offset": offset,
-                "message": "session_id parameter is required"
+                "cursor": str(offset),
+                "next_cursor": str(offset + len(summaries)) if limit > 0 and len(summaries) == limit else None
             }
         
-        history = await conversation_manager.get_conversation_history(
+        page = await conversation_manager.get_history_page(
             session_id=session_id,
             user_id=user_id,
-            limit=limit,
-            offset=offset
+            cursor=cursor,
+            limit=limit
         )
+        if page is None:
+            raise HTTPException(status_code=404, detail="Conversation not found")
         
-        return {
+        # Rows come straight from the message log, no models are built
+        return JSONResponse({
             "user_id": user_id,
             "session_id": session_id,
-            "conversations": history,
+            "messages": page.to_dicts(),
             "limit": limit,
-            "offset": offset
-        }
+            "cursor": str(page.start),
+            "next_cursor": page.next_cursor
+        })
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error retrieving conversation history: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to retrieve conversation history")
@@ -105,4 +105,20 @@ async def liveness_check() -> Dict[str, Any]:
     return {
         "status": "alive",
         "timestamp": datetime.utcnow().isoformat()
-    }
\ No newline at end of file
+    }
+
+@router.get("/metrics")
+async def performance_metrics() -> Dict[str, Any]:
+    """
+    Performance metrics endpoint.
+    
+    Exposes conversation and LLM statistics (response times, cache hit
+    rates, etc.) for dashboards and load tests.
+    """
+    conversation_manager = get_conversation_manager()
+    
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "conversations": conversation_manager.get_performance_stats(),
+        "llm": conversation_manager.llm_service.get_performance_stats()
+    }
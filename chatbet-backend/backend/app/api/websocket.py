@@ -18,6 +18,7 @@ from fastapi.responses import HTMLResponse
 
 from ..core.logging import get_logger
 from ..core.config import get_settings
+from ..core.deadline import deadline_scope
 from ..core.auth import CurrentUser, OptionalUser, get_current_user, get_optional_user
 from ..models.websocket_models import (
     WSUserMessage, WSError, WSPing, WebSocketMessageType,
@@ -26,7 +27,6 @@ from ..models.websocket_models import (
 from ..models.conversation import ChatRequest, IntentType
 from ..services.websocket_manager import get_connection_manager, WebSocketConnectionManager
 from ..services.conversation_manager import get_conversation_manager
-from ..services.websocket_streaming import WebSocketStreamingCallback
 from ..utils.exceptions import ChatBetException
 from ..utils.websocket_debug import get_websocket_debugger
 
@@ -35,54 +35,79 @@ router = APIRouter()
 settings = get_settings()
 
 
-async def _simulate_streaming_response(
-    connection_manager: WebSocketConnectionManager,
-    session_id: str,
-    response_content: str,
-    chunk_delay: float = 0.05
-):
-    """
-    Simulate streaming response by sending content in chunks.
-    
-    This is a temporary implementation until we integrate streaming
-    directly with the LLM service.
-    """
-    # Start streaming
-    await connection_manager.start_streaming_response(session_id)
-    
-    # Split response into words for streaming
-    words = response_content.split()
-    chunk_size = 3  # Words per chunk
-    accumulated_content = ""
+async def _handle_user_message(session_id: str, message: WSUserMessage):
+    """Handle incoming user chat messages."""
+    connection_manager = get_connection_manager()
+    conversation_manager = get_conversation_manager()
+    logger.info(
+        f"WebSocket handler received user message",
+        extra={
+            "session_id": session_id,
+            "user_id": message.user_id,
+            "message_id": message.message_id,
+            "content": message.content[:50] + "..." if len(message.content) > 50 else message.content,
+            "handler_call_timestamp": datetime.now().isoformat()
+        }
+    )
     
-    for i in range(0, len(words), chunk_size):
-        chunk_words = words[i:i + chunk_size]
-        chunk_content = " ".join(chunk_words)
-        
-        if i > 0:  # Add space before chunk if not first
-            chunk_content = " " + chunk_content
-            
-        accumulated_content += chunk_content
+    try:
+        # Send typing indicator
+        await connection_manager.send_typing_indicator(session_id, True, estimated_time=3)
         
-        # Send chunk
-        await connection_manager.send_streaming_chunk(
+        # Create ChatRequest for conversation manager
+        chat_request = ChatRequest(
+            message=message.content,
+            user_id=message.user_id,
             session_id=session_id,
-            content=chunk_content,
-            full_content=accumulated_content,
-            chunk_index=i // chunk_size,
-            is_final=False
+            max_tokens=None,
+            temperature=None
         )
         
-        # Small delay for streaming effect
-        await asyncio.sleep(chunk_delay)
-    
-    # End streaming
-    await connection_manager.end_streaming_response(
-        session_id=session_id,
-        final_content=accumulated_content,
-        total_chunks=(len(words) // chunk_size) + 1,
-        response_time_ms=int(len(words) * chunk_delay * 1000)
-    )
+        # One deadline covers processing and delivery of the turn
+        with deadline_scope(settings.turn_deadline_seconds):
+            # Forward the answer's chunks as the model produces them
+            await connection_manager.start_streaming_response(session_id)
+            full_content = ""
+            chunk_index = 0
+            metadata: Dict[str, Any] = {}
+            async for chunk in conversation_manager.process_message_stream(chat_request):
+                if chunk.chunk:
+                    full_content += chunk.chunk
+                    await connection_manager.send_streaming_chunk(
+                        session_id=session_id,
+                        content=chunk.chunk,
+                        full_content=full_content,
+                        chunk_index=chunk_index,
+                        is_final=False
+                    )
+                    chunk_index += 1
+                if chunk.is_final:
+                    metadata = chunk.metadata or {}
+            
+            await connection_manager.end_streaming_response(
+                session_id=session_id,
+                final_content=full_content,
+                total_chunks=chunk_index,
+                response_time_ms=metadata.get("response_time_ms", 0),
+                suggested_actions=metadata.get("suggested_actions")
+            )
+        
+        # Stop typing indicator
+        await connection_manager.send_typing_indicator(session_id, False)
+        
+    except Exception as e:
+        logger.error(f"Error processing user message: {e}")
+        await connection_manager.send_error(
+            session_id,
+            "MESSAGE_PROCESSING_ERROR",
+            "Failed to process your message. Please try again."
+        )
+        await connection_manager.send_typing_indicator(session_id, False)
+
+
+async def _handle_ping(session_id: str, message: WSPing):
+    """Handle ping messages for connection testing."""
+    await get_connection_manager().handle_ping(session_id, message)
 
 
 @router.websocket("/chat")
@@ -123,66 +148,9 @@ async def websocket_chat_endpoint(
             }
         )
         
-        # Register message handlers
-        async def handle_user_message(session_id: str, message: WSUserMessage):
-            """Handle incoming user chat messages."""
-            logger.info(
-                f"WebSocket handler received user message",
-                extra={
-                    "session_id": session_id,
-                    "user_id": message.user_id,
-                    "message_id": message.message_id,
-                    "content": message.content[:50] + "..." if len(message.content) > 50 else message.content,
-                    "handler_call_timestamp": datetime.now().isoformat()
-                }
-            )
-            
-            try:
-                # Send typing indicator
-                await connection_manager.send_typing_indicator(session_id, True, estimated_time=3)
-                
-                # Create ChatRequest for conversation manager
-                chat_request = ChatRequest(
-                    message=message.content,
-                    user_id=message.user_id,
-                    session_id=session_id,
-                    max_tokens=None,
-                    temperature=None
-                )
-                
-                # Create streaming callback
-                streaming_callback = WebSocketStreamingCallback(
-                    websocket_manager=connection_manager,
-                    session_id=session_id,
-                    message_id=message.message_id
-                )
-                
-                # For now, process message normally and then simulate streaming
-                # TODO: Integrate streaming_callback directly with LLM service
-                response = await conversation_manager.process_message(chat_request)
-                
-                # Simulate streaming by sending the response in chunks
-                await _simulate_streaming_response(connection_manager, session_id, response.message)
-                
-                # Stop typing indicator
-                await connection_manager.send_typing_indicator(session_id, False)
-                
-            except Exception as e:
-                logger.error(f"Error processing user message: {e}")
-                await connection_manager.send_error(
-                    session_id,
-                    "MESSAGE_PROCESSING_ERROR",
-                    "Failed to process your message. Please try again."
-                )
-                await connection_manager.send_typing_indicator(session_id, False)
-        
-        async def handle_ping(session_id: str, message: WSPing):
-            """Handle ping messages for connection testing."""
-            await connection_manager.handle_ping(session_id, message)
-        
-        # Register handlers
-        connection_manager.register_message_handler(WebSocketMessageType.USER_MESSAGE, handle_user_message)
-        connection_manager.register_message_handler(WebSocketMessageType.PING, handle_ping)
+        # Handlers are shared by all connections and registered once
+        connection_manager.register_message_handler(WebSocketMessageType.USER_MESSAGE, _handle_user_message)
+        connection_manager.register_message_handler(WebSocketMessageType.PING, _handle_ping)
         
         # Main message loop
         while True:
@@ -191,8 +159,12 @@ async def websocket_chat_endpoint(
                 data = await websocket.receive_text()
                 message_data = json.loads(data)
                 
-                # Handle the message
-                await connection_manager.handle_user_message(assigned_session_id, message_data)
+                # Handle the message as a session-owned task, so a disconnect
+                # can cancel it mid-generation instead of waiting for it
+                connection_manager.start_turn(
+                    assigned_session_id,
+                    connection_manager.handle_user_message(assigned_session_id, message_data)
+                )
                 
             except WebSocketDisconnect:
                 logger.info(f"WebSocket client disconnected: {assigned_session_id}")
@@ -227,7 +199,7 @@ async def websocket_chat_endpoint(
     finally:
         # Clean up connection
         if assigned_session_id:
-            await connection_manager.disconnect(assigned_session_id, "connection_closed")
+            await connection_manager.disconnect(assigned_session_id, "connection_closed", websocket=websocket)
 
 
 @router.websocket("/chat/{session_id}")
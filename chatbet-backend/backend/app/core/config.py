@@ -11,7 +11,7 @@ the same way. Plus, the IDE gets full autocomplete on our settings.
 """
 
 import secrets
-from typing import Literal, Optional, List, Union
+from typing import Any, Dict, Literal, Optional, List, Union
 from functools import lru_cache
 
 from pydantic import Field, field_validator, AnyHttpUrl
@@ -59,6 +59,36 @@ class Settings(BaseSettings):
     gemini_max_tokens: Optional[int] = Field(default=None, description="Maximum tokens for responses")
     gemini_timeout: int = Field(default=60, description="LLM request timeout in seconds")
     
+    # === LLM Provider ===
+    llm_provider: Literal["gemini", "fake"] = Field(default="gemini", description="Chat model backend")
+    fake_llm_latency_ms: float = Field(default=800.0, description="Fake provider mean latency to first token")
+    fake_llm_latency_jitter_ms: float = Field(default=200.0, description="Fake provider latency spread")
+    fake_llm_latency_distribution: Literal["fixed", "uniform", "lognormal"] = Field(default="lognormal", description="Fake provider latency distribution")
+    fake_llm_tokens_per_second: float = Field(default=60.0, description="Fake provider generation rate")
+    fake_llm_error_rate: float = Field(default=0.0, ge=0.0, le=1.0, description="Fake provider injected error probability")
+    fake_llm_tool_calls: bool = Field(default=True, description="Fake provider issues scripted tool calls")
+    fake_llm_seed: int = Field(default=42, description="Fake provider random seed")
+    
+    # === LLM Routing ===
+    gemini_light_model: str = Field(default="gemini-2.5-flash-lite", description="Smaller model for greetings, help and other light intents")
+    llm_routes: Dict[str, Dict[str, Any]] = Field(default_factory=dict, description="Route overrides, e.g. {\"light\": {\"max_tokens\": 200}}")
+    llm_intent_routes: Dict[str, str] = Field(default_factory=dict, description="Intent to route name overrides, e.g. {\"greeting\": \"data\"}")
+    llm_model_prices: Dict[str, List[float]] = Field(
+        default={"gemini-2.5-flash": [0.30, 2.50], "gemini-2.5-flash-lite": [0.10, 0.40]},
+        description="USD per million input/output tokens, for per-route cost reporting"
+    )
+    
+    # === LLM Scheduling ===
+    llm_max_concurrency: int = Field(default=8, description="Maximum concurrent LLM calls")
+    llm_tokens_per_minute: int = Field(default=1000000, description="Provider tokens-per-minute budget")
+    llm_queue_max_wait: float = Field(default=5.0, description="Maximum queue wait for interactive LLM calls (seconds)")
+    llm_background_queue_max_wait: float = Field(default=60.0, description="Maximum queue wait for background LLM calls (seconds)")
+    llm_max_output_tokens_estimate: int = Field(default=512, description="Output tokens reserved per call when budgeting")
+    
+    # === Turn Deadlines ===
+    turn_deadline_seconds: float = Field(default=25.0, description="End-to-end time budget for one chat turn")
+    deadline_answer_reserve_seconds: float = Field(default=5.0, description="Time kept back for the final answer; tools and retries yield below this")
+    
     # === Redis Configuration ===
     redis_host: str = Field(default="localhost", description="Redis server host")
     redis_port: int = Field(default=6379, description="Redis server port")
@@ -71,6 +101,22 @@ class Settings(BaseSettings):
     cache_ttl_fixtures: int = Field(default=14400, description="Match fixtures cache TTL (4 hours)")
     cache_ttl_odds: int = Field(default=30, description="Live odds cache TTL (30 seconds)")
     cache_ttl_user_sessions: int = Field(default=3600, description="User session cache TTL (1 hour)")
+    cache_ttl_llm_responses: int = Field(default=300, description="Generated LLM response cache TTL (5 minutes)")
+    api_data_fingerprint_max_entries: int = Field(default=4096, description="Fixture/odds responses remembered for data version tracking")
+    
+    # === Tournament Resolver ===
+    tournament_index_refresh_seconds: int = Field(default=900, description="Rebuild the tournament name index after this many seconds")
+    tournament_index_retry_seconds: int = Field(default=60, description="Wait before retrying a tournament index that never loaded")
+    tournament_fuzzy_threshold: float = Field(default=0.5, ge=0.0, le=1.0, description="Minimum trigram similarity for fuzzy tournament matches")
+    
+    # === LLM Response Cache ===
+    llm_response_cache_enabled: bool = Field(default=True, description="Reuse answers for repeated prompts")
+    llm_response_cache_size: int = Field(default=1024, description="Maximum in-process cached LLM responses")
+    semantic_cache_enabled: bool = Field(default=True, description="Reuse answers for near-duplicate context-free questions")
+    semantic_cache_threshold: float = Field(default=0.7, ge=0.0, le=1.0, description="Minimum MinHash similarity to reuse an answer")
+    semantic_cache_num_perm: int = Field(default=64, description="MinHash permutations per signature")
+    semantic_cache_bands: int = Field(default=16, description="LSH bands (must divide the permutation count)")
+    semantic_cache_max_entries: int = Field(default=2000, description="Maximum questions kept in the semantic index")
     
     # === Security Settings ===
     secret_key: str = Field(
@@ -89,9 +135,66 @@ class Settings(BaseSettings):
     rate_limit_window: int = Field(default=60, description="Rate limit window in seconds")
     
     # === Conversation Settings ===
-    max_conversation_history: int = Field(default=10, description="Maximum messages in conversation memory")
+    max_conversation_history: int = Field(default=10, description="Most recent messages sent to the model; older ones are folded into the summary")
     conversation_timeout: int = Field(default=1800, description="Conversation timeout in seconds (30 min)")
+    session_store_max_entries: int = Field(default=10000, description="Maximum conversations kept in memory")
+    session_store_max_bytes: int = Field(default=256 * 1024 * 1024, description="Approximate memory cap for stored conversations")
+    turn_replay_window_seconds: float = Field(default=2.0, description="Seconds a re-sent message gets its just-finished turn's response instead of a new turn")
+    dedup_max_entries: int = Field(default=50000, description="Maximum message ids or finished turns remembered for duplicate detection")
+    shared_turns_enabled: bool = Field(default=True, description="Let identical first turns of new sessions share one classification and answer")
+    shared_turn_window_seconds: float = Field(default=5.0, description="Seconds a finished shared first-turn answer is handed to new sessions")
+
+    # === Conversation Persistence ===
+    conversation_persistence_enabled: bool = Field(default=False, description="Persist conversations to Redis so any worker can resume them")
+    conversation_persistence_flush_interval: float = Field(default=0.25, description="Seconds between write-behind flushes to Redis")
+    conversation_persistence_batch_size: int = Field(default=200, description="Maximum conversations written per Redis pipeline")
+    conversation_persistence_ttl_seconds: int = Field(default=7 * 24 * 3600, description="How long persisted conversations are kept in Redis")
+    conversation_persistence_revalidate: bool = Field(default=True, description="Check Redis for turns written by other workers before resuming a local session")
+
+    # === Conversation Journal ===
+    conversation_journal_enabled: bool = Field(default=False, description="Journal conversations to a local append-only log and restore them on restart")
+    conversation_journal_dir: str = Field(default="data/journal", description="Directory holding the conversation journal and its snapshot")
+    conversation_journal_flush_interval: float = Field(default=0.2, description="Seconds between batched journal writes; each batch is fsynced once")
+    conversation_journal_compact_bytes: int = Field(default=64 * 1024 * 1024, description="Journal size that triggers compaction into a snapshot")
+
+    # === Prompt Budget ===
+    prompt_token_budget: int = Field(default=6000, description="Maximum estimated tokens per LLM prompt")
+    prompt_tool_result_tokens: int = Field(default=2500, description="Tokens reserved for tool results within the prompt budget")
+    
+    # === Conversation Summary ===
+    summary_enabled: bool = Field(default=True, description="Fold older turns into a rolling conversation summary")
+    summary_window_messages: int = Field(default=6, description="Most recent messages always sent verbatim")
+    summary_trigger_messages: int = Field(default=4, description="Unsummarized messages outside the window before folding")
+    summary_max_words: int = Field(default=120, description="Target length of the rolling summary")
+
+    # === Tool Planning ===
+    tool_planning_enabled: bool = Field(default=True, description="Run tools decided from intent and entities before generation")
+    tool_planning_max_teams: int = Field(default=2, description="Maximum teams searched ahead of generation per turn")
     
+    # === Data Prefetch ===
+    prefetch_enabled: bool = Field(default=True, description="Prefetch fixtures and odds for recently mentioned teams")
+    prefetch_max_teams: int = Field(default=2, description="Most recently mentioned teams prefetched after a turn")
+    prefetch_ttl_seconds: int = Field(default=120, description="How long prefetched fixture searches stay usable")
+    prefetch_budget_seconds: float = Field(default=10.0, description="Time budget for one post-turn prefetch")
+    prefetch_max_concurrency: int = Field(default=4, description="Concurrent upstream calls across all prefetches")
+    prefetch_max_entries: int = Field(default=500, description="Maximum prefetched tool results kept in memory")
+    
+    # === Tool Memo ===
+    tool_memo_enabled: bool = Field(default=True, description="Reuse tool results within a conversation")
+    tool_memo_ttl_seconds: Dict[str, float] = Field(
+        default={
+            "get_tournaments": 900,
+            "get_fixtures": 120,
+            "search_team_matches": 120,
+            "get_live_matches": 20,
+            "get_odds": 30
+        },
+        description="Per-tool reuse window in seconds; tools not listed are never memoized"
+    )
+    tool_memo_max_sessions: int = Field(default=1000, description="Sessions whose tool results are kept")
+    tool_memo_max_entries_per_session: int = Field(default=20, description="Tool results kept per session")
+    tool_memo_context_tokens: int = Field(default=800, description="Prompt tokens for previously retrieved data")
+
     @field_validator("gemini_max_tokens", mode="before")
     @classmethod
     def parse_optional_int(cls, v):
@@ -0,0 +1,86 @@
+"""
+Per-turn deadlines.
+
+Every layer used to have its own timeout: 60s for Gemini, 30s for the
+ChatBet API, tenacity backoff up to 10s, and our own retry sleeps. None
+of them knew about the others, so one unlucky turn could take minutes.
+
+A chat turn now sets a single deadline in a context variable. Because
+context variables follow the call chain (and are copied into tasks), the
+scheduler, the LLM calls, the tools, the retry loops and the HTTP client
+can all ask "how much time is left for this turn?" and degrade instead
+of blowing past it.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from ..utils.exceptions import DeadlineExceededError
+
+# Absolute time.monotonic() deadline of the current turn, None when unbounded
+_deadline: ContextVar[Optional[float]] = ContextVar("chatbet_turn_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Bound the enclosed work to `seconds` from now.
+
+    Nested scopes can only tighten the deadline, never extend it.
+    """
+    current = _deadline.get()
+    deadline = current
+    if seconds is not None and seconds > 0:
+        candidate = time.monotonic() + seconds
+        deadline = candidate if current is None else min(current, candidate)
+
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def no_deadline() -> Iterator[None]:
+    """Detach background work (e.g. summarization) from the turn that spawned it."""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current turn, None if there is no deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def has_budget(seconds: float) -> bool:
+    """Check whether at least `seconds` are left (always True without a deadline)."""
+    left = remaining()
+    return left is None or left >= seconds
+
+
+def clamp_timeout(timeout: Optional[float]) -> Optional[float]:
+    """Shrink a component timeout so it ends no later than the turn."""
+    left = remaining()
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
+
+
+def check_deadline(operation: str = "operation"):
+    """Raise DeadlineExceededError if the turn is out of time."""
+    if remaining() == 0.0:
+        raise DeadlineExceededError(
+            f"Turn deadline exceeded before {operation}",
+            error_code="deadline_exceeded",
+            status_code=504,
+            details={"operation": operation}
+        )
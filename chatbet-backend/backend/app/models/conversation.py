@@ -15,6 +15,8 @@ from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field, validator, ConfigDict
 
+from .message_log import LoggedMessage, MessageLog
+
 
 class MessageRole(str, Enum):
     """Message roles in conversation."""
@@ -146,6 +148,10 @@ class ConversationContext(BaseConversationModel):
     mentioned_teams: List[str] = Field(default_factory=list, description="Teams mentioned in conversation")
     mentioned_matches: List[str] = Field(default_factory=list, description="Matches mentioned in conversation")
     
+    # Rolling summary of turns older than the recent message window
+    summary: Optional[str] = Field(None, description="Running summary of earlier conversation turns")
+    summarized_message_count: int = Field(default=0, description="Number of leading messages folded into the summary")
+    
     # Authentication state
     is_authenticated: bool = Field(default=False, description="Whether user is authenticated")
     auth_token: Optional[str] = Field(None, description="Authentication token")
@@ -174,7 +180,7 @@ class Conversation(BaseConversationModel):
     """
     id: str = Field(default_factory=lambda: str(uuid4()), description="Unique conversation identifier")
     context: ConversationContext = Field(..., description="Conversation context")
-    messages: List[ChatMessage] = Field(default_factory=list, description="Message history")
+    messages: MessageLog = Field(default_factory=MessageLog, description="Message history")
     
     # Conversation metadata
     title: Optional[str] = Field(None, description="Conversation title (auto-generated)")
@@ -193,17 +199,17 @@ class Conversation(BaseConversationModel):
         self.messages.append(message)
         self.context.update_activity()
     
-    def get_recent_messages(self, count: int = 10) -> List[ChatMessage]:
+    def get_recent_messages(self, count: int = 10) -> List[LoggedMessage]:
         """Get the most recent messages."""
-        return self.messages[-count:] if count < len(self.messages) else self.messages
+        return self.messages[-count:]
     
-    def get_user_messages(self) -> List[ChatMessage]:
+    def get_user_messages(self) -> List[LoggedMessage]:
         """Get all user messages."""
-        return [msg for msg in self.messages if msg.role == MessageRole.USER]
+        return self.messages.of_role(MessageRole.USER)
     
-    def get_assistant_messages(self) -> List[ChatMessage]:
+    def get_assistant_messages(self) -> List[LoggedMessage]:
         """Get all assistant messages."""
-        return [msg for msg in self.messages if msg.role == MessageRole.ASSISTANT]
+        return self.messages.of_role(MessageRole.ASSISTANT)
     
     @property
     def message_count(self) -> int:
@@ -211,15 +217,19 @@ class Conversation(BaseConversationModel):
         return len(self.messages)
     
     @property
-    def last_message(self) -> Optional[ChatMessage]:
+    def last_message(self) -> Optional[LoggedMessage]:
         """Get the last message in conversation."""
         return self.messages[-1] if self.messages else None
     
     @property
-    def last_user_message(self) -> Optional[ChatMessage]:
+    def last_user_message(self) -> Optional[LoggedMessage]:
         """Get the last user message."""
-        user_messages = self.get_user_messages()
-        return user_messages[-1] if user_messages else None
+        return self.messages.last(MessageRole.USER)
+    
+    @property
+    def last_assistant_message(self) -> Optional[LoggedMessage]:
+        """Get the last assistant message."""
+        return self.messages.last(MessageRole.ASSISTANT)
 
 
 # === Request/Response Models for API ===
@@ -259,6 +269,9 @@ class ChatResponse(BaseConversationModel):
 
 class StreamingChatResponse(BaseConversationModel):
     """Streaming response chunk for real-time chat."""
+    # Spaces between tokens are part of the chunks
+    model_config = ConfigDict(str_strip_whitespace=False)
+
     chunk: str = Field(..., description="Response chunk content")
     session_id: str = Field(..., description="Session identifier")
     is_final: bool = Field(default=False, description="Whether this is the final chunk")
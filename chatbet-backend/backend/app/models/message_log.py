@@ -0,0 +1,439 @@
+"""
+Compact, array-backed message log for conversations.
+
+`Conversation.messages` used to be a list of `ChatMessage` Pydantic models,
+each with a dozen mostly empty fields, and every turn was stored a second
+time as LangChain messages in an `InMemoryChatMessageHistory`. Hot paths
+like `last_user_message` filtered the whole history into a new list on
+every access.
+
+The log keeps one row per message in parallel columns (ids, roles,
+contents, timestamps) plus one small tuple for the optional fields,
+present only when a message has any. Content is stored once; LangChain
+messages are produced from it when a prompt is built. The index of the
+last message of each role is kept up to date on append, so those
+lookups are O(1), and the log tracks its own approximate size.
+
+Reads return `LoggedMessage` views with the same attribute names as
+`ChatMessage`; `to_chat_message()` materializes a full model when one
+is needed (API responses).
+
+Prompts are built every turn from the recent window of the log, and
+converting that window allocated a fresh `HumanMessage`/`AIMessage` per
+row each time. The log converts each row once, the first time a window
+reaches it, and keeps the result; `to_langchain()` returns a
+`LangChainWindow` view over those cached messages, so a turn only
+converts what was added since the previous one. The cache is dropped on
+`clear()`, and rows folded into the conversation summary are released
+with `release_langchain()`.
+
+History reads page through the log with `page(cursor, limit)`: a
+`MessagePage` is a row range of the log, and `to_dicts()` builds the
+JSON-ready rows straight from the columns, without constructing or
+validating any model.
+"""
+
+import sys
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from pydantic_core import core_schema
+
+# Column order of the optional fields tuple
+_EXTRA_FIELDS = (
+    "user_id", "session_id", "detected_intent", "intent_confidence",
+    "response_time_ms", "token_count", "function_calls",
+)
+_ROLES = ("system", "user", "assistant", "function")
+_ROLE_CODES = {role: code for code, role in enumerate(_ROLES)}
+_LANGCHAIN_TYPES = {"system": SystemMessage, "user": HumanMessage, "assistant": AIMessage}
+
+# Per-row cost of the columns themselves: three list slots, a double and a byte
+_ROW_BYTES = 3 * 8 + 8 + 1
+# Approximate size of one cached LangChain message, excluding its content
+_LANGCHAIN_MESSAGE_BYTES = 800
+
+
+def _value(value: Any) -> Any:
+    """Enum members are stored by value, like the models' use_enum_values."""
+    return getattr(value, "value", value)
+
+
+class LoggedMessage:
+    """Read-only view of one row of a `MessageLog`."""
+
+    __slots__ = ("_log", "_index")
+
+    def __init__(self, log: "MessageLog", index: int):
+        self._log = log
+        self._index = index
+
+    @property
+    def id(self) -> str:
+        return self._log._ids[self._index]
+
+    @property
+    def role(self) -> str:
+        return _ROLES[self._log._roles[self._index]]
+
+    @property
+    def content(self) -> str:
+        return self._log._contents[self._index]
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self._log._timestamps[self._index])
+
+    def _extra(self, position: int) -> Any:
+        extras = self._log._extras[self._index]
+        return extras[position] if extras is not None else None
+
+    @property
+    def user_id(self) -> Optional[str]:
+        return self._extra(0)
+
+    @property
+    def session_id(self) -> Optional[str]:
+        return self._extra(1)
+
+    @property
+    def detected_intent(self) -> Optional[str]:
+        return self._extra(2)
+
+    @property
+    def intent_confidence(self) -> Optional[float]:
+        return self._extra(3)
+
+    @property
+    def response_time_ms(self) -> Optional[int]:
+        return self._extra(4)
+
+    @property
+    def token_count(self) -> Optional[int]:
+        return self._extra(5)
+
+    @property
+    def function_calls(self) -> Optional[List[Dict[str, Any]]]:
+        return self._extra(6)
+
+    def to_chat_message(self):
+        """Full `ChatMessage` model of this row."""
+        from .conversation import ChatMessage
+
+        extras = self._log._extras[self._index] or (None,) * len(_EXTRA_FIELDS)
+        return ChatMessage(
+            id=self.id,
+            role=self.role,
+            content=self.content,
+            timestamp=self.timestamp,
+            **dict(zip(_EXTRA_FIELDS, extras))
+        )
+
+    def __repr__(self) -> str:
+        return f"LoggedMessage(role={self.role!r}, content={self.content[:40]!r})"
+
+
+class LangChainWindow(Sequence):
+    """
+    Read-only view of a range of a log's cached LangChain messages.
+
+    Slicing returns another view; nothing is copied.
+    """
+
+    __slots__ = ("_messages", "_start", "_stop")
+
+    def __init__(self, messages: List[BaseMessage], start: int, stop: int):
+        self._messages = messages
+        self._start = start
+        self._stop = max(start, stop)
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[BaseMessage, "LangChainWindow", List[BaseMessage]]:
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                return [self[index] for index in range(start, stop, step)]
+            return LangChainWindow(self._messages, self._start + start, self._start + stop)
+        index = item + len(self) if item < 0 else item
+        if not 0 <= index < len(self):
+            raise IndexError("message index out of range")
+        return self._messages[self._start + index]
+
+    def __iter__(self) -> Iterator[BaseMessage]:
+        for index in range(self._start, self._stop):
+            yield self._messages[index]
+
+    def __reversed__(self) -> Iterator[BaseMessage]:
+        for index in range(self._stop - 1, self._start - 1, -1):
+            yield self._messages[index]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (LangChainWindow, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LangChainWindow({len(self)} messages)"
+
+
+class MessagePage:
+    """
+    Rows [start, stop) of a `MessageLog`; nothing is copied.
+
+    `next_cursor` continues after this page and is None on the last one.
+    """
+
+    __slots__ = ("_log", "start", "stop")
+
+    def __init__(self, log: "MessageLog", start: int, stop: int):
+        self._log = log
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __iter__(self) -> Iterator[LoggedMessage]:
+        for index in range(self.start, self.stop):
+            yield LoggedMessage(self._log, index)
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        return str(self.stop) if self.stop < len(self._log) else None
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Rows shaped like `ChatMessage` JSON dumps, read straight from the columns."""
+        log = self._log
+        empty = (None,) * len(_EXTRA_FIELDS)
+        rows = []
+        for index in range(self.start, min(self.stop, len(log))):
+            row = {
+                "id": log._ids[index],
+                "role": _ROLES[log._roles[index]],
+                "content": log._contents[index],
+                "timestamp": datetime.fromtimestamp(log._timestamps[index]).isoformat(),
+            }
+            row.update(zip(_EXTRA_FIELDS, log._extras[index] or empty))
+            rows.append(row)
+        return rows
+
+
+class MessageLog:
+    """
+    Append-only message history stored column-wise.
+
+    Supports `len()`, iteration, indexing and slicing (returning
+    `LoggedMessage` views), `append(ChatMessage)` and `clear()`.
+    """
+
+    __slots__ = (
+        "_ids", "_roles", "_contents", "_timestamps", "_extras", "_last", "_bytes", "_content_bytes",
+        "_lc_messages", "_lc_prefix", "_lc_base",
+    )
+
+    def __init__(self, messages: Optional[List[Any]] = None):
+        self._ids: List[str] = []
+        self._roles = bytearray()
+        self._contents: List[str] = []
+        self._timestamps = array("d")
+        self._extras: List[Optional[Tuple[Any, ...]]] = []
+        self._last: Dict[int, int] = {}
+        self._bytes = 0
+        self._content_bytes = 0
+        # Converted LangChain messages, from absolute position `_lc_base` on;
+        # _lc_prefix[i] is the number of convertible rows before row i
+        self._lc_messages: List[BaseMessage] = []
+        self._lc_prefix = array("l", [0])
+        self._lc_base = 0
+        for message in messages or ():
+            self.append(message)
+
+    # === Writing ===
+
+    def add(
+        self,
+        role: Any,
+        content: str,
+        id: str,
+        timestamp: Union[datetime, float],
+        **extras: Any
+    ) -> LoggedMessage:
+        """Append a message from its fields; optional fields as in `ChatMessage`."""
+        code = _ROLE_CODES[_value(role)]
+        row = tuple(_value(extras.get(name)) for name in _EXTRA_FIELDS)
+        row_extras = row if any(value is not None for value in row) else None
+        index = len(self._ids)
+
+        self._ids.append(id)
+        self._roles.append(code)
+        self._contents.append(content)
+        self._timestamps.append(timestamp.timestamp() if isinstance(timestamp, datetime) else float(timestamp))
+        self._extras.append(row_extras)
+        self._last[code] = index
+
+        content_size = sys.getsizeof(content)
+        self._content_bytes += content_size
+        self._bytes += _ROW_BYTES + content_size + sys.getsizeof(id)
+        if row_extras is not None:
+            self._bytes += sys.getsizeof(row_extras)
+        return LoggedMessage(self, index)
+
+    def append(self, message: Any) -> LoggedMessage:
+        """Append a `ChatMessage` (or a view of another log)."""
+        return self.add(
+            message.role,
+            message.content,
+            message.id,
+            message.timestamp,
+            **{name: getattr(message, name) for name in _EXTRA_FIELDS}
+        )
+
+    def clear(self):
+        """Drop every message."""
+        self.__init__()
+
+    # === Reading ===
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __bool__(self) -> bool:
+        return bool(self._ids)
+
+    def __iter__(self) -> Iterator[LoggedMessage]:
+        for index in range(len(self._ids)):
+            yield LoggedMessage(self, index)
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[LoggedMessage, List[LoggedMessage]]:
+        if isinstance(item, slice):
+            return [LoggedMessage(self, index) for index in range(*item.indices(len(self._ids)))]
+        index = item + len(self._ids) if item < 0 else item
+        if not 0 <= index < len(self._ids):
+            raise IndexError("message index out of range")
+        return LoggedMessage(self, index)
+
+    def last(self, role: Any) -> Optional[LoggedMessage]:
+        """Most recent message with `role`, in O(1)."""
+        index = self._last.get(_ROLE_CODES[_value(role)])
+        return LoggedMessage(self, index) if index is not None else None
+
+    def of_role(self, role: Any) -> List[LoggedMessage]:
+        """Every message with `role`, oldest first."""
+        code = _ROLE_CODES[_value(role)]
+        return [LoggedMessage(self, index) for index, value in enumerate(self._roles) if value == code]
+
+    def _langchain_message(self, index: int) -> Optional[BaseMessage]:
+        message_type = _LANGCHAIN_TYPES.get(_ROLES[self._roles[index]])
+        return message_type(content=self._contents[index]) if message_type is not None else None
+
+    def _convert(self, stop: int):
+        """Convert rows up to `stop` that no window reached yet."""
+        prefix = self._lc_prefix
+        for index in range(len(prefix) - 1, stop):
+            message = self._langchain_message(index)
+            if message is not None:
+                self._lc_messages.append(message)
+                self._bytes += _LANGCHAIN_MESSAGE_BYTES
+            prefix.append(len(self._lc_messages) + self._lc_base)
+
+    def to_langchain(self, start: int = 0, end: Optional[int] = None) -> Sequence[BaseMessage]:
+        """
+        LangChain messages for rows [start, end); function rows are skipped.
+
+        Returns a view over cached messages; only rows no earlier call
+        reached are converted. Rows released by summarization are
+        converted again, uncached.
+        """
+        start, stop, _ = slice(start, end).indices(len(self._ids))
+        stop = max(start, stop)
+        self._convert(stop)
+        low, high = self._lc_prefix[start], self._lc_prefix[stop]
+        if low < self._lc_base:
+            return [
+                message for message in map(self._langchain_message, range(start, stop))
+                if message is not None
+            ]
+        return LangChainWindow(self._lc_messages, low - self._lc_base, high - self._lc_base)
+
+    def release_langchain(self, before: int):
+        """
+        Drop cached LangChain messages of rows before `before` (folded into
+        the summary, never sent again).
+
+        The cache is replaced rather than trimmed in place, so windows
+        handed out earlier stay valid.
+        """
+        converted = len(self._lc_prefix) - 1
+        position = self._lc_prefix[min(before, converted)]
+        released = position - self._lc_base
+        if released <= 0:
+            return
+        self._lc_messages = self._lc_messages[released:]
+        self._lc_base = position
+        self._bytes -= released * _LANGCHAIN_MESSAGE_BYTES
+
+    def page(self, cursor: Optional[str] = None, limit: int = 50) -> MessagePage:
+        """
+        Up to `limit` messages from `cursor` on, oldest first; all of them
+        if `limit` is not positive.
+
+        A cursor is the position of the first message to return, as given
+        by `MessagePage.next_cursor`; raises ValueError for one that
+        doesn't fit this log.
+        """
+        try:
+            start = int(cursor) if cursor else 0
+        except ValueError:
+            raise ValueError(f"Invalid history cursor: {cursor!r}") from None
+        if not 0 <= start <= len(self._ids):
+            raise ValueError(f"History cursor out of range: {cursor!r}")
+        stop = len(self._ids) if limit <= 0 else min(start + limit, len(self._ids))
+        return MessagePage(self, start, stop)
+
+    def to_chat_messages(self) -> List[Any]:
+        """Every row as a full `ChatMessage` model."""
+        return [message.to_chat_message() for message in self]
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the rows, updated on append."""
+        return self._bytes
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Size breakdown of the log."""
+        return {
+            "messages": len(self._ids),
+            "bytes": self._bytes,
+            "content_bytes": self._content_bytes,
+            "langchain_cached": len(self._lc_messages),
+        }
+
+    # === Pydantic integration ===
+
+    @classmethod
+    def _coerce(cls, value: Any) -> "MessageLog":
+        if isinstance(value, MessageLog):
+            return value
+        from .conversation import ChatMessage
+
+        log = cls()
+        for message in value:
+            log.append(ChatMessage(**message) if isinstance(message, dict) else message)
+        return log
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: Any) -> core_schema.CoreSchema:
+        from .conversation import ChatMessage
+
+        list_schema = handler.generate_schema(List[ChatMessage])
+        return core_schema.json_or_python_schema(
+            json_schema=core_schema.no_info_after_validator_function(cls._coerce, list_schema),
+            python_schema=core_schema.no_info_plain_validator_function(cls._coerce),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda log: log.to_chat_messages(), return_schema=list_schema
+            )
+        )
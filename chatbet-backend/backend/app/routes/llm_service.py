@@ -2,7 +2,7 @@ from fastapi import (
     APIRouter
 )
 from ..services.llm import (
-    llm,
+    get_llm,
     STYLE_INSTRUCTIONS
 )
 
@@ -19,6 +19,6 @@ messages = [
 @router.post("/chat")
 async def chat_endpoint(user_message: str):
     messages.append(("user", user_message))
-    response = llm.invoke(messages)
+    response = get_llm().invoke(messages)
     # messages.append(("assistant", response.content))
     return {"response": response.content}
\ No newline at end of file
@@ -11,12 +11,15 @@ data is pretty stable (24h cache), but live odds change constantly (30s cache).
 """
 
 import asyncio
+import hashlib
+import json
 import logging
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Union
 from contextlib import asynccontextmanager
 
 import httpx
+from cachetools import LRUCache
 from tenacity import (
     retry, 
     stop_after_attempt, 
@@ -25,6 +28,7 @@ from tenacity import (
     RetryError
 )
 
+from ..core import deadline
 from ..core.config import settings
 from ..core.logging import get_logger, log_function_call
 from ..models.api_models import (
@@ -66,6 +70,15 @@ class CircuitBreakerError(APIError):
     pass
 
 
+# Shortest tenacity backoff between request attempts (seconds)
+RETRY_MIN_WAIT = 4
+
+
+def _stop_when_out_of_time(retry_state) -> bool:
+    """Tenacity stop condition: don't back off past the turn's deadline."""
+    return not deadline.has_budget(RETRY_MIN_WAIT + settings.deadline_answer_reserve_seconds)
+
+
 class CircuitBreaker:
     """
     Simple circuit breaker implementation.
@@ -148,6 +161,11 @@ class ChatBetAPIClient:
         # Simple in-memory cache (in production, use Redis)
         self._cache: Dict[str, Dict[str, Any]] = {}
         
+        # Fixture and odds data versions (bumped whenever upstream data of
+        # that kind changes); fingerprints of the most recent responses only
+        self._data_fingerprints: LRUCache = LRUCache(maxsize=settings.api_data_fingerprint_max_entries)
+        self._data_versions: Dict[str, int] = {"fixtures": 0, "odds": 0}
+        
         # Authentication state
         self._auth_token: Optional[str] = None
         self._token_expires_at: Optional[datetime] = None
@@ -192,9 +210,31 @@ class ChatBetAPIClient:
         }
         logger.debug(f"Cached data for {cache_key} (TTL: {ttl_seconds}s)")
     
+    def _record_data_version(self, kind: str, data_key: str, data: Any):
+        """
+        Bump the version of a kind of data if a fresh fetch differs from last time.
+        
+        Anything derived from fixtures or odds (like cached LLM answers) can
+        include the versions it depends on in its key and gets invalidated
+        for free. A fingerprint evicted from the bounded map just counts as
+        a change on its next fetch.
+        """
+        payload = json.dumps(data, sort_keys=True, default=str).encode()
+        fingerprint = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        
+        if self._data_fingerprints.get(data_key) != fingerprint:
+            self._data_fingerprints[data_key] = fingerprint
+            self._data_versions[kind] += 1
+            logger.debug(f"{kind} data version bumped to {self._data_versions[kind]} by {data_key}")
+    
+    @property
+    def data_versions(self) -> Dict[str, int]:
+        """Current version stamps of fixture and odds data, by kind."""
+        return dict(self._data_versions)
+    
     @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
+        stop=stop_after_attempt(3) | _stop_when_out_of_time,
+        wait=wait_exponential(multiplier=1, min=RETRY_MIN_WAIT, max=10),
         retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError))
     )
     async def _make_request(
@@ -214,6 +254,13 @@ class ChatBetAPIClient:
         if not self.circuit_breaker.can_execute():
             raise CircuitBreakerError("Circuit breaker is open")
         
+        # Bound the request by what's left of the turn
+        deadline.check_deadline(f"{method} {endpoint}")
+        timeout = deadline.clamp_timeout(self.timeout)
+        clamped = timeout is not None and timeout < self.timeout
+        if clamped:
+            kwargs.setdefault("timeout", timeout)
+        
         try:
             # Add common headers
             headers = kwargs.get("headers", {})
@@ -244,8 +291,9 @@ class ChatBetAPIClient:
             return response
             
         except Exception as e:
-            # Record failure for circuit breaker
-            self.circuit_breaker.record_failure()
+            # Record failure for circuit breaker (running out of turn time isn't the API's fault)
+            if not (clamped and isinstance(e, httpx.TimeoutException)):
+                self.circuit_breaker.record_failure()
             
             logger.error(f"Request failed: {method} {endpoint} - {str(e)}")
             raise
@@ -549,6 +597,7 @@ class ChatBetAPIClient:
             )
             
             fixtures_data = response.json()
+            self._record_data_version("fixtures", self._get_cache_key("/sports/fixtures", params), fixtures_data)
             
             # Handle the response format where first item is totalResults
             if fixtures_data and isinstance(fixtures_data[0], dict) and "totalResults" in fixtures_data[0]:
@@ -776,6 +825,7 @@ class ChatBetAPIClient:
             )
             
             odds_data = response.json()
+            self._record_data_version("odds", cache_key, odds_data)
             
             # Cache for 30 seconds (odds change frequently)
             self._set_cache(cache_key, odds_data, settings.cache_ttl_odds)
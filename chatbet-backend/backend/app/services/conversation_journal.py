@@ -0,0 +1,436 @@
+"""
+Local append-only conversation journal for warm restarts.
+
+Without Redis persistence, a deploy or a crash dropped every in-memory
+conversation and users lost their context mid-chat. The journal keeps a
+durable copy on local disk, with no external service involved:
+
+- after a turn the session is only marked dirty; a background writer
+  encodes every dirty session's new messages and appends them to the log
+  in one write, with one fsync per batch, so replies never wait on disk
+- the log is a sequence of length-prefixed, CRC-checked binary frames,
+  one event each: a session (re)start with its metadata, a metadata
+  update, a message at its position in the conversation, or a delete;
+  message and metadata bodies are the same compact records Redis
+  persistence uses
+- at startup the snapshot and then the log are replayed; a torn frame
+  at the end (a crash mid-write) ends the replay and is cut off
+- once the log grows past a threshold it is compacted: the live
+  sessions are rewritten into a fresh snapshot and the log starts over
+
+Replay is idempotent: a message is only applied at the position it was
+written for, so a crash between writing a snapshot and truncating the
+log replays the same state.
+"""
+
+import asyncio
+import json
+import os
+import struct
+import time
+import zlib
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..models.conversation import Conversation
+from .conversation_persistence import decode_conversation, encode_message, encode_meta
+
+logger = get_logger(__name__)
+
+# Frame header: payload length and CRC32 of the payload
+_HEADER = struct.Struct(">II")
+_SESSION_ID_LENGTH = struct.Struct(">H")
+_POSITION = struct.Struct(">I")
+
+# Event types
+START = b"s"      # session (re)started: metadata, earlier messages dropped
+META = b"c"       # metadata changed
+MESSAGE = b"m"    # message at a position
+DELETE = b"d"     # session cleared
+
+Event = Tuple[bytes, str, Optional[int], bytes]
+
+
+def encode_event(kind: bytes, session_id: str, body: bytes = b"", position: Optional[int] = None) -> bytes:
+    """One event as a length-prefixed, checksummed frame."""
+    sid = session_id.encode("utf-8")
+    payload = b"".join((
+        kind,
+        _SESSION_ID_LENGTH.pack(len(sid)),
+        sid,
+        _POSITION.pack(position) if kind == MESSAGE else b"",
+        body,
+    ))
+    return _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_events(data: bytes) -> Tuple[List[Event], int]:
+    """
+    Events of a journal file and the length of its intact prefix.
+
+    Decoding stops at the first truncated or corrupt frame.
+    """
+    events: List[Event] = []
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        length, crc = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        kind = payload[:1]
+        (sid_length,) = _SESSION_ID_LENGTH.unpack_from(payload, 1)
+        cursor = 1 + _SESSION_ID_LENGTH.size + sid_length
+        session_id = payload[1 + _SESSION_ID_LENGTH.size:cursor].decode("utf-8")
+        position = None
+        if kind == MESSAGE:
+            (position,) = _POSITION.unpack_from(payload, cursor)
+            cursor += _POSITION.size
+        events.append((kind, session_id, position, payload[cursor:]))
+        offset = start + length
+    return events, offset
+
+
+class JournalState:
+    """Sessions rebuilt from journal events: session_id -> [metadata, message records]."""
+
+    def __init__(self):
+        self.sessions: Dict[str, List[Any]] = {}
+        self.skipped = 0
+
+    def apply(self, events: List[Event]):
+        sessions = self.sessions
+        for kind, session_id, position, body in events:
+            if kind == START:
+                sessions[session_id] = [body, []]
+            elif kind == DELETE:
+                sessions.pop(session_id, None)
+            elif session_id not in sessions:
+                self.skipped += 1
+            elif kind == META:
+                sessions[session_id][0] = body
+            elif kind == MESSAGE:
+                records = sessions[session_id][1]
+                # Already applied (replayed twice), or a gap: only the next position is taken
+                if position == len(records):
+                    records.append(body)
+                else:
+                    self.skipped += 1
+
+    def last_activity(self, session_id: str) -> float:
+        """Timestamp of a session's last message, 0 if it has none."""
+        records = self.sessions[session_id][1]
+        return float(json.loads(records[-1])[3]) if records else 0.0
+
+
+class ConversationJournal:
+    """
+    Write-behind journal of conversations on local disk.
+
+    `recover` once at startup, `mark_dirty` after a turn, `forget` when a
+    session leaves memory and `delete` when it is cleared.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        flush_interval: Optional[float] = None,
+        compact_bytes: Optional[int] = None,
+        idle_timeout: Optional[float] = None
+    ):
+        self.directory = directory or settings.conversation_journal_dir
+        self.flush_interval = flush_interval or settings.conversation_journal_flush_interval
+        self.compact_bytes = compact_bytes or settings.conversation_journal_compact_bytes
+        self.idle_timeout = idle_timeout or settings.conversation_timeout
+        self.log_path = os.path.join(self.directory, "conversations.log")
+        self.snapshot_path = os.path.join(self.directory, "conversations.snapshot")
+
+        self._dirty: Dict[str, Conversation] = {}
+        self._pending: List[bytes] = []
+        # session_id -> (messages journaled, CRC of the last metadata written)
+        self._journaled: Dict[str, Tuple[int, int]] = {}
+        self._file: Optional[BinaryIO] = None
+        self._log_bytes = 0
+        # A failed write left part of a batch after `_log_bytes`
+        self._torn = False
+        self._lock = asyncio.Lock()
+        self._writer: Optional[asyncio.Task] = None
+
+        # Performance tracking
+        self._batches = 0
+        self._events = 0
+        self._bytes_written = 0
+        self._write_seconds = 0.0
+        self._compactions = 0
+        self._recovered = 0
+        self._recovery_ms = 0.0
+        self._failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.conversation_journal_enabled
+
+    # === Recovery ===
+
+    async def recover(self) -> List[Conversation]:
+        """
+        Replay the snapshot and the log, returning conversations active
+        within the idle timeout, least recently active first.
+        """
+        if not self.enabled:
+            return []
+        start = time.perf_counter()
+        state = await asyncio.to_thread(self._recover_files)
+
+        cutoff = time.time() - self.idle_timeout
+        conversations = []
+        for session_id in sorted(state.sessions, key=state.last_activity):
+            if state.last_activity(session_id) < cutoff:
+                continue
+            meta, records = state.sessions[session_id]
+            try:
+                conversation = decode_conversation(session_id, meta, records)
+            except Exception as e:
+                logger.warning(f"Unreadable journaled conversation {session_id}: {e}")
+                continue
+            self._journaled[session_id] = (len(records), zlib.crc32(meta))
+            conversations.append(conversation)
+
+        self._recovered = len(conversations)
+        self._recovery_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"Recovered {len(conversations)} conversations from journal in {self._recovery_ms:.1f}ms")
+        return conversations
+
+    def _read_state(self) -> Tuple[JournalState, int]:
+        """State from the snapshot and the log, and the log's intact length."""
+        state = JournalState()
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as f:
+                state.apply(decode_events(f.read())[0])
+        valid = 0
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "rb") as f:
+                events, valid = decode_events(f.read())
+            state.apply(events)
+        return state, valid
+
+    def _recover_files(self) -> JournalState:
+        os.makedirs(self.directory, exist_ok=True)
+        state, valid = self._read_state()
+        # Cut off a torn frame so new events follow intact ones
+        if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > valid:
+            logger.warning(f"Dropping {os.path.getsize(self.log_path) - valid} torn bytes at the end of the journal")
+            os.truncate(self.log_path, valid)
+        self._open_log()
+        return state
+
+    # === Writing ===
+
+    def mark_dirty(self, conversation: Conversation) -> Optional[asyncio.Task]:
+        """Queue a conversation for the next write; never waits on disk."""
+        if not self.enabled:
+            return None
+        self._dirty[conversation.id] = conversation
+        return self._ensure_writer()
+
+    def forget(self, session_id: str):
+        """
+        A session left memory; if it is started again, the journal starts
+        it over instead of appending to the old copy.
+        """
+        self._dirty.pop(session_id, None)
+        self._journaled.pop(session_id, None)
+
+    def delete(self, session_id: str):
+        """Record that a session was cleared."""
+        self.forget(session_id)
+        if self.enabled:
+            self._pending.append(encode_event(DELETE, session_id))
+            self._ensure_writer()
+
+    def _ensure_writer(self) -> asyncio.Task:
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_loop())
+        return self._writer
+
+    async def _write_loop(self):
+        while self._dirty or self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def _encode(self, session_id: str, conversation: Conversation) -> List[bytes]:
+        """Events bringing the journal's copy of a session up to date."""
+        meta = encode_meta(conversation)
+        meta_crc = zlib.crc32(meta)
+        journaled = self._journaled.get(session_id)
+        if journaled is None:
+            events = [encode_event(START, session_id, meta)]
+            written = 0
+        else:
+            written, last_crc = journaled
+            events = [encode_event(META, session_id, meta)] if meta_crc != last_crc else []
+
+        messages = conversation.messages
+        for position in range(written, len(messages)):
+            events.append(encode_event(MESSAGE, session_id, encode_message(messages[position]), position))
+        self._journaled[session_id] = (len(messages), meta_crc)
+        return events
+
+    async def flush(self) -> int:
+        """Append every pending event with one write and one fsync; returns the event count."""
+        async with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            pending, self._pending = self._pending, []
+            events = list(pending)
+            for session_id, conversation in dirty.items():
+                events.extend(self._encode(session_id, conversation))
+            if not events:
+                return 0
+
+            data = b"".join(events)
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(self._append, data)
+            except OSError as e:
+                self._failures += 1
+                logger.error(f"Conversation journal write failed ({len(events)} events): {e}")
+                self._requeue(pending, dirty)
+                return 0
+            self._write_seconds += time.perf_counter() - start
+            self._batches += 1
+            self._events += len(events)
+            self._bytes_written += len(data)
+
+            if self._log_bytes >= self.compact_bytes:
+                await self._compact_locked()
+            return len(events)
+
+    def _requeue(self, pending: List[bytes], dirty: Dict[str, Conversation]):
+        """Queue a failed batch again, ahead of anything queued since."""
+        self._pending[:0] = pending
+        for session_id, conversation in dirty.items():
+            # Unless it was deleted while the batch was being written
+            if self._journaled.pop(session_id, None) is not None:
+                # Written again in full once the disk is back
+                self._dirty.setdefault(session_id, conversation)
+
+    def _open_log(self):
+        if self._file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(self.log_path, "ab")
+            self._log_bytes = self._file.tell()
+
+    def _append(self, data: bytes):
+        if self._torn:
+            self._truncate_torn()
+        self._open_log()
+        try:
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError:
+            # Events appended after a torn frame would be lost at recovery
+            self._torn = True
+            try:
+                self._truncate_torn()
+            except OSError:
+                pass  # Retried before the next write
+            raise
+        self._log_bytes += len(data)
+
+    def _truncate_torn(self):
+        """Cut a partly written batch off the end of the log."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass  # The buffered tail is cut off below
+            self._file = None
+        os.truncate(self.log_path, self._log_bytes)
+        self._torn = False
+
+    # === Compaction ===
+
+    async def compact(self):
+        """Rewrite the live sessions into a fresh snapshot and empty the log."""
+        async with self._lock:
+            await self._compact_locked()
+
+    async def _compact_locked(self):
+        start = time.perf_counter()
+        try:
+            kept = await asyncio.to_thread(self._compact_files)
+        except OSError as e:
+            self._failures += 1
+            logger.error(f"Conversation journal compaction failed: {e}")
+            return
+        self._compactions += 1
+        logger.info(f"Compacted conversation journal to {kept} sessions in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    def _compact_files(self) -> int:
+        state, _ = self._read_state()
+        cutoff = time.time() - self.idle_timeout
+        tmp_path = self.snapshot_path + ".tmp"
+        kept = 0
+        with open(tmp_path, "wb") as f:
+            for session_id, (meta, records) in state.sessions.items():
+                if state.last_activity(session_id) < cutoff:
+                    continue
+                f.write(encode_event(START, session_id, meta))
+                for position, record in enumerate(records):
+                    f.write(encode_event(MESSAGE, session_id, record, position))
+                kept += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        # Everything in the log is in the snapshot now
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        with open(self.log_path, "wb") as f:
+            os.fsync(f.fileno())
+        self._fsync_directory()
+        self._open_log()
+        return kept
+
+    def _fsync_directory(self):
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    async def shutdown(self):
+        """Stop the writer, write whatever is still pending and close the log."""
+        if self._writer is not None and not self._writer.done():
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+        if self.enabled and (self._dirty or self._pending):
+            await self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get journal statistics."""
+        return {
+            "enabled": self.enabled,
+            "log_bytes": self._log_bytes,
+            "dirty_sessions": len(self._dirty),
+            "batches": self._batches,
+            "events": self._events,
+            "bytes_written": self._bytes_written,
+            "avg_events_per_batch": round(self._events / self._batches, 2) if self._batches else 0,
+            "avg_write_ms": round(self._write_seconds / self._batches * 1000, 3) if self._batches else 0,
+            "compactions": self._compactions,
+            "recovered_sessions": self._recovered,
+            "recovery_ms": round(self._recovery_ms, 2),
+            "failures": self._failures,
+        }
@@ -15,27 +15,50 @@ Why LangChain? It gives us:
 """
 
 import logging
-from typing import Dict, List, Optional, Any, Tuple, AsyncGenerator, cast
-from datetime import datetime, timedelta
+from collections import deque
+from typing import Deque, Dict, Hashable, List, Optional, Any, Sequence, Tuple, AsyncGenerator, Union, cast
+from datetime import datetime
 import asyncio
 from uuid import uuid4
 
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
-from langchain_core.chat_history import InMemoryChatMessageHistory
 from langchain_core.runnables.history import RunnableWithMessageHistory
 
 from ..core.config import settings
+from ..core.deadline import deadline_scope
 from ..core.logging import get_logger, log_function_call
 from ..models.conversation import (
     Conversation, ConversationContext, ChatMessage, MessageRole,
-    IntentType, ChatRequest, ChatResponse, IntentClassificationResult
+    IntentType, ChatRequest, ChatResponse, StreamingChatResponse, IntentClassificationResult,
+    ConversationSummary
 )
+from ..models.message_log import MessagePage
 from ..models.betting import BetRecommendation, BettingStrategy
 from ..services.llm_service import get_llm_service
 from ..services.chatbet_api import get_api_client
+from ..services.conversation_journal import ConversationJournal
+from ..services.conversation_persistence import ConversationPersistence
+from ..services.session_store import SessionEntry, SessionStore
+from ..services.shared_turns import SharedTurnRegistry, context_free_key, is_personal_intent
+from ..services.summarizer import ConversationSummarizer
+from ..services.turn_queue import SessionTurnQueue
+from ..services.tool_planner import merge_entities
+from ..utils.parsers import get_entity_extractor
 
 logger = get_logger(__name__)
 
+# A full answer, or its text chunks as the model produces them
+ResponseContent = Union[str, AsyncGenerator[str, None]]
+
+# Intents answered from the model alone; streamed without tool calling even
+# when the planner fetched nothing
+STREAMABLE_INTENTS = {
+    IntentType.GREETING,
+    IntentType.HELP_REQUEST,
+    IntentType.GENERAL_BETTING_INFO,
+    IntentType.UNCLEAR,
+}
+
 
 class ConversationError(Exception):
     """Base exception for conversation-related errors."""
@@ -62,17 +85,32 @@ class ConversationManager:
     def __init__(self):
         self.llm_service = get_llm_service()
         
-        # Session storage (in production, use Redis)
-        self.sessions: Dict[str, Conversation] = {}
-        self.memories: Dict[str, InMemoryChatMessageHistory] = {}
+        # Session storage (in production, use Redis), bounded and expiring
+        self.store = SessionStore()
+        self.store.on_evict(self._on_session_evicted)
+        
+        # Shared copy in Redis so any worker can resume a session
+        self.persistence = ConversationPersistence()
+        
+        # Local append-only copy, replayed after a restart
+        self.journal = ConversationJournal()
         
-        # Message deduplication tracking (user_message_hash -> timestamp)
-        self.processed_user_messages: Dict[str, datetime] = {}
-        self.dedup_window_minutes = 0.03  # Prevent same message processing within 2 seconds
+        # Runs each session's turns in order; duplicates share the in-flight turn
+        self.turn_queue = SessionTurnQueue()
+        
+        # First turns of new sessions asking the same thing share one answer
+        self.shared_turns = SharedTurnRegistry()
+        
+        # Folds older turns into a rolling summary in the background
+        self.summarizer = ConversationSummarizer(self.llm_service)
         
         # Performance tracking
         self._total_conversations = 0
         self._avg_response_time = 0.0
+        self._streams = 0
+        self._streams_buffered = 0
+        self._streams_shared = 0
+        self._first_chunk_times: Deque[float] = deque(maxlen=1000)
     
     @log_function_call()
     async def start_conversation(
@@ -91,9 +129,10 @@ class ConversationManager:
             session_id = str(uuid4())
         
         # Check if conversation already exists
-        if session_id in self.sessions:
+        entry = await self._get_entry(session_id)
+        if entry is not None:
             logger.debug(f"Resuming conversation: {session_id}")
-            return self.sessions[session_id]
+            return entry.conversation
         
         # Create new conversation
         context = ConversationContext(
@@ -111,29 +150,100 @@ class ConversationManager:
             title=None
         )
         
-        # Initialize LangChain memory - using new recommended approach
-        history = InMemoryChatMessageHistory()
-        
-        # Store in session cache
-        self.sessions[session_id] = conversation
-        self.memories[session_id] = history
+        # Store in session cache; its LangChain history is a view of the messages
+        self.store.put(session_id, conversation)
         
         self._total_conversations += 1
         logger.info(f"Started new conversation: {session_id}")
         
         return conversation
     
+    async def _get_entry(self, session_id: str) -> Optional[SessionEntry]:
+        """
+        Stored session, from local memory or hydrated from Redis.
+        
+        A local copy is only used if no other worker has added turns since.
+        """
+        entry = self.store.get(session_id)
+        if entry is not None:
+            if not await self.persistence.is_stale(session_id):
+                return entry
+            # Another worker has served this session since; its copy wins
+            self.store.pop(session_id)
+        
+        conversation = await self.persistence.load(session_id)
+        if conversation is None:
+            return None
+        logger.debug(f"Hydrated conversation from Redis: {session_id}")
+        return self.store.put(session_id, conversation)
+    
+    async def _classify_and_plan(
+        self,
+        message: str,
+        conversation: Conversation,
+        user_key: Optional[str] = None
+    ) -> Tuple[IntentClassificationResult, List[Dict[str, Any]]]:
+        """
+        Classify a message and run the tools its intent obviously needs.
+        
+        Team names the local extractor is sure about start their searches
+        while the intent is still being classified. Teams are remembered on
+        the conversation context for prefetching.
+        """
+        planner = self.llm_service.tool_planner
+        local_entities = get_entity_extractor().extract_entities(message)
+        speculative = planner.speculate(local_entities, session_id=conversation.id)
+        try:
+            intent_result = await self.llm_service.classify_intent(message, user_key=user_key)
+        except BaseException:
+            for task in speculative.values():
+                task.cancel()
+            raise
+        
+        entities = merge_entities(intent_result.entities, local_entities)
+        for team in entities.teams:
+            conversation.context.add_mentioned_team(team)
+        
+        planned_tool_results = await planner.dispatch(
+            intent_result.intent, entities, speculative, session_id=conversation.id
+        )
+        return intent_result, planned_tool_results
+    
+    def _ensure_stored(self, conversation: Conversation):
+        """Re-measure a conversation after a turn, re-storing it if it was evicted mid-turn."""
+        entry = self.store.peek(conversation.id)
+        if entry is None or entry.conversation is not conversation:
+            self.store.put(conversation.id, conversation)
+        else:
+            self.store.touch(conversation.id)
+    
+    def _on_session_evicted(self, session_id: str, entry: SessionEntry, reason: str):
+        """Release what an evicted or expired session still holds elsewhere."""
+        self.llm_service.tool_memo.clear(session_id)
+        self.journal.forget(session_id)
+    
+    def _schedule_background_work(self, conversation: Conversation):
+        """Post-turn work that must never delay the reply."""
+        self._ensure_stored(conversation)
+        self.persistence.mark_dirty(conversation)
+        self.journal.mark_dirty(conversation)
+        self.summarizer.maybe_schedule(conversation)
+        self.llm_service.prefetcher.maybe_schedule(conversation)
+    
     async def _generate_contextual_response(
         self,
         conversation: Conversation,
         intent_result: IntentClassificationResult,
-        user_context: Optional[Dict[str, Any]] = None
-    ) -> str:
+        user_context: Optional[Dict[str, Any]] = None,
+        stream: bool = False
+    ) -> ResponseContent:
         """
         Generate contextual response based on intent and conversation history.
         
         This method routes to different response strategies based on the
-        classified intent. It's the heart of our conversation logic.
+        classified intent. It's the heart of our conversation logic. With
+        `stream`, model answers come back as an async generator of chunks;
+        canned answers are still plain strings.
         """
         user_message = conversation.last_user_message
         if not user_message:
@@ -154,37 +264,36 @@ class ConversationManager:
         
         # Route based on intent
         if intent_result.intent == IntentType.MATCH_SCHEDULE_QUERY:
-            return await self._handle_schedule_query(user_message.content, conversation_history, enhanced_context)
+            return await self._handle_schedule_query(user_message.content, conversation_history, enhanced_context, stream)
         
         elif intent_result.intent == IntentType.ODDS_INFORMATION_QUERY:
-            return await self._handle_odds_query(user_message.content, conversation_history, enhanced_context)
+            return await self._handle_odds_query(user_message.content, conversation_history, enhanced_context, stream)
         
         elif intent_result.intent == IntentType.BETTING_RECOMMENDATION:
-            return await self._handle_betting_recommendation(user_message.content, conversation_history, enhanced_context)
+            return await self._handle_betting_recommendation(user_message.content, conversation_history, enhanced_context, stream)
         
         elif intent_result.intent == IntentType.TEAM_COMPARISON:
-            return await self._handle_team_comparison(user_message.content, conversation_history, enhanced_context)
+            return await self._handle_team_comparison(user_message.content, conversation_history, enhanced_context, stream)
         
         elif intent_result.intent == IntentType.USER_BALANCE_QUERY:
-            return await self._handle_balance_query(user_message.content, conversation_history, enhanced_context)
+            return await self._handle_balance_query(user_message.content, conversation_history, enhanced_context, stream)
         
         elif intent_result.intent == IntentType.BET_SIMULATION:
-            return await self._handle_bet_simulation(user_message.content, conversation_history, enhanced_context)
+            return await self._handle_bet_simulation(user_message.content, conversation_history, enhanced_context, stream)
         
         elif intent_result.intent == IntentType.GREETING:
-            return await self._handle_greeting(user_message.content, conversation_history, enhanced_context)
+            return await self._handle_greeting(user_message.content, conversation_history, enhanced_context, stream)
         
         elif intent_result.intent == IntentType.HELP_REQUEST:
-            return await self._handle_help_request(user_message.content, conversation_history, enhanced_context)
+            return await self._handle_help_request(user_message.content, conversation_history, enhanced_context, stream)
         
         else:
             # General response for unclear or general queries
-            result = await self.llm_service.generate_response(
-                user_message.content, conversation_history, enhanced_context, stream=False
+            return await self.llm_service.generate_response(
+                user_message.content, conversation_history, enhanced_context, stream=stream
             )
-            return cast(str, result)
     
-    async def _handle_schedule_query(self, user_message: str, history: List[BaseMessage], context: Dict[str, Any]) -> str:
+    async def _handle_schedule_query(self, user_message: str, history: Sequence[BaseMessage], context: Dict[str, Any], stream: bool = False) -> ResponseContent:
         """Handle match schedule queries with real-time data."""
         # Extract team names from entities if available
         entities = context.get("entities", {})
@@ -196,62 +305,54 @@ class ConversationManager:
         else:
             context["query_type"] = "general_schedule"
         
-        # When stream=False, generate_response returns a string
-        result = await self.llm_service.generate_response(user_message, history, context, stream=False)
-        return cast(str, result)
+        return await self.llm_service.generate_response(user_message, history, context, stream=stream)
     
-    async def _handle_odds_query(self, user_message: str, history: List[BaseMessage], context: Dict[str, Any]) -> str:
+    async def _handle_odds_query(self, user_message: str, history: Sequence[BaseMessage], context: Dict[str, Any], stream: bool = False) -> ResponseContent:
         """Handle odds information queries."""
         context["query_type"] = "odds_information"
         context["include_odds_explanation"] = True
         
-        result = await self.llm_service.generate_response(user_message, history, context, stream=False)
-        return cast(str, result)
+        return await self.llm_service.generate_response(user_message, history, context, stream=stream)
     
-    async def _handle_betting_recommendation(self, user_message: str, history: List[BaseMessage], context: Dict[str, Any]) -> str:
+    async def _handle_betting_recommendation(self, user_message: str, history: Sequence[BaseMessage], context: Dict[str, Any], stream: bool = False) -> ResponseContent:
         """Handle betting recommendation requests."""
         context["query_type"] = "betting_recommendation"
         context["include_risk_warning"] = True
         context["include_reasoning"] = True
         
-        result = await self.llm_service.generate_response(user_message, history, context, stream=False)
-        return cast(str, result)
+        return await self.llm_service.generate_response(user_message, history, context, stream=stream)
     
-    async def _handle_team_comparison(self, user_message: str, history: List[BaseMessage], context: Dict[str, Any]) -> str:
+    async def _handle_team_comparison(self, user_message: str, history: Sequence[BaseMessage], context: Dict[str, Any], stream: bool = False) -> ResponseContent:
         """Handle team comparison queries."""
         context["query_type"] = "team_comparison"
         context["include_stats"] = True
         
-        result = await self.llm_service.generate_response(user_message, history, context, stream=False)
-        return cast(str, result)
+        return await self.llm_service.generate_response(user_message, history, context, stream=stream)
     
-    async def _handle_balance_query(self, user_message: str, history: List[BaseMessage], context: Dict[str, Any]) -> str:
+    async def _handle_balance_query(self, user_message: str, history: Sequence[BaseMessage], context: Dict[str, Any], stream: bool = False) -> ResponseContent:
         """Handle user balance queries."""
         if not context.get("conversation_context", {}).get("is_authenticated"):
             return "To check your balance, you'll need to sign in first. Would you like me to help you with that?"
         
         context["query_type"] = "balance_query"
-        result = await self.llm_service.generate_response(user_message, history, context, stream=False)
-        return cast(str, result)
+        return await self.llm_service.generate_response(user_message, history, context, stream=stream)
     
-    async def _handle_bet_simulation(self, user_message: str, history: List[BaseMessage], context: Dict[str, Any]) -> str:
+    async def _handle_bet_simulation(self, user_message: str, history: Sequence[BaseMessage], context: Dict[str, Any], stream: bool = False) -> ResponseContent:
         """Handle bet placement simulation."""
         context["query_type"] = "bet_simulation"
         context["include_calculation"] = True
         context["include_risk_warning"] = True
         
-        result = await self.llm_service.generate_response(user_message, history, context, stream=False)
-        return cast(str, result)
+        return await self.llm_service.generate_response(user_message, history, context, stream=stream)
     
-    async def _handle_greeting(self, user_message: str, history: List[BaseMessage], context: Dict[str, Any]) -> str:
+    async def _handle_greeting(self, user_message: str, history: Sequence[BaseMessage], context: Dict[str, Any], stream: bool = False) -> ResponseContent:
         """Handle greetings and conversation starters."""
         context["query_type"] = "greeting"
         context["show_capabilities"] = True
         
-        result = await self.llm_service.generate_response(user_message, history, context, stream=False)
-        return cast(str, result)
+        return await self.llm_service.generate_response(user_message, history, context, stream=stream)
     
-    async def _handle_help_request(self, user_message: str, history: List[BaseMessage], context: Dict[str, Any]) -> str:
+    async def _handle_help_request(self, user_message: str, history: Sequence[BaseMessage], context: Dict[str, Any], stream: bool = False) -> ResponseContent:
         """Handle help requests."""
         help_response = """I'm ChatBet Assistant, your sports betting companion! Here's what I can help you with:
 
@@ -284,19 +385,25 @@ Just ask me anything about sports betting, and I'll help you make informed decis
         
         return help_response
     
-    def _convert_to_langchain_messages(self, conversation: Conversation) -> List[BaseMessage]:
-        """Convert our ChatMessage objects to LangChain BaseMessage objects."""
-        messages = []
-        
-        for msg in conversation.get_recent_messages():
-            if msg.role == MessageRole.USER:
-                messages.append(HumanMessage(content=msg.content))
-            elif msg.role == MessageRole.ASSISTANT:
-                messages.append(AIMessage(content=msg.content))
-            elif msg.role == MessageRole.SYSTEM:
-                messages.append(SystemMessage(content=msg.content))
-        
-        return messages
+    @staticmethod
+    def _fallback_response(intent: Optional[IntentType]) -> str:
+        """A more helpful reply than nothing when the model returned an empty answer."""
+        if intent == IntentType.MATCH_SCHEDULE_QUERY:
+            return "I'm currently unable to retrieve match schedules. This might be due to a temporary issue with the sports data service. The tournament might be in an off-season or there could be a brief connectivity issue. Please try again in a moment, or ask about general tournament information instead."
+        elif intent == IntentType.ODDS_INFORMATION_QUERY:
+            return "I'm having trouble accessing betting odds right now. This could be because betting markets aren't open yet, the match hasn't started accepting bets, or there's a temporary connection issue. Can I help you with tournament schedules or general betting information instead?"
+        elif intent == IntentType.BETTING_RECOMMENDATION:
+            return "I'm unable to access current match data for betting recommendations right now due to a temporary issue with the sports data service. However, I can still help you understand betting strategies, explain different types of bets, or provide general tournament information. What would you like to know?"
+        else:
+            return "I'm experiencing a temporary issue accessing the sports data service. This usually resolves quickly - please try your question again in a moment. Alternatively, I can help with general betting information or explain how different types of sports bets work."
+    
+    def _convert_to_langchain_messages(self, conversation: Conversation) -> Sequence[BaseMessage]:
+        """Recent messages as LangChain messages; a view of the log's cached conversions."""
+        # Turns already folded into the rolling summary are not resent; the
+        # summarizer folds turns before they fall out of this window
+        messages = conversation.messages
+        start = max(len(messages) - settings.max_conversation_history, conversation.context.summarized_message_count, 0)
+        return messages.to_langchain(start)
     
     def _generate_suggested_actions(self, intent: IntentType) -> List[str]:
         """Generate contextual follow-up suggestions based on intent."""
@@ -347,46 +454,73 @@ Just ask me anything about sports betting, and I'll help you make informed decis
                 / self._total_conversations
             )
     
-    async def get_conversation_history(
-        self, 
-        session_id: str, 
+    async def get_history_page(
+        self,
+        session_id: str,
         user_id: Optional[str] = None,
-        limit: int = 50,
-        offset: int = 0
-    ) -> Optional[Conversation]:
-        """Get conversation history for a session."""
-        conversation = self.sessions.get(session_id)
-        if not conversation:
-            return None
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Optional[MessagePage]:
+        """
+        One page of a session's messages, oldest first.
         
-        # Apply pagination to messages if needed
-        if limit > 0 and len(conversation.messages) > offset:
-            # Create a copy of the conversation with paginated messages
-            start_idx = offset
-            end_idx = offset + limit
-            paginated_messages = conversation.messages[start_idx:end_idx]
-            
-            # Create new conversation with paginated messages
-            paginated_conversation = Conversation(
-                id=conversation.id,
-                context=conversation.context,
-                messages=paginated_messages,
-                title=conversation.title,
-                is_active=conversation.is_active
-            )
-            return paginated_conversation
+        The page is a view of the message log; nothing is copied until it
+        is serialized. With `user_id`, sessions of other users are treated
+        as missing. Raises ValueError for a cursor that doesn't fit.
+        """
+        entry = await self._get_entry(session_id)
+        if entry is None:
+            return None
+        if user_id is not None and entry.conversation.context.user_id != user_id:
+            return None
+        return entry.conversation.messages.page(cursor, limit)
+    
+    async def _user_sessions(self, user_id: str) -> List[str]:
+        """A user's session ids: local ones by recency, then ones only in Redis."""
+        local = self.store.sessions_for(user_id)
+        known = set(local)
+        remote = sorted(sid for sid in await self.persistence.sessions_for(user_id) if sid not in known)
+        return local + remote
+    
+    async def list_conversations(self, user_id: str, limit: int = 20, offset: int = 0) -> List[ConversationSummary]:
+        """
+        Summaries of a user's conversations, most recently used first.
         
-        return conversation
+        Uses the per-user session index; only the sessions of the requested
+        page are read.
+        """
+        session_ids = await self._user_sessions(user_id)
+        summaries = []
+        for session_id in session_ids[offset:offset + limit if limit > 0 else None]:
+            entry = self.store.peek(session_id) or await self._get_entry(session_id)
+            if entry is not None:
+                summaries.append(self._summarize(entry.conversation))
+        return summaries
+    
+    @staticmethod
+    def _summarize(conversation: Conversation) -> ConversationSummary:
+        last_message = conversation.last_message
+        return ConversationSummary(
+            id=conversation.id,
+            title=conversation.title,
+            message_count=conversation.message_count,
+            last_message_preview=last_message.content[:100] if last_message else "",
+            created_at=conversation.context.created_at,
+            last_activity=conversation.context.last_activity,
+            is_active=conversation.is_active
+        )
     
     async def clear_conversation(self, session_id: str) -> bool:
         """Clear conversation history for a session."""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-        
-        if session_id in self.memories:
-            self.memories[session_id].clear()
-            del self.memories[session_id]
-        
+        entry = self.store.pop(session_id)
+        user_id = None
+        if entry is not None:
+            user_id = entry.conversation.context.user_id
+            entry.history.clear()
+        
+        self.llm_service.tool_memo.clear(session_id)
+        await self.persistence.delete(session_id, user_id)
+        self.journal.delete(session_id)
         logger.info(f"Cleared conversation: {session_id}")
         return True
     
@@ -394,23 +528,65 @@ Just ask me anything about sports betting, and I'll help you make informed decis
         """Get conversation manager performance statistics."""
         return {
             "total_conversations": self._total_conversations,
-            "active_sessions": len(self.sessions),
+            "active_sessions": len(self.store),
             "average_response_time_ms": round(self._avg_response_time, 2),
-            "memory_usage_mb": len(self.sessions) * 0.1  # Rough estimate
+            "memory_usage_mb": self.store.memory_usage_mb,
+            "session_store": self.store.get_stats(),
+            "turn_queue": self.turn_queue.get_stats(),
+            "shared_turns": self.shared_turns.get_stats(),
+            "persistence": self.persistence.get_stats(),
+            "journal": self.journal.get_stats(),
+            "summarizer": self.summarizer.get_stats(),
+            "streaming": self._streaming_stats()
+        }
+    
+    def _streaming_stats(self) -> Dict[str, Any]:
+        """Time-to-first-chunk of streamed turns."""
+        first_chunk_times = sorted(self._first_chunk_times)
+        return {
+            "streams": self._streams,
+            "buffered_tool_turns": self._streams_buffered,
+            "shared_first_turns": self._streams_shared,
+            "avg_time_to_first_chunk_ms": round(sum(first_chunk_times) / len(first_chunk_times), 2) if first_chunk_times else 0,
+            "p95_time_to_first_chunk_ms": round(first_chunk_times[int(len(first_chunk_times) * 0.95) - 1], 2) if first_chunk_times else 0,
         }
     
     async def initialize(self):
         """Initialize the conversation manager."""
         logger.info("Initializing conversation manager")
         # LLM service initialization is handled in the service itself
+        await self.persistence.connect()
+        
+        # Warm restart: sessions come back least recently active first, so
+        # the store keeps the most recent ones if they don't all fit
+        for conversation in await self.journal.recover():
+            self.store.put(conversation.id, conversation)
         logger.info("Conversation manager initialized successfully")
     
     async def process_message(self, request: ChatRequest) -> ChatResponse:
         """
         Process a chat message and return response.
         
-        This is the main entry point for message processing.
+        This is the main entry point for message processing. Turns of a
+        session run in arrival order, and a duplicate of a turn that is
+        still in flight gets that turn's response. Once a turn starts, all
+        of it shares one deadline that every layer below can see.
         """
+        if not request.session_id:
+            return await self._process_message_with_deadline(request)
+        return await self.turn_queue.submit(
+            request.session_id,
+            lambda: self._process_message_with_deadline(request),
+            message=request.message
+        )
+    
+    async def _process_message_with_deadline(self, request: ChatRequest) -> ChatResponse:
+        """Process one turn under its own deadline."""
+        with deadline_scope(settings.turn_deadline_seconds):
+            return await self._process_message(request)
+    
+    async def _process_message(self, request: ChatRequest) -> ChatResponse:
+        """Process a chat message within the current turn deadline."""
         start_time = datetime.now()
         message_id = str(uuid4())
         
@@ -425,53 +601,6 @@ Just ask me anything about sports betting, and I'll help you make informed decis
             }
         )
         
-        # Create a hash for message deduplication (session + message content)
-        import hashlib
-        message_hash = hashlib.md5(f"{request.session_id}:{request.message}".encode()).hexdigest()
-        current_time = datetime.now()
-        
-        # Check if we've processed this exact message recently
-        if message_hash in self.processed_user_messages:
-            last_processed = self.processed_user_messages[message_hash]
-            time_diff = (current_time - last_processed).total_seconds() / 60  # minutes
-            
-            if time_diff < self.dedup_window_minutes:
-                logger.warning(
-                    f"Duplicate message detected and blocked",
-                    extra={
-                        "session_id": request.session_id,
-                        "user_id": request.user_id,
-                        "message_hash": message_hash,
-                        "message_content": request.message[:50],
-                        "last_processed": last_processed.isoformat(),
-                        "time_diff_seconds": time_diff * 60
-                    }
-                )
-                # Return a polite acknowledgment instead of processing again
-                return ChatResponse(
-                    message="I'm still processing your previous message. Please wait a moment.",
-                    session_id=request.session_id or str(uuid4()),
-                    message_id=message_id,
-                    response_time_ms=10,
-                    token_count=0,
-                    detected_intent=IntentType.GENERAL_SPORTS_QUERY,
-                    intent_confidence=1.0,
-                    function_calls_made=[],
-                    suggested_actions=[]
-                )
-        
-        # Mark message as being processed
-        self.processed_user_messages[message_hash] = current_time
-        
-        # Clean up old processed messages to prevent memory leaks
-        cutoff_time = current_time - timedelta(minutes=self.dedup_window_minutes * 2)
-        messages_to_remove = [
-            hash_key for hash_key, timestamp in self.processed_user_messages.items()
-            if timestamp < cutoff_time
-        ]
-        for hash_key in messages_to_remove:
-            del self.processed_user_messages[hash_key]
-        
         try:
             # Ensure we have a valid session ID
             session_id = request.session_id or str(uuid4())
@@ -481,7 +610,6 @@ Just ask me anything about sports betting, and I'll help you make informed decis
                 user_id=request.user_id,
                 session_id=session_id
             )
-            history = self.memories[conversation.id]
             
             # Log message processing start
             logger.info(
@@ -494,47 +622,8 @@ Just ask me anything about sports betting, and I'll help you make informed decis
                 }
             )
             
-            # Classify user intent first
-            intent_result = await self.llm_service.classify_intent(request.message)
-            logger.debug(f"Classified intent: {intent_result.intent} (confidence: {intent_result.confidence})")
-            
-            # Create user message
-            user_msg = ChatMessage(
-                role=MessageRole.USER,
-                content=request.message,
-                session_id=conversation.id,
-                user_id=request.user_id,
-                detected_intent=intent_result.intent,
-                intent_confidence=intent_result.confidence,
-                response_time_ms=None,
-                token_count=None,
-                function_calls=None
-            )
-            
-            # Add to conversation
-            conversation.add_message(user_msg)
-            
-            # Add to LangChain memory
-            history.add_user_message(request.message)
-            
-            # Generate response based on intent
-            response_content = await self._generate_contextual_response(
-                conversation=conversation,
-                intent_result=intent_result,
-                user_context={}
-            )
-            
-            # Ensure response content is not empty
-            if not response_content or not response_content.strip():
-                # Provide a more helpful fallback response based on the intent
-                if intent_result.intent == IntentType.MATCH_SCHEDULE_QUERY:
-                    response_content = "I'm currently unable to retrieve match schedules. This might be due to a temporary issue with the sports data service. The tournament might be in an off-season or there could be a brief connectivity issue. Please try again in a moment, or ask about general tournament information instead."
-                elif intent_result.intent == IntentType.ODDS_INFORMATION_QUERY:
-                    response_content = "I'm having trouble accessing betting odds right now. This could be because betting markets aren't open yet, the match hasn't started accepting bets, or there's a temporary connection issue. Can I help you with tournament schedules or general betting information instead?"
-                elif intent_result.intent == IntentType.BETTING_RECOMMENDATION:
-                    response_content = "I'm unable to access current match data for betting recommendations right now due to a temporary issue with the sports data service. However, I can still help you understand betting strategies, explain different types of bets, or provide general tournament information. What would you like to know?"
-                else:
-                    response_content = "I'm experiencing a temporary issue accessing the sports data service. This usually resolves quickly - please try your question again in a moment. Alternatively, I can help with general betting information or explain how different types of sports bets work."
+            # Classify, record the user message and generate the answer
+            intent_result, response_content = await self._answer(request, conversation)
             
             # Create assistant message
             response_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
@@ -551,9 +640,9 @@ Just ask me anything about sports betting, and I'll help you make informed decis
                 function_calls=None
             )
             
-            # Add to conversation and memory
+            # Add to conversation
             conversation.add_message(assistant_msg)
-            history.add_ai_message(response_content)
+            self._schedule_background_work(conversation)
             
             # Update performance metrics
             self._update_performance_metrics(response_time_ms)
@@ -604,276 +693,271 @@ Just ask me anything about sports betting, and I'll help you make informed decis
                 suggested_actions=["Try rephrasing your question", "Ask for help"]
             )
     
-    async def process_message_stream(self, request: ChatRequest) -> AsyncGenerator[ChatResponse, None]:
+    async def _answer(self, request: ChatRequest, conversation: Conversation) -> Tuple[IntentClassificationResult, str]:
         """
-        Process message with streaming response.
+        Answer a turn, sharing it with identical context-free turns.
+        
+        The first turn of a new session depends on nothing but the message,
+        so sessions asking the same thing at once share one classification
+        and answer; this session then records its own copy of them.
+        """
+        key = await self._context_free_key(request, conversation)
+        if key is None:
+            return await self._answer_turn(request, conversation)
+        return await self._shared_answer(key, request, conversation)
+    
+    async def _context_free_key(self, request: ChatRequest, conversation: Conversation) -> Optional[Hashable]:
+        """Sharing key of a session's first turn; None once the session has context."""
+        if not settings.shared_turns_enabled or conversation.message_count or conversation.context.summary:
+            return None
+        fixtures_version = (await get_api_client()).data_versions["fixtures"]
+        return context_free_key(request.message, conversation.context, fixtures_version)
+    
+    async def _shared_answer(
+        self,
+        key: Hashable,
+        request: ChatRequest,
+        conversation: Conversation
+    ) -> Tuple[IntentClassificationResult, str]:
+        """Answer a context-free turn through the shared turn registry."""
+        (intent_result, response_content), shared = await self.shared_turns.run(
+            key,
+            lambda: self._answer_turn(request, conversation),
+            shareable=lambda answer: not is_personal_intent(answer[0].intent)
+        )
+        if shared:
+            intent_result = intent_result.model_copy(deep=True)
+            local_entities = get_entity_extractor().extract_entities(request.message)
+            for team in merge_entities(intent_result.entities, local_entities).teams:
+                conversation.context.add_mentioned_team(team)
+            conversation.add_message(self._user_message(request, conversation, intent_result))
+        return intent_result, response_content
+    
+    async def _answer_turn(self, request: ChatRequest, conversation: Conversation) -> Tuple[IntentClassificationResult, str]:
+        """Classify the message, add it to the conversation and generate the answer."""
+        # Classify user intent first, fetching the data it needs alongside
+        intent_result, planned_tool_results = await self._classify_and_plan(
+            request.message, conversation, user_key=request.user_id or conversation.id
+        )
+        logger.debug(f"Classified intent: {intent_result.intent} (confidence: {intent_result.confidence})")
+        
+        # Add to conversation
+        conversation.add_message(self._user_message(request, conversation, intent_result))
         
-        Yields response chunks for real-time experience.
+        # Generate response based on intent
+        response_content = cast(str, await self._generate_contextual_response(
+            conversation=conversation,
+            intent_result=intent_result,
+            user_context={"planned_tool_results": planned_tool_results}
+        ))
+        
+        # Ensure response content is not empty
+        if not response_content or not response_content.strip():
+            response_content = self._fallback_response(intent_result.intent)
+        return intent_result, response_content
+    
+    @staticmethod
+    def _user_message(
+        request: ChatRequest,
+        conversation: Conversation,
+        intent_result: IntentClassificationResult
+    ) -> ChatMessage:
+        """The user's message of a turn, with its classification."""
+        return ChatMessage(
+            role=MessageRole.USER,
+            content=request.message,
+            session_id=conversation.id,
+            user_id=request.user_id,
+            detected_intent=intent_result.intent,
+            intent_confidence=intent_result.confidence,
+            response_time_ms=None,
+            token_count=None,
+            function_calls=None
+        )
+    
+    async def process_message_stream(self, request: ChatRequest) -> AsyncGenerator[StreamingChatResponse, None]:
         """
+        Process message with streaming response.
+    
+        Yields the answer's chunks as the model produces them, then one
+        final chunk (`is_final`) carrying the response metadata. Turns are
+        ordered with the session's other turns and run under the turn
+        deadline, like `process_message`.
+        """
+        chunks: asyncio.Queue = asyncio.Queue()
+    
+        async def produce():
+            # The deadline lives in the producer task, not the caller's context
+            with deadline_scope(settings.turn_deadline_seconds):
+                try:
+                    async for chunk in self._stream_turn(request):
+                        chunks.put_nowait(chunk)
+                finally:
+                    chunks.put_nowait(None)
+    
+        if request.session_id:
+            turn = asyncio.create_task(self.turn_queue.submit(request.session_id, produce))
+        else:
+            turn = asyncio.create_task(produce())
+        try:
+            while (chunk := await chunks.get()) is not None:
+                yield chunk
+            await turn
+        finally:
+            # The client went away: the turn queue cancels the abandoned turn
+            if not turn.done():
+                turn.cancel()
+    
+    def _can_stream(self, intent: IntentType, planned_tool_results: List[Dict[str, Any]]) -> bool:
+        """
+        Whether a turn's answer can be streamed.
+    
+        The streamed model call has no tool calling, so a turn streams when
+        the planner already fetched its data or its intent needs none;
+        otherwise the tool-calling answer is sent as a single chunk.
+        """
+        return bool(planned_tool_results) or intent in STREAMABLE_INTENTS
+    
+    async def _stream_turn(self, request: ChatRequest) -> AsyncGenerator[StreamingChatResponse, None]:
+        """Run one streamed turn, yielding its chunks and the final metadata chunk."""
+        start_time = datetime.now()
+        session_id = request.session_id or str(uuid4())
+    
         try:
-            # Ensure we have a valid session ID
-            session_id = request.session_id or str(uuid4())
-            
             # Get or create conversation
             conversation = await self.start_conversation(
                 user_id=request.user_id,
                 session_id=session_id
             )
-            
-            # Create chat message
-            user_message = ChatMessage(
-                role=MessageRole.USER,
-                content=request.message,
+    
+            # Another session is answering the same first turn: share it
+            key = await self._context_free_key(request, conversation)
+            shared = key is not None and self.shared_turns.is_shared(key)
+            if shared:
+                streamed = False
+                intent_result, response = await self._shared_answer(key, request, conversation)
+            else:
+                # Classify user intent first, fetching the data it needs alongside
+                intent_result, planned_tool_results = await self._classify_and_plan(
+                    request.message, conversation, user_key=request.user_id or conversation.id
+                )
+                conversation.add_message(self._user_message(request, conversation, intent_result))
+    
+                streamed = self._can_stream(intent_result.intent, planned_tool_results)
+                response = await self._generate_contextual_response(
+                    conversation=conversation,
+                    intent_result=intent_result,
+                    user_context={"planned_tool_results": planned_tool_results},
+                    stream=streamed
+                )
+    
+            parts: List[str] = []
+            first_chunk_ms: Optional[float] = None
+            async for text in self._response_chunks(response):
+                if first_chunk_ms is None:
+                    first_chunk_ms = (datetime.now() - start_time).total_seconds() * 1000
+                parts.append(text)
+                yield StreamingChatResponse(chunk=text, session_id=conversation.id, is_final=False, metadata=None)
+    
+            response_content = "".join(parts)
+            if not response_content.strip():
+                response_content = self._fallback_response(intent_result.intent)
+                first_chunk_ms = (datetime.now() - start_time).total_seconds() * 1000
+                yield StreamingChatResponse(chunk=response_content, session_id=conversation.id, is_final=False, metadata=None)
+    
+            # Create assistant message
+            response_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+            assistant_msg = ChatMessage(
+                role=MessageRole.ASSISTANT,
+                content=response_content,
                 session_id=conversation.id,
                 user_id=request.user_id,
                 detected_intent=None,
                 intent_confidence=None,
-                response_time_ms=None,
+                response_time_ms=response_time_ms,
                 token_count=None,
                 function_calls=None
             )
-            
-            # Stream the response
-            response_chunks = []
-            async for chunk in self._stream_response(user_message, conversation):
-                response_chunks.append(chunk.message)
-                yield chunk
-            
-            # Save final message to conversation
-            final_message = "".join(response_chunks)
-            assistant_message = ChatMessage(
-                role=MessageRole.ASSISTANT,
-                content=final_message,
+    
+            # Add to conversation
+            conversation.add_message(assistant_msg)
+            self._schedule_background_work(conversation)
+    
+            # Update performance metrics
+            self._update_performance_metrics(response_time_ms)
+            self._streams += 1
+            if shared:
+                self._streams_shared += 1
+            elif not streamed:
+                self._streams_buffered += 1
+            self._first_chunk_times.append(first_chunk_ms)
+    
+            yield StreamingChatResponse(
+                chunk="",
                 session_id=conversation.id,
-                user_id=request.user_id,
-                detected_intent=None,
-                intent_confidence=None,
-                response_time_ms=None,
-                token_count=None,
-                function_calls=None
+                is_final=True,
+                metadata={
+                    "message_id": assistant_msg.id,
+                    "response_time_ms": response_time_ms,
+                    "time_to_first_chunk_ms": round(first_chunk_ms, 2),
+                    "streamed": streamed,
+                    "detected_intent": intent_result.intent,
+                    "intent_confidence": intent_result.confidence,
+                    "suggested_actions": self._generate_suggested_actions(intent_result.intent)
+                }
             )
-            conversation.messages.append(user_message)
-            conversation.messages.append(assistant_message)
-            
+    
         except Exception as e:
             logger.error(f"Error in streaming response: {str(e)}", exc_info=True)
-            yield ChatResponse(
-                message="I apologize, but I encountered an error. Please try again.",
-                session_id=request.session_id or str(uuid4()),
-                message_id=str(uuid4()),
-                response_time_ms=0,
-                token_count=None,
-                detected_intent=IntentType.UNCLEAR,
-                intent_confidence=0.0,
-                function_calls_made=[],
-                suggested_actions=[]
+            yield StreamingChatResponse(
+                chunk="I apologize, but I encountered an error. Please try again.",
+                session_id=session_id,
+                is_final=True,
+                metadata={
+                    "error": True,
+                    "response_time_ms": int((datetime.now() - start_time).total_seconds() * 1000),
+                    "detected_intent": IntentType.UNCLEAR,
+                    "intent_confidence": 0.0
+                }
             )
     
-    async def _stream_response(
-        self, 
-        user_message: ChatMessage, 
-        conversation: Conversation
-    ) -> AsyncGenerator[ChatResponse, None]:
-        """Internal method for streaming responses."""
-        # This is a simplified streaming implementation
-        # In practice, you'd want to stream from the LLM service
-        
-        # Process normally first
-        response_content = await self._generate_contextual_response(
-            conversation=conversation,
-            intent_result=IntentClassificationResult(
-                intent=IntentType.GENERAL_SPORTS_QUERY,
-                confidence=0.8
-            ),
-            user_context={}
-        )
-        
-        # Split into chunks for streaming effect
-        words = response_content.split()
-        chunk_size = 3  # Words per chunk
-        
-        for i in range(0, len(words), chunk_size):
-            chunk_words = words[i:i + chunk_size]
-            chunk_text = " ".join(chunk_words)
-            
-            yield ChatResponse(
-                message=chunk_text + " ",
-                session_id=conversation.id,
-                message_id=str(uuid4()),
-                response_time_ms=100,  # Simulated time
-                token_count=None,
-                detected_intent=IntentType.GENERAL_SPORTS_QUERY,
-                intent_confidence=0.8,
-                function_calls_made=[],
-                suggested_actions=[]
-            )
-            
-            # Small delay for streaming effect
-            await asyncio.sleep(0.1)
+    @staticmethod
+    async def _response_chunks(response: ResponseContent) -> AsyncGenerator[str, None]:
+        """Text chunks of a streamed answer; a complete answer is one chunk."""
+        if isinstance(response, str):
+            if response:
+                yield response
+            return
+        async for text in response:
+            yield text
     
     async def clear_conversation_history(
         self,
         user_id: str,
         session_id: Optional[str] = None
     ):
-        """Clear conversation history for a user."""
+        """Clear conversation history for a user, or one of their sessions."""
+        # Found through the per-user index, without scanning other sessions
+        sessions = await self._user_sessions(user_id)
         if session_id:
-            # Clear specific session
-            if session_id in self.sessions:
-                del self.sessions[session_id]
-            if session_id in self.memories:
-                del self.memories[session_id]
-        else:
-            # Clear all sessions for user
-            sessions_to_remove = []
-            for sid, conversation in self.sessions.items():
-                if conversation.context.user_id == user_id:
-                    sessions_to_remove.append(sid)
-            
-            for sid in sessions_to_remove:
-                if sid in self.sessions:
-                    del self.sessions[sid]
-                if sid in self.memories:
-                    del self.memories[sid]
+            sessions = [session_id] if session_id in sessions else []
+        
+        for sid in sessions:
+            self.store.pop(sid)
+            self.llm_service.tool_memo.clear(sid)
+            await self.persistence.delete(sid, user_id)
+            self.journal.delete(sid)
         
         logger.info(f"Cleared conversation history for user {user_id}, session {session_id}")
 
     async def cleanup(self):
         """Cleanup resources."""
-        self.sessions.clear()
-        self.memories.clear()
+        await self.summarizer.shutdown()
+        await self.persistence.shutdown()
+        await self.journal.shutdown()
+        self.store.clear()
         await self.llm_service.cleanup()
 
-    async def process_message_with_streaming(
-        self, 
-        request: ChatRequest, 
-        streaming_callback
-    ) -> None:
-        """
-        Process a chat message with WebSocket streaming.
-        
-        This method integrates with WebSocket streaming callbacks to provide
-        real-time response generation for connected clients.
-        
-        Args:
-            request: Chat request containing user message
-            streaming_callback: WebSocket streaming callback instance
-        """
-        start_time = datetime.now()
-        
-        try:
-            # Ensure we have a valid session ID
-            session_id = request.session_id or str(uuid4())
-            
-            # Get or create conversation
-            conversation = await self.start_conversation(
-                user_id=request.user_id,
-                session_id=session_id
-            )
-            history = self.memories[conversation.id]
-            
-            # Classify user intent first
-            intent_result = await self.llm_service.classify_intent(request.message)
-            logger.debug(f"Classified intent: {intent_result.intent} (confidence: {intent_result.confidence})")
-            
-            # Create user message
-            user_msg = ChatMessage(
-                role=MessageRole.USER,
-                content=request.message,
-                session_id=conversation.id,
-                user_id=request.user_id,
-                detected_intent=intent_result.intent,
-                intent_confidence=intent_result.confidence,
-                response_time_ms=None,
-                token_count=None,
-                function_calls=None
-            )
-            
-            # Add to conversation and memory
-            conversation.add_message(user_msg)
-            history.add_user_message(request.message)
-            
-            # Generate streaming response with callback
-            await self._generate_streaming_response(
-                conversation=conversation,
-                intent_result=intent_result,
-                streaming_callback=streaming_callback,
-                user_context={}
-            )
-            
-        except Exception as e:
-            logger.error(f"Error in streaming message processing: {str(e)}", exc_info=True)
-            # The streaming callback should handle error notification
-            raise
-    
-    async def _generate_streaming_response(
-        self,
-        conversation: Conversation,
-        intent_result: IntentClassificationResult,
-        streaming_callback,
-        user_context: Optional[Dict[str, Any]] = None
-    ):
-        """
-        Generate streaming response using the provided callback.
-        
-        This method integrates the LLM service with WebSocket streaming
-        to provide real-time response generation.
-        """
-        user_message = conversation.last_user_message
-        if not user_message:
-            raise ValueError("No user message found in conversation")
-            
-        conversation_history = self._convert_to_langchain_messages(conversation)
-        
-        # Build enhanced context
-        enhanced_context = {
-            "intent": intent_result.intent,
-            "confidence": intent_result.confidence,
-            "entities": intent_result.entities,
-            "conversation_context": conversation.context.model_dump(),
-        }
-        
-        if user_context:
-            enhanced_context.update(user_context)
-        
-        # Generate response with streaming callback
-        # Note: For now, we'll use the standard generate_response without streaming
-        # and implement streaming at the WebSocket level. A future enhancement would be to 
-        # modify the LLM service to accept streaming callbacks directly.
-        start_time = datetime.now()
-        response_result = await self.llm_service.generate_response(
-            user_message=user_message.content,
-            conversation_history=conversation_history,
-            user_context=enhanced_context,
-            stream=False  # Don't use streaming here to get string response
-        )
-        
-        # Ensure we have a string response (not AsyncGenerator)
-        if isinstance(response_result, str):
-            response_content = response_result
-        else:
-            # Should not happen with stream=False, but handle gracefully
-            response_content = "I apologize, but I encountered an issue generating a response."
-        
-        # Create assistant message for conversation history
-        response_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
-        assistant_msg = ChatMessage(
-            role=MessageRole.ASSISTANT,
-            content=response_content,
-            session_id=conversation.id,
-            user_id=conversation.context.user_id,
-            detected_intent=None,
-            intent_confidence=None,
-            response_time_ms=response_time_ms,
-            token_count=None,
-            function_calls=None
-        )
-        
-        # Add to conversation and memory
-        conversation.add_message(assistant_msg)
-        history = self.memories[conversation.id]
-        history.add_ai_message(response_content)
-
 
 # Global conversation manager instance
 _conversation_manager: Optional[ConversationManager] = None
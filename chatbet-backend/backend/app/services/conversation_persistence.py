@@ -0,0 +1,290 @@
+"""
+Redis-backed conversation persistence with write-behind.
+
+Conversations only lived in one process's memory. With several uvicorn
+workers, a user's next HTTP turn often lands on a worker that never saw
+the session, and every restart dropped all of them.
+
+Hot sessions still live in the local `SessionStore`; Redis is the shared
+copy behind it:
+
+- after a turn the session is only marked dirty; a background flusher
+  writes every dirty session's new messages in pipelined batches, so the
+  reply never waits on Redis
+- messages go to an append-only Redis list, one compact JSON array per
+  message, so a flush sends only what was added since the last one
+- on a local miss (another worker served the session, or a restart) the
+  session is hydrated from Redis in one round trip
+- before resuming a local session, one LLEN tells whether another worker
+  appended turns since; if so the stale local copy is replaced
+- each user's session ids are kept in a Redis set, written with the
+  same pipeline, so any worker can list or clear a user's conversations
+
+If Redis is down everything degrades to the previous local-only
+behaviour.
+"""
+
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from cachetools import LRUCache
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..models.conversation import ChatMessage, Conversation, ConversationContext, MessageRole
+from ..utils.cache import RedisCache, get_redis_cache
+from ..utils.exceptions import CacheUnavailableError
+
+logger = get_logger(__name__)
+
+_ROLE_CODES = {
+    MessageRole.USER.value: "u",
+    MessageRole.ASSISTANT.value: "a",
+    MessageRole.SYSTEM.value: "s",
+    MessageRole.FUNCTION.value: "f",
+}
+_CODE_ROLES = {code: role for role, code in _ROLE_CODES.items()}
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def encode_message(message: ChatMessage) -> bytes:
+    """
+    One message as a compact JSON array:
+    [id, role, content, timestamp, intent, confidence, response_time_ms, user_id],
+    with trailing empty fields dropped.
+    """
+    fields = [
+        message.id,
+        _ROLE_CODES[message.role],
+        message.content,
+        round(message.timestamp.timestamp(), 3),
+        message.detected_intent,
+        message.intent_confidence,
+        message.response_time_ms,
+        message.user_id,
+    ]
+    while fields[-1] is None:
+        fields.pop()
+    return _dumps(fields)
+
+
+def decode_message(data: bytes, session_id: str) -> ChatMessage:
+    """Inverse of `encode_message`."""
+    fields = json.loads(data) + [None] * 4
+    return ChatMessage(
+        id=fields[0],
+        role=_CODE_ROLES[fields[1]],
+        content=fields[2],
+        timestamp=datetime.fromtimestamp(fields[3]),
+        session_id=session_id,
+        detected_intent=fields[4],
+        intent_confidence=fields[5],
+        response_time_ms=fields[6],
+        user_id=fields[7],
+        token_count=None,
+        function_calls=None
+    )
+
+
+def encode_meta(conversation: Conversation) -> bytes:
+    """Conversation context and title; defaults and auth tokens are left out."""
+    context = conversation.context.model_dump(mode="json", exclude_defaults=True, exclude={"auth_token"})
+    return _dumps({"c": context, "t": conversation.title})
+
+
+def decode_conversation(session_id: str, meta: bytes, records: List[bytes]) -> Conversation:
+    """Rebuild a conversation from its metadata and message records."""
+    data = json.loads(meta)
+    return Conversation(
+        id=session_id,
+        context=ConversationContext(**data["c"]),
+        messages=[decode_message(record, session_id) for record in records],
+        title=data.get("t")
+    )
+
+
+class ConversationPersistence:
+    """
+    Write-behind persistence of conversations to Redis.
+
+    `mark_dirty` after a turn, `load` on a local miss and `is_stale`
+    before resuming a local session.
+    """
+
+    def __init__(
+        self,
+        redis_cache: Optional[RedisCache] = None,
+        flush_interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        ttl_seconds: Optional[int] = None
+    ):
+        self.redis = redis_cache if redis_cache is not None else get_redis_cache()
+        self.flush_interval = flush_interval or settings.conversation_persistence_flush_interval
+        self.batch_size = batch_size or settings.conversation_persistence_batch_size
+        self.ttl_seconds = ttl_seconds or settings.conversation_persistence_ttl_seconds
+
+        self._dirty: Dict[str, Conversation] = {}
+        self._flushing: Set[str] = set()
+        # Messages already in Redis per session; outlives local eviction so a
+        # session re-stored mid-turn isn't appended twice
+        self._persisted: LRUCache = LRUCache(maxsize=settings.session_store_max_entries * 2)
+        self._flusher: Optional[asyncio.Task] = None
+
+        # Performance tracking
+        self._flushes = 0
+        self._flushed_sessions = 0
+        self._flushed_messages = 0
+        self._failures = 0
+        self._hydrations = 0
+        self._stale_reloads = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether persistence is on and Redis is usable right now."""
+        return settings.conversation_persistence_enabled and self.redis.connected
+
+    async def connect(self):
+        """Connect to Redis if persistence is on; failures leave it local-only."""
+        if not settings.conversation_persistence_enabled or self.redis.connected:
+            return
+        try:
+            await self.redis.connect()
+        except CacheUnavailableError as e:
+            logger.warning(f"Conversation persistence disabled, Redis unavailable: {e}")
+
+    def mark_dirty(self, conversation: Conversation) -> Optional[asyncio.Task]:
+        """Queue a conversation for the next flush; never waits on Redis."""
+        if not self.enabled:
+            return None
+        self._dirty[conversation.id] = conversation
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+        return self._flusher
+
+    async def _flush_loop(self):
+        # Stops while Redis is unusable; the next turn after it recovers restarts it
+        while self._dirty and self.enabled:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write every dirty conversation; returns the number of messages written."""
+        dirty, self._dirty = self._dirty, {}
+        items = list(dirty.items())
+        written = 0
+        for start in range(0, len(items), self.batch_size):
+            try:
+                written += await self._flush_batch(items[start:start + self.batch_size])
+            except asyncio.CancelledError:
+                self._requeue(items[start:])
+                raise
+        return written
+
+    def _requeue(self, items: List[Tuple[str, Conversation]]):
+        # Unless a newer turn already queued the session again
+        for session_id, conversation in items:
+            self._dirty.setdefault(session_id, conversation)
+
+    async def _flush_batch(self, items: List[Tuple[str, Conversation]]) -> int:
+        batch = []
+        user_sessions = []
+        counts = {}
+        for session_id, conversation in items:
+            persisted = self._persisted.get(session_id, 0)
+            messages = conversation.messages
+            batch.append((session_id, encode_meta(conversation), persisted, [encode_message(m) for m in messages[persisted:]]))
+            counts[session_id] = len(messages)
+            if conversation.context.user_id:
+                user_sessions.append((conversation.context.user_id, session_id))
+
+        self._flushing.update(counts)
+        try:
+            ok = await self.redis.append_conversation_logs(batch, self.ttl_seconds, user_sessions)
+        finally:
+            self._flushing.difference_update(counts)
+
+        if not ok:
+            self._failures += 1
+            self._requeue(items)
+            return 0
+
+        written = sum(len(records) for *_, records in batch)
+        self._persisted.update(counts)
+        self._flushes += 1
+        self._flushed_sessions += len(batch)
+        self._flushed_messages += written
+        return written
+
+    async def load(self, session_id: str) -> Optional[Conversation]:
+        """Hydrate a conversation from Redis, None if it was never persisted."""
+        if not self.enabled:
+            return None
+        stored = await self.redis.load_conversation_log(session_id)
+        if stored is None:
+            return None
+        meta, records = stored
+        try:
+            conversation = decode_conversation(session_id, meta, records)
+        except Exception as e:
+            logger.warning(f"Unreadable persisted conversation {session_id}: {e}")
+            return None
+        self._persisted[session_id] = len(records)
+        self._hydrations += 1
+        return conversation
+
+    async def is_stale(self, session_id: str) -> bool:
+        """
+        Whether another worker appended turns to a session this worker holds.
+
+        A session with local turns not yet written keeps its local copy.
+        """
+        if not self.enabled or not settings.conversation_persistence_revalidate:
+            return False
+        if session_id in self._dirty or session_id in self._flushing:
+            return False
+        remote = await self.redis.conversation_log_length(session_id)
+        if remote is None or remote <= self._persisted.get(session_id, 0):
+            return False
+        self._stale_reloads += 1
+        return True
+
+    async def sessions_for(self, user_id: str) -> List[str]:
+        """Ids of a user's persisted conversations; empty when persistence is off."""
+        if not self.enabled:
+            return []
+        return await self.redis.conversation_sessions(user_id) or []
+
+    async def delete(self, session_id: str, user_id: Optional[str] = None):
+        """Forget a conversation locally and in Redis."""
+        self._dirty.pop(session_id, None)
+        self._persisted.pop(session_id, None)
+        if self.enabled:
+            await self.redis.delete_conversation_log(session_id, user_id)
+
+    async def shutdown(self):
+        """Stop the flusher and write whatever is still pending."""
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        if self._dirty and self.enabled:
+            await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get persistence statistics."""
+        return {
+            "enabled": settings.conversation_persistence_enabled,
+            "connected": self.redis.connected,
+            "dirty_sessions": len(self._dirty),
+            "flushes": self._flushes,
+            "flushed_sessions": self._flushed_sessions,
+            "flushed_messages": self._flushed_messages,
+            "avg_sessions_per_flush": round(self._flushed_sessions / self._flushes, 2) if self._flushes else 0,
+            "failures": self._failures,
+            "hydrations": self._hydrations,
+            "stale_reloads": self._stale_reloads,
+        }
@@ -1,18 +1,33 @@
 """
 Legacy LLM service - this will be replaced by the new comprehensive service.
 Keeping this temporarily for backward compatibility.
+
+The client used to be created at import time, which required Google
+credentials just to import the app. It's now created on first use
+through the provider factory, so the fake provider works here too.
 """
 
-from langchain_google_genai import (
-    ChatGoogleGenerativeAI,
-)
+from typing import Optional
+
+from langchain_core.language_models import BaseChatModel
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash-exp",
-    temperature=0,
-    max_tokens=None,
-    timeout=None,
-    max_retries=2,
-)
+from .llm_providers import create_chat_model
 
 STYLE_INSTRUCTIONS = "Use a conversational tone and write in a chat style without formal formatting or lists and do not use any emojis."
+
+_llm: Optional[BaseChatModel] = None
+
+
+def get_llm() -> BaseChatModel:
+    """Get the legacy chat model, creating it on first use."""
+    global _llm
+    if _llm is None:
+        _llm = create_chat_model(model="gemini-2.0-flash-exp", temperature=0)
+    return _llm
+
+
+def __getattr__(name: str):
+    # Keep `from ..services.llm import llm` working without eager creation
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
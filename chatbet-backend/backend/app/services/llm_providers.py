@@ -0,0 +1,262 @@
+"""
+LLM provider factory.
+
+`ChatBetLLMService` used to hard-wire `ChatGoogleGenerativeAI`, which meant
+the orchestration layer (scheduler, caches, conversation manager, WebSocket
+handling) could only be exercised with network access and real spend.
+Chat models are now created here based on `settings.llm_provider`:
+
+- "gemini": the real Google Gemini client
+- "fake": a deterministic local model for load testing and benchmarks
+
+The fake model is a real LangChain chat model, so everything downstream
+(bind_tools, with_structured_output, astream, usage metadata) behaves the
+same as with Gemini, only without the network.
+"""
+
+import asyncio
+import math
+import random
+import re
+from typing import Any, AsyncIterator, Dict, Iterator, List, Literal, Optional, Sequence, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import Field, PrivateAttr
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..utils.exceptions import LLMError
+from ..utils.parsers import classify_intent_locally
+from ..utils.token_budget import estimate_messages_tokens, estimate_tokens
+
+logger = get_logger(__name__)
+
+
+# (pattern, tool name, tool args) - first match wins
+DEFAULT_TOOL_SCRIPT: List[Tuple[str, str, Dict[str, Any]]] = [
+    (r"\blive\b", "get_live_matches", {}),
+    (r"\b(tournaments?|leagues?|competitions?)\b", "get_tournaments", {}),
+    (r"\b(match|matches|play|plays|playing|fixtures?|schedule|games?|today|tomorrow)\b", "get_fixtures", {}),
+]
+
+_FAKE_REPLY_WORDS = (
+    "Here's what I found for you based on the latest data. Matches and odds can change "
+    "quickly, so check again closer to kick-off and always bet responsibly within your budget."
+).split()
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic local chat model for load testing.
+
+    Latency is drawn from a seeded distribution, streaming emits one word
+    per token at `tokens_per_second`, tool calls follow a regex script, and
+    `error_rate` injects provider failures.
+    """
+
+    latency_ms: float = Field(default=800.0, description="Mean time to first token")
+    latency_jitter_ms: float = Field(default=200.0, description="Spread of the latency distribution")
+    latency_distribution: Literal["fixed", "uniform", "lognormal"] = "lognormal"
+    tokens_per_second: float = Field(default=60.0, description="Streaming/generation rate")
+    reply_tokens: int = Field(default=40, description="Words in a generated reply")
+    error_rate: float = Field(default=0.0, ge=0.0, le=1.0, description="Probability of an injected failure")
+    tool_calls_enabled: bool = True
+    tool_script: List[Tuple[str, str, Dict[str, Any]]] = Field(default_factory=lambda: list(DEFAULT_TOOL_SCRIPT))
+    seed: int = 42
+
+    _rng: random.Random = PrivateAttr()
+    _calls: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context: Any):
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "chatbet-fake"
+
+    # === Simulation helpers ===
+
+    def _sample_latency(self) -> float:
+        """Sample time-to-first-token in seconds."""
+        if self.latency_distribution == "fixed":
+            latency = self.latency_ms
+        elif self.latency_distribution == "uniform":
+            latency = self._rng.uniform(self.latency_ms - self.latency_jitter_ms, self.latency_ms + self.latency_jitter_ms)
+        else:
+            # Lognormal with the requested mean and spread (long tail like real providers)
+            mean = max(self.latency_ms, 1.0)
+            sigma = math.sqrt(math.log(1 + (self.latency_jitter_ms / mean) ** 2))
+            latency = self._rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+        return max(latency, 0.0) / 1000
+
+    def _maybe_fail(self):
+        self._calls += 1
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise LLMError("Injected fake provider error", error_code="fake_provider_error", status_code=503)
+
+    def _scripted_tool_calls(self, messages: List[BaseMessage], tools: Sequence[str]) -> List[Dict[str, Any]]:
+        """Tool calls for the last user message, only when tools are bound."""
+        if not self.tool_calls_enabled or not tools or not messages or not isinstance(messages[-1], HumanMessage):
+            return []
+        text = str(messages[-1].content).lower()
+        for pattern, tool_name, tool_args in self.tool_script:
+            if tool_name in tools and re.search(pattern, text):
+                return [{"name": tool_name, "args": dict(tool_args), "id": f"fake_call_{self._calls}"}]
+        return []
+
+    def _reply_text(self) -> str:
+        words = [_FAKE_REPLY_WORDS[i % len(_FAKE_REPLY_WORDS)] for i in range(self.reply_tokens)]
+        return " ".join(words)
+
+    def _build_message(self, messages: List[BaseMessage], tools: Sequence[str]) -> AIMessage:
+        tool_calls = self._scripted_tool_calls(messages, tools)
+        content = "" if tool_calls else self._reply_text()
+        input_tokens = estimate_messages_tokens(messages)
+        output_tokens = estimate_tokens(content) if content else 8
+        return AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+                "input_token_details": {"cache_read": 0},
+            }
+        )
+
+    # === BaseChatModel interface ===
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        self._maybe_fail()
+        message = self._build_message(messages, kwargs.get("tools") or [])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        await asyncio.sleep(self._sample_latency())
+        self._maybe_fail()
+        message = self._build_message(messages, kwargs.get("tools") or [])
+        if message.content and self.tokens_per_second > 0:
+            await asyncio.sleep(self.reply_tokens / self.tokens_per_second)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        self._maybe_fail()
+        for index, word in enumerate(self._reply_text().split()):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word if index == 0 else f" {word}"))
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self._sample_latency())
+        self._maybe_fail()
+        delay = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        words = self._reply_text().split()
+        input_tokens = estimate_messages_tokens(messages)
+        for index, word in enumerate(words):
+            usage = None
+            if index == len(words) - 1:
+                usage = {"input_tokens": input_tokens, "output_tokens": len(words), "total_tokens": input_tokens + len(words)}
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(content=word if index == 0 else f" {word}", usage_metadata=usage)
+            )
+            if delay:
+                await asyncio.sleep(delay)
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        """Bind tools by name; scripted tool calls are only issued for bound tools."""
+        tool_names = [getattr(t, "name", None) or getattr(t, "__name__", str(t)) for t in tools]
+        return self.bind(tools=tool_names, **kwargs)
+
+    def with_structured_output(self, schema: Any, **kwargs: Any):
+        """Return a runnable producing `schema` instances from keyword rules."""
+
+        async def _structured(llm_input: Any) -> Any:
+            await asyncio.sleep(self._sample_latency())
+            self._maybe_fail()
+            return self._structured_response(schema, llm_input)
+
+        def _structured_sync(llm_input: Any) -> Any:
+            self._maybe_fail()
+            return self._structured_response(schema, llm_input)
+
+        return RunnableLambda(_structured_sync, afunc=_structured)
+
+    @staticmethod
+    def _structured_response(schema: Any, llm_input: Any) -> Any:
+        if hasattr(llm_input, "to_messages"):
+            messages = llm_input.to_messages()
+            text = str(messages[-1].content) if messages else ""
+        else:
+            text = str(llm_input)
+
+        fields = getattr(schema, "model_fields", {})
+        if "intent" in fields:
+            # The intent prompt wraps the message as: Classify this message: '...'
+            match = re.search(r"Classify this message: '(.*)'", text, re.DOTALL)
+            intent, confidence = classify_intent_locally(match.group(1) if match else text)
+            return schema(intent=intent, confidence=confidence, entities={}, reasoning="fake keyword classifier")
+        return schema.model_construct()
+
+
+def create_chat_model(
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None
+) -> BaseChatModel:
+    """Create the configured chat model."""
+    provider = provider or settings.llm_provider
+
+    if provider == "fake":
+        logger.info("Using fake LLM provider")
+        return FakeChatModel(
+            latency_ms=settings.fake_llm_latency_ms,
+            latency_jitter_ms=settings.fake_llm_latency_jitter_ms,
+            latency_distribution=settings.fake_llm_latency_distribution,
+            tokens_per_second=settings.fake_llm_tokens_per_second,
+            error_rate=settings.fake_llm_error_rate,
+            tool_calls_enabled=settings.fake_llm_tool_calls,
+            seed=settings.fake_llm_seed
+        )
+
+    if provider == "gemini":
+        # Imported lazily so the fake provider works without the Google SDK configured
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        return ChatGoogleGenerativeAI(
+            model=model or settings.gemini_model,
+            temperature=settings.gemini_temperature if temperature is None else temperature,
+            max_tokens=max_tokens if max_tokens is not None else settings.gemini_max_tokens,
+            timeout=settings.gemini_timeout,
+            max_retries=2,
+            # Enable function calling
+            convert_system_message_to_human=False
+        )
+
+    raise ValueError(f"Unknown LLM provider: {provider}")
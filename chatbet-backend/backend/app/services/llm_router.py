@@ -0,0 +1,195 @@
+"""
+Intent-based model and token routing.
+
+Every answer used to go to `settings.gemini_model` with unlimited output
+and all five tools bound - a "hello" paid for the same model, the same
+tool schemas in the prompt and the same open-ended generation as "who
+should I bet on this weekend?".
+
+Each intent now maps to a route that picks the model, the output token
+cap, the temperature and whether tools are bound:
+
+- light:  greetings, help, balance, unclear - small model, short answers, no tools
+- data:   schedules, odds, tournaments, comparisons - tools, medium answers
+- advice: recommendations, predictions, bet simulations - tools, longer answers
+
+Routes and the intent mapping can be overridden through settings
+(`llm_routes`, `llm_intent_routes`), and latency and estimated cost are
+reported per route.
+"""
+
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Deque, Dict, Optional, Sequence
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..models.conversation import IntentType
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class LLMRoute:
+    """Model settings used to answer one class of intents."""
+    name: str
+    model: str
+    max_tokens: Optional[int]
+    temperature: float
+    tools: bool
+
+
+DEFAULT_INTENT_ROUTES: Dict[IntentType, str] = {
+    IntentType.GREETING: "light",
+    IntentType.HELP_REQUEST: "light",
+    IntentType.USER_BALANCE_QUERY: "light",
+    IntentType.UNCLEAR: "light",
+    IntentType.MATCH_SCHEDULE_QUERY: "data",
+    IntentType.MATCH_INQUIRY: "data",
+    IntentType.TEAM_SCHEDULE_QUERY: "data",
+    IntentType.TOURNAMENT_INFO_QUERY: "data",
+    IntentType.TOURNAMENT_INFO: "data",
+    IntentType.ODDS_INFORMATION_QUERY: "data",
+    IntentType.ODDS_COMPARISON: "data",
+    IntentType.TEAM_COMPARISON: "data",
+    IntentType.GENERAL_SPORTS_QUERY: "data",
+    IntentType.GENERAL_BETTING_INFO: "data",
+    IntentType.BET_HISTORY_QUERY: "data",
+    IntentType.BETTING_RECOMMENDATION: "advice",
+    IntentType.MATCH_PREDICTION: "advice",
+    IntentType.BET_SIMULATION: "advice",
+}
+
+
+def default_routes() -> Dict[str, LLMRoute]:
+    """Built-in routes; "default" keeps the legacy settings for unknown intents."""
+    return {
+        "light": LLMRoute("light", settings.gemini_light_model, 300, 0.5, tools=False),
+        "data": LLMRoute("data", settings.gemini_model, 800, 0.3, tools=True),
+        "advice": LLMRoute("advice", settings.gemini_model, 1500, settings.gemini_temperature, tools=True),
+        "default": LLMRoute(
+            "default", settings.gemini_model, settings.gemini_max_tokens, settings.gemini_temperature, tools=True
+        ),
+    }
+
+
+class _RouteStats:
+    """Latency and token accounting for one route."""
+
+    def __init__(self):
+        self.requests = 0
+        self.latencies: Deque[float] = deque(maxlen=1000)
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+
+class LLMRouter:
+    """
+    Pick and build the chat model for an intent.
+
+    Models are created lazily, once per route, through `model_factory`
+    (the provider factory by default).
+    """
+
+    def __init__(
+        self,
+        model_factory: Callable[..., Any],
+        routes: Optional[Dict[str, LLMRoute]] = None,
+        intent_routes: Optional[Dict[str, str]] = None
+    ):
+        self.model_factory = model_factory
+        self.routes = routes or self._load_routes()
+        self.intent_routes: Dict[str, str] = {
+            intent.value: route for intent, route in DEFAULT_INTENT_ROUTES.items()
+        }
+        self.intent_routes.update(intent_routes if intent_routes is not None else settings.llm_intent_routes)
+
+        self._models: Dict[str, Any] = {}
+        self._tool_models: Dict[str, Any] = {}
+        self._stats: Dict[str, _RouteStats] = {name: _RouteStats() for name in self.routes}
+
+    @staticmethod
+    def _load_routes() -> Dict[str, LLMRoute]:
+        """Built-in routes with overrides from settings applied field by field."""
+        routes = default_routes()
+        for name, overrides in settings.llm_routes.items():
+            base = routes.get(name) or replace(routes["default"], name=name)
+            fields = {k: v for k, v in overrides.items() if k in ("model", "max_tokens", "temperature", "tools")}
+            routes[name] = replace(base, **fields)
+        return routes
+
+    def route_for(self, intent: Optional[Any]) -> LLMRoute:
+        """Route for an intent (enum or value); unknown intents use "default"."""
+        if isinstance(intent, IntentType):
+            intent = intent.value
+        name = self.intent_routes.get(intent, "default") if intent else "default"
+        route = self.routes.get(name)
+        if route is None:
+            logger.warning(f"Intent {intent} routed to unknown route {name}, using default")
+            route = self.routes["default"]
+        return route
+
+    def model_for(self, route: LLMRoute) -> Any:
+        """Chat model for a route, without tools."""
+        if route.name not in self._models:
+            self._models[route.name] = self.model_factory(
+                model=route.model,
+                temperature=route.temperature,
+                max_tokens=route.max_tokens
+            )
+        return self._models[route.name]
+
+    def tool_model_for(self, route: LLMRoute, tools: Sequence[Any]) -> Any:
+        """Chat model for a route with tools bound if the route uses them."""
+        if not route.tools:
+            return self.model_for(route)
+        if route.name not in self._tool_models:
+            self._tool_models[route.name] = self.model_for(route).bind_tools(tools)
+        return self._tool_models[route.name]
+
+    # === Accounting ===
+
+    def _route_stats(self, route: LLMRoute) -> _RouteStats:
+        return self._stats.setdefault(route.name, _RouteStats())
+
+    def record_usage(self, route: LLMRoute, message: Any):
+        """Attribute provider-reported tokens to a route."""
+        usage = getattr(message, "usage_metadata", None)
+        if not usage:
+            return
+        stats = self._route_stats(route)
+        stats.input_tokens += usage.get("input_tokens", 0) or 0
+        stats.output_tokens += usage.get("output_tokens", 0) or 0
+
+    def record_request(self, route: LLMRoute, latency_ms: float):
+        """Record one answered request on a route."""
+        stats = self._route_stats(route)
+        stats.requests += 1
+        stats.latencies.append(latency_ms)
+
+    def estimate_cost(self, route: LLMRoute) -> float:
+        """Estimated USD spent on a route, from settings.llm_model_prices."""
+        stats = self._route_stats(route)
+        input_price, output_price = (settings.llm_model_prices.get(route.model) or [0.0, 0.0])[:2]
+        return (stats.input_tokens * input_price + stats.output_tokens * output_price) / 1_000_000
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-route latency, token and cost statistics."""
+        stats: Dict[str, Any] = {}
+        for name, route in self.routes.items():
+            route_stats = self._route_stats(route)
+            latencies = sorted(route_stats.latencies)
+            cost = self.estimate_cost(route)
+            stats[name] = {
+                "model": route.model,
+                "max_tokens": route.max_tokens,
+                "tools": route.tools,
+                "requests": route_stats.requests,
+                "avg_latency_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0,
+                "p95_latency_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2) if latencies else 0,
+                "input_tokens": route_stats.input_tokens,
+                "output_tokens": route_stats.output_tokens,
+                "estimated_cost_usd": round(cost, 6),
+                "cost_per_request_usd": round(cost / route_stats.requests, 6) if route_stats.requests else 0,
+            }
+        return stats
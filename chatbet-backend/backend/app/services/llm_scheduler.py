@@ -0,0 +1,324 @@
+"""
+Global scheduler for LLM requests.
+
+Nothing used to bound how many Gemini calls we had in flight. A burst of
+users could blow through the provider quota, and then every request failed
+at once. Every LLM call now goes through this scheduler first:
+
+- A global concurrency limit and a tokens-per-minute bucket
+- Priority lanes: interactive chat is always served before background work
+- Round-robin between users inside a lane, so one chatty session can't
+  starve everybody else
+- Queue-time metrics
+- Load shedding: if the expected wait is longer than the lane's deadline
+  (or what's left of the turn's deadline), the request fails fast with
+  LLMBusyError instead of queueing forever
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from ..core import deadline
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..utils.exceptions import LLMBusyError
+
+logger = get_logger(__name__)
+
+
+class Priority(IntEnum):
+    """Scheduling lanes, lower value is served first."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+@dataclass
+class SchedulerGrant:
+    """A granted LLM slot; callers may report actual token usage."""
+    user_key: str
+    priority: Priority
+    estimated_tokens: int
+    queue_time_ms: float = 0.0
+    actual_tokens: Optional[int] = None
+
+
+@dataclass
+class _Ticket:
+    grant: SchedulerGrant
+    future: "asyncio.Future[None]"
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class LLMScheduler:
+    """
+    Admission control for LLM calls.
+
+    Use `slot()` as an async context manager around a provider call. The
+    slot is held until the block exits, so streaming responses keep their
+    concurrency share until the last chunk.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        interactive_max_wait: Optional[float] = None,
+        background_max_wait: Optional[float] = None
+    ):
+        self.max_concurrency = max_concurrency or settings.llm_max_concurrency
+        self.tokens_per_minute = tokens_per_minute or settings.llm_tokens_per_minute
+        self.max_wait = {
+            Priority.INTERACTIVE: interactive_max_wait or settings.llm_queue_max_wait,
+            Priority.BACKGROUND: background_max_wait or settings.llm_background_queue_max_wait,
+        }
+
+        # One round-robin ring of per-user queues per lane
+        self._lanes: Dict[Priority, "OrderedDict[str, Deque[_Ticket]]"] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self._active = 0
+
+        # Token bucket, refilled continuously
+        self._tokens = float(self.tokens_per_minute)
+        self._refill_rate = self.tokens_per_minute / 60.0
+        self._last_refill = time.monotonic()
+        self._refill_timer: Optional[asyncio.TimerHandle] = None
+
+        # Recent service times drive the expected-wait estimate for shedding
+        self._service_times: Deque[float] = deque(maxlen=200)
+
+        # Performance tracking
+        self._queue_times: Dict[Priority, Deque[float]] = {p: deque(maxlen=1000) for p in Priority}
+        self._granted = {p: 0 for p in Priority}
+        self._shed = {p: 0 for p in Priority}
+        self._timeouts = {p: 0 for p in Priority}
+        self._max_queue_depth = 0
+
+    # === Public API ===
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        user_key: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        estimated_tokens: int = 0
+    ) -> AsyncIterator[SchedulerGrant]:
+        """Wait for (or be refused) a slot to call the LLM."""
+        grant = await self.acquire(user_key or "anonymous", priority, estimated_tokens)
+        started = time.monotonic()
+        try:
+            yield grant
+        finally:
+            self.release(grant, time.monotonic() - started)
+
+    async def acquire(self, user_key: str, priority: Priority, estimated_tokens: int) -> SchedulerGrant:
+        """Queue a request and wait until it's dispatched."""
+        grant = SchedulerGrant(user_key=user_key, priority=priority, estimated_tokens=estimated_tokens)
+        # Never queue past the turn's deadline
+        max_wait = deadline.clamp_timeout(self.max_wait[priority])
+
+        # Fast path: a free slot and enough token budget
+        if self._queued() == 0 and self._active < self.max_concurrency and self._take_tokens(estimated_tokens):
+            self._grant(grant, 0.0)
+            return grant
+
+        expected_wait = self.expected_wait(priority)
+        if expected_wait > max_wait:
+            self._shed[priority] += 1
+            logger.warning(
+                f"Shedding {priority.name.lower()} LLM request for {user_key}: "
+                f"expected wait {expected_wait:.1f}s > {max_wait:.1f}s"
+            )
+            raise LLMBusyError(
+                "The assistant is handling too many requests right now",
+                error_code="llm_busy",
+                status_code=503,
+                details={"expected_wait_seconds": round(expected_wait, 2)}
+            )
+
+        ticket = _Ticket(grant=grant, future=asyncio.get_running_loop().create_future())
+        lane = self._lanes[priority]
+        lane.setdefault(user_key, deque()).append(ticket)
+        self._max_queue_depth = max(self._max_queue_depth, self._queued())
+        self._dispatch()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(ticket.future), timeout=max_wait)
+        except asyncio.TimeoutError:
+            self._abandon(ticket)
+            self._timeouts[priority] += 1
+            raise LLMBusyError(
+                "Timed out waiting for the assistant",
+                error_code="llm_busy",
+                status_code=503,
+                details={"waited_seconds": max_wait}
+            )
+        except asyncio.CancelledError:
+            self._abandon(ticket)
+            raise
+
+        return grant
+
+    def release(self, grant: SchedulerGrant, service_time: float):
+        """Return a slot and reconcile the token estimate with actual usage."""
+        self._active -= 1
+        self._service_times.append(service_time)
+        if grant.actual_tokens is not None:
+            self._tokens = min(
+                float(self.tokens_per_minute),
+                self._tokens + grant.estimated_tokens - grant.actual_tokens
+            )
+        self._dispatch()
+
+    def expected_wait(self, priority: Priority) -> float:
+        """Rough wait estimate: work queued at or ahead of this lane over throughput."""
+        ahead = sum(
+            len(queue)
+            for lane_priority, lane in self._lanes.items()
+            if lane_priority <= priority
+            for queue in lane.values()
+        )
+        if ahead == 0 and self._active < self.max_concurrency:
+            return 0.0
+        avg_service = (
+            sum(self._service_times) / len(self._service_times)
+            if self._service_times else 1.0
+        )
+        return (ahead + 1) * avg_service / self.max_concurrency
+
+    # === Internals ===
+
+    def _queued(self) -> int:
+        return sum(len(queue) for lane in self._lanes.values() for queue in lane.values())
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.tokens_per_minute),
+            self._tokens + (now - self._last_refill) * self._refill_rate
+        )
+        self._last_refill = now
+
+    def _take_tokens(self, estimated_tokens: int) -> bool:
+        self._refill()
+        # A single oversized request may use the whole bucket
+        needed = min(estimated_tokens, self.tokens_per_minute)
+        if self._tokens < needed:
+            return False
+        self._tokens -= needed
+        return True
+
+    def _grant(self, grant: SchedulerGrant, queue_time: float):
+        self._active += 1
+        grant.queue_time_ms = queue_time * 1000
+        self._granted[grant.priority] += 1
+        self._queue_times[grant.priority].append(grant.queue_time_ms)
+
+    def _next_ticket(self) -> Optional[_Ticket]:
+        """Peek the next ticket: highest-priority lane, then round-robin by user."""
+        for priority in Priority:
+            lane = self._lanes[priority]
+            while lane:
+                user_key, queue = next(iter(lane.items()))
+                if queue and not queue[0].future.done():
+                    return queue[0]
+                if queue:
+                    queue.popleft()
+                if not queue:
+                    del lane[user_key]
+        return None
+
+    def _pop_ticket(self, ticket: _Ticket):
+        lane = self._lanes[ticket.grant.priority]
+        queue = lane[ticket.grant.user_key]
+        queue.popleft()
+        if queue:
+            # Rotate this user to the back of the ring
+            lane.move_to_end(ticket.grant.user_key)
+        else:
+            del lane[ticket.grant.user_key]
+
+    def _dispatch(self):
+        """Grant as many queued tickets as concurrency and tokens allow."""
+        while self._active < self.max_concurrency:
+            ticket = self._next_ticket()
+            if ticket is None:
+                return
+            if not self._take_tokens(ticket.grant.estimated_tokens):
+                self._schedule_refill(ticket.grant.estimated_tokens)
+                return
+            self._pop_ticket(ticket)
+            self._grant(ticket.grant, time.monotonic() - ticket.enqueued_at)
+            ticket.future.set_result(None)
+
+    def _schedule_refill(self, needed_tokens: int):
+        """Wake the dispatcher once the bucket holds enough tokens."""
+        if self._refill_timer is not None:
+            return
+        deficit = min(needed_tokens, self.tokens_per_minute) - self._tokens
+
+        def _on_refill():
+            self._refill_timer = None
+            self._dispatch()
+
+        self._refill_timer = asyncio.get_running_loop().call_later(
+            max(deficit / self._refill_rate, 0.01), _on_refill
+        )
+
+    def _abandon(self, ticket: _Ticket):
+        """Drop a ticket whose caller gave up, releasing it if it was just granted."""
+        if ticket.future.done() and not ticket.future.cancelled():
+            self.release(ticket.grant, 0.0)
+            return
+        ticket.future.cancel()
+        lane = self._lanes[ticket.grant.priority]
+        queue = lane.get(ticket.grant.user_key)
+        if queue is not None:
+            try:
+                queue.remove(ticket)
+            except ValueError:
+                pass
+            if not queue:
+                del lane[ticket.grant.user_key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics."""
+        lanes: Dict[str, Any] = {}
+        for priority in Priority:
+            queue_times = sorted(self._queue_times[priority])
+            lanes[priority.name.lower()] = {
+                "queued": sum(len(q) for q in self._lanes[priority].values()),
+                "granted": self._granted[priority],
+                "shed": self._shed[priority],
+                "timeouts": self._timeouts[priority],
+                "avg_queue_time_ms": round(sum(queue_times) / len(queue_times), 2) if queue_times else 0,
+                "p95_queue_time_ms": round(queue_times[int(len(queue_times) * 0.95) - 1], 2) if queue_times else 0,
+            }
+
+        self._refill()
+        return {
+            "active": self._active,
+            "max_concurrency": self.max_concurrency,
+            "queued": self._queued(),
+            "max_queue_depth": self._max_queue_depth,
+            "tokens_available": int(self._tokens),
+            "tokens_per_minute": self.tokens_per_minute,
+            "lanes": lanes
+        }
+
+
+# Global scheduler instance
+_llm_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get the global LLM scheduler instance."""
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        _llm_scheduler = LLMScheduler()
+    return _llm_scheduler
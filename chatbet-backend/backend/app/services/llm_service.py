@@ -13,13 +13,12 @@ Key features:
 - Performance monitoring and error handling
 """
 
-import json
 import logging
-from typing import List, Dict, Any, Optional, Callable, AsyncGenerator, Union
+from typing import List, Dict, Any, Optional, Callable, AsyncGenerator, Sequence, Union, Tuple
 from datetime import datetime
 import asyncio
+import time
 
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import PydanticOutputParser
@@ -27,85 +26,34 @@ from langchain_core.runnables import RunnablePassthrough
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
+from ..core import deadline
 from ..core.config import settings
 from ..core.logging import get_logger, log_function_call
 from ..models.conversation import IntentType, IntentClassificationResult
 from ..models.api_models import Tournament, MatchFixture, MatchOdds
 from ..services.chatbet_api import get_api_client
+from ..services.llm_providers import create_chat_model
+from ..services.llm_router import LLMRoute, LLMRouter
+from ..services.llm_scheduler import Priority, SchedulerGrant, get_llm_scheduler
+from ..services.prompts import (
+    INTENT_PROMPT, INTENT_SYSTEM_PROMPT, SUMMARY_SYSTEM_PROMPT,
+    build_system_prompt, get_prompt_cache_stats, with_conversation_summary, with_retrieved_data
+)
+from ..services.response_cache import LLMResponseCache, data_stamp, is_cacheable_intent, prompt_context_fingerprint
+from ..services.semantic_cache import create_semantic_cache
+from ..services.prefetcher import DataPrefetcher
+from ..services.tool_memo import SessionToolMemo
+from ..services.tool_planner import ToolPlanner
+from ..services.tournament_resolver import get_tournament_resolver
+from ..utils.projections import project_fixtures, project_odds, project_tournaments
+from ..utils.exceptions import DeadlineExceededError, LLMBusyError
+from ..utils.parsers import classify_intent_locally
+from ..utils.token_budget import TokenBudgeter, compact_json, estimate_messages_tokens, estimate_tokens
 
 logger = get_logger(__name__)
 
-
-# Cache for tournament mapping
-_tournament_cache: Optional[Dict[str, str]] = None
-
-async def _get_tournament_id_mapping() -> Dict[str, str]:
-    """
-    Get mapping of tournament names to IDs.
-    
-    Returns a dictionary mapping lowercase tournament names to their API IDs.
-    """
-    global _tournament_cache
-    
-    if _tournament_cache is not None:
-        return _tournament_cache
-    
-    try:
-        api_client = await get_api_client()
-        all_tournaments = await api_client.get_all_tournaments(with_active_fixtures=True)
-        
-        mapping = {}
-        for sport in all_tournaments:
-            for tournament in sport.tournaments:
-                name_lower = tournament.name.lower()
-                mapping[name_lower] = tournament.tournamentId
-                
-                # Add common aliases
-                if "la liga" in name_lower:
-                    mapping["la liga"] = tournament.tournamentId
-                    mapping["spanish league"] = tournament.tournamentId
-                elif "premier league" in name_lower:
-                    mapping["premier league"] = tournament.tournamentId
-                    mapping["english league"] = tournament.tournamentId
-                elif "bundesliga" in name_lower:
-                    mapping["bundesliga"] = tournament.tournamentId
-                    mapping["german league"] = tournament.tournamentId
-                elif "serie a" in name_lower:
-                    mapping["serie a"] = tournament.tournamentId
-                    mapping["italian league"] = tournament.tournamentId
-                elif "ligue 1" in name_lower:
-                    mapping["ligue 1"] = tournament.tournamentId
-                    mapping["french league"] = tournament.tournamentId
-        
-        _tournament_cache = mapping
-        logger.info(f"Cached {len(mapping)} tournament mappings")
-        return mapping
-        
-    except Exception as e:
-        logger.error(f"Failed to build tournament mapping: {e}")
-        return {}
-
-
-async def _resolve_tournament_id(tournament_input: Optional[str]) -> Optional[str]:
-    """
-    Resolve tournament input to a valid tournament ID.
-    
-    Args:
-        tournament_input: Could be a tournament ID, name, or None
-        
-    Returns:
-        Valid tournament ID or None
-    """
-    if not tournament_input:
-        return None
-    
-    # If it's already a numeric ID, return as-is
-    if tournament_input.isdigit():
-        return tournament_input
-    
-    # Try to find by name
-    mapping = await _get_tournament_id_mapping()
-    return mapping.get(tournament_input.lower())
+BUSY_MESSAGE = "I'm handling a lot of requests right now. Please try again in a few seconds."
+DEADLINE_MESSAGE = "Sorry, that took longer than expected. Please ask again and I'll get you an answer."
 
 
 async def _retry_api_call(func, max_retries: int = 2, delay: float = 1.0, *args, **kwargs):
@@ -113,29 +61,33 @@ async def _retry_api_call(func, max_retries: int = 2, delay: float = 1.0, *args,
     Internal retry helper for API calls.
     
     This provides retry logic without interfering with LangChain tool schema generation.
+    Retries stop early when the backoff would eat into the turn's answer time.
     """
     last_exception = None
     
     for attempt in range(max_retries + 1):
+        backoff = delay * (2 ** attempt)
+        can_retry = attempt < max_retries and deadline.has_budget(backoff + settings.deadline_answer_reserve_seconds)
         try:
             result = await func(*args, **kwargs)
             # Check if result indicates an error
             if isinstance(result, list) and len(result) > 0:
                 first_item = result[0]
                 if isinstance(first_item, dict) and first_item.get("status") == "error":
-                    if attempt < max_retries:
+                    if can_retry:
                         logger.warning(f"API call failed on attempt {attempt + 1}, retrying...")
-                        await asyncio.sleep(delay * (2 ** attempt))
+                        await asyncio.sleep(backoff)
                         continue
             return result
         except Exception as e:
             last_exception = e
-            if attempt < max_retries:
+            if can_retry:
                 logger.warning(f"API call failed on attempt {attempt + 1}: {str(e)}, retrying...")
-                await asyncio.sleep(delay * (2 ** attempt))
+                await asyncio.sleep(backoff)
                 continue
             else:
-                logger.error(f"API call failed after {max_retries + 1} attempts: {str(e)}")
+                logger.error(f"API call failed after {attempt + 1} attempts: {str(e)}")
+                break
     
     # If we get here, all retries failed
     if last_exception:
@@ -182,21 +134,45 @@ class ChatBetLLMService:
     """
     
     def __init__(self):
-        # Initialize Gemini model with optimized settings
-        self.llm = ChatGoogleGenerativeAI(
-            model=settings.gemini_model,
-            temperature=settings.gemini_temperature,
-            max_tokens=settings.gemini_max_tokens,
-            timeout=settings.gemini_timeout,
-            max_retries=2,
-            # Enable function calling
-            convert_system_message_to_human=False
-        )
+        # Initialize the configured chat model (Gemini, or the local fake for load tests)
+        self.llm = create_chat_model()
+        
+        # Per-intent model, output cap, temperature and tools for answers
+        self.router = LLMRouter(create_chat_model)
         
         # Performance tracking
         self._total_requests = 0
         self._total_tokens = 0
         self._avg_response_time = 0.0
+        self._total_prompt_tokens = 0
+        self._prompt_count = 0
+        self._input_tokens = 0
+        self._cached_input_tokens = 0
+        self._completed_calls = 0
+        self._llm_call_time_ms = 0.0
+        self._cancelled_calls = 0
+        self._llm_time_saved_ms = 0.0
+        self._deadline_degradations = {
+            "local_intent": 0,
+            "skipped_tools": 0,
+            "cache_answers": 0,
+            "deadline_exceeded": 0
+        }
+        
+        # Every provider call goes through the global scheduler
+        self.scheduler = get_llm_scheduler()
+        
+        # Keep prompts within a fixed token budget
+        self.token_budgeter = TokenBudgeter()
+        
+        # Exact-match cache for repeated prompts
+        self.response_cache = LLMResponseCache()
+        
+        # Near-duplicate cache for context-free questions
+        self.semantic_cache = create_semantic_cache()
+        
+        # Free-text tournament names -> API tournament IDs
+        self.tournament_resolver = get_tournament_resolver()
         
         # Setup intent classification
         self._setup_intent_classifier()
@@ -206,52 +182,8 @@ class ChatBetLLMService:
     
     def _setup_intent_classifier(self):
         """Setup intent classification chain."""
-        intent_system_prompt = """You are an expert intent classifier for a sports betting conversational AI.
-
-Your job is to analyze user messages and classify them into one of these categories:
-
-MATCH_SCHEDULE_QUERY: User asking about match schedules, when teams play, fixtures
-- Examples: "When does Barcelona play?", "What matches are today?", "Who plays tomorrow?"
-
-ODDS_INFORMATION_QUERY: User asking about betting odds, prices, or probabilities  
-- Examples: "What are the odds for Barcelona vs Real?", "How much does a draw pay?"
-
-BETTING_RECOMMENDATION: User asking for betting advice or recommendations
-- Examples: "What should I bet on?", "Which team should I back?", "Best bet today?"
-
-TEAM_COMPARISON: User comparing teams or asking about team strengths
-- Examples: "Who's better, Barcelona or Real?", "Compare these teams"
-
-USER_BALANCE_QUERY: User asking about their account balance or money
-- Examples: "How much money do I have?", "What's my balance?", "Can I afford this bet?"
-
-BET_SIMULATION: User wants to place a bet or simulate betting
-- Examples: "I want to bet $50 on Barcelona", "Place a bet for me"
-
-GENERAL_SPORTS_QUERY: General sports questions not related to betting
-- Examples: "Tell me about football", "Who won the World Cup?"
-
-GREETING: General greetings and conversation starters
-- Examples: "Hello", "Hi there", "Good morning"
-
-HELP_REQUEST: User asking for help or instructions
-- Examples: "Help me", "How does this work?", "What can you do?"
-
-UNCLEAR: Message is unclear or doesn't fit other categories
-- Examples: Incomplete sentences, unclear context
-
-Analyze the user's message and respond with:
-1. The most likely intent
-2. Confidence score (0.0 to 1.0)
-3. Any relevant entities extracted (team names, dates, amounts, etc.)
-4. Brief reasoning for your classification
-
-Be accurate and confident in your classifications. Consider context and user intent carefully."""
-
-        self.intent_prompt = ChatPromptTemplate.from_messages([
-            ("system", intent_system_prompt),
-            ("human", "Classify this message: '{message}'")
-        ])
+        # The prompt template is static and shared across instances
+        self.intent_prompt = INTENT_PROMPT
         
         self.intent_parser = PydanticOutputParser(pydantic_object=IntentClassifier)
         
@@ -264,7 +196,7 @@ Be accurate and confident in your classifications. Consider context and user int
         """Setup LangChain tools for function calling."""
         
         @tool
-        async def get_tournaments() -> List[Dict[str, Any]]:
+        async def get_tournaments() -> List[Any]:
             """Get list of available tournaments and competitions."""
             async def _get_tournaments_impl():
                 api_client = await get_api_client()
@@ -275,7 +207,7 @@ Be accurate and confident in your classifications. Consider context and user int
                         "message": "No tournaments currently available",
                         "suggestion": "Please try again later"
                     }]
-                return [t.model_dump() for t in tournaments[:10]]  # Limit to prevent token overflow
+                return project_tournaments(tournaments[:10])  # Limit to prevent token overflow
             
             try:
                 return await _retry_api_call(_get_tournaments_impl)
@@ -288,7 +220,7 @@ Be accurate and confident in your classifications. Consider context and user int
                 }]
         
         @tool
-        async def get_fixtures(tournament_id: Optional[str] = None, days_ahead: int = 7) -> List[Dict[str, Any]]:
+        async def get_fixtures(tournament_id: Optional[str] = None, days_ahead: int = 7) -> List[Any]:
             """
             Get upcoming match fixtures.
             
@@ -302,12 +234,13 @@ Be accurate and confident in your classifications. Consider context and user int
                 # Resolve tournament ID if provided
                 resolved_tournament_id = None
                 if tournament_id:
-                    resolved_tournament_id = await _resolve_tournament_id(tournament_id)
+                    resolved_tournament_id = await self.tournament_resolver.resolve(tournament_id)
                     if not resolved_tournament_id:
                         return [{
                             "status": "invalid_tournament",
                             "message": f"Tournament '{tournament_id}' not found or not available",
-                            "suggestion": "Try using a different tournament name or check available tournaments first"
+                            "suggestion": "Try using a different tournament name or check available tournaments first",
+                            "closest_matches": self.tournament_resolver.suggest(tournament_id)
                         }]
                 
                 # Get fixtures using the correct API method signature
@@ -329,7 +262,7 @@ Be accurate and confident in your classifications. Consider context and user int
                         "suggestion": "Try checking other tournaments or live matches"
                     }]
                 
-                return [f.model_dump() for f in fixtures[:15]]  # Limit results
+                return project_fixtures(fixtures[:15])  # Limit results
             
             try:
                 return await _retry_api_call(_get_fixtures_impl)
@@ -378,23 +311,8 @@ Be accurate and confident in your classifications. Consider context and user int
                         amount=amount
                     )
                 
-                # For get_odds, we don't need the complex retry logic since it returns MatchOdds object
-                # Just do a simple retry
-                odds: Optional[MatchOdds] = None
-                last_exception = None
-                for attempt in range(3):  # 3 attempts total
-                    try:
-                        odds = await _get_odds_api_call()
-                        break
-                    except Exception as e:
-                        last_exception = e
-                        if attempt < 2:  # Only sleep if we have more attempts
-                            await asyncio.sleep(1.0 * (2 ** attempt))
-                        continue
-                else:
-                    # All retries failed
-                    if last_exception:
-                        raise last_exception
+                # Same backoff as the other tools, stopping when the turn runs low
+                odds: Optional[MatchOdds] = await _retry_api_call(_get_odds_api_call, max_retries=2, delay=1.0)
                 
                 if not odds:
                     return [{
@@ -403,63 +321,17 @@ Be accurate and confident in your classifications. Consider context and user int
                         "suggestion": "This match might not have odds available yet, or betting might be suspended"
                     }]
                 
-                # Simplify odds data for LLM consumption based on actual MatchOdds structure
-                simplified_odds = {
-                    "fixture_id": fixture_id,
-                    "status": odds.status,
-                    "main_market": odds.main_market,
-                    "markets": []
-                }
-                
-                # Extract available betting markets from MatchOdds attributes
-                available_markets = []
-                
-                # Check main result market (1X2)
-                if odds.result is not None:
-                    available_markets.append({
-                        "market_name": "Match Result (1X2)",
-                        "data": odds.result
-                    })
-                
-                # Check over/under market
-                if odds.over_under is not None:
-                    available_markets.append({
-                        "market_name": "Over/Under",
-                        "data": odds.over_under
-                    })
-                
-                # Check both teams to score
-                if odds.both_teams_to_score is not None:
-                    available_markets.append({
-                        "market_name": "Both Teams to Score",
-                        "data": odds.both_teams_to_score
-                    })
-                
-                # Check double chance
-                if odds.double_chance is not None:
-                    available_markets.append({
-                        "market_name": "Double Chance",
-                        "data": odds.double_chance
-                    })
-                
-                # Check handicap
-                if odds.handicap is not None:
-                    available_markets.append({
-                        "market_name": "Handicap",
-                        "data": odds.handicap
-                    })
+                # Project odds to compact implied-probability tuples
+                projected_odds = project_odds(fixture_id, odds, max_markets=3)
                 
-                if not available_markets:
+                if not projected_odds["markets"]:
                     return [{
                         "status": "no_markets",
                         "message": f"No betting markets available for fixture {fixture_id}",
                         "suggestion": "This match might not have betting markets open yet"
                     }]
                 
-                # Limit to top 3 markets to prevent token overflow
-                simplified_odds["markets"] = available_markets[:3]
-                
-                return [simplified_odds]
+                return [projected_odds]
                 
             except Exception as e:
                 logger.error(f"Error getting odds: {e}")
@@ -470,7 +342,7 @@ Be accurate and confident in your classifications. Consider context and user int
                 }]
         
         @tool
-        async def search_team_matches(team_name: str) -> List[Dict[str, Any]]:
+        async def search_team_matches(team_name: str) -> List[Any]:
             """
             Search for upcoming matches for a specific team.
             
@@ -486,7 +358,7 @@ Be accurate and confident in your classifications. Consider context and user int
                 for fixture in fixtures_response.fixtures:  # Access the fixtures list from the response
                     if (team_name.lower() in fixture.homeCompetitor.name.lower() or 
                         team_name.lower() in fixture.awayCompetitor.name.lower()):
-                        team_matches.append(fixture.model_dump())
+                        team_matches.append(fixture)
                 
                 if not team_matches:
                     return [{
@@ -497,8 +369,8 @@ Be accurate and confident in your classifications. Consider context and user int
                     }]
                 
                 # Sort by date and limit
-                team_matches.sort(key=lambda x: x["startTime"])
-                return team_matches[:10]
+                team_matches.sort(key=lambda x: x.startTime)
+                return project_fixtures(team_matches[:10])
                 
             except Exception as e:
                 logger.error(f"Error searching team matches: {e}")
@@ -509,7 +381,7 @@ Be accurate and confident in your classifications. Consider context and user int
                 }]
         
         @tool
-        async def get_live_matches(tournament_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        async def get_live_matches(tournament_id: Optional[str] = None) -> List[Any]:
             """
             Get currently live matches as an alternative to upcoming fixtures.
             
@@ -522,12 +394,13 @@ Be accurate and confident in your classifications. Consider context and user int
                 # Resolve tournament ID if provided
                 resolved_tournament_id = None
                 if tournament_id:
-                    resolved_tournament_id = await _resolve_tournament_id(tournament_id)
+                    resolved_tournament_id = await self.tournament_resolver.resolve(tournament_id)
                     if not resolved_tournament_id:
                         return [{
                             "status": "invalid_tournament",
                             "message": f"Tournament '{tournament_id}' not found or not available",
-                            "suggestion": "Try using a different tournament name or check available tournaments first"
+                            "suggestion": "Try using a different tournament name or check available tournaments first",
+                            "closest_matches": self.tournament_resolver.suggest(tournament_id)
                         }]
                 
                 # Get live fixtures using the correct API method signature
@@ -551,8 +424,7 @@ Be accurate and confident in your classifications. Consider context and user int
                     }]
                 
                 # Sort by date and limit results
-                fixtures_list = [f.model_dump() for f in fixtures[:10]]  # Limit to prevent token overflow
-                return fixtures_list
+                return project_fixtures(fixtures[:10])  # Limit to prevent token overflow
                 
             except Exception as e:
                 logger.error(f"Error getting live matches: {e}")
@@ -564,9 +436,18 @@ Be accurate and confident in your classifications. Consider context and user int
         
         self.tools = [get_tournaments, get_fixtures, get_live_matches, get_odds, search_team_matches]
         self.llm_with_tools = self.llm.bind_tools(self.tools)
+        
+        # Warms tool results for teams the conversation keeps mentioning
+        self.prefetcher = DataPrefetcher(self.tools)
+        
+        # Tool results reused across turns of the same conversation
+        self.tool_memo = SessionToolMemo(self.tools)
+        
+        # Runs the tools a classified turn obviously needs before generation
+        self.tool_planner = ToolPlanner(self.tools, self.prefetcher, self.tool_memo)
     
     @log_function_call()
-    async def classify_intent(self, message: str) -> IntentClassificationResult:
+    async def classify_intent(self, message: str, user_key: Optional[str] = None) -> IntentClassificationResult:
         """
         Classify user intent from message.
         
@@ -575,8 +456,15 @@ Be accurate and confident in your classifications. Consider context and user int
         """
         start_time = datetime.now()
         
+        # Leave enough of the turn for the answer itself
+        left = deadline.remaining()
+        classify_budget = None if left is None else left - settings.deadline_answer_reserve_seconds
+        if classify_budget is not None and classify_budget <= 0:
+            return self._classify_locally(message)
+        
         try:
-            result = await self.intent_chain.ainvoke({"message": message})
+            with deadline.deadline_scope(classify_budget):
+                result = await self._invoke_llm(self.intent_chain, {"message": message}, user_key)
             
             # Ensure result is an IntentClassifier instance
             if not isinstance(result, IntentClassifier):
@@ -597,6 +485,8 @@ Be accurate and confident in your classifications. Consider context and user int
                 alternatives=[]  # Could be enhanced with alternative intents
             )
             
+        except DeadlineExceededError:
+            return self._classify_locally(message)
         except Exception as e:
             logger.error(f"Error classifying intent: {e}")
             # Return fallback classification
@@ -607,13 +497,21 @@ Be accurate and confident in your classifications. Consider context and user int
                 alternatives=[]
             )
     
+    def _classify_locally(self, message: str) -> IntentClassificationResult:
+        """Keyword classification when there's no time for an LLM call."""
+        intent, confidence = classify_intent_locally(message)
+        self._deadline_degradations["local_intent"] += 1
+        logger.info(f"Classified intent locally under deadline pressure: {intent}")
+        return IntentClassificationResult(intent=intent, confidence=confidence, entities={}, alternatives=[])
+    
     @log_function_call()
     async def generate_response(
         self,
         user_message: str,
-        conversation_history: List[BaseMessage],
+        conversation_history: Sequence[BaseMessage],
         user_context: Optional[Dict[str, Any]] = None,
-        stream: bool = False
+        stream: bool = False,
+        priority: Priority = Priority.INTERACTIVE
     ) -> Union[str, AsyncGenerator[str, None]]:
         """
         Generate conversational response using Gemini.
@@ -622,33 +520,112 @@ Be accurate and confident in your classifications. Consider context and user int
         and conversation history to generate contextually appropriate responses.
         """
         start_time = datetime.now()
+        user_key = self._user_key(user_context)
+        route = self.router.route_for((user_context or {}).get("intent"))
         
         try:
             # Build system prompt with context
             system_prompt = self._build_system_prompt(user_context)
+            conversation_context = (user_context or {}).get("conversation_context") or {}
+            session_id = conversation_context.get("session_id")
+            system_prompt = with_conversation_summary(system_prompt, conversation_context.get("summary"))
+            planned_results = (user_context or {}).get("planned_tool_results") or []
+            
+            # Earlier turns' data, minus what the planner fetched for this one
+            retrieved = self.tool_memo.retrieved(
+                session_id, exclude=[(item["tool_name"], item.get("args")) for item in planned_results]
+            )
+            if retrieved:
+                system_prompt = with_retrieved_data(
+                    system_prompt,
+                    self.token_budgeter.format_tool_results(retrieved, settings.tool_memo_context_tokens)
+                )
             
             # Prepare messages - use List[BaseMessage] type
             messages: List[BaseMessage] = [SystemMessage(content=system_prompt)]
             
-            # Add conversation history (limited to prevent token overflow)
-            recent_history = conversation_history[-settings.max_conversation_history:]
+            # Add conversation history (limited by count, then by token budget)
+            recent_history = self.token_budgeter.fit_history(
+                system_prompt,
+                conversation_history[-settings.max_conversation_history:],
+                user_message
+            )
             messages.extend(recent_history)
             
             # Add current user message
             messages.append(HumanMessage(content=user_message))
             
+            # Data fetched by the tool planner goes in up front, so the
+            # answer needs a single model call
+            failed_tools: List[Dict[str, Any]] = []
+            if planned_results:
+                failed_tools = [
+                    failure for item in planned_results
+                    if (failure := self._tool_failure(item["tool_name"], item["result"]))
+                ]
+                messages.append(HumanMessage(content=self._tool_results_message(planned_results, failed_tools, messages)))
+            
             if stream:
                 # Return the async generator for streaming
-                return self._generate_streaming_response(messages)
+                self._record_prompt_tokens(messages)
+                if planned_results:
+                    self.tool_planner.record_single_call_answer()
+                return self._generate_streaming_response(messages, user_key, priority, route)
             else:
-                # Generate response with tool calling
-                response = await self.llm_with_tools.ainvoke(messages)
+                # Serve repeated prompts from the response cache
+                cache_key = None
+                semantic_scope = None
+                stamp = ""
+                intent = (user_context or {}).get("intent")
+                cacheable = is_cacheable_intent(intent)
+                if cacheable and (settings.llm_response_cache_enabled or settings.semantic_cache_enabled):
+                    stamp = data_stamp(intent, planned_results, (await get_api_client()).data_versions)
+                
+                if settings.llm_response_cache_enabled and cacheable:
+                    cache_key = self.response_cache.build_key(
+                        user_message, intent, recent_history, user_context, stamp
+                    )
+                    cached_response = await self.response_cache.get(cache_key)
+                    if cached_response is not None:
+                        logger.debug(f"Response cache hit for intent {intent}")
+                        return cached_response
+                
+                # Running out of time: a near-duplicate answer beats no answer
+                if (settings.semantic_cache_enabled and cacheable and recent_history
+                        and not deadline.has_budget(settings.deadline_answer_reserve_seconds)):
+                    scope = f"{intent}:{prompt_context_fingerprint(user_context)}"
+                    semantic_hit = self.semantic_cache.lookup(user_message, scope, stamp)
+                    if semantic_hit is not None:
+                        self._deadline_degradations["cache_answers"] += 1
+                        return semantic_hit[0]
+                
+                # Fall back to near-duplicate matching for context-free turns
+                if settings.semantic_cache_enabled and cacheable and not recent_history:
+                    semantic_scope = f"{intent}:{prompt_context_fingerprint(user_context)}"
+                    semantic_hit = self.semantic_cache.lookup(user_message, semantic_scope, stamp)
+                    if semantic_hit is not None:
+                        logger.debug(f"Semantic cache hit for intent {intent} (similarity {semantic_hit[1]:.2f})")
+                        return semantic_hit[0]
+                
+                if planned_results:
+                    response = await self._invoke_llm(
+                        self.router.model_for(route), messages, user_key, priority, route
+                    )
+                    self.tool_planner.record_single_call_answer()
+                else:
+                    # Generate response with tool calling
+                    response = await self._invoke_llm(
+                        self.router.tool_model_for(route, self.tools), messages, user_key, priority, route
+                    )
                 
                 # Handle tool calls if present
                 if hasattr(response, 'tool_calls') and getattr(response, 'tool_calls', None):
-                    response = await self._handle_tool_calls(response, messages)
+                    response, failed_tools = await self._handle_tool_calls(
+                        response, messages, user_key, priority, route, session_id
+                    )
                 
                 response_time = (datetime.now() - start_time).total_seconds() * 1000
+                self._record_prompt_tokens(messages)
                 
                 # Safely get content
                 content = getattr(response, 'content', '')
@@ -659,70 +636,177 @@ Be accurate and confident in your classifications. Consider context and user int
                     content = str(content) if content else ''
                 
                 self._update_performance_metrics(response_time, len(content))
+                self.router.record_request(route, response_time)
+                
+                # Only cache complete answers built on healthy data
+                if content.strip() and not failed_tools:
+                    if cache_key:
+                        await self.response_cache.set(cache_key, content)
+                    if semantic_scope:
+                        self.semantic_cache.add(user_message, content, semantic_scope, stamp)
                 
                 return content
                 
+        except LLMBusyError:
+            return BUSY_MESSAGE
+        except DeadlineExceededError:
+            self._deadline_degradations["deadline_exceeded"] += 1
+            return DEADLINE_MESSAGE
         except Exception as e:
             logger.error(f"Error generating response: {e}")
             return "I apologize, but I'm having trouble processing your request right now. Please try again in a moment."
     
-    async def _generate_streaming_response(self, messages: List[BaseMessage]) -> AsyncGenerator[str, None]:
-        """Generate streaming response chunks."""
+    async def summarize_conversation(
+        self,
+        previous_summary: Optional[str],
+        turns: List[str],
+        max_words: int,
+        user_key: Optional[str] = None
+    ) -> str:
+        """
+        Fold conversation turns into a running summary.
+        
+        Runs in the background lane so it never delays interactive chat.
+        """
+        messages: List[BaseMessage] = [
+            SystemMessage(content=SUMMARY_SYSTEM_PROMPT.format(max_words=max_words)),
+            HumanMessage(content=(
+                f"Existing summary:\n{previous_summary or '(none)'}\n\n"
+                "New turns:\n" + "\n".join(turns)
+            ))
+        ]
+        response = await self._invoke_llm(self.llm, messages, user_key, Priority.BACKGROUND)
+        content = getattr(response, 'content', '')
+        if isinstance(content, list):
+            content = ' '.join(str(item) for item in content if item)
+        return str(content or '').strip()
+    
+    async def _generate_streaming_response(
+        self,
+        messages: List[BaseMessage],
+        user_key: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        route: Optional[LLMRoute] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Generate streaming response chunks.
+        
+        Each chunk is awaited for at most the time left in the turn, so a
+        stalled stream gives its scheduler slot back at the deadline.
+        """
+        route = route or self.router.route_for(None)
+        streamed = False
         try:
-            async for chunk in self.llm.astream(messages):
-                content = getattr(chunk, 'content', '')
-                if content:
-                    # Ensure content is a string
-                    if isinstance(content, list):
-                        # Join list content into string
-                        content_str = ' '.join(str(item) for item in content if item)
-                    elif isinstance(content, str):
-                        content_str = content
-                    else:
-                        content_str = str(content)
-                    
-                    if content_str.strip():  # Only yield non-empty content
-                        yield content_str
+            deadline.check_deadline("LLM stream")
+            # The slot is held for the whole stream
+            async with self.scheduler.slot(user_key, priority, self._estimate_call_tokens(messages)) as grant:
+                stream = self.router.model_for(route).astream(messages).__aiter__()
+                try:
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(stream.__anext__(), deadline.remaining())
+                        except StopAsyncIteration:
+                            break
+                        self._record_usage(chunk, grant)
+                        self.router.record_usage(route, chunk)
+                        content = getattr(chunk, 'content', '')
+                        if content:
+                            # Ensure content is a string
+                            if isinstance(content, list):
+                                # Join list content into string
+                                content_str = ' '.join(str(item) for item in content if item)
+                            elif isinstance(content, str):
+                                content_str = content
+                            else:
+                                content_str = str(content)
+                            
+                            # Whitespace-only chunks ("\n\n") carry the paragraph breaks
+                            if content_str:
+                                streamed = True
+                                yield content_str
+                finally:
+                    aclose = getattr(stream, "aclose", None)
+                    if aclose is not None:
+                        await aclose()
+        except LLMBusyError:
+            yield BUSY_MESSAGE
+        except (asyncio.TimeoutError, DeadlineExceededError):
+            self._deadline_degradations["deadline_exceeded"] += 1
+            yield f"\n\n{DEADLINE_MESSAGE}" if streamed else DEADLINE_MESSAGE
         except Exception as e:
             logger.error(f"Error in streaming response: {e}")
             yield "I apologize, but I'm having trouble with the streaming response."
     
-    async def _handle_tool_calls(self, response, messages: List[BaseMessage]) -> AIMessage:
-        """Handle function/tool calls from the LLM."""
+    async def _handle_tool_calls(
+        self,
+        response,
+        messages: List[BaseMessage],
+        user_key: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        route: Optional[LLMRoute] = None,
+        session_id: Optional[str] = None
+    ) -> Tuple[AIMessage, List[Dict[str, Any]]]:
+        """
+        Handle function/tool calls from the LLM.
+        
+        Returns the final AI message along with any tools that failed, so the
+        caller can decide whether the answer is safe to cache.
+        """
+        failed_tools: List[Dict[str, Any]] = []
         try:
             # Execute tool calls
             tool_results = []
-            failed_tools = []
             
             for tool_call in response.tool_calls:
                 tool_name = tool_call["name"]
                 tool_args = tool_call["args"]
                 
+                # Served from this session's memo or the prefetch, no upstream wait
+                reused = await self._reuse_tool_result(session_id, tool_name, tool_args)
+                if reused is not None:
+                    tool_results.append({
+                        "tool_call_id": tool_call["id"],
+                        "tool_name": tool_name,
+                        "result": reused
+                    })
+                    continue
+                
+                # Tools only get the time the final answer doesn't need
+                left = deadline.remaining()
+                tool_budget = None if left is None else left - settings.deadline_answer_reserve_seconds
+                if tool_budget is not None and tool_budget <= 0:
+                    self._deadline_degradations["skipped_tools"] += 1
+                    failed_tools.append({
+                        "tool_name": tool_name,
+                        "error": "Skipped, not enough time left to fetch this data",
+                        "suggestion": "Ask again to get the latest data"
+                    })
+                    continue
+                
                 # Find and execute the tool
                 for tool in self.tools:
                     if tool.name == tool_name:
                         try:
-                            result = await tool.ainvoke(tool_args)
+                            result = await asyncio.wait_for(tool.ainvoke(tool_args), tool_budget)
                             # Check if result indicates an error or no data
-                            if isinstance(result, list) and len(result) > 0:
-                                first_item = result[0]
-                                if isinstance(first_item, dict):
-                                    status = first_item.get("status")
-                                    if status == "error":
-                                        failed_tools.append({
-                                            "tool_name": tool_name,
-                                            "error": first_item.get("message", "Unknown error"),
-                                            "suggestion": first_item.get("suggestion", "Please try again")
-                                        })
-                                    elif status == "no_tournaments":
-                                        # This is OK, not an error
-                                        pass
+                            failure = self._tool_failure(tool_name, result)
+                            if failure:
+                                failed_tools.append(failure)
+                            else:
+                                self.tool_memo.put(session_id, tool_name, tool_args, result)
                             
                             tool_results.append({
                                 "tool_call_id": tool_call["id"],
                                 "tool_name": tool_name,
                                 "result": result
                             })
+                        except asyncio.TimeoutError:
+                            self._deadline_degradations["skipped_tools"] += 1
+                            failed_tools.append({
+                                "tool_name": tool_name,
+                                "error": "Timed out, not enough time left to fetch this data",
+                                "suggestion": "Ask again to get the latest data"
+                            })
                         except Exception as e:
                             logger.error(f"Tool {tool_name} failed: {str(e)}")
                             failed_tools.append({
@@ -734,41 +818,92 @@ Be accurate and confident in your classifications. Consider context and user int
             
             # Create a follow-up message with tool results and error context
             if tool_results:
-                tool_message = f"Based on the data I retrieved:\n{json.dumps(tool_results, indent=2)}"
-                
-                # Add context about failed tools if any
-                if failed_tools:
-                    tool_message += f"\n\nNote: Some data sources had issues:\n{json.dumps(failed_tools, indent=2)}"
-                
-                tool_message += "\n\nNow let me provide you with a helpful response:"
+                tool_message = self._tool_results_message(tool_results, failed_tools, messages + [response])
                 
                 # Add tool results to conversation and get final response
                 messages.append(response)
                 messages.append(HumanMessage(content=tool_message))
                 
-                final_response = await self.llm.ainvoke(messages)
+                route = route or self.router.route_for(None)
+                final_response = await self._invoke_llm(
+                    self.router.model_for(route), messages, user_key, priority, route
+                )
                 # Ensure we return an AIMessage
                 if isinstance(final_response, AIMessage):
-                    return final_response
+                    return final_response, failed_tools
                 else:
                     # Convert to AIMessage if needed
                     content = getattr(final_response, 'content', '')
                     if isinstance(content, list):
                         content = ' '.join(str(item) for item in content if item)
-                    return AIMessage(content=str(content))
+                    return AIMessage(content=str(content)), failed_tools
             
             # Convert response to AIMessage if needed
             if isinstance(response, AIMessage):
-                return response
+                return response, failed_tools
             else:
                 content = getattr(response, 'content', '')
                 if isinstance(content, list):
                     content = ' '.join(str(item) for item in content if item)
-                return AIMessage(content=str(content))
+                return AIMessage(content=str(content)), failed_tools
             
+        except (LLMBusyError, DeadlineExceededError):
+            # Let generate_response pick the degraded answer
+            raise
         except Exception as e:
             logger.error(f"Error handling tool calls: {e}")
-            return AIMessage(content="I encountered an issue while retrieving the latest information. Let me help you with what I know.")
+            failed_tools.append({"tool_name": "tool_execution", "error": str(e)})
+            return AIMessage(content="I encountered an issue while retrieving the latest information. Let me help you with what I know."), failed_tools
+    
+    async def _reuse_tool_result(
+        self,
+        session_id: Optional[str],
+        tool_name: str,
+        tool_args: Dict[str, Any]
+    ) -> Optional[Any]:
+        """Earlier result for the same tool call in this session, or a prefetched one."""
+        memoized = self.tool_memo.get(session_id, tool_name, tool_args)
+        if memoized is not None:
+            return memoized
+        prefetched = await self.prefetcher.lookup(tool_name, tool_args)
+        if prefetched is not None:
+            self.tool_memo.put(session_id, tool_name, tool_args, prefetched)
+        return prefetched
+    
+    @staticmethod
+    def _tool_failure(tool_name: str, result: Any) -> Optional[Dict[str, Any]]:
+        """Failure entry for a tool result that reports an error, None otherwise."""
+        if isinstance(result, list) and len(result) > 0:
+            first_item = result[0]
+            # "no_tournaments" and friends are valid answers, not errors
+            if isinstance(first_item, dict) and first_item.get("status") == "error":
+                return {
+                    "tool_name": tool_name,
+                    "error": first_item.get("message", "Unknown error"),
+                    "suggestion": first_item.get("suggestion", "Please try again")
+                }
+        return None
+    
+    def _tool_results_message(
+        self,
+        tool_results: List[Dict[str, Any]],
+        failed_tools: List[Dict[str, Any]],
+        messages: List[BaseMessage]
+    ) -> str:
+        """Follow-up message carrying tool results, fitted into the prompt budget."""
+        # Fit the payload into whatever the prompt budget has left
+        remaining_tokens = self.token_budgeter.max_prompt_tokens - estimate_messages_tokens(messages)
+        tool_message = (
+            "Based on the data I retrieved:\n"
+            f"{self.token_budgeter.format_tool_results(tool_results, max(remaining_tokens, 0))}"
+        )
+        
+        # Add context about failed tools if any
+        if failed_tools:
+            tool_message += f"\n\nNote: Some data sources had issues:\n{compact_json(failed_tools)}"
+        
+        tool_message += "\n\nNow let me provide you with a helpful response:"
+        return tool_message
     
     def _build_system_prompt(self, user_context: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -777,81 +912,7 @@ Be accurate and confident in your classifications. Consider context and user int
         This prompt establishes the AI's personality, knowledge domain,
         and behavioral guidelines for sports betting conversations.
         """
-        base_prompt = """You are ChatBet Assistant, an expert conversational AI specializing in sports betting and match analysis.
-
-PERSONALITY & TONE:
-- Friendly, knowledgeable, and helpful
-- Use a conversational tone without excessive formality
-- Be enthusiastic about sports while maintaining professionalism
-- Always prioritize responsible gambling
-
-CORE EXPERTISE:
-- Sports betting odds analysis and interpretation
-- Match predictions and team comparisons
-- Tournament and fixture information
-- Betting strategy and risk management
-- Sports knowledge across major leagues and competitions
-
-CAPABILITIES:
-- Access real-time sports data and betting odds
-- Provide betting recommendations with risk analysis
-- Explain betting concepts and strategies
-- Help users understand odds and probabilities
-- Simulate bet placements and calculations
-
-IMPORTANT GUIDELINES:
-1. Always promote responsible gambling
-2. Never guarantee betting outcomes
-3. Clearly explain risks and probabilities
-4. Provide balanced analysis, not just positive predictions
-5. Suggest appropriate stake sizes relative to bankroll
-6. Warn about high-risk bets appropriately
-
-RESPONSE STYLE:
-- Keep responses concise but informative
-- Use bullet points for multiple pieces of information
-- Include specific numbers (odds, dates, times) when available
-- Ask clarifying questions when user intent is unclear
-- Provide actionable insights, not just raw data
-
-WHEN USING TOOLS:
-- Use get_tournaments() for tournament/league information
-- Use get_fixtures() for match schedules and upcoming games
-- Use get_live_matches() for currently ongoing matches
-- Use get_odds() for current betting odds and markets
-- Use search_team_matches() when user asks about specific teams
-
-HANDLING EMPTY OR ERROR RESPONSES:
-- If tools return empty data or no results, provide helpful explanations
-- Suggest alternative queries or different tournaments
-- Explain why data might not be available (off-season, no upcoming matches, etc.)
-- Always maintain a helpful tone even when data is unavailable
-- Offer related information or suggestions for what the user could try instead
-
-EXAMPLE RESPONSES FOR COMMON SCENARIOS:
-- No fixtures available: "I don't see any upcoming fixtures for [tournament] right now. This could be because it's the off-season or between match rounds. Would you like me to check other tournaments or show you what tournaments are currently active?"
-- No odds available: "Betting odds aren't available for this match yet. This usually happens when matches are far in the future or betting hasn't opened. Let me help you find matches with available odds."
-- Team not found: "I couldn't find any upcoming matches for [team]. The team name might need to be more specific, or they might not have scheduled matches soon. Can you try the full team name or ask about a different team?"
-
-Remember: You're helping users make informed betting decisions, not just providing information. Always be helpful even when data is limited."""
-
-        # Add user-specific context if available
-        if user_context:
-            context_additions = []
-            
-            if user_context.get("preferred_teams"):
-                context_additions.append(f"User's favorite teams: {', '.join(user_context['preferred_teams'])}")
-            
-            if user_context.get("timezone"):
-                context_additions.append(f"User timezone: {user_context['timezone']}")
-            
-            if user_context.get("is_authenticated"):
-                context_additions.append("User is authenticated and can place bets")
-            
-            if context_additions:
-                base_prompt += f"\n\nUSER CONTEXT:\n" + "\n".join(context_additions)
-        
-        return base_prompt
+        return build_system_prompt(user_context)
     
     def _update_performance_metrics(self, response_time_ms: float, token_count: int):
         """Update performance tracking metrics."""
@@ -864,6 +925,82 @@ Remember: You're helping users make informed betting decisions, not just providi
             / self._total_requests
         )
     
+    def _record_prompt_tokens(self, messages: List[BaseMessage]):
+        """Log and track the estimated prompt size of a turn."""
+        prompt_tokens = estimate_messages_tokens(messages)
+        self._total_prompt_tokens += prompt_tokens
+        self._prompt_count += 1
+        logger.info(f"Prompt size: ~{prompt_tokens} tokens across {len(messages)} messages")
+    
+    def _record_usage(self, message: Any, grant: Optional[SchedulerGrant] = None):
+        """Track provider-reported input tokens and how many were served from cache."""
+        usage = getattr(message, "usage_metadata", None)
+        if not usage:
+            return
+        self._input_tokens += usage.get("input_tokens", 0) or 0
+        self._cached_input_tokens += (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+        if grant is not None and usage.get("total_tokens"):
+            grant.actual_tokens = (grant.actual_tokens or 0) + usage["total_tokens"]
+    
+    @staticmethod
+    def _user_key(user_context: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Fairness key for the scheduler: the user if known, else the session."""
+        context = user_context or {}
+        conversation_context = context.get("conversation_context") or {}
+        return (
+            conversation_context.get("user_id")
+            or context.get("user_id")
+            or conversation_context.get("session_id")
+            or context.get("session_id")
+        )
+    
+    @staticmethod
+    def _estimate_call_tokens(llm_input: Any) -> int:
+        """Estimate the tokens a call will consume, including the reply."""
+        if isinstance(llm_input, list):
+            prompt_tokens = estimate_messages_tokens(llm_input)
+        elif isinstance(llm_input, dict) and "message" in llm_input:
+            prompt_tokens = estimate_tokens(INTENT_SYSTEM_PROMPT) + estimate_tokens(str(llm_input["message"]))
+        else:
+            prompt_tokens = estimate_tokens(str(llm_input))
+        return prompt_tokens + settings.llm_max_output_tokens_estimate
+    
+    async def _invoke_llm(
+        self,
+        runnable: Any,
+        llm_input: Any,
+        user_key: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        route: Optional[LLMRoute] = None
+    ) -> Any:
+        """Run a provider call through the global scheduler."""
+        started = time.perf_counter()
+        deadline.check_deadline("LLM call")
+        try:
+            async with self.scheduler.slot(user_key, priority, self._estimate_call_tokens(llm_input)) as grant:
+                result = await asyncio.wait_for(runnable.ainvoke(llm_input), deadline.remaining())
+                self._record_usage(result, grant)
+                if route is not None:
+                    self.router.record_usage(route, result)
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError(
+                "LLM call ran past the turn deadline",
+                error_code="deadline_exceeded",
+                status_code=504
+            )
+        except asyncio.CancelledError:
+            # The client went away; count the provider time we didn't spend
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._cancelled_calls += 1
+            if self._completed_calls:
+                avg_call_ms = self._llm_call_time_ms / self._completed_calls
+                self._llm_time_saved_ms += max(avg_call_ms - elapsed_ms, 0.0)
+            raise
+        
+        self._completed_calls += 1
+        self._llm_call_time_ms += (time.perf_counter() - started) * 1000
+        return result
+    
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get LLM performance statistics."""
         return {
@@ -873,14 +1010,36 @@ Remember: You're helping users make informed betting decisions, not just providi
             "average_tokens_per_request": (
                 round(self._total_tokens / self._total_requests, 2) 
                 if self._total_requests > 0 else 0
-            )
+            ),
+            "average_prompt_tokens": (
+                round(self._total_prompt_tokens / self._prompt_count, 2)
+                if self._prompt_count > 0 else 0
+            ),
+            "input_tokens": self._input_tokens,
+            "cached_input_tokens": self._cached_input_tokens,
+            "cached_token_ratio_percent": (
+                round(self._cached_input_tokens / self._input_tokens * 100, 2)
+                if self._input_tokens > 0 else 0
+            ),
+            "cancelled_llm_calls": self._cancelled_calls,
+            "llm_time_saved_ms": round(self._llm_time_saved_ms, 2),
+            "deadline_degradations": dict(self._deadline_degradations),
+            "system_prompt": get_prompt_cache_stats(),
+            "scheduler": self.scheduler.get_stats(),
+            "token_budget": self.token_budgeter.get_stats(),
+            "response_cache": self.response_cache.get_stats(),
+            "semantic_cache": self.semantic_cache.get_stats(),
+            "tournament_resolver": self.tournament_resolver.get_stats(),
+            "tool_planner": self.tool_planner.get_stats(),
+            "prefetch": self.prefetcher.get_stats(),
+            "tool_memo": self.tool_memo.get_stats(),
+            "routes": self.router.get_stats()
         }
     
     async def cleanup(self):
         """Cleanup resources."""
         # Note: API client cleanup is handled by the get_api_client() function
-        # No resources to cleanup in LLM service itself
-        pass
+        await self.prefetcher.shutdown()
 
 
 # Global LLM service instance
@@ -0,0 +1,221 @@
+"""
+Speculative data prefetch from conversation context.
+
+Follow-up questions are predictable: after "when does Barcelona play?"
+the next turn is very likely "what are the odds?". Without a prefetch,
+that follow-up waits on the same upstream fixture search again and then
+on the odds call.
+
+After each turn, the prefetcher looks at the most recently mentioned
+teams and, in the background, fetches their upcoming matches and the
+odds of the next one. Results are kept for a short, per-tool TTL, and
+the tool planner and the model's own tool calls check here before going
+upstream. Work is bounded per turn (teams, time) and globally
+(concurrent upstream calls), and runs without the turn's deadline so
+the user never waits on it.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from cachetools import TLRUCache
+
+from ..core import deadline
+from ..core.config import settings
+from ..core.deadline import no_deadline
+from ..core.logging import get_logger
+from ..models.conversation import Conversation
+from .tool_planner import canonical_tool_key, first_fixture
+
+logger = get_logger(__name__)
+
+
+class _Prefetched:
+    """One prefetched tool result."""
+
+    __slots__ = ("result", "ttl", "used")
+
+    def __init__(self, result: Any, ttl: float):
+        self.result = result
+        self.ttl = ttl
+        self.used = False
+
+
+class DataPrefetcher:
+    """
+    Warm tool results for entities the conversation keeps coming back to.
+
+    Lookups that find a fresh entry (or an in-flight prefetch for the same
+    call) count as hits; everything else is a miss.
+    """
+
+    def __init__(
+        self,
+        tools: Sequence[Any],
+        max_teams: Optional[int] = None,
+        budget_seconds: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        max_entries: Optional[int] = None
+    ):
+        self.tools: Dict[str, Any] = {tool.name: tool for tool in tools}
+        self.max_teams = max_teams or settings.prefetch_max_teams
+        self.budget_seconds = budget_seconds or settings.prefetch_budget_seconds
+
+        self._entries: TLRUCache = TLRUCache(
+            maxsize=max_entries or settings.prefetch_max_entries,
+            ttu=lambda key, entry, now: now + entry.ttl
+        )
+        self._fetching: Dict[str, asyncio.Task] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency or settings.prefetch_max_concurrency)
+        self._in_flight: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Performance tracking
+        self._prefetches = 0
+        self._prefetch_failures = 0
+        self._budget_exhausted = 0
+        self._used = 0
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def ttl_for(tool_name: str) -> float:
+        """How long a prefetched result stays usable."""
+        if tool_name == "get_odds":
+            return min(settings.cache_ttl_odds, settings.prefetch_ttl_seconds)
+        return settings.prefetch_ttl_seconds
+
+    def _key(self, tool_name: str, args: Optional[Dict[str, Any]]) -> Optional[str]:
+        tool = self.tools.get(tool_name)
+        return canonical_tool_key(tool, args) if tool is not None else None
+
+    async def lookup(self, tool_name: str, args: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Prefetched result for a tool call, None if it has to go upstream."""
+        key = self._key(tool_name, args)
+        if key is None:
+            return None
+
+        entry = self._entries.get(key)
+        fetching = self._fetching.get(key)
+        if entry is None and fetching is not None:
+            # Already on its way; waiting beats asking upstream twice
+            await asyncio.wait({fetching}, timeout=deadline.clamp_timeout(None))
+            entry = self._entries.get(key)
+
+        if entry is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        if not entry.used:
+            entry.used = True
+            self._used += 1
+        return entry.result
+
+    def maybe_schedule(self, conversation: Conversation) -> Optional[asyncio.Task]:
+        """Start a background prefetch for the most recently mentioned teams."""
+        if not settings.prefetch_enabled or "search_team_matches" not in self.tools:
+            return None
+        if conversation.id in self._in_flight:
+            return None
+
+        teams = [
+            team for team in reversed(conversation.context.mentioned_teams[-self.max_teams:])
+            if self._key("search_team_matches", {"team_name": team}) not in self._entries
+        ]
+        if not teams:
+            return None
+
+        self._in_flight.add(conversation.id)
+        task = asyncio.create_task(self._prefetch(conversation, teams))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _prefetch(self, conversation: Conversation, teams: List[str]):
+        started: List[asyncio.Task] = []
+        try:
+            # Tasks inherit the spawning turn's deadline; prefetches have their own budget
+            with no_deadline():
+                await asyncio.wait_for(
+                    asyncio.gather(*(self._prefetch_team(conversation, team, started) for team in teams)),
+                    self.budget_seconds
+                )
+        except asyncio.TimeoutError:
+            self._budget_exhausted += 1
+            for task in started:
+                task.cancel()
+            await asyncio.gather(*started, return_exceptions=True)
+            logger.debug(f"Prefetch budget exhausted for {conversation.id}")
+        except Exception as e:
+            logger.warning(f"Prefetch failed for {conversation.id}: {e}")
+        finally:
+            self._in_flight.discard(conversation.id)
+
+    async def _prefetch_team(self, conversation: Conversation, team: str, started: List[asyncio.Task]):
+        """Upcoming matches for a team, then the odds of its next one."""
+        matches = await self._fetch("search_team_matches", {"team_name": team}, started)
+        fixture = first_fixture(matches)
+        if not fixture or "get_odds" not in self.tools:
+            return
+        conversation.context.add_mentioned_match(str(fixture[0]))
+        await self._fetch("get_odds", {"fixture_id": fixture[0], "tournament_id": fixture[5]}, started)
+
+    async def _fetch(self, tool_name: str, args: Dict[str, Any], started: List[asyncio.Task]) -> Optional[Any]:
+        key = self._key(tool_name, args)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry.result
+
+        task = self._fetching.get(key)
+        if task is None:
+            task = asyncio.create_task(self._invoke(tool_name, args, key))
+            self._fetching[key] = task
+            task.add_done_callback(lambda _: self._fetching.pop(key, None))
+            started.append(task)
+
+        # Fetches are shared, so waiting must not cancel them (and vice versa)
+        await asyncio.wait({task})
+        return None if task.cancelled() else task.result()
+
+    async def _invoke(self, tool_name: str, args: Dict[str, Any], key: str) -> Optional[Any]:
+        async with self._semaphore:
+            try:
+                result = await self.tools[tool_name].ainvoke(args)
+            except Exception as e:
+                self._prefetch_failures += 1
+                logger.debug(f"Prefetch of {tool_name} failed: {e}")
+                return None
+
+        # Error payloads are not worth keeping; the real turn will retry
+        if isinstance(result, list) and result and isinstance(result[0], dict) and result[0].get("status") == "error":
+            self._prefetch_failures += 1
+            return None
+
+        self._entries[key] = _Prefetched(result, self.ttl_for(tool_name))
+        self._prefetches += 1
+        return result
+
+    async def shutdown(self):
+        """Cancel background prefetches."""
+        for task in list(self._tasks) + list(self._fetching.values()):
+            task.cancel()
+        pending = list(self._tasks) + list(self._fetching.values())
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get prefetch statistics."""
+        lookups = self._hits + self._misses
+        return {
+            "enabled": settings.prefetch_enabled,
+            "prefetches": self._prefetches,
+            "prefetch_failures": self._prefetch_failures,
+            "budget_exhausted": self._budget_exhausted,
+            "entries": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate_percent": round(self._hits / lookups * 100, 2) if lookups > 0 else 0,
+            "used_percent": round(self._used / self._prefetches * 100, 2) if self._prefetches > 0 else 0,
+        }
@@ -0,0 +1,201 @@
+"""
+Exact-match cache for generated LLM responses.
+
+A lot of turns are context-free and repeat constantly ("what matches are
+today?", "help", "hi"). Each of those used to cost a full Gemini generation.
+This cache remembers answers keyed by everything that can change them:
+
+- the normalized user message
+- the classified intent
+- the conversation history actually sent to the model
+- the prompt-relevant user context
+- a stamp of the fixture/odds data the answer is built on
+
+Because the data stamp is part of the key, answers built on stale
+fixtures or odds simply stop matching once that data changes. Answers
+that use no upstream data (greetings, help) carry an empty stamp, so odds
+moving somewhere never touches them; the TTL bounds everything else.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..models.conversation import IntentType
+from ..utils.cache import TieredCache
+
+logger = get_logger(__name__)
+
+
+# Intents whose answers depend on private account state
+NON_CACHEABLE_INTENTS = {
+    IntentType.USER_BALANCE_QUERY,
+    IntentType.BET_SIMULATION,
+    IntentType.BET_HISTORY_QUERY,
+    IntentType.UNCLEAR,
+}
+
+# Intents answered without upstream data
+DATA_FREE_INTENTS = {
+    IntentType.GREETING,
+    IntentType.HELP_REQUEST,
+    IntentType.GENERAL_BETTING_INFO,
+}
+
+# Intents answered from fixtures alone; any other intent may use odds too
+FIXTURE_INTENTS = {
+    IntentType.MATCH_SCHEDULE_QUERY,
+    IntentType.MATCH_INQUIRY,
+    IntentType.TEAM_SCHEDULE_QUERY,
+    IntentType.TOURNAMENT_INFO_QUERY,
+    IntentType.TOURNAMENT_INFO,
+}
+
+# User context keys that end up in the system prompt
+PROMPT_CONTEXT_KEYS = ("preferred_teams", "timezone", "is_authenticated", "query_type")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION_RE = re.compile(r"[\s?!.¡¿,;:]+$")
+
+
+def normalize_message(message: str) -> str:
+    """Normalize a user message so trivial variations share a cache key."""
+    normalized = _WHITESPACE_RE.sub(" ", message.strip().lower())
+    return _TRAILING_PUNCTUATION_RE.sub("", normalized)
+
+
+def is_cacheable_intent(intent: Optional[Any]) -> bool:
+    """Check whether answers for this intent are safe to share."""
+    if intent is None:
+        return False
+    try:
+        return IntentType(intent) not in NON_CACHEABLE_INTENTS
+    except ValueError:
+        return False
+
+
+def data_dependencies(intent: Optional[Any]) -> Tuple[str, ...]:
+    """Kinds of upstream data answers for an intent are built on."""
+    try:
+        intent = IntentType(intent)
+    except ValueError:
+        return ("fixtures", "odds")
+    if intent in DATA_FREE_INTENTS:
+        return ()
+    if intent in FIXTURE_INTENTS:
+        return ("fixtures",)
+    return ("fixtures", "odds")
+
+
+def data_stamp(
+    intent: Optional[Any],
+    planned_tool_results: Optional[List[Dict[str, Any]]],
+    data_versions: Dict[str, int]
+) -> str:
+    """
+    Version of the data an answer is built on, for cache keys.
+
+    With planned tool results the model sees exactly that data, so the
+    stamp is a digest of it. Otherwise the model fetches what it needs, and
+    the stamp is the version of each kind of data the intent depends on.
+    """
+    dependencies = data_dependencies(intent)
+    if not dependencies:
+        return ""
+    if planned_tool_results:
+        return "p" + hashlib.blake2b(
+            json.dumps(planned_tool_results, sort_keys=True, default=str).encode(), digest_size=8
+        ).hexdigest()
+    return "".join(f"{kind[0]}{data_versions.get(kind, 0)}" for kind in dependencies)
+
+
+def prompt_context(user_context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Extract the user context values that actually reach the prompt."""
+    context = user_context or {}
+    values = {k: context.get(k) for k in PROMPT_CONTEXT_KEYS if context.get(k) is not None}
+    # The rolling summary stands in for older turns, so it's part of the prompt too
+    summary = (context.get("conversation_context") or {}).get("summary")
+    if summary:
+        values["conversation_summary"] = summary
+    return values
+
+
+def prompt_context_fingerprint(user_context: Optional[Dict[str, Any]]) -> str:
+    """Short stable digest of the prompt-relevant user context."""
+    return hashlib.sha256(
+        json.dumps(prompt_context(user_context), sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+
+
+class LLMResponseCache:
+    """
+    Response cache backed by the tiered (local + Redis) cache.
+
+    Entries keyed on old data are never hit again and age out with the
+    TTL and the LRU bound.
+    """
+
+    def __init__(self, cache: Optional[TieredCache] = None):
+        self.cache = cache or TieredCache(
+            namespace="llm_responses",
+            maxsize=settings.llm_response_cache_size,
+            ttl=settings.cache_ttl_llm_responses
+        )
+
+        # Performance tracking
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+
+    def build_key(
+        self,
+        user_message: str,
+        intent: Optional[Any],
+        history: Sequence[BaseMessage],
+        user_context: Optional[Dict[str, Any]],
+        data_stamp: str
+    ) -> str:
+        """Build a stable cache key for a generation request."""
+        key_material = {
+            "message": normalize_message(user_message),
+            "intent": str(IntentType(intent).value) if intent else None,
+            "history": [(message.type, message.content) for message in history],
+            "context": prompt_context(user_context),
+        }
+        digest = hashlib.sha256(
+            json.dumps(key_material, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f"v{data_stamp}:{digest}"
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get cached response for a key."""
+        value = await self.cache.get(key)
+        if isinstance(value, str):
+            self._hits += 1
+            return value
+
+        self._misses += 1
+        return None
+
+    async def set(self, key: str, response: str):
+        """Store a generated response."""
+        await self.cache.set(key, response)
+        self._stores += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get response cache statistics."""
+        total_requests = self._hits + self._misses
+        hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
+
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "stores": self._stores,
+            "hit_rate_percent": round(hit_rate, 2),
+            "tiers": self.cache.get_stats()
+        }
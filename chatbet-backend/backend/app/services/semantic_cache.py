@@ -0,0 +1,307 @@
+"""
+Near-duplicate response cache using local MinHash/LSH similarity.
+
+The exact-match cache only helps when users type the same thing twice.
+In practice the same schedule question comes in dozens of phrasings
+("who plays today", "today's games?", "matches today"). This module
+catches those without any network call or embedding model:
+
+1. Questions are canonicalized (stopwords dropped, domain synonyms folded)
+2. Character shingles of the canonical form are MinHashed
+3. Signatures are banded into an LSH index for sub-linear candidate lookup
+4. Candidates above a Jaccard threshold reuse the stored answer
+
+Only context-free turns (no conversation history) are eligible, and the
+index is partitioned by intent, data version and "guard" tokens, so
+near-identical strings that mean different things never share an answer:
+
+- dates and numbers ("today"/"tomorrow", "2.5"/"3.5")
+- market and side words ("over"/"under", "home win"/"away win")
+- the teams mentioned ("Manchester United"/"Manchester City")
+"""
+
+import hashlib
+import re
+import struct
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..services.response_cache import normalize_message
+from ..utils.parsers import get_entity_extractor
+
+logger = get_logger(__name__)
+
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9áéíóúñü]+")
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "be", "there", "any", "what", "which",
+    "who", "whats", "for", "me", "show", "tell", "please", "of", "on", "in",
+    "at", "to", "do", "does", "can", "you", "i", "give", "list", "get", "s",
+    "some", "all", "about", "going", "will", "have", "has", "playing",
+}
+
+SYNONYMS = {
+    "games": "match", "game": "match", "matches": "match", "fixtures": "match",
+    "fixture": "match", "plays": "match", "play": "match", "schedule": "match",
+    "lineup": "match", "partidos": "match", "partido": "match",
+    "todays": "today", "hoy": "today", "tonight": "today",
+    "tomorrows": "tomorrow", "manana": "tomorrow", "mañana": "tomorrow",
+    "price": "odds", "prices": "odds", "odd": "odds", "lines": "odds",
+    "hello": "hi", "hey": "hi", "hola": "hi",
+    "tie": "draw", "empate": "draw", "wins": "win", "winner": "win", "victory": "win",
+    "loses": "lose", "loss": "lose", "local": "home", "visitor": "away", "visiting": "away",
+}
+
+# Tokens that change the meaning of an otherwise similar question
+GUARD_TOKENS = {
+    # When
+    "today", "tomorrow", "yesterday", "weekend", "week", "month", "live", "now",
+    # Which market or side ("over 2.5" and "under 2.5" differ by one word)
+    "over", "under", "home", "away", "draw", "win", "lose", "btts", "handicap",
+    "first", "second", "half", "not", "no",
+}
+
+
+def canonicalize(message: str) -> Tuple[str, str]:
+    """
+    Reduce a question to its canonical form.
+
+    Returns the canonical text used for shingling and a guard string
+    that must match exactly for two questions to be considered duplicates.
+    """
+    normalized = normalize_message(message).replace("'", "").replace("’", "")
+    tokens = _TOKEN_RE.findall(normalized)
+    canonical_tokens: Set[str] = set()
+    # Team names differ by a word or two but never share an answer
+    guards: Set[str] = {name for name, _ in get_entity_extractor().extract_known_teams(normalized)}
+
+    for token in tokens:
+        token = SYNONYMS.get(token, token)
+        if token in STOPWORDS:
+            continue
+        canonical_tokens.add(token)
+        if token in GUARD_TOKENS or token.isdigit():
+            guards.add(token)
+
+    # Sorting makes the form insensitive to word order
+    return " ".join(sorted(canonical_tokens)), ",".join(sorted(guards))
+
+
+def shingles(text: str, k: int = 3) -> Set[str]:
+    """Character k-shingles of a text, padded so short words still count."""
+    padded = f" {text} "
+    if len(padded) <= k:
+        return {padded}
+    return {padded[i:i + k] for i in range(len(padded) - k + 1)}
+
+
+class MinHasher:
+    """
+    MinHash signatures with universal hashing.
+
+    Coefficients are derived from a fixed seed, so signatures are stable
+    across processes and restarts.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        self.num_perm = num_perm
+        coefficients = []
+        for i in range(num_perm):
+            digest = hashlib.blake2b(f"{seed}:{i}".encode(), digest_size=16).digest()
+            a, b = struct.unpack("<QQ", digest)
+            coefficients.append((a % (_MERSENNE_PRIME - 1) + 1, b % _MERSENNE_PRIME))
+        self._coefficients = coefficients
+
+    @staticmethod
+    def _base_hash(shingle: str) -> int:
+        return struct.unpack("<I", hashlib.blake2b(shingle.encode(), digest_size=4).digest())[0]
+
+    def signature(self, shingle_set: Set[str]) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a shingle set."""
+        base_hashes = [self._base_hash(s) for s in shingle_set]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in base_hashes)
+            for a, b in self._coefficients
+        )
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        matches = sum(1 for x, y in zip(sig_a, sig_b) if x == y)
+        return matches / len(sig_a)
+
+
+@dataclass
+class SemanticCacheEntry:
+    """A cached question/answer pair."""
+    partition: str
+    question: str
+    answer: str
+    signature: Tuple[int, ...]
+    created_at: float
+
+
+class SemanticResponseCache:
+    """
+    Bounded LSH index over recent context-free questions and answers.
+
+    Memory is capped by `max_entries`; the oldest entries are evicted
+    first (and also expire after `ttl` seconds).
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        num_perm: int = 64,
+        bands: int = 16,
+        max_entries: int = 2000,
+        ttl: int = 300
+    ):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hasher = MinHasher(num_perm=num_perm)
+
+        self._entries: "OrderedDict[int, SemanticCacheEntry]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[int]] = {}
+        self._next_id = 0
+
+        # Performance tracking
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _band_keys(self, partition: str, signature: Tuple[int, ...]) -> List[Tuple[str, int, Tuple[int, ...]]]:
+        return [
+            (partition, band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def _remove(self, entry_id: int):
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for key in self._band_keys(entry.partition, entry.signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def _expire(self):
+        """Evict expired entries from the head (oldest first)."""
+        cutoff = time.monotonic() - self.ttl
+        while self._entries:
+            entry_id, entry = next(iter(self._entries.items()))
+            if entry.created_at >= cutoff:
+                break
+            self._remove(entry_id)
+
+    @staticmethod
+    def _partition(intent: Any, data_version: Any, guards: str) -> str:
+        return f"{intent}|{data_version}|{guards}"
+
+    def lookup(self, question: str, intent: Any, data_version: Any) -> Optional[Tuple[str, float]]:
+        """
+        Find a cached answer for a near-duplicate question.
+
+        Returns (answer, similarity) or None when nothing is similar enough.
+        """
+        self._expire()
+
+        canonical, guards = canonicalize(question)
+        if not canonical:
+            self._misses += 1
+            return None
+
+        partition = self._partition(intent, data_version, guards)
+        signature = self.hasher.signature(shingles(canonical))
+
+        candidates: Set[int] = set()
+        for key in self._band_keys(partition, signature):
+            candidates.update(self._buckets.get(key, ()))
+
+        best: Optional[Tuple[str, float]] = None
+        for entry_id in candidates:
+            entry = self._entries[entry_id]
+            similarity = MinHasher.similarity(signature, entry.signature)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (entry.answer, similarity)
+
+        if best is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        logger.debug(f"Semantic cache hit (similarity {best[1]:.2f}) for '{question[:50]}'")
+        return best
+
+    def add(self, question: str, answer: str, intent: Any, data_version: Any):
+        """Index a context-free question and its answer."""
+        canonical, guards = canonicalize(question)
+        if not canonical:
+            return
+
+        partition = self._partition(intent, data_version, guards)
+        signature = self.hasher.signature(shingles(canonical))
+
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = SemanticCacheEntry(
+            partition=partition,
+            question=question,
+            answer=answer,
+            signature=signature,
+            created_at=time.monotonic()
+        )
+        for key in self._band_keys(partition, signature):
+            self._buckets.setdefault(key, set()).add(entry_id)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def clear(self):
+        """Drop every indexed entry."""
+        self._entries.clear()
+        self._buckets.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get semantic cache statistics."""
+        total_requests = self._hits + self._misses
+        hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
+
+        return {
+            "entries": len(self._entries),
+            "buckets": len(self._buckets),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate_percent": round(hit_rate, 2)
+        }
+
+
+def create_semantic_cache() -> SemanticResponseCache:
+    """Create a semantic cache from application settings."""
+    return SemanticResponseCache(
+        threshold=settings.semantic_cache_threshold,
+        num_perm=settings.semantic_cache_num_perm,
+        bands=settings.semantic_cache_bands,
+        max_entries=settings.semantic_cache_max_entries,
+        ttl=settings.cache_ttl_llm_responses
+    )
@@ -0,0 +1,278 @@
+"""
+Bounded in-process session store.
+
+`ConversationManager` used to keep every `Conversation` and its
+`InMemoryChatMessageHistory` in two plain dicts that only shrank when a
+client explicitly cleared a conversation. Anonymous WebSocket and HTTP
+sessions never do, so each one leaked for the life of the process.
+
+Sessions now live in one insertion-ordered map that is kept in
+last-access order:
+
+- LRU eviction once `max_entries` or the approximate `max_bytes` is hit
+- idle expiry after `settings.conversation_timeout`
+
+Every session has the same idle timeout, so the least recently used
+session is also the next one to expire. The head of the map is the
+expiry queue: expiring is popping from the head until it's fresh, with
+no scans and no separate timer structure.
+
+A session's LangChain history is a view over its conversation's
+message log, so each message's content is held once.
+
+An index of session ids per user is kept alongside, so listing or
+clearing one user's conversations touches only their sessions.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..models.conversation import ChatMessage, Conversation, MessageRole
+
+logger = get_logger(__name__)
+
+# Rough cost of a conversation and its context, before any messages
+BASE_SESSION_BYTES = 4096
+
+EvictionCallback = Callable[[str, "SessionEntry", str], None]
+
+_HISTORY_ROLES = {"human": MessageRole.USER, "ai": MessageRole.ASSISTANT, "system": MessageRole.SYSTEM}
+
+
+class ConversationHistory(BaseChatMessageHistory):
+    """LangChain chat history read from and written to a conversation's message log."""
+
+    def __init__(self, conversation: Conversation):
+        self.conversation = conversation
+
+    @property
+    def messages(self) -> List[BaseMessage]:  # type: ignore[override]
+        return list(self.conversation.messages.to_langchain())
+
+    def add_message(self, message: BaseMessage) -> None:
+        role = _HISTORY_ROLES.get(message.type)
+        if role is None:
+            raise ValueError(f"Unsupported message type for conversation history: {message.type}")
+        self.conversation.add_message(ChatMessage(role=role, content=str(message.content)))
+
+    def clear(self) -> None:
+        self.conversation.messages.clear()
+
+
+class SessionEntry:
+    """A conversation and its bookkeeping."""
+
+    __slots__ = ("conversation", "last_access", "size_bytes")
+
+    def __init__(self, conversation: Conversation, now: float):
+        self.conversation = conversation
+        self.last_access = now
+        self.size_bytes = BASE_SESSION_BYTES
+
+    @property
+    def history(self) -> ConversationHistory:
+        """LangChain view of the conversation; nothing is copied."""
+        return ConversationHistory(self.conversation)
+
+    def measure(self) -> int:
+        """Current approximate size; the message log keeps its own running total."""
+        self.size_bytes = BASE_SESSION_BYTES + self.conversation.messages.memory_bytes
+        return self.size_bytes
+
+
+class SessionStore:
+    """
+    Conversations with LRU eviction, a byte cap and idle expiry.
+
+    `on_evict(session_id, entry, reason)` is called for every session that
+    leaves the store other than through `pop`, with reason "expired",
+    "max_entries" or "max_bytes".
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries or settings.session_store_max_entries
+        self.max_bytes = max_bytes or settings.session_store_max_bytes
+        self.idle_timeout = idle_timeout or settings.conversation_timeout
+        self._clock = clock
+        self._entries: "OrderedDict[str, SessionEntry]" = OrderedDict()
+        self._bytes = 0
+        self._listeners: List[EvictionCallback] = []
+        # user_id -> ids of that user's stored sessions
+        self._by_user: Dict[str, Set[str]] = {}
+
+        # Performance tracking
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evicted: Dict[str, int] = {"max_entries": 0, "max_bytes": 0}
+
+    def on_evict(self, callback: EvictionCallback):
+        """Register a callback for sessions dropped by eviction or expiry."""
+        self._listeners.append(callback)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, session_id: str) -> bool:
+        self.expire()
+        return session_id in self._entries
+
+    def get(self, session_id: str) -> Optional[SessionEntry]:
+        """Entry for a session, marking it as recently used."""
+        now = self._clock()
+        self.expire(now)
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        entry.last_access = now
+        self._entries.move_to_end(session_id)
+        return entry
+
+    def peek(self, session_id: str) -> Optional[SessionEntry]:
+        """Entry for a session without touching its recency."""
+        return self._entries.get(session_id)
+
+    def put(self, session_id: str, conversation: Conversation) -> SessionEntry:
+        """Store a session as the most recently used one."""
+        now = self._clock()
+        self.expire(now)
+        self.pop(session_id)
+
+        entry = SessionEntry(conversation, now)
+        self._entries[session_id] = entry
+        self._bytes += entry.measure()
+        user_id = conversation.context.user_id
+        if user_id:
+            self._by_user.setdefault(user_id, set()).add(session_id)
+        self._enforce_limits(keep=session_id)
+        return entry
+
+    def touch(self, session_id: str):
+        """Re-measure a session after it grew, evicting others if over budget."""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return
+        before = entry.size_bytes
+        self._bytes += entry.measure() - before
+        entry.last_access = self._clock()
+        self._entries.move_to_end(session_id)
+        self._enforce_limits(keep=session_id)
+
+    def pop(self, session_id: str) -> Optional[SessionEntry]:
+        """Remove a session explicitly (no eviction callbacks)."""
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self._bytes -= entry.size_bytes
+            self._unindex(session_id, entry.conversation.context.user_id)
+        return entry
+
+    def _unindex(self, session_id: str, user_id: Optional[str]):
+        sessions = self._by_user.get(user_id) if user_id else None
+        if sessions is not None:
+            sessions.discard(session_id)
+            if not sessions:
+                del self._by_user[user_id]
+
+    def clear(self):
+        """Drop every session."""
+        self._entries.clear()
+        self._by_user.clear()
+        self._bytes = 0
+
+    def sessions_for(self, user_id: str) -> List[str]:
+        """Ids of a user's stored sessions, most recently used first."""
+        entries = self._entries
+        sessions = [session_id for session_id in self._by_user.get(user_id, ()) if session_id in entries]
+        return sorted(sessions, key=lambda session_id: entries[session_id].last_access, reverse=True)
+
+    def items(self) -> Iterator[Tuple[str, SessionEntry]]:
+        """Snapshot of (session_id, entry) pairs, least recently used first."""
+        return iter(list(self._entries.items()))
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop sessions idle for longer than the timeout; O(1) per expired session."""
+        now = self._clock() if now is None else now
+        cutoff = now - self.idle_timeout
+        expired = 0
+        while self._entries:
+            session_id, entry = next(iter(self._entries.items()))
+            if entry.last_access > cutoff:
+                break
+            self._drop(session_id, "expired")
+            expired += 1
+        return expired
+
+    def _enforce_limits(self, keep: Optional[str] = None):
+        while len(self._entries) > self.max_entries:
+            if not self._evict_lru("max_entries", keep):
+                break
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            if not self._evict_lru("max_bytes", keep):
+                break
+
+    def _evict_lru(self, reason: str, keep: Optional[str]) -> bool:
+        for session_id in self._entries:
+            if session_id != keep:
+                self._drop(session_id, reason)
+                return True
+        return False
+
+    def _drop(self, session_id: str, reason: str):
+        entry = self.pop(session_id)
+        if entry is None:
+            return
+        if reason == "expired":
+            self._expired += 1
+        else:
+            self._evicted[reason] += 1
+        logger.debug(f"Session {session_id} dropped from store ({reason})")
+        for callback in self._listeners:
+            try:
+                callback(session_id, entry, reason)
+            except Exception as e:
+                logger.warning(f"Session eviction callback failed for {session_id}: {e}")
+
+    @property
+    def memory_usage_mb(self) -> float:
+        """Approximate memory held by stored sessions."""
+        return round(self._bytes / (1024 * 1024), 3)
+
+    def session_memory(self, session_id: str) -> Optional[Dict[str, int]]:
+        """Approximate memory of one session, None if it isn't stored."""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return None
+        messages = entry.conversation.messages
+        return {"session_bytes": BASE_SESSION_BYTES + messages.memory_bytes, **messages.memory_usage()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get session store statistics."""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "memory_usage_mb": self.memory_usage_mb,
+            "avg_session_bytes": self._bytes // len(self._entries) if self._entries else 0,
+            "indexed_users": len(self._by_user),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate_percent": round(self._hits / lookups * 100, 2) if lookups > 0 else 0,
+            "expired": self._expired,
+            "evicted": dict(self._evicted),
+        }
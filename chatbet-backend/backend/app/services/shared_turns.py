@@ -0,0 +1,168 @@
+"""
+Sharing of context-free turns across sessions.
+
+At kickoff many users open the chat with the same question ("what matches
+are today?"). Each of those sessions is brand new, so nothing in the
+answer depends on who asks, yet every one of them ran its own intent
+classification, tool calls and generation.
+
+A session's first turn is context-free: its prompt is only the message
+and the few context values a new session has (timezone, whether the user
+is authenticated). Such turns are keyed by
+
+- the normalized message
+- a digest of the context values that reach the system prompt
+- the fixture data version (the intent isn't known yet, so this is the
+  data any of them could use; odds move too often to key on and the
+  short window already bounds how old a shared answer can be)
+
+and turns with the same key share one classify-and-generate pipeline:
+
+- a turn whose twin is still in flight joins it instead of starting its own
+- a finished answer is handed out for a short window afterwards; once the
+  fixtures change, the key changes and nothing stale is reused
+- answers about private account state (balance, bets) are never handed
+  out; a turn that joined one runs its own pipeline after all
+
+Only the classification and the answer are shared; each session records
+its own messages, with its own copy of the result.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..models.conversation import ConversationContext, IntentType
+from ..utils.dedup import DedupRegistry
+from .prompts import USER_CONTEXT_KEYS, user_context_key
+from .response_cache import normalize_message
+
+logger = get_logger(__name__)
+
+# Intents whose answers depend on the asking user's account
+PERSONAL_INTENTS = {
+    IntentType.USER_BALANCE_QUERY,
+    IntentType.BET_SIMULATION,
+    IntentType.BET_HISTORY_QUERY,
+}
+
+
+def is_personal_intent(intent: Any) -> bool:
+    try:
+        return IntentType(intent) in PERSONAL_INTENTS
+    except ValueError:
+        return False
+
+
+def context_free_key(message: str, context: ConversationContext, fixtures_version: int) -> Tuple[str, str, int]:
+    """Key shared by identical first turns of new sessions."""
+    prompt_values = context.model_dump(include=set(USER_CONTEXT_KEYS))
+    return (normalize_message(message), user_context_key(prompt_values), fixtures_version)
+
+
+class _SharedTurn:
+    """An in-flight shared turn and how many callers wait for it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SharedTurnRegistry:
+    """
+    In-flight and just-finished context-free turns, by key.
+
+    The first caller of a key runs its own work; later callers get that
+    result while it is in flight or within `window_seconds` of finishing.
+    """
+
+    def __init__(self, window_seconds: Optional[float] = None):
+        self.window_seconds = (
+            settings.shared_turn_window_seconds if window_seconds is None else window_seconds
+        )
+        self._in_flight: Dict[Hashable, _SharedTurn] = {}
+        self._finished = DedupRegistry(self.window_seconds, settings.dedup_max_entries)
+
+        # Performance tracking
+        self._leaders = 0
+        self._joined = 0
+        self._reused = 0
+        self._not_shareable = 0
+
+    def is_shared(self, key: Hashable) -> bool:
+        """Whether a turn for `key` is in flight or just finished."""
+        return key in self._in_flight or key in self._finished
+
+    async def run(
+        self,
+        key: Hashable,
+        work: Callable[[], Awaitable[Any]],
+        shareable: Callable[[Any], bool] = lambda result: True
+    ) -> Tuple[Any, bool]:
+        """
+        Result for `key`, and whether it came from another caller's work.
+
+        A result that isn't `shareable` is never handed to another caller:
+        whoever joined it runs its own `work` instead.
+        """
+        shared = self._in_flight.get(key)
+        if shared is not None:
+            result = await self._wait(shared)
+            if shareable(result):
+                self._joined += 1
+                logger.debug("Context-free turn joined an identical in-flight turn")
+                return result, True
+            self._not_shareable += 1
+            return await work(), False
+
+        finished = self._finished.get(key)
+        if finished is not None:
+            self._reused += 1
+            logger.debug("Context-free turn answered from an identical finished turn")
+            return finished[0], True
+
+        task = asyncio.create_task(work())
+        entry = _SharedTurn(task)
+        self._in_flight[key] = entry
+        self._leaders += 1
+        task.add_done_callback(lambda done: self._on_done(key, entry, shareable))
+        return await self._wait(entry), False
+
+    async def _wait(self, entry: _SharedTurn) -> Any:
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.task)
+        except asyncio.CancelledError:
+            # Nobody is left to read the answer
+            if entry.waiters == 1 and not entry.task.done():
+                entry.task.cancel()
+            raise
+        finally:
+            entry.waiters -= 1
+
+    def _on_done(self, key: Hashable, entry: _SharedTurn, shareable: Callable[[Any], bool]):
+        if self._in_flight.get(key) is entry:
+            del self._in_flight[key]
+
+        task = entry.task
+        if task.cancelled() or task.exception() is not None or self.window_seconds <= 0:
+            return
+        if shareable(task.result()):
+            self._finished.put(key, (task.result(),))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get shared turn statistics."""
+        shared = self._joined + self._reused
+        total = self._leaders + shared
+        return {
+            "leaders": self._leaders,
+            "joined_in_flight": self._joined,
+            "reused_finished": self._reused,
+            "not_shareable": self._not_shareable,
+            "in_flight": len(self._in_flight),
+            "hit_rate_percent": round(shared / total * 100, 2) if total else 0,
+            "finished_registry": self._finished.get_stats(),
+        }
@@ -0,0 +1,136 @@
+"""
+Rolling conversation summarization.
+
+Prompts used to carry the last N raw messages, and assistant replies can be
+hundreds of tokens each. Long betting sessions sent bloated prompts and
+still forgot what the user said early on ("I only bet on La Liga").
+
+Turns older than a recent window are now folded into a compact running
+summary stored on `ConversationContext`. Summarization runs as a background
+task on the scheduler's low-priority lane, so it never adds latency to the
+user's turn, and the prompt uses the summary in place of the folded turns.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+from ..core.config import settings
+from ..core.deadline import no_deadline
+from ..core.logging import get_logger
+from ..models.conversation import Conversation, MessageRole
+from ..utils.exceptions import LLMBusyError
+
+logger = get_logger(__name__)
+
+
+class ConversationSummarizer:
+    """
+    Fold old turns of a conversation into `context.summary`.
+
+    A fold is scheduled once at least `trigger_messages` messages have
+    fallen out of the recent `window_messages`, or sooner if unsummarized
+    messages would otherwise fall out of the `history_messages` the prompt
+    carries verbatim; at most one fold per session runs at a time.
+    """
+
+    def __init__(
+        self,
+        llm_service: Any,
+        window_messages: Optional[int] = None,
+        trigger_messages: Optional[int] = None,
+        max_words: Optional[int] = None,
+        history_messages: Optional[int] = None
+    ):
+        self.llm_service = llm_service
+        # The prompt's history window, see ConversationManager._convert_to_langchain_messages
+        self.history_messages = history_messages or settings.max_conversation_history
+        self.window_messages = min(window_messages or settings.summary_window_messages, self.history_messages)
+        self.trigger_messages = trigger_messages or settings.summary_trigger_messages
+        self.max_words = max_words or settings.summary_max_words
+
+        self._in_flight: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Performance tracking
+        self._folds = 0
+        self._folded_messages = 0
+        self._failures = 0
+
+    def pending_messages(self, conversation: Conversation) -> int:
+        """Messages outside the recent window that are not summarized yet."""
+        foldable = len(conversation.messages) - self.window_messages
+        return max(0, foldable - conversation.context.summarized_message_count)
+
+    def maybe_schedule(self, conversation: Conversation) -> Optional[asyncio.Task]:
+        """Start a background fold if enough old turns accumulated."""
+        if not settings.summary_enabled:
+            return None
+        if conversation.id in self._in_flight:
+            return None
+        pending = self.pending_messages(conversation)
+        unsummarized = len(conversation.messages) - conversation.context.summarized_message_count
+        if pending == 0 or (pending < self.trigger_messages and unsummarized < self.history_messages):
+            return None
+
+        self._in_flight.add(conversation.id)
+        task = asyncio.create_task(self._fold(conversation))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _fold(self, conversation: Conversation):
+        context = conversation.context
+        start = context.summarized_message_count
+        end = len(conversation.messages) - self.window_messages
+
+        try:
+            turns = []
+            for message in conversation.messages[start:end]:
+                if message.role == MessageRole.USER:
+                    turns.append(f"User: {message.content}")
+                elif message.role == MessageRole.ASSISTANT:
+                    turns.append(f"Assistant: {message.content}")
+
+            # Tasks inherit the spawning turn's deadline; summaries have their own pace
+            with no_deadline():
+                summary = await self.llm_service.summarize_conversation(
+                    context.summary,
+                    turns,
+                    self.max_words,
+                    user_key=context.user_id or conversation.id
+                )
+            if not summary:
+                return
+
+            # Only move forward; a clear or a concurrent reset wins
+            if context.summarized_message_count == start:
+                context.summary = summary
+                context.summarized_message_count = end
+                conversation.messages.release_langchain(end)
+                self._folds += 1
+                self._folded_messages += end - start
+                logger.debug(f"Folded {end - start} messages into summary for {conversation.id}")
+
+        except LLMBusyError:
+            logger.debug(f"Summarization for {conversation.id} deferred, LLM is busy")
+        except Exception as e:
+            self._failures += 1
+            logger.warning(f"Summarization failed for {conversation.id}: {e}")
+        finally:
+            self._in_flight.discard(conversation.id)
+
+    async def shutdown(self):
+        """Cancel background folds."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get summarizer statistics."""
+        return {
+            "folds": self._folds,
+            "folded_messages": self._folded_messages,
+            "failures": self._failures,
+            "in_flight": len(self._in_flight)
+        }
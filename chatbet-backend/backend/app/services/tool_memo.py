@@ -0,0 +1,144 @@
+"""
+Per-session tool result memoization.
+
+Within one conversation the model keeps asking for the same data: it
+calls `get_tournaments()` on turn one and again on turn three, or
+`get_fixtures(tournament_id="La Liga")` on every follow-up about La Liga.
+Each of those went through the tool wrapper, `_retry_api_call` and the
+upstream API again.
+
+Results are now memoized per session, keyed by tool name and
+canonicalized arguments, with a TTL that depends on how fast the data
+goes stale (tournaments barely change, odds move by the second). Fresh
+results are also shown to the model as "already retrieved" data, so it
+can answer from them instead of requesting the tool again.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from cachetools import LRUCache, TLRUCache
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from .tool_planner import canonical_tool_key
+
+logger = get_logger(__name__)
+
+
+class _MemoEntry:
+    """One memoized tool result."""
+
+    __slots__ = ("tool_name", "args", "result", "ttl")
+
+    def __init__(self, tool_name: str, args: Dict[str, Any], result: Any, ttl: float):
+        self.tool_name = tool_name
+        self.args = args
+        self.result = result
+        self.ttl = ttl
+
+
+class SessionToolMemo:
+    """
+    Session-scoped memo of tool results with per-tool TTLs.
+
+    Sessions are kept in an LRU so abandoned conversations don't pile up.
+    """
+
+    def __init__(
+        self,
+        tools: Sequence[Any],
+        max_sessions: Optional[int] = None,
+        max_entries_per_session: Optional[int] = None
+    ):
+        self.tools: Dict[str, Any] = {tool.name: tool for tool in tools}
+        self.max_entries_per_session = max_entries_per_session or settings.tool_memo_max_entries_per_session
+        self._sessions: LRUCache = LRUCache(maxsize=max_sessions or settings.tool_memo_max_sessions)
+
+        # Performance tracking
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+
+    @staticmethod
+    def ttl_for(tool_name: str) -> float:
+        """How long a tool's result is reused within a session (0 disables memoization)."""
+        return settings.tool_memo_ttl_seconds.get(tool_name, 0)
+
+    def _key(self, tool_name: str, args: Optional[Dict[str, Any]]) -> Optional[str]:
+        tool = self.tools.get(tool_name)
+        return canonical_tool_key(tool, args) if tool is not None else None
+
+    def _session(self, session_id: str, create: bool = False) -> Optional[TLRUCache]:
+        entries = self._sessions.get(session_id)
+        if entries is None and create:
+            entries = TLRUCache(
+                maxsize=self.max_entries_per_session,
+                ttu=lambda key, entry, now: now + entry.ttl
+            )
+            self._sessions[session_id] = entries
+        return entries
+
+    def get(self, session_id: Optional[str], tool_name: str, args: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Memoized result for a tool call in this session, None if it has to run."""
+        if not settings.tool_memo_enabled or not session_id:
+            return None
+        key = self._key(tool_name, args)
+        entries = self._session(session_id)
+        entry = entries.get(key) if entries is not None and key is not None else None
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return entry.result
+
+    def put(self, session_id: Optional[str], tool_name: str, args: Optional[Dict[str, Any]], result: Any):
+        """Remember a successful tool result for this session."""
+        ttl = self.ttl_for(tool_name)
+        if not settings.tool_memo_enabled or not session_id or ttl <= 0:
+            return
+        # Error payloads are not worth repeating; the next call should retry
+        if isinstance(result, list) and result and isinstance(result[0], dict) and result[0].get("status") == "error":
+            return
+        key = self._key(tool_name, args)
+        if key is None:
+            return
+        self._session(session_id, create=True)[key] = _MemoEntry(tool_name, dict(args or {}), result, ttl)
+        self._stores += 1
+
+    def retrieved(
+        self,
+        session_id: Optional[str],
+        exclude: Iterable[Any] = ()
+    ) -> List[Dict[str, Any]]:
+        """
+        Fresh results of this session as tool results for the prompt.
+
+        `exclude` holds (tool_name, args) pairs already in the prompt.
+        """
+        if not settings.tool_memo_enabled or not session_id:
+            return []
+        entries = self._session(session_id)
+        if not entries:
+            return []
+        skip: Set[Optional[str]] = {self._key(name, args) for name, args in exclude}
+        return [
+            {"tool_name": entry.tool_name, "args": entry.args, "result": entry.result}
+            for key, entry in list(entries.items())
+            if key not in skip
+        ]
+
+    def clear(self, session_id: str):
+        """Forget a session's results."""
+        self._sessions.pop(session_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get memo statistics."""
+        lookups = self._hits + self._misses
+        return {
+            "enabled": settings.tool_memo_enabled,
+            "sessions": len(self._sessions),
+            "stores": self._stores,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate_percent": round(self._hits / lookups * 100, 2) if lookups > 0 else 0,
+        }
@@ -0,0 +1,348 @@
+"""
+Deterministic tool pre-dispatch.
+
+Once a turn is classified we usually already know which data it needs: a
+`MATCH_SCHEDULE_QUERY` about "Barcelona" means `search_team_matches`, an
+`ODDS_INFORMATION_QUERY` with a fixture means `get_odds`. Letting the
+model discover that costs a full round trip (tools bound, tool call
+returned, tools run, second generation).
+
+The planner maps intent + entities to tool calls and runs them before the
+answer is generated, so the answer is a single model call with the data
+already in context. Team names found by the local entity extractor are
+enough to start `search_team_matches` speculatively while the intent is
+still being classified; if the intent turns out not to need them, the
+speculative calls are cancelled and counted as wasted.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from ..core import deadline
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..models.conversation import IntentType
+
+if TYPE_CHECKING:
+    from .prefetcher import DataPrefetcher
+    from .tool_memo import SessionToolMemo
+
+logger = get_logger(__name__)
+
+
+SCHEDULE_INTENTS = {
+    IntentType.MATCH_SCHEDULE_QUERY,
+    IntentType.TEAM_SCHEDULE_QUERY,
+    IntentType.MATCH_INQUIRY,
+}
+ODDS_INTENTS = {
+    IntentType.ODDS_INFORMATION_QUERY,
+    IntentType.ODDS_COMPARISON,
+    IntentType.BETTING_RECOMMENDATION,
+    IntentType.MATCH_PREDICTION,
+}
+TOURNAMENT_INTENTS = {
+    IntentType.TOURNAMENT_INFO_QUERY,
+    IntentType.TOURNAMENT_INFO,
+}
+TEAM_INTENTS = SCHEDULE_INTENTS | ODDS_INTENTS | {IntentType.TEAM_COMPARISON}
+
+# Keys the intent classifier uses for entities we can plan on
+TEAM_ENTITY_KEYS = ("team_name", "team", "teams", "home_team", "away_team")
+TOURNAMENT_ENTITY_KEYS = ("tournament", "tournament_name", "league", "competition")
+
+# Local extractor matches below this confidence are guesses, not team names
+LOCAL_TEAM_MIN_CONFIDENCE = 0.9
+
+
+@dataclass(frozen=True)
+class PlannedCall:
+    """One tool invocation decided without asking the model."""
+    tool_name: str
+    args: Tuple[Tuple[str, Any], ...] = ()
+    # Follow up with get_odds for the first fixture this call returns
+    follow_odds: bool = False
+
+    @classmethod
+    def of(cls, tool_name: str, follow_odds: bool = False, **args: Any) -> "PlannedCall":
+        return cls(tool_name, tuple(sorted(args.items())), follow_odds)
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        return dict(self.args)
+
+
+@dataclass
+class PlanEntities:
+    """Entities the planner cares about, merged from classifier and local extractor."""
+    teams: List[str] = field(default_factory=list)
+    tournament: Optional[str] = None
+    tournament_id: Optional[str] = None
+    fixture_id: Optional[str] = None
+
+
+def canonical_tool_key(tool: Any, args: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Stable key for a tool invocation.
+    
+    Defaults are filled in from the tool schema and values are compared
+    case-insensitively, so `get_odds(fixture_id=777)` and
+    `get_odds(sport_id="1", fixture_id="777", amount=100)` share a key.
+    """
+    values = {name: spec.get("default") for name, spec in (getattr(tool, "args", None) or {}).items()}
+    values.update(args or {})
+
+    def normalize(value: Any) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return f"{float(value):g}"
+        return str(value).strip().lower()
+
+    normalized = {k: normalize(v) for k, v in values.items() if v is not None}
+    return f"{getattr(tool, 'name', tool)}:{json.dumps(normalized, sort_keys=True)}"
+
+
+def _as_names(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return _as_names(value.get("name"))
+    if isinstance(value, (list, tuple)):
+        return [name for item in value for name in _as_names(item)]
+    return []
+
+
+def local_team_names(local_entities: Optional[Dict[str, Any]]) -> List[str]:
+    """Confident team names from `EntityExtractor.extract_entities` output."""
+    teams = (local_entities or {}).get("teams") or []
+    return [
+        team["name"] for team in teams
+        if isinstance(team, dict) and team.get("name") and team.get("confidence", 0) >= LOCAL_TEAM_MIN_CONFIDENCE
+    ]
+
+
+def merge_entities(
+    classified: Optional[Dict[str, Any]],
+    local_entities: Optional[Dict[str, Any]] = None,
+    max_teams: Optional[int] = None
+) -> PlanEntities:
+    """Normalize classifier entities and add confident local team names."""
+    classified = classified or {}
+    max_teams = max_teams if max_teams is not None else settings.tool_planning_max_teams
+
+    teams: List[str] = []
+    for name in [n for key in TEAM_ENTITY_KEYS for n in _as_names(classified.get(key))] + local_team_names(local_entities):
+        # Team search is case-insensitive; lowercase so speculative calls match
+        name = name.strip().lower()
+        if name and name not in teams:
+            teams.append(name)
+
+    tournament = next((n for key in TOURNAMENT_ENTITY_KEYS for n in _as_names(classified.get(key))), None)
+    tournament_id = classified.get("tournament_id")
+    fixture_id = classified.get("fixture_id") or classified.get("match_id")
+    return PlanEntities(
+        teams=teams[:max_teams],
+        tournament=tournament,
+        tournament_id=str(tournament_id) if tournament_id else None,
+        fixture_id=str(fixture_id) if fixture_id else None
+    )
+
+
+def first_fixture(result: Any) -> Optional[List[Any]]:
+    """First fixture row of a projected fixture list (legend first, then rows)."""
+    if not isinstance(result, list):
+        return None
+    return next((row for row in result if isinstance(row, list) and len(row) >= 6 and row[0]), None)
+
+
+class ToolPlanner:
+    """
+    Map classified turns to tool calls and run them ahead of generation.
+
+    Results use the same shape as model-requested tool results, so the
+    token budgeter formats them identically.
+    """
+
+    def __init__(
+        self,
+        tools: Sequence[Any],
+        prefetcher: Optional["DataPrefetcher"] = None,
+        memo: Optional["SessionToolMemo"] = None
+    ):
+        self.tools: Dict[str, Any] = {tool.name: tool for tool in tools}
+        self.prefetcher = prefetcher
+        self.memo = memo
+
+        self._plans = 0
+        self._planned_calls = 0
+        self._speculative_calls = 0
+        self._speculative_hits = 0
+        self._speculative_wasted = 0
+        self._skipped_calls = 0
+        self._failed_calls = 0
+        self._single_call_answers = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.tool_planning_enabled
+
+    def plan(self, intent: Optional[Any], entities: PlanEntities) -> List[PlannedCall]:
+        """Tool calls needed to answer an intent, empty if the model should decide."""
+        try:
+            intent = IntentType(intent) if intent is not None else None
+        except ValueError:
+            return []
+
+        calls: List[PlannedCall] = []
+        if intent in ODDS_INTENTS and entities.fixture_id and entities.tournament_id:
+            calls.append(PlannedCall.of("get_odds", fixture_id=entities.fixture_id, tournament_id=entities.tournament_id))
+        elif intent in TEAM_INTENTS and entities.teams:
+            # Only the first team's next match is worth pricing
+            calls.extend(
+                PlannedCall.of("search_team_matches", follow_odds=(intent in ODDS_INTENTS and i == 0), team_name=team)
+                for i, team in enumerate(entities.teams)
+            )
+        elif intent in SCHEDULE_INTENTS:
+            tournament = entities.tournament_id or entities.tournament
+            calls.append(PlannedCall.of("get_fixtures", tournament_id=tournament) if tournament else PlannedCall.of("get_fixtures"))
+        elif intent in TOURNAMENT_INTENTS:
+            calls.append(PlannedCall.of("get_tournaments"))
+
+        return [call for call in calls if call.tool_name in self.tools]
+
+    def speculate(
+        self,
+        local_entities: Optional[Dict[str, Any]],
+        session_id: Optional[str] = None
+    ) -> Dict[PlannedCall, asyncio.Task]:
+        """
+        Start team searches from locally extracted names before classification.
+
+        Team searches are useful for every team-bearing intent, so they are
+        the only calls worth starting before the intent is known.
+        """
+        if not self.enabled or "search_team_matches" not in self.tools:
+            return {}
+        speculative = {}
+        for team in local_team_names(local_entities)[:settings.tool_planning_max_teams]:
+            call = PlannedCall.of("search_team_matches", team_name=team)
+            speculative[call] = asyncio.create_task(self._run(call, session_id))
+            self._speculative_calls += 1
+        return speculative
+
+    async def dispatch(
+        self,
+        intent: Optional[Any],
+        entities: PlanEntities,
+        speculative: Optional[Dict[PlannedCall, asyncio.Task]] = None,
+        session_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the plan for a classified turn, reusing speculative calls.
+
+        Returns tool results ready to go into the prompt; an empty list
+        means the model should pick its tools itself.
+        """
+        speculative = dict(speculative or {})
+        calls = self.plan(intent, entities) if self.enabled else []
+
+        tasks: List[Tuple[PlannedCall, asyncio.Task]] = []
+        for call in calls:
+            # follow_odds doesn't change the search itself
+            task = speculative.pop(PlannedCall(call.tool_name, call.args), None)
+            if task is not None:
+                self._speculative_hits += 1
+            else:
+                task = asyncio.create_task(self._run(call, session_id))
+            tasks.append((call, task))
+
+        for task in speculative.values():
+            task.cancel()
+            self._speculative_wasted += 1
+
+        if not tasks:
+            return []
+        self._plans += 1
+        self._planned_calls += len(tasks)
+
+        results = await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
+        tool_results = []
+        for (call, _), result in zip(tasks, results):
+            if isinstance(result, BaseException) or result is None:
+                continue
+            tool_results.append(self._tool_result(call, result, len(tool_results)))
+            if call.follow_odds:
+                fixture = first_fixture(result)
+                if fixture:
+                    odds_call = PlannedCall.of("get_odds", fixture_id=fixture[0], tournament_id=fixture[5])
+                    odds = await self._run(odds_call, session_id)
+                    self._planned_calls += 1
+                    if odds is not None:
+                        tool_results.append(self._tool_result(odds_call, odds, len(tool_results)))
+        return tool_results
+
+    async def _run(self, call: PlannedCall, session_id: Optional[str] = None) -> Optional[Any]:
+        """Planned tool result, reusing this session's earlier results when fresh."""
+        if self.memo is not None:
+            memoized = self.memo.get(session_id, call.tool_name, call.kwargs)
+            if memoized is not None:
+                return memoized
+
+        result = await self._fetch(call)
+        if result is not None and self.memo is not None:
+            self.memo.put(session_id, call.tool_name, call.kwargs, result)
+        return result
+
+    async def _fetch(self, call: PlannedCall) -> Optional[Any]:
+        """Invoke one planned tool within what the answer doesn't need of the turn."""
+        if self.prefetcher is not None:
+            prefetched = await self.prefetcher.lookup(call.tool_name, call.kwargs)
+            if prefetched is not None:
+                return prefetched
+
+        left = deadline.remaining()
+        budget = None if left is None else left - settings.deadline_answer_reserve_seconds
+        if budget is not None and budget <= 0:
+            self._skipped_calls += 1
+            return None
+        try:
+            return await asyncio.wait_for(self.tools[call.tool_name].ainvoke(call.kwargs), budget)
+        except asyncio.TimeoutError:
+            self._skipped_calls += 1
+            return None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Planned tool {call.tool_name} failed: {e}")
+            self._failed_calls += 1
+            return [{"status": "error", "message": str(e), "suggestion": "Please try again later"}]
+
+    @staticmethod
+    def _tool_result(call: PlannedCall, result: Any, index: int) -> Dict[str, Any]:
+        return {
+            "tool_call_id": f"planned_{index}",
+            "tool_name": call.tool_name,
+            "args": call.kwargs,
+            "result": result
+        }
+
+    def record_single_call_answer(self):
+        """An answer was generated in one model call thanks to planned data."""
+        self._single_call_answers += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tool planning statistics."""
+        return {
+            "enabled": self.enabled,
+            "plans": self._plans,
+            "planned_calls": self._planned_calls,
+            "speculative_calls": self._speculative_calls,
+            "speculative_hits": self._speculative_hits,
+            "speculative_wasted": self._speculative_wasted,
+            "skipped_calls": self._skipped_calls,
+            "failed_calls": self._failed_calls,
+            "round_trips_saved": self._single_call_answers,
+        }
@@ -0,0 +1,313 @@
+"""
+Tournament name resolution for the sports tools.
+
+The LLM passes tournaments to `get_fixtures` / `get_live_matches` the way
+users say them: "La Liga", "laliga", "premier", "Liga de Campeones". We
+used to build a lowercase name -> id dict once per process, so anything
+but an exact English name failed with `invalid_tournament` (and newly
+active tournaments never showed up until a restart).
+
+The resolver keeps an index that:
+
+1. Refreshes itself after a TTL, single-flight, keeping the old index if
+   the API is down
+2. Normalizes keys (lowercase, accents folded, punctuation dropped)
+3. Indexes every language variant the API serves (en, es, pt_br)
+4. Falls back to prefix matching and then trigram similarity
+
+The fallbacks never cross tiers: "Serie B", "Ligue 2" or "Premier League
+2" differ from an indexed league only in a number or a single letter, so
+they score high on similarity but are other competitions. If they aren't
+indexed, the lookup fails and the tools offer `suggest()` candidates
+instead of fixtures for the wrong league.
+"""
+
+import asyncio
+import re
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..services.chatbet_api import get_api_client
+
+logger = get_logger(__name__)
+
+
+INDEX_LANGUAGES = ("en", "es", "pt_br")
+
+# Extra names for well-known competitions. Each canonical name is matched
+# against the normalized tournament names: the name equal to it, else the
+# shortest name containing it, gets the aliases.
+TOURNAMENT_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "la liga": ("laliga", "spanish league", "liga espanola", "primera division"),
+    "premier league": ("premier", "epl", "english league", "english premier league"),
+    "bundesliga": ("german league", "liga alemana"),
+    "serie a": ("italian league", "calcio", "liga italiana"),
+    "ligue 1": ("french league", "liga francesa"),
+    "uefa champions league": ("champions league", "ucl", "champions", "liga de campeones"),
+}
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, fold accents and collapse punctuation to single spaces."""
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALNUM_RE.sub(" ", folded.lower()).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of a normalized name, padded at word boundaries."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def tier_tokens(text: str) -> Set[str]:
+    """Words of a normalized name that tell tiers apart: numbers and single letters."""
+    return {word for word in text.split() if len(word) == 1 or any(c.isdigit() for c in word)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two short words."""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def is_misspelling_of(query: str, key: str) -> bool:
+    """
+    Whether `query` could be `key` (or part of it) with typos.
+
+    Tier words must match exactly, and every other query word must be
+    within a typo or two of a word of the key ("championship" is not a
+    misspelling of "champions").
+    """
+    if tier_tokens(query) != tier_tokens(key):
+        return False
+    key_words = key.split()
+    return all(
+        any(edit_distance(word, key_word) <= (1 if len(word) <= 5 else 2) for key_word in key_words)
+        for word in query.split()
+    )
+
+
+def trigram_similarity(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two trigram sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class TournamentResolver:
+    """
+    Resolve free-text tournament names to API tournament IDs.
+
+    Lookups try, in order: numeric ID passthrough, exact normalized name,
+    the same name without spaces ("laliga"), a unique prefix, and the best
+    trigram match above `fuzzy_threshold` that is a plausible misspelling.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: Optional[float] = None,
+        fuzzy_threshold: Optional[float] = None,
+        retry_seconds: Optional[float] = None
+    ):
+        self.refresh_seconds = refresh_seconds or settings.tournament_index_refresh_seconds
+        self.retry_seconds = retry_seconds or settings.tournament_index_retry_seconds
+        self.fuzzy_threshold = fuzzy_threshold or settings.tournament_fuzzy_threshold
+
+        self._names: Dict[str, str] = {}        # normalized name -> tournament id
+        self._compact: Dict[str, str] = {}      # normalized name without spaces -> tournament id
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._loaded_at: Optional[float] = None
+        self._retry_at: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()
+
+        # Performance tracking
+        self._lookups = 0
+        self._exact_hits = 0
+        self._fuzzy_hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._refresh_failures = 0
+
+    # === Index maintenance ===
+
+    def is_stale(self) -> bool:
+        """Check whether the index needs a refresh."""
+        now = time.monotonic()
+        if self._loaded_at is None:
+            return self._retry_at is None or now >= self._retry_at
+        return now - self._loaded_at > self.refresh_seconds
+
+    async def ensure_fresh(self):
+        """Refresh the index if it's stale; concurrent callers share one refresh."""
+        if not self.is_stale():
+            return
+        async with self._refresh_lock:
+            if self.is_stale():
+                await self.refresh()
+
+    async def refresh(self):
+        """Rebuild the index from every language variant of the tournament list."""
+        try:
+            api_client = await get_api_client()
+            responses = await asyncio.gather(
+                *(api_client.get_all_tournaments(language=language, with_active_fixtures=True)
+                  for language in INDEX_LANGUAGES),
+                return_exceptions=True
+            )
+
+            entries: List[Tuple[str, str]] = []
+            for response in responses:
+                if isinstance(response, BaseException):
+                    logger.warning(f"Tournament list variant failed: {response}")
+                    continue
+                for sport in response:
+                    for tournament in sport.tournaments:
+                        entries.append((tournament.name, tournament.tournamentId))
+
+            if not entries:
+                raise RuntimeError("no tournaments returned")
+
+            self.load(entries)
+            self._refreshes += 1
+            logger.info(f"Indexed {len(self._names)} tournament names")
+
+        except Exception as e:
+            self._refresh_failures += 1
+            logger.error(f"Failed to refresh tournament index: {e}")
+            if self._loaded_at is None:
+                # Nothing to serve yet: retry soon, but not on every tool call
+                self._retry_at = time.monotonic() + self.retry_seconds
+                return
+            # Keep serving the previous index, retry after another TTL
+            self._loaded_at = time.monotonic()
+
+    def load(self, entries: Iterable[Tuple[str, str]]):
+        """Replace the index with (name, tournament id) pairs."""
+        # Every real name first, so an alias can never take a name's place
+        names: Dict[str, str] = {}
+        for name, tournament_id in entries:
+            key = normalize_name(name)
+            if key:
+                names.setdefault(key, tournament_id)
+
+        aliases_to_add: Dict[str, str] = {}
+        for canonical, aliases in TOURNAMENT_ALIASES.items():
+            target = canonical if canonical in names else min(
+                (key for key in names if canonical in key), key=lambda key: (len(key), key), default=None
+            )
+            if target is None:
+                continue
+            for alias in (canonical, *aliases):
+                aliases_to_add.setdefault(alias, names[target])
+        for alias, tournament_id in aliases_to_add.items():
+            names.setdefault(alias, tournament_id)
+
+        self._names = names
+        self._compact = {}
+        for key, tid in names.items():
+            self._compact.setdefault(key.replace(" ", ""), tid)
+        self._trigrams = {key: trigrams(key) for key in names}
+        self._loaded_at = time.monotonic()
+
+    # === Lookup ===
+
+    async def resolve(self, tournament_input: Optional[str]) -> Optional[str]:
+        """Resolve a tournament ID or name to a tournament ID."""
+        if not tournament_input:
+            return None
+
+        # If it's already a numeric ID, return as-is
+        if tournament_input.strip().isdigit():
+            return tournament_input.strip()
+
+        await self.ensure_fresh()
+        return self.lookup(tournament_input)
+
+    def lookup(self, tournament_input: str) -> Optional[str]:
+        """Resolve a name against the current index without refreshing."""
+        self._lookups += 1
+        query = normalize_name(tournament_input)
+        if not query:
+            self._misses += 1
+            return None
+
+        tournament_id = self._names.get(query) or self._compact.get(query.replace(" ", ""))
+        if tournament_id:
+            self._exact_hits += 1
+            return tournament_id
+
+        tournament_id = self._prefix_match(query) or self._fuzzy_match(query)
+        if tournament_id:
+            self._fuzzy_hits += 1
+            return tournament_id
+
+        self._misses += 1
+        return None
+
+    def suggest(self, tournament_input: str, limit: int = 3) -> List[str]:
+        """Closest indexed names, for error messages."""
+        query = trigrams(normalize_name(tournament_input))
+        scored = sorted(
+            ((trigram_similarity(query, grams), key) for key, grams in self._trigrams.items()),
+            reverse=True
+        )
+        return [key for score, key in scored[:limit] if score > 0]
+
+    def _prefix_match(self, query: str) -> Optional[str]:
+        """A name that starts with the query, if all such names agree on the tournament."""
+        if len(query) < 3:
+            return None
+        query_tiers = tier_tokens(query)
+        matches = {
+            tid for key, tid in self._names.items()
+            if key.startswith(query) and query_tiers <= tier_tokens(key)
+        }
+        return matches.pop() if len(matches) == 1 else None
+
+    def _fuzzy_match(self, query: str) -> Optional[str]:
+        query_grams = trigrams(query)
+        best_score, best_id = 0.0, None
+        for key, grams in self._trigrams.items():
+            score = trigram_similarity(query_grams, grams)
+            if score > best_score and score >= self.fuzzy_threshold and is_misspelling_of(query, key):
+                best_score, best_id = score, self._names[key]
+        return best_id
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get resolver statistics."""
+        hits = self._exact_hits + self._fuzzy_hits
+        return {
+            "indexed_names": len(self._names),
+            "lookups": self._lookups,
+            "exact_hits": self._exact_hits,
+            "fuzzy_hits": self._fuzzy_hits,
+            "misses": self._misses,
+            "hit_rate_percent": round(hits / self._lookups * 100, 2) if self._lookups > 0 else 0,
+            "refreshes": self._refreshes,
+            "refresh_failures": self._refresh_failures,
+            "index_age_seconds": (
+                round(time.monotonic() - self._loaded_at, 1) if self._loaded_at is not None else None
+            )
+        }
+
+
+# Global resolver instance
+_tournament_resolver: Optional[TournamentResolver] = None
+
+
+def get_tournament_resolver() -> TournamentResolver:
+    """Get the global tournament resolver instance."""
+    global _tournament_resolver
+    if _tournament_resolver is None:
+        _tournament_resolver = TournamentResolver()
+    return _tournament_resolver
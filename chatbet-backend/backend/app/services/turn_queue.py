@@ -0,0 +1,162 @@
+"""
+Per-session turn ordering with in-flight result sharing.
+
+`process_message` used to deduplicate by `md5(session_id:message)` within
+a ~2 second window: a repeated message got a canned "I'm still processing
+your previous message" reply, and two *different* messages of the same
+session ran concurrently, racing on `conversation.add_message` and
+interleaving their turns in the history.
+
+Turns now go through a per-session queue:
+
+- a session's turns run one at a time, in arrival order
+- a message identical to one the session is already running (or waiting
+  to run) joins that turn and gets the very same response, with no
+  second LLM call
+- a re-send that arrives just after its turn finished (a client retry, a
+  double click) gets that turn's response back, as long as nothing newer
+  happened in the session
+
+A turn keeps running while anyone still waits for it; if every caller
+goes away, it is cancelled.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..utils.dedup import DedupRegistry
+
+logger = get_logger(__name__)
+
+TurnKey = Tuple[str, str]
+
+
+class _Turn:
+    """A queued or running turn and how many callers wait for it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SessionTurnQueue:
+    """
+    Serialize each session's turns and share identical in-flight ones.
+
+    Sessions are independent; only turns of the same session wait on
+    each other.
+    """
+
+    def __init__(self, replay_window_seconds: Optional[float] = None):
+        self.replay_window_seconds = (
+            settings.turn_replay_window_seconds if replay_window_seconds is None else replay_window_seconds
+        )
+        self._last_turn: Dict[str, asyncio.Task] = {}
+        self._in_flight: Dict[TurnKey, _Turn] = {}
+        # session_id -> (message, result) of its just-finished turn
+        self._finished = DedupRegistry(self.replay_window_seconds, settings.dedup_max_entries)
+
+        # Performance tracking
+        self._turns = 0
+        self._queued = 0
+        self._shared = 0
+        self._replayed = 0
+
+    @staticmethod
+    def _normalize(message: str) -> str:
+        return message.strip()
+
+    async def submit(
+        self,
+        session_id: str,
+        turn: Callable[[], Awaitable[Any]],
+        message: Optional[str] = None
+    ) -> Any:
+        """
+        Run `turn()` after the session's earlier turns.
+
+        With `message`, an identical queued or running turn of the session
+        is joined instead, and a just-finished one is replayed.
+        """
+        key = (session_id, self._normalize(message)) if message is not None else None
+        if key is not None:
+            shared = self._in_flight.get(key)
+            if shared is not None:
+                self._shared += 1
+                logger.info("Duplicate message joined in-flight turn", extra={"session_id": session_id})
+                return await self._wait(key, shared)
+
+            replay = self._replay(session_id, key[1])
+            if replay is not None:
+                self._replayed += 1
+                logger.info("Duplicate message answered from finished turn", extra={"session_id": session_id})
+                return replay[0]
+
+        previous = self._last_turn.get(session_id)
+        if previous is not None and previous.done():
+            previous = None
+        if previous is not None:
+            self._queued += 1
+
+        async def _run_in_order():
+            if previous is not None:
+                await asyncio.wait([previous])
+            return await turn()
+
+        task = asyncio.create_task(_run_in_order())
+        self._turns += 1
+        self._last_turn[session_id] = task
+        self._finished.pop(session_id, None)
+        entry = _Turn(task)
+        if key is not None:
+            self._in_flight[key] = entry
+        task.add_done_callback(lambda done: self._on_done(session_id, key, entry))
+        return await self._wait(key, entry)
+
+    async def _wait(self, key: Optional[TurnKey], entry: _Turn) -> Any:
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.task)
+        except asyncio.CancelledError:
+            # Nobody is left to read the answer
+            if entry.waiters == 1 and not entry.task.done():
+                entry.task.cancel()
+            raise
+        finally:
+            entry.waiters -= 1
+
+    def _on_done(self, session_id: str, key: Optional[TurnKey], entry: _Turn):
+        if self._last_turn.get(session_id) is entry.task:
+            del self._last_turn[session_id]
+        if key is not None and self._in_flight.get(key) is entry:
+            del self._in_flight[key]
+
+        task = entry.task
+        if key is None or task.cancelled() or task.exception() is not None:
+            return
+        # Only remembered while it is the session's latest turn
+        if session_id not in self._last_turn and self.replay_window_seconds > 0:
+            self._finished.put(session_id, (key[1], task.result()))
+
+    def _replay(self, session_id: str, message: str) -> Optional[Tuple[Any]]:
+        """Result of the session's just-finished turn if it was the same message."""
+        finished = self._finished.get(session_id)
+        if finished is None or finished[0] != message:
+            return None
+        return (finished[1],)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get turn queue statistics."""
+        return {
+            "turns": self._turns,
+            "in_flight": len(self._in_flight),
+            "busy_sessions": len(self._last_turn),
+            "queued_behind_turn": self._queued,
+            "shared_in_flight": self._shared,
+            "replayed_finished": self._replayed,
+            "finished_registry": self._finished.get_stats(),
+        }
@@ -9,7 +9,7 @@ management for the ChatBet real-time chat system.
 import asyncio
 import json
 import logging
-from typing import Dict, Optional, Set, List, Any, Callable
+from typing import Dict, Optional, Set, List, Any, Callable, Coroutine
 from datetime import datetime, timedelta
 from uuid import uuid4
 from collections import defaultdict
@@ -17,6 +17,7 @@ from collections import defaultdict
 from fastapi import WebSocket, WebSocketDisconnect
 from pydantic import ValidationError
 
+from ..core.config import settings
 from ..core.logging import get_logger
 from ..models.websocket_models import (
     WSMessage, WSBaseMessage, WSUserMessage, WSBotResponse, WSError,
@@ -25,6 +26,7 @@ from ..models.websocket_models import (
     WSSessionEnded, WebSocketMessageType, parse_websocket_message,
     create_error_message, create_typing_indicator
 )
+from ..utils.dedup import DedupRegistry
 
 logger = get_logger(__name__)
 
@@ -42,6 +44,10 @@ class ConnectionInfo:
         self.is_authenticated = user_id is not None
         self.client_info: Dict[str, Any] = {}
         
+        # In-flight chat turns, cancelled when the client goes away
+        self.turn_tasks: Set[asyncio.Task] = set()
+        self.last_turn: Optional[asyncio.Task] = None
+        
     def update_activity(self):
         """Update last activity timestamp."""
         self.last_activity = datetime.utcnow()
@@ -77,9 +83,11 @@ class WebSocketConnectionManager:
         # User to sessions mapping for multi-device support
         self.user_sessions: Dict[str, Set[str]] = defaultdict(set)
         
-        # Message deduplication tracking
-        self.processed_messages: Dict[str, datetime] = {}
-        self.message_cleanup_interval = timedelta(minutes=10)
+        # Message deduplication tracking (message_id -> first seen), kept for 10 minutes
+        self.processed_messages = DedupRegistry(
+            window_seconds=timedelta(minutes=10).total_seconds(),
+            max_entries=settings.dedup_max_entries
+        )
         
         # Background tasks
         self.background_tasks: Set[asyncio.Task] = set()
@@ -87,6 +95,7 @@ class WebSocketConnectionManager:
         # Connection statistics
         self.total_connections = 0
         self.total_messages = 0
+        self.cancelled_turns = 0
         self.started_at = datetime.utcnow()
         
         # Event handlers
@@ -133,6 +142,9 @@ class WebSocketConnectionManager:
                     }
                 )
                 
+                # Stop work for the replaced client before it can answer on the new socket
+                self._cancel_turns(existing_connection, "connection_replaced")
+                
                 # Close the existing connection
                 try:
                     await existing_connection.websocket.close(
@@ -199,18 +211,30 @@ class WebSocketConnectionManager:
             logger.error(f"Error establishing WebSocket connection: {e}")
             raise
     
-    async def disconnect(self, session_id: str, reason: str = "client_disconnect"):
+    async def disconnect(
+        self,
+        session_id: str,
+        reason: str = "client_disconnect",
+        websocket: Optional[WebSocket] = None
+    ):
         """
         Handle client disconnection.
         
         Args:
             session_id: Session to disconnect
             reason: Reason for disconnection
+            websocket: Only disconnect if the session still belongs to this socket
         """
         if session_id not in self.connections:
             return
         
         connection_info = self.connections[session_id]
+        if websocket is not None and connection_info.websocket is not websocket:
+            # The session was already taken over by a newer connection
+            return
+        
+        # Cancel in-flight turns (LLM calls, tools, HTTP requests) nobody will read
+        self._cancel_turns(connection_info, reason)
         
         try:
             # Send session ended message if connection is still active
@@ -354,30 +378,18 @@ class WebSocketConnectionManager:
                 message_id = message.message_id
                 current_time = datetime.utcnow()
                 
-                # Check if we've already processed this message
-                if message_id in self.processed_messages:
+                # Mark message as processed unless we've already seen it
+                if not self.processed_messages.add(message_id, current_time):
                     logger.warning(
                         f"Duplicate message detected and ignored",
                         extra={
                             "session_id": session_id,
                             "message_id": message_id,
-                            "original_time": self.processed_messages[message_id].isoformat(),
+                            "original_time": self.processed_messages.get(message_id).isoformat(),
                             "duplicate_time": current_time.isoformat()
                         }
                     )
                     return False
-                
-                # Mark message as processed
-                self.processed_messages[message_id] = current_time
-                
-                # Clean up old processed messages to prevent memory leaks
-                cutoff_time = current_time - self.message_cleanup_interval
-                messages_to_remove = [
-                    mid for mid, timestamp in self.processed_messages.items()
-                    if timestamp < cutoff_time
-                ]
-                for mid in messages_to_remove:
-                    del self.processed_messages[mid]
 
             # Update connection activity and stats
             connection_info.update_activity()
@@ -413,6 +425,50 @@ class WebSocketConnectionManager:
             await self.send_error(session_id, "MESSAGE_PROCESSING_ERROR", "Failed to process message")
             return False
     
+    def start_turn(self, session_id: str, turn: Coroutine[Any, Any, Any]) -> Optional[asyncio.Task]:
+        """
+        Run a chat turn as a task owned by the session.
+        
+        Turns of a session still run one after another, but the receive loop
+        stays free to notice a disconnect and cancel the turn mid-generation.
+        
+        Args:
+            session_id: Session the turn belongs to
+            turn: Coroutine processing the incoming message
+            
+        Returns:
+            The turn task, or None if the session is gone
+        """
+        connection_info = self.connections.get(session_id)
+        if connection_info is None:
+            turn.close()
+            return None
+        
+        previous = connection_info.last_turn
+        
+        async def _run_in_order():
+            if previous is not None and not previous.done():
+                await asyncio.wait([previous])
+            return await turn
+        
+        task = asyncio.create_task(_run_in_order())
+        connection_info.last_turn = task
+        connection_info.turn_tasks.add(task)
+        task.add_done_callback(connection_info.turn_tasks.discard)
+        return task
+    
+    def _cancel_turns(self, connection_info: ConnectionInfo, reason: str):
+        """Cancel every in-flight turn of a connection."""
+        pending = [task for task in connection_info.turn_tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.cancelled_turns += len(pending)
+            logger.info(
+                f"Cancelled {len(pending)} in-flight turns",
+                extra={"session_id": connection_info.session_id, "reason": reason}
+            )
+    
     async def send_typing_indicator(
         self, 
         session_id: str, 
@@ -547,6 +603,9 @@ class WebSocketConnectionManager:
             message_type: Type of message to handle
             handler: Async handler function
         """
+        if handler in self.message_handlers[message_type]:
+            # Endpoints register on every connection; keep one entry per handler
+            return
         self.message_handlers[message_type].append(handler)
         logger.debug(f"Registered handler for message type: {message_type}")
     
@@ -585,6 +644,9 @@ class WebSocketConnectionManager:
             "active_connections": len(self.connections),
             "total_connections": self.total_connections,
             "total_messages": self.total_messages,
+            "in_flight_turns": sum(len(conn.turn_tasks) for conn in self.connections.values()),
+            "cancelled_turns": self.cancelled_turns,
+            "dedup": self.processed_messages.get_stats(),
             "unique_users": len(self.user_sessions),
             "uptime_seconds": int((datetime.utcnow() - self.started_at).total_seconds()),
             "authenticated_sessions": sum(
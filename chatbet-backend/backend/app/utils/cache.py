@@ -14,12 +14,13 @@ The caching strategy here is critical for performance:
 import json
 import pickle
 import logging
-from typing import Any, Optional, Union, Dict, List
+from typing import Any, Optional, Union, Dict, List, Tuple
 from datetime import datetime, timedelta
 import asyncio
 
 import redis.asyncio as redis
 from redis.asyncio import Redis, ConnectionPool
+from cachetools import TTLCache
 
 from ..core.config import settings
 from ..core.logging import get_logger, log_function_call
@@ -27,6 +28,20 @@ from ..utils.exceptions import CacheError, CacheUnavailableError
 
 logger = get_logger(__name__)
 
+# Appends one conversation's new message records unless they are already
+# there. KEYS: metadata, message list. ARGV: ttl, metadata, position of the
+# first record, records. A batch retried after its EXEC went through (the
+# reply was lost) finds its records in place and appends nothing again.
+APPEND_CONVERSATION_LOG_SCRIPT = """
+local first = 4 + math.max(redis.call('LLEN', KEYS[2]) - tonumber(ARGV[3]), 0)
+for i = first, #ARGV, 1000 do
+    redis.call('RPUSH', KEYS[2], unpack(ARGV, i, math.min(i + 999, #ARGV)))
+end
+redis.call('SETEX', KEYS[1], ARGV[1], ARGV[2])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return math.max(#ARGV - first + 1, 0)
+"""
+
 
 class RedisCache:
     """
@@ -349,6 +364,130 @@ class RedisCache:
         """Get cached conversation data."""
         return await self.get(conversation_id, namespace="conversations")
     
+    # === Conversation log (append-only, written in pipelined batches) ===
+    
+    @staticmethod
+    def _conversation_log_keys(conversation_id: str) -> Tuple[str, str]:
+        """Keys of a conversation's metadata and message list."""
+        return f"conversation_log:{conversation_id}:meta", f"conversation_log:{conversation_id}:messages"
+    
+    @staticmethod
+    def _conversation_user_key(user_id: str) -> str:
+        """Key of the set of a user's conversation ids."""
+        return f"conversation_user:{user_id}"
+    
+    async def append_conversation_logs(
+        self,
+        batch: List[Tuple[str, bytes, int, List[bytes]]],
+        ttl: int,
+        user_sessions: Optional[List[Tuple[str, str]]] = None
+    ) -> bool:
+        """
+        Write (conversation_id, metadata, position, new message records)
+        for many conversations in one MULTI/EXEC round trip.
+    
+        Metadata is replaced and both keys get their TTL refreshed. Records
+        are appended from `position` on, skipping any the list already
+        holds, so a requeued batch never duplicates them. Each
+        (user_id, conversation_id) of `user_sessions` is added to that
+        user's index.
+        """
+        if not batch or not self._connected or not self._check_circuit_breaker():
+            return False
+    
+        try:
+            pipe = self.redis.pipeline(transaction=True)
+            for conversation_id, meta, position, records in batch:
+                pipe.eval(
+                    APPEND_CONVERSATION_LOG_SCRIPT, 2, *self._conversation_log_keys(conversation_id),
+                    ttl, meta, position, *records
+                )
+            for user_id, conversation_id in user_sessions or ():
+                user_key = self._conversation_user_key(user_id)
+                pipe.sadd(user_key, conversation_id)
+                pipe.expire(user_key, ttl)
+            await pipe.execute()
+            return True
+    
+        except Exception as e:
+            self._record_failure()
+            logger.error(f"Conversation log write error ({len(batch)} conversations): {e}")
+            return False
+    
+    async def load_conversation_log(self, conversation_id: str) -> Optional[Tuple[bytes, List[bytes]]]:
+        """Metadata and every message record of a conversation, None if absent."""
+        if not self._connected or not self._check_circuit_breaker():
+            return None
+    
+        try:
+            meta_key, messages_key = self._conversation_log_keys(conversation_id)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.get(meta_key)
+            pipe.lrange(messages_key, 0, -1)
+            meta, records = await pipe.execute()
+    
+            if meta is None:
+                self._cache_misses += 1
+                return None
+            self._cache_hits += 1
+            return meta, list(records or [])
+    
+        except Exception as e:
+            self._record_failure()
+            logger.error(f"Conversation log read error for {conversation_id}: {e}")
+            return None
+    
+    async def conversation_log_length(self, conversation_id: str) -> Optional[int]:
+        """Number of persisted messages of a conversation, None if Redis is unavailable."""
+        if not self._connected or not self._check_circuit_breaker():
+            return None
+    
+        try:
+            _, messages_key = self._conversation_log_keys(conversation_id)
+            return int(await self.redis.llen(messages_key))
+    
+        except Exception as e:
+            self._record_failure()
+            logger.error(f"Conversation log length error for {conversation_id}: {e}")
+            return None
+    
+    async def conversation_sessions(self, user_id: str) -> Optional[List[str]]:
+        """Ids of a user's persisted conversations, None if Redis is unavailable."""
+        if not self._connected or not self._check_circuit_breaker():
+            return None
+    
+        try:
+            members = await self.redis.smembers(self._conversation_user_key(user_id))
+            return [m.decode("utf-8") if isinstance(m, bytes) else m for m in members]
+    
+        except Exception as e:
+            self._record_failure()
+            logger.error(f"Conversation index read error for user {user_id}: {e}")
+            return None
+    
+    async def delete_conversation_log(self, conversation_id: str, user_id: Optional[str] = None) -> bool:
+        """Remove a conversation's metadata and messages, and its entry in the user's index."""
+        if not self._connected or not self._check_circuit_breaker():
+            return False
+    
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(*self._conversation_log_keys(conversation_id))
+            if user_id:
+                pipe.srem(self._conversation_user_key(user_id), conversation_id)
+            await pipe.execute()
+            return True
+    
+        except Exception as e:
+            self._record_failure()
+            logger.error(f"Conversation log delete error for {conversation_id}: {e}")
+            return False
+    
+    @property
+    def connected(self) -> bool:
+        """Whether Redis is connected and the circuit breaker allows operations."""
+        return self._connected and self._check_circuit_breaker()
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get cache performance statistics."""
         total_requests = self._cache_hits + self._cache_misses
@@ -366,6 +505,82 @@ class RedisCache:
         }
 
 
+class TieredCache:
+    """
+    Two-level cache: an in-process TTL/LRU map in front of Redis.
+
+    The local tier answers hot keys without a network hop, while Redis
+    (when connected) shares entries across workers and survives restarts.
+    If Redis is down the cache quietly degrades to local-only, so callers
+    never need to care which tier is available.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        maxsize: int = 1024,
+        ttl: int = 300,
+        redis_cache: Optional[RedisCache] = None
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self._local: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._redis = redis_cache if redis_cache is not None else get_redis_cache()
+
+        # Performance tracking
+        self._local_hits = 0
+        self._remote_hits = 0
+        self._misses = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from the fastest tier that has it."""
+        value = self._local.get(key)
+        if value is not None:
+            self._local_hits += 1
+            return value
+
+        value = await self._redis.get(key, namespace=self.namespace)
+        if value is not None:
+            # Promote to local tier for subsequent reads
+            self._local[key] = value
+            self._remote_hits += 1
+            return value
+
+        self._misses += 1
+        return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Store value in both tiers."""
+        self._local[key] = value
+        await self._redis.set(key, value, ttl=ttl or self.ttl, namespace=self.namespace)
+        return True
+
+    async def delete(self, key: str) -> bool:
+        """Remove value from both tiers."""
+        self._local.pop(key, None)
+        return await self._redis.delete(key, namespace=self.namespace)
+
+    def clear_local(self):
+        """Drop every entry from the in-process tier."""
+        self._local.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tiered cache statistics."""
+        hits = self._local_hits + self._remote_hits
+        total_requests = hits + self._misses
+        hit_rate = (hits / total_requests * 100) if total_requests > 0 else 0
+
+        return {
+            "namespace": self.namespace,
+            "local_entries": len(self._local),
+            "local_hits": self._local_hits,
+            "remote_hits": self._remote_hits,
+            "misses": self._misses,
+            "hit_rate_percent": round(hit_rate, 2),
+            "total_requests": total_requests
+        }
+
+
 # Global cache instance
 _redis_cache: Optional[RedisCache] = None
 
@@ -0,0 +1,123 @@
+"""
+Time-windowed duplicate detection with O(1) expiry.
+
+The WebSocket manager and the conversation turn queue both remember what
+they have recently seen (message ids, just-finished turns) for a fixed
+window. The WebSocket manager used to clean its dict by scanning every
+entry on every incoming message, so the cost of a message grew with
+the number of messages of the last ten minutes.
+
+Every entry of a registry lives for the same window, so insertion order
+is also expiry order. Entries are kept in an insertion-ordered map and
+expired by popping from its head until the head is fresh: amortized O(1)
+per message, whatever the volume. A size cap drops the oldest entries
+first, so a burst can't grow the registry without bound.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class DedupRegistry:
+    """
+    Keys seen within the last `window_seconds`, at most `max_entries` of them.
+
+    Each key can carry a value (e.g. when it was first seen, or a result
+    to hand to duplicates).
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        # key -> (seen_at, value), oldest first
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+        # Performance tracking
+        self._added = 0
+        self._duplicates = 0
+        self._expired = 0
+        self._evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        self.expire()
+        return key in self._entries
+
+    def add(self, key: Hashable, value: Any = None) -> bool:
+        """
+        Remember `key` unless it was seen within the window.
+
+        Returns True for a new key, False for a duplicate (which keeps its
+        original value and time).
+        """
+        now = self._clock()
+        self.expire(now)
+        if key in self._entries:
+            self._duplicates += 1
+            return False
+        self._store(key, value, now)
+        return True
+
+    def put(self, key: Hashable, value: Any = None):
+        """Remember `key` with a fresh window, replacing any earlier entry."""
+        now = self._clock()
+        self.expire(now)
+        self._entries.pop(key, None)
+        self._store(key, value, now)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Value stored with `key`, `default` if it is unknown or expired."""
+        self.expire()
+        entry = self._entries.get(key)
+        return default if entry is None else entry[1]
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Forget `key`, returning its value."""
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        """Forget everything."""
+        self._entries.clear()
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop entries older than the window, from the head; O(1) per dropped entry."""
+        cutoff = (self._clock() if now is None else now) - self.window_seconds
+        expired = 0
+        entries = self._entries
+        while entries:
+            seen_at = entries[next(iter(entries))][0]
+            if seen_at > cutoff:
+                break
+            entries.popitem(last=False)
+            expired += 1
+        self._expired += expired
+        return expired
+
+    def _store(self, key: Hashable, value: Any, now: float):
+        self._entries[key] = (now, value)
+        self._added += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evicted += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "window_seconds": self.window_seconds,
+            "added": self._added,
+            "duplicates": self._duplicates,
+            "expired": self._expired,
+            "evicted": self._evicted,
+        }
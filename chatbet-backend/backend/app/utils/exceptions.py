@@ -90,6 +90,11 @@ class TokenLimitError(LLMError):
     pass
 
 
+class LLMBusyError(LLMError):
+    """LLM request shed because the scheduler queue is too long."""
+    pass
+
+
 class IntentClassificationError(ConversationError):
     """Intent classification failed."""
     pass
@@ -144,6 +149,11 @@ class PerformanceError(ChatBetException):
     pass
 
 
+class DeadlineExceededError(PerformanceError):
+    """The chat turn ran out of its time budget."""
+    pass
+
+
 # === Security Exceptions ===
 
 class SecurityError(ChatBetException):
@@ -13,10 +13,34 @@ from datetime import datetime, timedelta, date
 from decimal import Decimal
 
 from ..core.logging import get_logger
+from ..models.conversation import IntentType
 
 logger = get_logger(__name__)
 
 
+# Keyword rules for classifying intents without a model - first match wins.
+# Used when a turn has no time left for the LLM, and by the fake provider.
+INTENT_KEYWORD_RULES: List[Tuple[str, IntentType]] = [
+    (r"\b(balance|money|afford)\b", IntentType.USER_BALANCE_QUERY),
+    (r"\b(bet|wager|stake)\b.*\$?\d+|\bplace a bet\b", IntentType.BET_SIMULATION),
+    (r"\b(odds|pays?|price)\b", IntentType.ODDS_INFORMATION_QUERY),
+    (r"\b(should i bet|recommend|best bet)\b", IntentType.BETTING_RECOMMENDATION),
+    (r"\b(better|compare|vs)\b", IntentType.TEAM_COMPARISON),
+    (r"\b(match|matches|play|plays|fixtures?|schedule|games?|today|tomorrow)\b", IntentType.MATCH_SCHEDULE_QUERY),
+    (r"\b(help|how does|what can you)\b", IntentType.HELP_REQUEST),
+    (r"^(hi|hello|hey|hola|good (morning|afternoon|evening))\b", IntentType.GREETING),
+]
+
+
+def classify_intent_locally(text: str) -> Tuple[IntentType, float]:
+    """Classify a message with the keyword rules; (intent, confidence)."""
+    message = text.lower().strip()
+    for pattern, intent in INTENT_KEYWORD_RULES:
+        if re.search(pattern, message):
+            return intent, 0.9
+    return IntentType.GENERAL_SPORTS_QUERY, 0.5
+
+
 class EntityExtractor:
     """
     Extract structured entities from natural language text.
@@ -38,7 +62,14 @@ class EntityExtractor:
             "juve": "juventus",
             "arsenal": "arsenal",
             "chelsea": "chelsea",
-            "liverpool": "liverpool"
+            "liverpool": "liverpool",
+            "barcelona": "barcelona",
+            "real madrid": "real madrid",
+            "atletico": "atletico madrid",
+            "manchester united": "manchester united",
+            "manchester city": "manchester city",
+            "juventus": "juventus",
+            "bayern munich": "bayern munich"
         }
         
         # Betting terms and their normalized forms
@@ -171,18 +202,25 @@ class EntityExtractor:
         
         return dates
     
-    def extract_teams(self, text: str) -> List[Dict[str, Any]]:
-        """Extract team names from text."""
+    def extract_known_teams(self, text: str) -> List[Tuple[str, str]]:
+        """(full name, alias) of each known team mentioned in lowercase text."""
         teams = []
         
-        # Check for team aliases first
+        # Whole words, so "really" isn't Real Madrid
+        seen = set()
         for alias, full_name in self.team_aliases.items():
-            if alias in text:
-                teams.append({
-                    "name": full_name,
-                    "alias": alias,
-                    "confidence": 0.9
-                })
+            if full_name not in seen and re.search(rf"\b{re.escape(alias)}\b", text):
+                seen.add(full_name)
+                teams.append((full_name, alias))
+        
+        return teams
+    
+    def extract_teams(self, text: str) -> List[Dict[str, Any]]:
+        """Extract team names from text."""
+        teams = [
+            {"name": full_name, "alias": alias, "confidence": 0.9}
+            for full_name, alias in self.extract_known_teams(text)
+        ]
         
         # Look for potential team names (capitalized words)
         team_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b'
@@ -0,0 +1,137 @@
+"""
+Compact, LLM-facing projections of API models.
+
+The tools used to hand the model `model_dump()` output: every fixture
+carried `source`, `sportId`, competitor ids and two jersey icon URLs, and
+odds came through as raw market blobs. The model needs none of that to
+answer "who plays today?".
+
+Each projection here is schema-stable and positional. A list of rows is
+prefixed with a legend string naming the columns, so the model can read
+`["1234","Barcelona","Sevilla","2025-09-20T19:00:00Z","La Liga"]`
+without repeating keys fifteen times.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..models.api_models import FixtureInfo, MatchOdds, Tournament
+
+
+FIXTURE_LEGEND = "columns: [fixture_id, home, away, start_utc, tournament, tournament_id]"
+TOURNAMENT_LEGEND = "columns: [tournament_id, name, country]"
+ODDS_LEGEND = "outcomes: [outcome, decimal_odds, implied_probability_pct, line]"
+
+# Market attributes of MatchOdds, in the order they are shown to the model
+ODDS_MARKETS = (
+    ("result", "Match Result (1X2)"),
+    ("over_under", "Over/Under"),
+    ("both_teams_to_score", "Both Teams to Score"),
+    ("double_chance", "Double Chance"),
+    ("handicap", "Handicap"),
+)
+
+_ODDS_KEYS = ("odds", "odd", "price", "value")
+_LINE_KEYS = ("line", "handicap", "total", "points")
+_LABEL_KEYS = ("name", "label", "outcome")
+
+
+def project_fixture(fixture: FixtureInfo) -> List[str]:
+    """Project a fixture to a positional row (see FIXTURE_LEGEND)."""
+    return [
+        fixture.id,
+        fixture.homeCompetitor.name,
+        fixture.awayCompetitor.name,
+        fixture.startTime,
+        fixture.tournament.name,
+        fixture.tournament.id,
+    ]
+
+
+def project_fixtures(fixtures: Iterable[FixtureInfo]) -> List[Any]:
+    """Project fixtures to a legend line followed by one row per fixture."""
+    return [FIXTURE_LEGEND, *(project_fixture(f) for f in fixtures)]
+
+
+def project_tournament(tournament: Tournament) -> List[Optional[str]]:
+    """Project a tournament to a positional row (see TOURNAMENT_LEGEND)."""
+    return [tournament.id, tournament.name, tournament.country]
+
+
+def project_tournaments(tournaments: Iterable[Tournament]) -> List[Any]:
+    """Project tournaments to a legend line followed by one row each."""
+    return [TOURNAMENT_LEGEND, *(project_tournament(t) for t in tournaments)]
+
+
+def implied_probability(decimal_odds: float) -> Optional[float]:
+    """Implied probability (in percent) of decimal odds."""
+    if decimal_odds <= 1.0:
+        return None
+    return round(100.0 / decimal_odds, 1)
+
+
+def _as_float(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _outcome_tuple(label: str, data: Any) -> Optional[Tuple[Any, ...]]:
+    """Turn one outcome of a market blob into an odds tuple."""
+    line = None
+    if isinstance(data, dict):
+        label = next((str(data[k]) for k in _LABEL_KEYS if data.get(k)), label)
+        line = next((data[k] for k in _LINE_KEYS if data.get(k) is not None), None)
+        decimal_odds = next(
+            (_as_float(data[k]) for k in _ODDS_KEYS if _as_float(data.get(k)) is not None),
+            None
+        )
+    else:
+        decimal_odds = _as_float(data)
+
+    if decimal_odds is None:
+        return None
+    return (label, round(decimal_odds, 2), implied_probability(decimal_odds), line)
+
+
+def project_market(market: Any) -> List[Tuple[Any, ...]]:
+    """
+    Project a raw market blob to odds tuples (see ODDS_LEGEND).
+
+    Markets arrive either as {outcome: {...}} mappings or as lists of
+    outcome dicts; anything without a readable price is skipped.
+    """
+    if isinstance(market, dict):
+        candidates = list(market.items())
+    elif isinstance(market, list):
+        candidates = [(str(index), item) for index, item in enumerate(market)]
+    else:
+        return []
+
+    outcomes = []
+    for label, data in candidates:
+        outcome = _outcome_tuple(label, data)
+        if outcome is not None:
+            outcomes.append(outcome)
+    return outcomes
+
+
+def project_odds(fixture_id: str, odds: MatchOdds, max_markets: int = 3) -> Dict[str, Any]:
+    """Project match odds to implied-probability tuples per market."""
+    markets: Dict[str, List[Tuple[Any, ...]]] = {}
+    for attribute, market_name in ODDS_MARKETS:
+        outcomes = project_market(getattr(odds, attribute))
+        if outcomes:
+            markets[market_name] = outcomes
+        if len(markets) >= max_markets:
+            break
+
+    return {
+        "fixture_id": fixture_id,
+        "status": odds.status,
+        "main_market": odds.main_market,
+        "legend": ODDS_LEGEND,
+        "markets": markets,
+    }
@@ -0,0 +1,242 @@
+"""
+Prompt token budgeting for LLM calls.
+
+Without this, prompt size was whatever the conversation and the tools
+happened to produce: the last N messages regardless of length, plus up to
+15 full fixture dumps pretty-printed with jersey icon URLs. Latency and cost
+grew with it. The budgeter keeps every prompt under a fixed size:
+
+1. Tokens are estimated locally (no tokenizer round-trip)
+2. The budget is split between system prompt, history and tool results
+3. Low-value fields are dropped and JSON is compacted
+4. The oldest history turns go first when space runs out
+"""
+
+import json
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage
+
+from ..core.config import settings
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+# Roughly 4 characters per token for English/Spanish text and JSON
+CHARS_PER_TOKEN = 4
+
+# Fixed per-message overhead (role markers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Fields the model never needs to answer a question
+LOW_VALUE_FIELDS = {"jerseyIcon", "source", "sportId"}
+
+# Strings are never shortened below this; past it, results are summarized
+MIN_TRUNCATED_CHARS = 32
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text without calling a tokenizer."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _message_text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, list):
+        content = " ".join(str(item) for item in content if item)
+    text = str(content)
+
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        text += compact_json(tool_calls)
+    return text
+
+
+def estimate_message_tokens(message: BaseMessage) -> int:
+    """Estimate the tokens a single chat message costs in the prompt."""
+    return estimate_tokens(_message_text(message)) + MESSAGE_OVERHEAD_TOKENS
+
+
+def estimate_messages_tokens(messages: List[BaseMessage]) -> int:
+    """Estimate the total prompt tokens for a list of messages."""
+    return sum(estimate_message_tokens(message) for message in messages)
+
+
+def strip_low_value_fields(data: Any) -> Any:
+    """Recursively drop fields that add tokens but no information."""
+    if isinstance(data, dict):
+        return {
+            key: strip_low_value_fields(value)
+            for key, value in data.items()
+            if key not in LOW_VALUE_FIELDS and value is not None
+        }
+    if isinstance(data, list):
+        return [strip_low_value_fields(item) for item in data]
+    return data
+
+
+def compact_json(data: Any) -> str:
+    """Serialize to JSON without indentation or padding."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class TokenBudgeter:
+    """
+    Fit prompts into a fixed token budget.
+
+    `max_prompt_tokens` caps the whole prompt; `tool_result_tokens` is the
+    share reserved for tool payloads, so history can't starve the data the
+    model needs for the current turn.
+    """
+
+    def __init__(
+        self,
+        max_prompt_tokens: Optional[int] = None,
+        tool_result_tokens: Optional[int] = None
+    ):
+        self.max_prompt_tokens = max_prompt_tokens or settings.prompt_token_budget
+        self.tool_result_tokens = tool_result_tokens or settings.prompt_tool_result_tokens
+
+        # Performance tracking
+        self._turns_dropped = 0
+        self._tool_items_dropped = 0
+        self._tool_fields_truncated = 0
+        self._trimmed_prompts = 0
+
+    def history_budget(self, system_prompt: str, user_message: str) -> int:
+        """Tokens left for conversation history."""
+        fixed = (
+            estimate_tokens(system_prompt)
+            + estimate_tokens(user_message)
+            + 2 * MESSAGE_OVERHEAD_TOKENS
+        )
+        return max(0, self.max_prompt_tokens - self.tool_result_tokens - fixed)
+
+    def fit_history(
+        self,
+        system_prompt: str,
+        history: Sequence[BaseMessage],
+        user_message: str
+    ) -> List[BaseMessage]:
+        """
+        Keep the most recent history that fits the budget.
+
+        Turns are dropped oldest first. A leading non-human message is
+        dropped too, so history never starts mid-exchange.
+        """
+        budget = self.history_budget(system_prompt, user_message)
+
+        kept: List[BaseMessage] = []
+        used = 0
+        for message in reversed(history):
+            cost = estimate_message_tokens(message)
+            if used + cost > budget:
+                break
+            kept.append(message)
+            used += cost
+        kept.reverse()
+
+        while kept and not isinstance(kept[0], HumanMessage):
+            kept.pop(0)
+
+        dropped = len(history) - len(kept)
+        if dropped:
+            self._turns_dropped += dropped
+            self._trimmed_prompts += 1
+            logger.debug(f"Dropped {dropped} oldest history messages to fit {budget} token budget")
+
+        return kept
+
+    def format_tool_results(
+        self,
+        tool_results: List[Dict[str, Any]],
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """
+        Serialize tool results within the tool-result budget.
+
+        Low-value fields are stripped and JSON is compacted first; if that
+        is still too large, the longest result lists lose trailing items,
+        then the longest strings are shortened. The payload is always valid
+        JSON: if nothing fits, each result is replaced by a truncation
+        summary.
+        """
+        budget = min(max_tokens, self.tool_result_tokens) if max_tokens is not None else self.tool_result_tokens
+        results = strip_low_value_fields(tool_results)
+
+        payload = compact_json(results)
+        if estimate_tokens(payload) <= budget:
+            return payload
+
+        self._trimmed_prompts += 1
+        while estimate_tokens(payload) > budget:
+            index, items = self._largest_result_list(results)
+            if items is None or len(items) <= 1:
+                break
+            items.pop()
+            self._tool_items_dropped += 1
+            results[index]["omitted_items"] = results[index].get("omitted_items", 0) + 1
+            payload = compact_json(results)
+
+        # Nothing left to trim item by item; shorten the longest strings
+        while estimate_tokens(payload) > budget:
+            container, key, text = self._longest_string(results)
+            keep = max(MIN_TRUNCATED_CHARS, len(text) - (len(payload) - budget * CHARS_PER_TOKEN) - 1)
+            if container is None or keep + 1 >= len(text):
+                payload = compact_json(self._truncation_summary(results))
+                break
+            container[key] = text[:keep] + "…"
+            self._tool_fields_truncated += 1
+            payload = compact_json(results)
+
+        logger.debug(f"Trimmed tool results to ~{estimate_tokens(payload)} tokens (budget {budget})")
+        return payload
+
+    @staticmethod
+    def _longest_string(data: Any, container: Any = None, key: Any = None) -> Tuple[Any, Any, str]:
+        """Find the longest string value and the dict or list holding it."""
+        if isinstance(data, str):
+            return container, key, data
+        children = data.items() if isinstance(data, dict) else enumerate(data) if isinstance(data, list) else ()
+        best: Tuple[Any, Any, str] = (None, None, "")
+        for child_key, child in children:
+            found = TokenBudgeter._longest_string(child, data, child_key)
+            if found[0] is not None and len(found[2]) > len(best[2]):
+                best = found
+        return best
+
+    @staticmethod
+    def _truncation_summary(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Stand-in for results that can't fit the budget at all."""
+        summary = []
+        for result in results:
+            entry: Dict[str, Any] = {"status": "truncated"}
+            if isinstance(result, dict) and result.get("tool_name"):
+                entry["tool_name"] = result["tool_name"]
+            summary.append(entry)
+        return summary
+
+    @staticmethod
+    def _largest_result_list(results: List[Dict[str, Any]]) -> Tuple[int, Optional[List[Any]]]:
+        """Find the tool result whose list payload is the longest."""
+        best_index, best_items = -1, None
+        for index, result in enumerate(results):
+            items = result.get("result") if isinstance(result, dict) else None
+            if isinstance(items, list) and (best_items is None or len(items) > len(best_items)):
+                best_index, best_items = index, items
+        return best_index, best_items
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get budgeting statistics."""
+        return {
+            "max_prompt_tokens": self.max_prompt_tokens,
+            "tool_result_tokens": self.tool_result_tokens,
+            "trimmed_prompts": self._trimmed_prompts,
+            "history_messages_dropped": self._turns_dropped,
+            "tool_items_dropped": self._tool_items_dropped,
+            "tool_fields_truncated": self._tool_fields_truncated
+        }
@@ -24,7 +24,7 @@ from .api.auth import router as auth_router
 from .api.health import router as health_router
 from .api.websocket import router as websocket_router
 from .utils.exceptions import ChatBetException
-from .services.conversation_manager import get_conversation_manager
+from .services.conversation_manager import get_conversation_manager, cleanup_conversation_manager
 from .services.websocket_manager import WebSocketConnectionManager
 from .services.sports_streaming import get_sports_streamer, cleanup_sports_streamer
 
@@ -49,6 +49,9 @@ async def startup_event():
         websocket_manager = WebSocketConnectionManager()
         app.state.websocket_manager = websocket_manager
         
+        # Initialize conversation manager (connects conversation persistence)
+        await get_conversation_manager().initialize()
+        
         # Initialize sports streamer
         sports_streamer = get_sports_streamer(websocket_manager)
         await sports_streamer.initialize()
@@ -77,6 +80,9 @@ async def shutdown_event():
             for session_id in active_sessions:
                 await manager.disconnect(session_id, "server_shutdown")
         
+        # Flush pending conversation writes
+        await cleanup_conversation_manager()
+        
         logger.info("Services cleaned up successfully")
     except Exception as e:
         logger.error(f"Error during cleanup: {e}")
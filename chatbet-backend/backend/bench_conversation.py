@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Local load test for the conversation and WebSocket layers.
+
+Runs the real ConversationManager (and optionally the real WebSocket chat
+endpoint) against the fake LLM provider, so orchestration throughput can
+be measured without network access or provider spend. Results are
+reproducible for a given seed and set of options.
+
+Examples:
+    python bench_conversation.py --sessions 50 --turns 4
+    python bench_conversation.py --mode websocket --sessions 20 --latency-ms 300
+    python bench_conversation.py --mode stream --tokens-per-second 60
+    python bench_conversation.py --error-rate 0.05 --distribution uniform
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+
+QUESTIONS = [
+    "Hello",
+    "What matches are today?",
+    "When does Barcelona play?",
+    "What are the odds for Real Madrid?",
+    "Who should I bet on this weekend?",
+    "Compare Barcelona vs Sevilla",
+    "Help",
+    "Which tournaments are available?",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark ChatBet orchestration with the fake LLM provider")
+    parser.add_argument("--mode", choices=["conversation", "stream", "websocket"], default="conversation")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent sessions")
+    parser.add_argument("--turns", type=int, default=3, help="Messages per session")
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="Fake provider mean latency")
+    parser.add_argument("--jitter-ms", type=float, default=150.0, help="Fake provider latency spread")
+    parser.add_argument("--distribution", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="Fake provider generation rate")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Injected provider error probability")
+    parser.add_argument("--tool-calls", action="store_true", help="Issue scripted and planned tool calls (hits the sports API)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args()
+
+
+def configure_environment(args):
+    """Settings are read at import time, so configure before importing the app."""
+    os.environ.update({
+        "LLM_PROVIDER": "fake",
+        "FAKE_LLM_LATENCY_MS": str(args.latency_ms),
+        "FAKE_LLM_LATENCY_JITTER_MS": str(args.jitter_ms),
+        "FAKE_LLM_LATENCY_DISTRIBUTION": args.distribution,
+        "FAKE_LLM_TOKENS_PER_SECOND": str(args.tokens_per_second),
+        "FAKE_LLM_ERROR_RATE": str(args.error_rate),
+        "FAKE_LLM_TOOL_CALLS": str(args.tool_calls).lower(),
+        "TOOL_PLANNING_ENABLED": str(args.tool_calls).lower(),
+        "PREFETCH_ENABLED": str(args.tool_calls).lower(),
+        "FAKE_LLM_SEED": str(args.seed),
+        "LOG_LEVEL": "WARNING",
+    })
+
+
+def summarize(latencies_ms: List[float], elapsed: float, errors: int) -> Dict[str, float]:
+    ordered = sorted(latencies_ms)
+    return {
+        "requests": len(ordered) + errors,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed > 0 else 0,
+        "p50_ms": round(statistics.median(ordered), 1) if ordered else 0,
+        "p95_ms": round(ordered[max(int(len(ordered) * 0.95) - 1, 0)], 1) if ordered else 0,
+        "max_ms": round(ordered[-1], 1) if ordered else 0,
+    }
+
+
+async def bench_conversation(args) -> Dict[str, float]:
+    from app.models.conversation import ChatRequest
+    from app.services.conversation_manager import get_conversation_manager
+
+    manager = get_conversation_manager()
+    rng = random.Random(args.seed)
+    scripts = [[rng.choice(QUESTIONS) for _ in range(args.turns)] for _ in range(args.sessions)]
+    latencies: List[float] = []
+    errors = 0
+
+    async def run_session(index: int):
+        nonlocal errors
+        for question in scripts[index]:
+            start = time.perf_counter()
+            try:
+                await manager.process_message(ChatRequest(
+                    message=question,
+                    user_id=f"bench_user_{index}",
+                    session_id=f"bench_session_{index}",
+                    max_tokens=None,
+                    temperature=None
+                ))
+                latencies.append((time.perf_counter() - start) * 1000)
+            except Exception:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(i) for i in range(args.sessions)))
+    results = summarize(latencies, time.perf_counter() - start, errors)
+    results["llm"] = manager.llm_service.get_performance_stats()["scheduler"]
+    return results
+
+
+async def bench_stream(args) -> Dict[str, float]:
+    """Like `bench_conversation`, through `process_message_stream`, also timing the first chunk."""
+    from app.models.conversation import ChatRequest
+    from app.services.conversation_manager import get_conversation_manager
+
+    manager = get_conversation_manager()
+    rng = random.Random(args.seed)
+    scripts = [[rng.choice(QUESTIONS) for _ in range(args.turns)] for _ in range(args.sessions)]
+    latencies: List[float] = []
+    first_chunks: List[float] = []
+    errors = 0
+
+    async def run_session(index: int):
+        nonlocal errors
+        for question in scripts[index]:
+            start = time.perf_counter()
+            first_chunk = None
+            async for chunk in manager.process_message_stream(ChatRequest(
+                message=question,
+                user_id=f"bench_user_{index}",
+                session_id=f"bench_session_{index}",
+                max_tokens=None,
+                temperature=None
+            )):
+                if first_chunk is None:
+                    first_chunk = (time.perf_counter() - start) * 1000
+                if chunk.is_final and (chunk.metadata or {}).get("error"):
+                    errors += 1
+                    break
+            else:
+                latencies.append((time.perf_counter() - start) * 1000)
+                first_chunks.append(first_chunk)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(i) for i in range(args.sessions)))
+    results = summarize(latencies, time.perf_counter() - start, errors)
+    ordered = sorted(first_chunks)
+    results["first_chunk_p50_ms"] = round(statistics.median(ordered), 1) if ordered else 0
+    results["first_chunk_p95_ms"] = round(ordered[max(int(len(ordered) * 0.95) - 1, 0)], 1) if ordered else 0
+    results["streaming"] = manager.get_performance_stats()["streaming"]
+    return results
+
+
+class BenchWebSocket:
+    """In-process WebSocket that replays a scripted client."""
+
+    def __init__(self, questions: List[str], session_id: str):
+        self.questions = questions
+        self.session_id = session_id
+        self.latencies: List[float] = []
+        self.responses = 0
+        self._incoming: asyncio.Queue = asyncio.Queue()
+        self._pending = 0
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+    async def send_text(self, data: str):
+        message = json.loads(data)
+        if message.get("type") == "streaming_end":
+            self.responses += 1
+            # Only the first response to a turn counts towards latency
+            if self._pending > 0:
+                self._pending -= 1
+                self.latencies.append((time.perf_counter() - self._turn_started) * 1000)
+                await self._next_turn()
+
+    async def receive_text(self) -> str:
+        from fastapi import WebSocketDisconnect
+
+        item = await self._incoming.get()
+        if item is None:
+            raise WebSocketDisconnect(code=1000)
+        return item
+
+    async def start(self):
+        self._turn = 0
+        await self._next_turn()
+
+    async def _next_turn(self):
+        if self._turn >= len(self.questions):
+            await self._incoming.put(None)
+            return
+        question = self.questions[self._turn]
+        self._turn += 1
+        self._pending = 1
+        self._turn_started = time.perf_counter()
+        await self._incoming.put(json.dumps({
+            "type": "user_message",
+            "content": question,
+            "user_id": f"user_{self.session_id}",
+            "session_id": self.session_id,
+            "message_id": f"{self.session_id}-{self._turn}",
+        }))
+
+
+async def bench_websocket(args) -> Dict[str, float]:
+    from app.api import websocket as websocket_api
+
+    rng = random.Random(args.seed)
+    sockets = [
+        BenchWebSocket([rng.choice(QUESTIONS) for _ in range(args.turns)], f"ws_bench_{i}")
+        for i in range(args.sessions)
+    ]
+
+    async def run_socket(socket: BenchWebSocket):
+        await socket.start()
+        await websocket_api.websocket_chat_endpoint(socket, user_id=f"user_{socket.session_id}", session_id=socket.session_id)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_socket(s) for s in sockets))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for socket in sockets for latency in socket.latencies]
+    expected = args.sessions * args.turns
+    results = summarize(latencies, elapsed, max(expected - len(latencies), 0))
+    results["responses_per_message"] = round(sum(s.responses for s in sockets) / expected, 2) if expected else 0
+    return results
+
+
+def main():
+    args = parse_args()
+    configure_environment(args)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    runner = {"conversation": bench_conversation, "stream": bench_stream, "websocket": bench_websocket}[args.mode]
+    results = asyncio.run(runner(args))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Mode: {args.mode}  sessions={args.sessions} turns={args.turns} "
+          f"latency={args.latency_ms}±{args.jitter_ms}ms ({args.distribution}) seed={args.seed}")
+    for key, value in results.items():
+        print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
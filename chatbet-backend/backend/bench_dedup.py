@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for duplicate detection of incoming messages.
+
+Compares the per-message cost of the previous approach (a plain dict
+scanned on every message to drop expired ids) with `DedupRegistry`
+(insertion-ordered, expired from the head) as the number of ids inside
+the window grows. Each run starts at steady state: the window already
+holds `volume` ids, and ids expire as fast as new ones arrive.
+
+Examples:
+    python bench_dedup.py
+    python bench_dedup.py --volumes 1000 10000 100000 --messages 20000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark per-message cost of duplicate detection")
+    parser.add_argument("--volumes", type=int, nargs="+", default=[1000, 10000, 50000], help="Ids inside the dedup window")
+    parser.add_argument("--messages", type=int, default=20000, help="Messages timed per volume")
+    parser.add_argument("--scan-messages", type=int, default=500, help="Messages timed for the scanning dict (it is slow)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args()
+
+
+class ManualClock:
+    """One tick per message, so the window holds a fixed number of ids."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def scanning_dict_cost(volume: int, messages: int) -> float:
+    """Microseconds per message with the dict scanned on every message."""
+    processed: Dict[str, float] = {f"warm-{i}": float(i - volume) for i in range(volume)}
+    window = float(volume)
+    start = time.perf_counter()
+    for i in range(messages):
+        now = float(i)
+        message_id = f"msg-{i}"
+        if message_id in processed:
+            continue
+        processed[message_id] = now
+        cutoff = now - window
+        expired = [mid for mid, seen_at in processed.items() if seen_at < cutoff]
+        for mid in expired:
+            del processed[mid]
+    return (time.perf_counter() - start) / messages * 1e6
+
+
+def registry_cost(volume: int, messages: int) -> float:
+    """Microseconds per message with DedupRegistry."""
+    from app.utils.dedup import DedupRegistry
+
+    clock = ManualClock()
+    registry = DedupRegistry(window_seconds=float(volume), max_entries=volume * 2, clock=clock)
+    for i in range(volume):
+        clock.now = float(i - volume)
+        registry.add(f"warm-{i}")
+    start = time.perf_counter()
+    for i in range(messages):
+        clock.now = float(i)
+        registry.add(f"msg-{i}")
+    elapsed = time.perf_counter() - start
+    assert len(registry) <= volume + 1
+    return elapsed / messages * 1e6
+
+
+def main():
+    args = parse_args()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    results: List[Dict[str, float]] = []
+    for volume in args.volumes:
+        results.append({
+            "volume": volume,
+            "scanning_dict_us_per_message": round(scanning_dict_cost(volume, args.scan_messages), 3),
+            "registry_us_per_message": round(registry_cost(volume, args.messages), 3),
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'ids in window':>14} {'scanning dict':>16} {'registry':>12}")
+    for row in results:
+        print(
+            f"{row['volume']:>14} {row['scanning_dict_us_per_message']:>13.2f} us "
+            f"{row['registry_us_per_message']:>9.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for building a turn's LangChain history.
+
+Every turn sends the recent window of the conversation to the model.
+Compares converting that window to fresh `HumanMessage`/`AIMessage`
+objects on every turn (the previous approach) with the message log's
+incremental cache, which converts each row once and hands out views.
+Reports memory allocated and time spent per turn, measured with
+tracemalloc over a conversation of `--turns` exchanges.
+
+Examples:
+    python bench_history.py
+    python bench_history.py --turns 500 --window 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark per-turn LangChain history conversion")
+    parser.add_argument("--turns", type=int, default=200, help="User/assistant exchanges per conversation")
+    parser.add_argument("--window", type=int, default=10, help="Recent messages sent with each turn")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args()
+
+
+def fresh_window(log, window: int) -> List[Any]:
+    """The previous approach: convert the whole window every turn."""
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    messages = []
+    for message in log[max(0, len(log) - window):]:
+        if message.role == "user":
+            messages.append(HumanMessage(content=message.content))
+        elif message.role == "assistant":
+            messages.append(AIMessage(content=message.content))
+    return messages
+
+
+def cached_window(log, window: int) -> Any:
+    return log.to_langchain(max(0, len(log) - window))
+
+
+def measure(build: Callable[[Any, int], Any], turns: int, window: int) -> Dict[str, float]:
+    """Allocated bytes and microseconds per turn to build the history."""
+    from app.models.message_log import MessageLog
+
+    log = MessageLog()
+    allocated = 0
+    elapsed = 0.0
+    tracemalloc.start()
+    for turn in range(turns):
+        log.add("user", f"What are the odds for match {turn}?", id=f"u{turn}", timestamp=float(turn))
+        log.add("assistant", f"Here are the odds for match {turn}: 1.85 / 3.40 / 4.20", id=f"a{turn}", timestamp=float(turn))
+
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        history = build(log, window)
+        elapsed += time.perf_counter() - start
+        allocated += tracemalloc.get_traced_memory()[1] - before
+        assert len(history) == min(window, len(log))
+        del history
+    tracemalloc.stop()
+    return {
+        "bytes_per_turn": allocated / turns,
+        "us_per_turn": elapsed / turns * 1e6,
+    }
+
+
+def main():
+    args = parse_args()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    results = {
+        "fresh_conversion": measure(fresh_window, args.turns, args.window),
+        "incremental_cache": measure(cached_window, args.turns, args.window),
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'approach':>18} {'allocated/turn':>16} {'time/turn':>12}")
+    for name, row in results.items():
+        print(f"{name:>18} {row['bytes_per_turn']:>14.0f} B {row['us_per_turn']:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the local conversation journal.
+
+Simulates `--sessions` active conversations each adding `--turns`
+exchanges, with one journal batch (one write, one fsync) per round of
+turns, the way the background writer batches a flush interval. Reports:
+
+- the cost a turn pays on the hot path (marking the session dirty)
+- the writer's cost and the bytes written per journaled message
+- recovery time at startup, replaying the raw log and then a compacted
+  snapshot of the same state
+
+Examples:
+    python bench_journal.py
+    python bench_journal.py --sessions 1000 --turns 20 --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark conversation journal writes and recovery")
+    parser.add_argument("--sessions", type=int, default=200, help="Active conversations")
+    parser.add_argument("--turns", type=int, default=10, help="User/assistant exchanges per conversation")
+    parser.add_argument("--directory", default=None, help="Journal directory (default: a temporary one)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    return parser.parse_args()
+
+
+async def run(args, directory: str):
+    from app.core.config import settings
+    from app.models.conversation import ChatMessage, Conversation, ConversationContext, MessageRole
+    from app.services.conversation_journal import ConversationJournal
+
+    settings.conversation_journal_enabled = True
+    # Large enough that the write phase never compacts
+    journal = ConversationJournal(directory, compact_bytes=1 << 40)
+    await journal.recover()
+
+    conversations = [
+        Conversation(id=f"bench_{i}", context=ConversationContext(session_id=f"bench_{i}", user_id=f"user_{i}"))
+        for i in range(args.sessions)
+    ]
+
+    mark_seconds = 0.0
+    flush_seconds = 0.0
+    messages = 0
+    for turn in range(args.turns):
+        for conversation in conversations:
+            conversation.add_message(ChatMessage(
+                role=MessageRole.USER, content=f"What are the odds for match {turn}?",
+                detected_intent="odds_information_query", intent_confidence=0.92
+            ))
+            conversation.add_message(ChatMessage(
+                role=MessageRole.ASSISTANT, content=f"Here are the odds for match {turn}: 1.85 / 3.40 / 4.20",
+                response_time_ms=850
+            ))
+            start = time.perf_counter()
+            journal.mark_dirty(conversation)
+            mark_seconds += time.perf_counter() - start
+            messages += 2
+
+        start = time.perf_counter()
+        await journal.flush()
+        flush_seconds += time.perf_counter() - start
+
+    stats = journal.get_stats()
+    await journal.shutdown()
+    log_bytes = os.path.getsize(journal.log_path)
+
+    start = time.perf_counter()
+    recovered = await ConversationJournal(directory).recover()
+    log_recovery_ms = (time.perf_counter() - start) * 1000
+    assert len(recovered) == args.sessions
+
+    compactor = ConversationJournal(directory)
+    await compactor.recover()
+    await compactor.compact()
+    await compactor.shutdown()
+
+    start = time.perf_counter()
+    recovered = await ConversationJournal(directory).recover()
+    snapshot_recovery_ms = (time.perf_counter() - start) * 1000
+    assert sum(c.message_count for c in recovered) == messages
+
+    return {
+        "sessions": args.sessions,
+        "messages": messages,
+        "batches": stats["batches"],
+        "mark_dirty_us_per_turn": mark_seconds / (args.sessions * args.turns) * 1e6,
+        "writer_us_per_message": flush_seconds / messages * 1e6,
+        "bytes_per_message": stats["bytes_written"] / messages,
+        "avg_batch_write_ms": stats["avg_write_ms"],
+        "log_bytes": log_bytes,
+        "log_recovery_ms": log_recovery_ms,
+        "snapshot_bytes": os.path.getsize(compactor.snapshot_path),
+        "snapshot_recovery_ms": snapshot_recovery_ms,
+    }
+
+
+def main():
+    args = parse_args()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    if args.directory:
+        results = asyncio.run(run(args, args.directory))
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            results = asyncio.run(run(args, directory))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{results['sessions']} sessions, {results['messages']} messages in {results['batches']} fsynced batches")
+    print(f"  hot path (mark dirty):  {results['mark_dirty_us_per_turn']:8.2f} us/turn")
+    print(f"  writer:                 {results['writer_us_per_message']:8.2f} us/message, {results['bytes_per_message']:.0f} B/message")
+    print(f"  batch write + fsync:    {results['avg_batch_write_ms']:8.2f} ms")
+    print(f"  recovery from log:      {results['log_recovery_ms']:8.1f} ms ({results['log_bytes'] / 1024:.0f} KB)")
+    print(f"  recovery from snapshot: {results['snapshot_recovery_ms']:8.1f} ms ({results['snapshot_bytes'] / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
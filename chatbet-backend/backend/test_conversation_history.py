@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for reading and clearing conversation history.
+
+Checks cursor pagination over the message log, that page rows match the
+`ChatMessage` JSON they replace, and the per-user session index used to
+list and clear a user's conversations.
+"""
+
+import asyncio
+
+from app.models.conversation import ChatMessage, Conversation, ConversationContext, MessageRole
+from app.services.conversation_manager import ConversationManager
+from app.services.session_store import SessionStore
+
+
+def make_conversation(session_id: str, user_id=None, turns: int = 0) -> Conversation:
+    conversation = Conversation(
+        id=session_id,
+        context=ConversationContext(session_id=session_id, user_id=user_id, is_authenticated=user_id is not None)
+    )
+    for i in range(turns):
+        conversation.add_message(ChatMessage(role=MessageRole.USER, content=f"question {i}", detected_intent="greeting", intent_confidence=0.9))
+        conversation.add_message(ChatMessage(role=MessageRole.ASSISTANT, content=f"answer {i}", response_time_ms=15))
+    return conversation
+
+
+def test_cursor_pages():
+    """Cursors walk the whole log; rows are the same JSON the models produced."""
+    print("Testing cursor pagination...")
+
+    log = make_conversation("pages", user_id="u1", turns=5).messages
+    seen = []
+    cursor = None
+    while True:
+        page = log.page(cursor, limit=4)
+        seen.extend(row["content"] for row in page.to_dicts())
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == [m.content for m in log] and len(seen) == 10
+
+    expected = [message.to_chat_message().model_dump(mode="json") for message in log[2:4]]
+    assert log.page("2", limit=2).to_dicts() == expected
+    assert len(log.page(limit=0)) == 10, "No limit returns everything"
+    assert log.page("10").to_dicts() == [] and log.page("10").next_cursor is None
+
+    for bad in ("abc", "-1", "11"):
+        try:
+            log.page(bad)
+            raise AssertionError(f"cursor {bad!r} accepted")
+        except ValueError:
+            pass
+    print("✅ Cursor pagination working correctly")
+
+
+def test_store_user_index():
+    """The store tracks each user's sessions through put, pop and eviction."""
+    print("\nTesting per-user session index...")
+
+    store = SessionStore(max_entries=3, max_bytes=10**9, idle_timeout=60)
+    for session_id, user_id in (("a1", "alice"), ("b1", "bob"), ("a2", "alice")):
+        store.put(session_id, make_conversation(session_id, user_id))
+    store.put("anon", make_conversation("anon"))
+
+    # "a1" was least recently used and made room for "anon"
+    assert store.sessions_for("alice") == ["a2"]
+    store.get("b1")
+    store.pop("b1")
+    assert store.sessions_for("bob") == [] and store.get_stats()["indexed_users"] == 1
+    print("✅ Per-user session index working correctly")
+
+
+def test_manager_lists_and_clears():
+    """Listing and clearing only touch the user's own sessions."""
+    print("\nTesting conversation manager integration...")
+
+    async def run():
+        manager = ConversationManager()
+        for session_id, user_id, turns in (("a1", "alice", 1), ("a2", "alice", 3), ("b1", "bob", 2)):
+            manager.store.put(session_id, make_conversation(session_id, user_id, turns))
+
+        summaries = await manager.list_conversations("alice")
+        assert [s.id for s in summaries] == ["a2", "a1"]
+        assert summaries[0].message_count == 6 and summaries[0].last_message_preview == "answer 2"
+
+        page = await manager.get_history_page("a2", user_id="alice", cursor="4", limit=10)
+        assert [row["content"] for row in page.to_dicts()] == ["question 2", "answer 2"]
+        assert await manager.get_history_page("b1", user_id="alice") is None, "Other users' sessions are hidden"
+
+        await manager.clear_conversation_history("alice", session_id="b1")
+        assert "b1" in manager.store, "A session of another user is not cleared"
+        await manager.clear_conversation_history("alice")
+        assert await manager.list_conversations("alice") == []
+        assert "b1" in manager.store and len(manager.store) == 1
+
+    asyncio.run(run())
+    print("✅ Conversation manager lists and clears by user")
+
+
+if __name__ == "__main__":
+    test_cursor_pages()
+    test_store_user_index()
+    test_manager_lists_and_clears()
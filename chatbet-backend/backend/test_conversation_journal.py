@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Test script for the local conversation journal.
+
+Checks that journaled conversations come back after a restart, that a
+torn write at the end of the log is dropped, that compaction keeps the
+same state, and the conversation manager wiring.
+"""
+
+import asyncio
+import errno
+import os
+import tempfile
+
+from app.core.config import settings
+from app.models.conversation import ChatMessage, Conversation, ConversationContext, MessageRole
+from app.services.conversation_journal import ConversationJournal
+from app.services.conversation_manager import ConversationManager
+
+
+def make_conversation(session_id: str, turns: int, user_id=None) -> Conversation:
+    conversation = Conversation(
+        id=session_id,
+        context=ConversationContext(session_id=session_id, user_id=user_id, is_authenticated=user_id is not None)
+    )
+    add_turns(conversation, turns)
+    return conversation
+
+
+def add_turns(conversation: Conversation, turns: int, start: int = 0):
+    for i in range(start, start + turns):
+        conversation.add_message(ChatMessage(role=MessageRole.USER, content=f"question {i}", detected_intent="greeting", intent_confidence=0.9))
+        conversation.add_message(ChatMessage(role=MessageRole.ASSISTANT, content=f"answer {i}", response_time_ms=15))
+
+
+def with_journal(run):
+    """Run a scenario with the journal enabled in a fresh directory."""
+    previous = settings.conversation_journal_enabled
+    settings.conversation_journal_enabled = True
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            asyncio.run(run(directory))
+    finally:
+        settings.conversation_journal_enabled = previous
+
+
+def test_restart_recovery():
+    """New messages are appended incrementally and replayed in order."""
+    print("Testing warm restart...")
+
+    async def run(directory):
+        journal = ConversationJournal(directory, flush_interval=0.01)
+        assert await journal.recover() == []
+        first = make_conversation("j1", 2, user_id="u1")
+        journal.mark_dirty(first)
+        journal.mark_dirty(make_conversation("j2", 1))
+        await journal.flush()
+
+        add_turns(first, 1, start=2)
+        journal.mark_dirty(first)
+        journal.mark_dirty(make_conversation("j3", 1))
+        journal.delete("j3")
+        await journal.flush()
+        assert journal.get_stats()["batches"] == 2
+        await journal.shutdown()
+
+        restarted = ConversationJournal(directory)
+        recovered = {c.id: c for c in await restarted.recover()}
+        assert set(recovered) == {"j1", "j2"}, "Deleted sessions stay deleted"
+        assert [m.content for m in recovered["j1"].messages] == [m.content for m in first.messages]
+        assert [m.id for m in recovered["j1"].messages] == [m.id for m in first.messages]
+        assert recovered["j1"].context.user_id == "u1"
+        assert recovered["j1"].messages[0].detected_intent == "greeting"
+
+        # Appends continue where the old process stopped
+        add_turns(recovered["j1"], 1, start=3)
+        restarted.mark_dirty(recovered["j1"])
+        assert await restarted.flush() == 3, "Only metadata and the two new messages are written"
+        await restarted.shutdown()
+
+    with_journal(run)
+    print("✅ Conversations recovered after restart")
+
+
+def test_torn_tail_dropped():
+    """A crash mid-write loses only the torn frame."""
+    print("\nTesting torn write recovery...")
+
+    async def run(directory):
+        journal = ConversationJournal(directory)
+        await journal.recover()
+        journal.mark_dirty(make_conversation("t1", 2))
+        await journal.flush()
+        await journal.shutdown()
+        intact = os.path.getsize(journal.log_path)
+
+        with open(journal.log_path, "ab") as f:
+            f.write(b"\x00\x00\x01\x00garbage")
+
+        restarted = ConversationJournal(directory)
+        recovered = await restarted.recover()
+        assert [c.message_count for c in recovered] == [4]
+        assert os.path.getsize(restarted.log_path) == intact, "Torn bytes are cut off"
+        await restarted.shutdown()
+
+    with_journal(run)
+    print("✅ Torn writes dropped on recovery")
+
+
+def test_failed_write_rolled_back():
+    """A write that fails mid-batch is cut off and retried, deletes included."""
+    print("\nTesting failed writes...")
+
+    class FullDisk:
+        """Writes half of the data, then fails like a full disk."""
+
+        def __init__(self, file):
+            self.file = file
+
+        def write(self, data):
+            self.file.write(data[:len(data) // 2])
+            self.file.flush()
+            raise OSError(errno.ENOSPC, "No space left on device")
+
+        def __getattr__(self, name):
+            return getattr(self.file, name)
+
+    async def run(directory):
+        journal = ConversationJournal(directory)
+        await journal.recover()
+        first = make_conversation("f1", 1)
+        journal.mark_dirty(first)
+        journal.mark_dirty(make_conversation("f2", 1))
+        await journal.flush()
+        intact = os.path.getsize(journal.log_path)
+
+        add_turns(first, 1, start=1)
+        journal.mark_dirty(first)
+        journal.delete("f2")
+        journal._file = FullDisk(journal._file)
+        assert await journal.flush() == 0
+        assert os.path.getsize(journal.log_path) == intact, "The partial batch is cut off"
+        assert journal.get_stats()["dirty_sessions"] == 1
+
+        # Later batches follow intact frames and carry the failed one's events
+        add_turns(first, 1, start=2)
+        await journal.flush()
+        await journal.shutdown()
+
+        recovered = await ConversationJournal(directory).recover()
+        assert [c.id for c in recovered] == ["f1"], "The delete survived the failure"
+        assert [m.content for m in recovered[0].messages] == [m.content for m in first.messages]
+
+    with_journal(run)
+    print("✅ Failed writes rolled back and retried")
+
+
+def test_compaction():
+    """Compaction folds the log into a snapshot without changing the state."""
+    print("\nTesting compaction...")
+
+    async def run(directory):
+        journal = ConversationJournal(directory, compact_bytes=2048)
+        await journal.recover()
+        conversation = make_conversation("c1", 1)
+        for turn in range(1, 12):
+            journal.mark_dirty(conversation)
+            await journal.flush()
+            add_turns(conversation, 1, start=turn)
+        journal.mark_dirty(make_conversation("c2", 1))
+        journal.delete("c2")
+        await journal.flush()
+        await journal.compact()
+        stats = journal.get_stats()
+        assert stats["compactions"] >= 2 and stats["log_bytes"] == 0
+        await journal.shutdown()
+
+        recovered = await ConversationJournal(directory).recover()
+        assert [c.id for c in recovered] == ["c1"]
+        assert recovered[0].message_count == 22
+
+    with_journal(run)
+    print("✅ Compaction keeps the journaled state")
+
+
+def test_manager_recovers_sessions():
+    """A restarted conversation manager serves the journaled sessions."""
+    print("\nTesting conversation manager integration...")
+
+    async def run(directory):
+        previous = settings.conversation_journal_dir
+        settings.conversation_journal_dir = directory
+        try:
+            manager = ConversationManager()
+            await manager.journal.recover()
+            conversation = make_conversation("m1", 2, user_id="alice")
+            manager.store.put("m1", conversation)
+            manager._schedule_background_work(conversation)
+            await manager.journal.shutdown()
+
+            restarted = ConversationManager()
+            await restarted.initialize()
+            assert "m1" in restarted.store
+            assert restarted.store.sessions_for("alice") == ["m1"]
+            assert restarted.get_performance_stats()["journal"]["recovered_sessions"] == 1
+
+            await restarted.clear_conversation("m1")
+            await restarted.journal.shutdown()
+            assert await ConversationJournal(directory).recover() == []
+        finally:
+            settings.conversation_journal_dir = previous
+
+    with_journal(run)
+    print("✅ Conversation manager restores journaled sessions")
+
+
+if __name__ == "__main__":
+    test_restart_recovery()
+    test_torn_tail_dropped()
+    test_failed_write_rolled_back()
+    test_compaction()
+    test_manager_recovers_sessions()
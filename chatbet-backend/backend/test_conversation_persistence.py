@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Test script for Redis-backed conversation persistence.
+
+Runs against an in-memory stand-in for the Redis client that counts
+pipeline round trips, and uses two conversation managers sharing it as
+two workers.
+"""
+
+import asyncio
+from typing import Dict, List, Set
+
+from app.core.config import settings
+from app.models.conversation import ChatMessage, Conversation, ConversationContext, MessageRole
+from app.services.conversation_manager import ConversationManager
+from app.services.conversation_persistence import (
+    ConversationPersistence, decode_message, encode_message
+)
+from app.utils.cache import RedisCache
+
+
+class MemoryRedis:
+    """Just the Redis commands the conversation log uses."""
+
+    def __init__(self):
+        self.values: Dict[str, bytes] = {}
+        self.lists: Dict[str, List[bytes]] = {}
+        self.sets: Dict[str, Set[str]] = {}
+        self.round_trips = 0
+        self.transactions: List[bool] = []
+        # Replies to drop after the commands were applied, like a client timeout after EXEC
+        self.lost_replies = 0
+
+    def pipeline(self, transaction: bool = True):
+        self.transactions.append(transaction)
+        return MemoryPipeline(self)
+
+    async def llen(self, key):
+        self.round_trips += 1
+        return len(self.lists.get(key, []))
+
+    async def smembers(self, key):
+        self.round_trips += 1
+        return {member.encode() for member in self.sets.get(key, ())}
+
+
+class MemoryPipeline:
+    def __init__(self, redis: MemoryRedis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        results = []
+        for name, args in self.commands:
+            if name == "eval":
+                # The conversation log append script
+                _, _, meta_key, messages_key, ttl, meta, position, *records = args
+                stored = self.redis.lists.setdefault(messages_key, [])
+                new = records[max(len(stored) - position, 0):]
+                stored.extend(new)
+                self.redis.values[meta_key] = meta
+                results.append(len(new))
+            elif name == "setex":
+                self.redis.values[args[0]] = args[2]
+                results.append(True)
+            elif name == "rpush":
+                self.redis.lists.setdefault(args[0], []).extend(args[1:])
+                results.append(len(self.redis.lists[args[0]]))
+            elif name == "get":
+                results.append(self.redis.values.get(args[0]))
+            elif name == "lrange":
+                results.append(list(self.redis.lists.get(args[0], [])))
+            elif name == "delete":
+                for key in args:
+                    self.redis.values.pop(key, None)
+                    self.redis.lists.pop(key, None)
+                results.append(len(args))
+            elif name == "sadd":
+                self.redis.sets.setdefault(args[0], set()).update(args[1:])
+                results.append(1)
+            elif name == "srem":
+                self.redis.sets.get(args[0], set()).difference_update(args[1:])
+                results.append(1)
+            else:
+                results.append(True)
+        if self.redis.lost_replies:
+            self.redis.lost_replies -= 1
+            raise ConnectionError("Timeout reading from socket")
+        return results
+
+
+def make_cache(redis: MemoryRedis) -> RedisCache:
+    cache = RedisCache()
+    cache.redis = redis
+    cache._connected = True
+    return cache
+
+
+def add_turn(conversation: Conversation, text: str):
+    conversation.add_message(ChatMessage(role=MessageRole.USER, content=text, detected_intent="greeting", intent_confidence=0.9))
+    conversation.add_message(ChatMessage(role=MessageRole.ASSISTANT, content=f"Reply to {text}", response_time_ms=120))
+
+
+def test_compact_messages():
+    """Message records round-trip and are much smaller than the model's JSON."""
+    print("Testing compact message encoding...")
+
+    message = ChatMessage(role=MessageRole.USER, content="When does Barcelona play?", session_id="s1", detected_intent="match_schedule_query", intent_confidence=0.93)
+    record = encode_message(message)
+    decoded = decode_message(record, "s1")
+
+    assert decoded.id == message.id and decoded.content == message.content
+    assert decoded.role == message.role and decoded.detected_intent == message.detected_intent
+    assert abs((decoded.timestamp - message.timestamp).total_seconds()) < 0.001
+    assert len(record) < len(message.model_dump_json()) / 2
+    print(f"✅ Message record is {len(record)} bytes vs {len(message.model_dump_json())} as a model")
+
+
+def test_write_behind_batches():
+    """Dirty sessions are written together, and only their new messages."""
+    print("\nTesting write-behind batching...")
+
+    async def run():
+        original = settings.conversation_persistence_enabled
+        settings.conversation_persistence_enabled = True
+        try:
+            redis = MemoryRedis()
+            persistence = ConversationPersistence(make_cache(redis), flush_interval=0.01)
+            conversations = [Conversation(id=f"s{i}", context=ConversationContext(session_id=f"s{i}")) for i in range(3)]
+            for conversation in conversations:
+                add_turn(conversation, "hello")
+                assert persistence.mark_dirty(conversation) is not None
+            assert redis.round_trips == 0, "Marking dirty never waits on Redis"
+
+            await asyncio.sleep(0.05)
+            assert redis.round_trips == 1, "Three sessions, one pipeline"
+            assert redis.transactions == [True], "Batches are written in MULTI/EXEC"
+            assert len(redis.lists["conversation_log:s0:messages"]) == 2
+
+            add_turn(conversations[0], "again")
+            persistence.mark_dirty(conversations[0])
+            assert await persistence.flush() == 2, "Only the new turn is appended"
+            assert len(redis.lists["conversation_log:s0:messages"]) == 4
+
+            stats = persistence.get_stats()
+            assert stats["flushed_messages"] == 8 and stats["dirty_sessions"] == 0
+        finally:
+            settings.conversation_persistence_enabled = original
+
+    asyncio.run(run())
+    print("✅ Write-behind batching working correctly")
+
+
+def test_lost_reply_not_duplicated():
+    """A batch retried after its write went through appends nothing twice."""
+    print("\nTesting retried batches...")
+
+    async def run():
+        original = settings.conversation_persistence_enabled
+        settings.conversation_persistence_enabled = True
+        try:
+            redis = MemoryRedis()
+            persistence = ConversationPersistence(make_cache(redis))
+            conversation = Conversation(id="r1", context=ConversationContext(session_id="r1"))
+            add_turn(conversation, "hello")
+            persistence.mark_dirty(conversation)
+            await persistence.flush()
+
+            add_turn(conversation, "again")
+            persistence.mark_dirty(conversation)
+            redis.lost_replies = 1
+            assert await persistence.flush() == 0, "The write looks failed and is requeued"
+            assert persistence.get_stats()["dirty_sessions"] == 1
+
+            add_turn(conversation, "once more")
+            await persistence.flush()
+            assert [decode_message(r, "r1").content for r in redis.lists["conversation_log:r1:messages"]] == [
+                m.content for m in conversation.messages
+            ]
+        finally:
+            settings.conversation_persistence_enabled = original
+
+    asyncio.run(run())
+    print("✅ Retried batches don't duplicate messages")
+
+
+def test_workers_share_sessions():
+    """A session served by one worker is resumed by another, and back."""
+    print("\nTesting sessions shared across workers...")
+
+    async def run():
+        original = settings.conversation_persistence_enabled, settings.prefetch_enabled
+        settings.conversation_persistence_enabled, settings.prefetch_enabled = True, False
+        try:
+            redis = MemoryRedis()
+            workers = []
+            for _ in range(2):
+                manager = ConversationManager()
+                manager.persistence = ConversationPersistence(make_cache(redis))
+                workers.append(manager)
+            first, second = workers
+
+            conversation = await first.start_conversation(user_id="u1", session_id="shared")
+            conversation.context.add_mentioned_team("barcelona")
+            add_turn(conversation, "When does Barcelona play?")
+            first._schedule_background_work(conversation)
+            await first.persistence.flush()
+
+            hydrated = await second.start_conversation(session_id="shared")
+            assert [m.content for m in hydrated.messages] == [m.content for m in conversation.messages]
+            assert hydrated.context.mentioned_teams == ["barcelona"] and hydrated.context.user_id == "u1"
+            assert len(second.store.peek("shared").history.messages) == 2
+
+            add_turn(hydrated, "And the odds?")
+            second._schedule_background_work(hydrated)
+            await second.persistence.flush()
+
+            # The first worker's copy is now behind and gets replaced
+            resumed = await first.start_conversation(session_id="shared")
+            assert resumed is not conversation and resumed.message_count == 4
+            assert first.persistence.get_stats()["stale_reloads"] == 1
+
+            # A worker that never served the user lists the session from Redis
+            third = ConversationManager()
+            third.persistence = ConversationPersistence(make_cache(redis))
+            summaries = await third.list_conversations("u1")
+            assert [s.id for s in summaries] == ["shared"] and summaries[0].message_count == 4
+
+            await first.clear_conversation("shared")
+            assert await second.persistence.load("shared") is None
+            assert await second.persistence.sessions_for("u1") == []
+        finally:
+            settings.conversation_persistence_enabled, settings.prefetch_enabled = original
+
+    asyncio.run(run())
+    print("✅ Sessions shared across workers")
+
+
+if __name__ == "__main__":
+    test_compact_messages()
+    test_write_behind_batches()
+    test_lost_reply_not_duplicated()
+    test_workers_share_sessions()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test script for per-turn deadline propagation.
+
+Checks the deadline context variable itself, and that the scheduler,
+the retry helper and intent classification respect what's left of the
+turn instead of their own, longer timeouts.
+"""
+
+import asyncio
+import time
+
+from langchain_core.messages import AIMessageChunk, HumanMessage
+
+from app.core import deadline
+from app.core.config import settings
+from app.models.conversation import IntentType
+from app.services.llm_providers import FakeChatModel
+from app.services.llm_scheduler import LLMScheduler
+from app.services.llm_service import DEADLINE_MESSAGE, ChatBetLLMService, IntentClassifier, _retry_api_call
+from app.services.prompts import INTENT_PROMPT
+from app.utils.exceptions import DeadlineExceededError, LLMBusyError
+
+
+def test_deadline_scope():
+    """Scopes nest by tightening and are visible to child tasks."""
+    print("Testing deadline scopes...")
+
+    assert deadline.remaining() is None and deadline.clamp_timeout(30) == 30
+
+    async def run():
+        with deadline.deadline_scope(10):
+            assert 9 < deadline.remaining() <= 10
+            with deadline.deadline_scope(60):
+                assert deadline.remaining() <= 10, "Nested scope must not extend the deadline"
+            with deadline.deadline_scope(0.5):
+                assert deadline.clamp_timeout(30) <= 0.5
+                # Tasks copy the context, so spawned work sees the same deadline
+                assert await asyncio.create_task(_remaining()) <= 0.5
+            with deadline.no_deadline():
+                assert deadline.remaining() is None
+
+        with deadline.deadline_scope(0.01):
+            await asyncio.sleep(0.02)
+            try:
+                deadline.check_deadline("test")
+                raise AssertionError("Expected DeadlineExceededError")
+            except DeadlineExceededError as e:
+                assert e.error_code == "deadline_exceeded"
+
+    async def _remaining():
+        return deadline.remaining()
+
+    asyncio.run(run())
+    print("✅ Deadline scopes working correctly")
+
+
+def test_scheduler_and_retries_yield():
+    """Queueing and retry backoff stop at the turn deadline."""
+    print("\nTesting scheduler and retry deadline handling...")
+
+    async def run():
+        scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=10**9, interactive_max_wait=10)
+
+        async def hold():
+            async with scheduler.slot("holder"):
+                await asyncio.sleep(0.3)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+        start = time.monotonic()
+        with deadline.deadline_scope(0.1):
+            try:
+                async with scheduler.slot("late"):
+                    raise AssertionError("Slot should not be granted")
+            except LLMBusyError:
+                pass
+        assert time.monotonic() - start < 0.2
+        await holder
+
+        calls = []
+
+        async def flaky():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        with deadline.deadline_scope(settings.deadline_answer_reserve_seconds + 0.5):
+            start = time.monotonic()
+            try:
+                await _retry_api_call(flaky, 2, 1.0)
+            except RuntimeError:
+                pass
+        assert len(calls) == 1, "No time to back off, so no retries"
+        assert time.monotonic() - start < 0.1
+
+    asyncio.run(run())
+    print("✅ Scheduler and retries respect the deadline")
+
+
+def test_odds_tool_retries_yield():
+    """The odds tool stops retrying when the turn is running out."""
+    print("\nTesting odds tool retries under deadline pressure...")
+
+    from app.services import llm_service as llm_module
+
+    calls = []
+
+    class DownClient:
+        async def get_odds(self, **kwargs):
+            calls.append(kwargs)
+            raise RuntimeError("odds API down")
+
+    async def get_down_client():
+        return DownClient()
+
+    async def run():
+        service = ChatBetLLMService()
+        get_odds = next(tool for tool in service.tools if tool.name == "get_odds")
+        original = llm_module.get_api_client
+        llm_module.get_api_client = get_down_client
+        try:
+            with deadline.deadline_scope(settings.deadline_answer_reserve_seconds + 0.5):
+                start = time.monotonic()
+                result = await get_odds.ainvoke({"tournament_id": "1", "fixture_id": "2"})
+                elapsed = time.monotonic() - start
+        finally:
+            llm_module.get_api_client = original
+        assert len(calls) == 1, "No time to back off, so no retries"
+        assert elapsed < 0.1
+        assert result and result[0].get("status") == "error"
+
+    asyncio.run(run())
+    print("✅ Odds tool retries respect the deadline")
+
+
+def test_classification_degrades():
+    """A slow classifier gives way to local keyword rules."""
+    print("\nTesting intent classification under deadline pressure...")
+
+    async def run():
+        service = ChatBetLLMService()
+        slow_model = FakeChatModel(latency_ms=500, latency_distribution="fixed")
+        service.intent_chain = INTENT_PROMPT | slow_model.with_structured_output(IntentClassifier)
+
+        start = time.monotonic()
+        with deadline.deadline_scope(settings.deadline_answer_reserve_seconds + 0.1):
+            result = await service.classify_intent("What matches are on today?")
+        assert time.monotonic() - start < 0.4
+        assert result.intent == IntentType.MATCH_SCHEDULE_QUERY
+
+        with deadline.deadline_scope(1):
+            result = await service.classify_intent("Hello there")
+        assert result.intent == IntentType.GREETING
+        assert service.get_performance_stats()["deadline_degradations"]["local_intent"] == 2
+
+    asyncio.run(run())
+    print("✅ Intent classification degrades to local rules")
+
+
+def test_stalled_stream_stops():
+    """A stream that stalls gives up at the deadline; whitespace chunks are kept."""
+    print("\nTesting streaming under deadline pressure...")
+
+    class StallingModel:
+        closed = False
+
+        async def astream(self, messages):
+            try:
+                for text in ("First paragraph.", "\n\n", "Second"):
+                    yield AIMessageChunk(content=text)
+                await asyncio.sleep(10)
+            finally:
+                StallingModel.closed = True
+
+    async def run():
+        service = ChatBetLLMService()
+        service.router.model_for = lambda route: StallingModel()
+
+        start = time.monotonic()
+        with deadline.deadline_scope(0.2):
+            chunks = [chunk async for chunk in service._generate_streaming_response([HumanMessage(content="hi")])]
+        assert time.monotonic() - start < 0.5
+        assert "".join(chunks) == f"First paragraph.\n\nSecond\n\n{DEADLINE_MESSAGE}"
+        assert StallingModel.closed, "The provider stream is closed"
+        assert service.scheduler.get_stats()["active"] == 0, "The slot is released"
+        assert service.get_performance_stats()["deadline_degradations"]["deadline_exceeded"] == 1
+
+    asyncio.run(run())
+    print("✅ Stalled streams stop at the deadline")
+
+
+if __name__ == "__main__":
+    test_deadline_scope()
+    test_scheduler_and_retries_yield()
+    test_odds_tool_retries_yield()
+    test_classification_degrades()
+    test_stalled_stream_stops()
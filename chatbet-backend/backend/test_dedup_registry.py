@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared duplicate-detection registry.
+
+Uses a manual clock to check window expiry, the size cap, and the
+WebSocket manager's use of it.
+"""
+
+import asyncio
+
+from app.services.websocket_manager import WebSocketConnectionManager
+from app.utils.dedup import DedupRegistry
+
+
+class ManualClock:
+    """Clock the test moves forward by hand."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class MockWebSocket:
+    """Mock WebSocket for testing."""
+
+    def __init__(self):
+        self.messages_sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        self.messages_sent.append(data)
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+def test_window_and_cap():
+    """Duplicates are caught inside the window, expire after it, and the cap holds."""
+    print("Testing dedup window and size cap...")
+
+    clock = ManualClock()
+    registry = DedupRegistry(window_seconds=10, max_entries=3, clock=clock)
+    assert registry.add("a", "first") and not registry.add("a", "second")
+    assert registry.get("a") == "first", "A duplicate keeps the original value"
+
+    clock.now += 5
+    registry.add("b")
+    clock.now += 6
+    assert "a" not in registry and "b" in registry
+    assert registry.add("a"), "Seen again after the window is new"
+
+    registry.put("b", "refreshed")
+    for key in ("c", "d"):
+        registry.add(key)
+    assert len(registry) == 3 and "a" not in registry, "Oldest entries make room"
+
+    stats = registry.get_stats()
+    assert stats["duplicates"] == 1 and stats["expired"] == 1 and stats["evicted"] == 1
+    print("✅ Dedup window and size cap working correctly")
+
+
+def test_websocket_manager_uses_registry():
+    """A re-sent WebSocket message id is ignored without scanning old ids."""
+    print("\nTesting WebSocket message dedup...")
+
+    async def run():
+        manager = WebSocketConnectionManager()
+        session_id = await manager.connect(MockWebSocket(), session_id="dedup_ws")
+        message = {"type": "user_message", "content": "hi", "session_id": session_id, "message_id": "m-1"}
+
+        assert await manager.handle_user_message(session_id, dict(message))
+        assert not await manager.handle_user_message(session_id, dict(message))
+        assert manager.get_statistics()["dedup"]["duplicates"] == 1
+        await manager.shutdown()
+
+    asyncio.run(run())
+    print("✅ WebSocket manager ignores re-sent message ids")
+
+
+if __name__ == "__main__":
+    test_window_and_cap()
+    test_websocket_manager_uses_registry()
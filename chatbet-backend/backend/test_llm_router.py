@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for intent-based model routing.
+
+Checks the intent -> route mapping, settings overrides, lazy per-route
+model creation with tools only where needed, and per-route accounting.
+"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage
+
+from app.core.config import settings
+from app.models.conversation import IntentType
+from app.services.llm_providers import FakeChatModel
+from app.services.llm_router import LLMRouter
+from app.services.llm_service import ChatBetLLMService
+
+
+class RecordingFactory:
+    """Model factory that records the settings each route asked for."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, **kwargs):
+        self.calls.append(kwargs)
+        return FakeChatModel(latency_ms=1, latency_distribution="fixed", tokens_per_second=0, tool_calls_enabled=False)
+
+
+def test_intent_mapping_and_overrides():
+    """Intents map to routes; settings can retarget routes and intents."""
+    print("Testing intent routing table...")
+
+    router = LLMRouter(RecordingFactory())
+    assert router.route_for(IntentType.GREETING).name == "light"
+    assert router.route_for("odds_information_query").name == "data"
+    assert router.route_for(IntentType.BETTING_RECOMMENDATION).name == "advice"
+    assert router.route_for(None).name == "default"
+    assert not router.route_for(IntentType.HELP_REQUEST).tools
+
+    original = settings.llm_routes
+    settings.llm_routes = {"light": {"max_tokens": 120, "ignored": True}, "vip": {"model": "gemini-2.5-pro"}}
+    try:
+        router = LLMRouter(RecordingFactory(), intent_routes={"greeting": "vip", "help_request": "missing"})
+    finally:
+        settings.llm_routes = original
+
+    assert router.routes["light"].max_tokens == 120
+    assert router.route_for("greeting").model == "gemini-2.5-pro"
+    assert router.route_for("help_request").name == "default"
+    print("✅ Intent routing table working correctly")
+
+
+def test_models_built_once_per_route():
+    """Each route builds its model once, and binds tools only when it uses them."""
+    print("\nTesting per-route model creation...")
+
+    factory = RecordingFactory()
+    router = LLMRouter(factory)
+    light, data = router.route_for("greeting"), router.route_for("match_schedule_query")
+
+    assert router.tool_model_for(light, ["get_fixtures"]) is router.model_for(light)
+    assert router.tool_model_for(data, ["get_fixtures"]) is router.tool_model_for(data, ["get_fixtures"])
+    assert len(factory.calls) == 2
+    assert factory.calls[0] == {"model": light.model, "temperature": light.temperature, "max_tokens": light.max_tokens}
+    print("✅ Models built once per route")
+
+
+def test_route_accounting():
+    """Latency, tokens and estimated cost are reported per route."""
+    print("\nTesting per-route accounting...")
+
+    async def run():
+        service = ChatBetLLMService()
+        service.router = LLMRouter(RecordingFactory())
+
+        await service.generate_response("what's my balance?", [], {"intent": "user_balance_query"})
+        await service.generate_response("bet $10 on Barcelona", [], {"intent": "bet_simulation"})
+        await service.generate_response("bet $20 on Sevilla", [], {"intent": "bet_simulation"})
+
+        service.router.record_usage(
+            service.router.routes["light"],
+            AIMessage(content="", usage_metadata={"input_tokens": 1_000_000, "output_tokens": 0, "total_tokens": 1_000_000})
+        )
+        stats = service.get_performance_stats()["routes"]
+        assert stats["light"]["requests"] == 1 and stats["advice"]["requests"] == 2
+        assert stats["advice"]["avg_latency_ms"] > 0 and stats["advice"]["output_tokens"] > 0
+        assert stats["light"]["estimated_cost_usd"] >= 0.10
+        print(f"   Routes: { {name: s['requests'] for name, s in stats.items()} }")
+
+    asyncio.run(run())
+    print("✅ Per-route accounting working correctly")
+
+
+if __name__ == "__main__":
+    test_intent_mapping_and_overrides()
+    test_models_built_once_per_route()
+    test_route_accounting()
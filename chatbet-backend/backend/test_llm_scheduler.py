@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for the global LLM request scheduler.
+
+Simulates provider calls with sleeps to check the concurrency limit,
+priority lanes, per-user round-robin, the token budget and load shedding.
+"""
+
+import asyncio
+import time
+
+from app.services.llm_scheduler import LLMScheduler, Priority
+from app.utils.exceptions import LLMBusyError
+
+
+async def fake_call(scheduler, order, user, priority=Priority.INTERACTIVE, duration=0.02, tokens=0):
+    async with scheduler.slot(user, priority, tokens):
+        order.append((user, priority))
+        await asyncio.sleep(duration)
+
+
+def test_concurrency_and_priority():
+    """Interactive requests jump ahead of queued background work."""
+    print("Testing concurrency limit and priority lanes...")
+
+    async def run():
+        scheduler = LLMScheduler(max_concurrency=2, tokens_per_minute=10**9,
+                                 interactive_max_wait=10, background_max_wait=10)
+        order = []
+        peak = 0
+
+        async def watch():
+            nonlocal peak
+            while True:
+                peak = max(peak, scheduler.get_stats()["active"])
+                await asyncio.sleep(0.001)
+
+        watcher = asyncio.create_task(watch())
+        background = [asyncio.create_task(fake_call(scheduler, order, f"bg{i}", Priority.BACKGROUND)) for i in range(4)]
+        await asyncio.sleep(0)
+        interactive = [asyncio.create_task(fake_call(scheduler, order, f"user{i}")) for i in range(2)]
+        await asyncio.gather(*background, *interactive)
+        watcher.cancel()
+
+        assert peak <= 2, f"Concurrency exceeded: {peak}"
+        # The first two background calls were admitted immediately; interactive ones go next
+        assert [p for _, p in order[2:4]] == [Priority.INTERACTIVE, Priority.INTERACTIVE]
+        stats = scheduler.get_stats()
+        assert stats["lanes"]["interactive"]["granted"] == 2
+        assert stats["lanes"]["background"]["granted"] == 4
+        print(f"   Peak concurrency {peak}, order: {[u for u, _ in order]}")
+
+    asyncio.run(run())
+    print("✅ Concurrency limit and priority lanes working correctly")
+
+
+def test_round_robin_fairness():
+    """A user with many queued calls doesn't starve others."""
+    print("\nTesting per-user round-robin...")
+
+    async def run():
+        scheduler = LLMScheduler(max_concurrency=1, tokens_per_minute=10**9, interactive_max_wait=10)
+        order = []
+        tasks = [asyncio.create_task(fake_call(scheduler, order, "chatty", duration=0.005)) for _ in range(5)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(fake_call(scheduler, order, name, duration=0.005)) for name in ("alice", "bob")]
+        await asyncio.gather(*tasks)
+
+        users = [u for u, _ in order]
+        # alice and bob are served within the first few slots, not after all of chatty's calls
+        assert users.index("alice") <= 3 and users.index("bob") <= 3, users
+        print(f"   Service order: {users}")
+
+    asyncio.run(run())
+    print("✅ Round-robin fairness working correctly")
+
+
+def test_token_budget_and_shedding():
+    """Token budget throttles calls; long expected waits are shed fast."""
+    print("\nTesting token budget and load shedding...")
+
+    async def run():
+        # 6000 tokens/minute = 100 tokens/second
+        scheduler = LLMScheduler(max_concurrency=10, tokens_per_minute=6000, interactive_max_wait=5)
+        order = []
+        start = time.monotonic()
+        await fake_call(scheduler, order, "a", tokens=6000, duration=0)
+        await fake_call(scheduler, order, "a", tokens=20, duration=0)
+        waited = time.monotonic() - start
+        assert waited >= 0.15, f"Token bucket did not throttle ({waited:.3f}s)"
+        print(f"   Second call waited {waited * 1000:.0f}ms for tokens")
+
+        busy = LLMScheduler(max_concurrency=1, tokens_per_minute=10**9, interactive_max_wait=0.05)
+        holder = asyncio.create_task(fake_call(busy, order, "holder", duration=0.3))
+        await asyncio.sleep(0.01)
+
+        start = time.monotonic()
+        try:
+            await fake_call(busy, order, "late")
+            raise AssertionError("Expected LLMBusyError")
+        except LLMBusyError as e:
+            assert e.error_code == "llm_busy"
+        assert time.monotonic() - start < 0.2, "Shedding should be fast"
+        await holder
+
+        stats = busy.get_stats()["lanes"]["interactive"]
+        assert stats["shed"] + stats["timeouts"] == 1
+        assert busy.get_stats()["active"] == 0 and busy.get_stats()["queued"] == 0
+
+    asyncio.run(run())
+    print("✅ Token budget and load shedding working correctly")
+
+
+if __name__ == "__main__":
+    test_concurrency_and_priority()
+    test_round_robin_fairness()
+    test_token_budget_and_shedding()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test script for the array-backed conversation message log.
+
+Checks O(1) role lookups, that content is stored once and LangChain
+messages are produced from it, the memory accounting, the Pydantic
+round trip, and the LangChain history view used by the session store.
+"""
+
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.models.conversation import ChatMessage, Conversation, ConversationContext, MessageRole
+from app.models.message_log import LangChainWindow, LoggedMessage, MessageLog
+from app.services.session_store import SessionEntry
+
+
+def make_message(role: MessageRole, content: str, **kwargs) -> ChatMessage:
+    return ChatMessage(
+        role=role,
+        content=content,
+        session_id=kwargs.pop("session_id", None),
+        user_id=kwargs.pop("user_id", None),
+        detected_intent=kwargs.pop("detected_intent", None),
+        intent_confidence=kwargs.pop("intent_confidence", None),
+        response_time_ms=kwargs.pop("response_time_ms", None),
+        token_count=None,
+        function_calls=None
+    )
+
+
+def make_conversation(turns: int) -> Conversation:
+    conversation = Conversation(id="log_test", context=ConversationContext(session_id="log_test"))
+    for i in range(turns):
+        conversation.add_message(make_message(MessageRole.USER, f"question {i}", user_id="u1"))
+        conversation.add_message(make_message(
+            MessageRole.ASSISTANT, f"answer {i}", detected_intent="general_betting_info", response_time_ms=12
+        ))
+    return conversation
+
+
+def test_role_lookups():
+    """Last user/assistant message come from the role index, not a scan."""
+    print("Testing role lookups...")
+
+    conversation = make_conversation(3)
+    assert isinstance(conversation.messages, MessageLog)
+    assert conversation.last_user_message.content == "question 2"
+    assert conversation.last_assistant_message.content == "answer 2"
+    assert conversation.last_user_message.user_id == "u1"
+    assert conversation.last_assistant_message.detected_intent == "general_betting_info"
+
+    conversation.add_message(make_message(MessageRole.USER, "question 3"))
+    assert conversation.last_user_message.content == "question 3"
+    assert conversation.last_user_message.user_id is None
+    assert [m.content for m in conversation.get_user_messages()] == [f"question {i}" for i in range(4)]
+    assert [m.content for m in conversation.get_recent_messages(2)] == ["answer 2", "question 3"]
+    assert conversation.messages[-1].role == "user"
+
+    conversation.messages.clear()
+    assert conversation.last_user_message is None and conversation.message_count == 0
+    print("✅ Role lookups working correctly")
+
+
+def test_content_stored_once():
+    """LangChain messages share the log's content strings."""
+    print("\nTesting LangChain conversion...")
+
+    conversation = make_conversation(2)
+    langchain = conversation.messages.to_langchain()
+    assert [type(m) for m in langchain] == [HumanMessage, AIMessage, HumanMessage, AIMessage]
+    assert all(a.content is b.content for a, b in zip(langchain, conversation.messages))
+    assert [m.content for m in conversation.messages.to_langchain(2)] == ["question 1", "answer 1"]
+
+    usage = conversation.messages.memory_usage()
+    assert usage["messages"] == 4
+    assert 0 < usage["content_bytes"] < usage["bytes"] == conversation.messages.memory_bytes
+    print("✅ Content stored once, LangChain messages built on demand")
+
+
+def test_incremental_langchain_cache():
+    """Each row is converted once; windows are views, released on summarize."""
+    print("\nTesting incremental LangChain cache...")
+
+    conversation = make_conversation(3)
+    log = conversation.messages
+    window = log.to_langchain(2)
+    assert isinstance(window, LangChainWindow) and len(window) == 4
+    assert isinstance(window[1:3], LangChainWindow)
+    assert [m.content for m in window[1:3]] == ["answer 1", "question 2"]
+    assert [m.content for m in reversed(window)][0] == "answer 2"
+
+    conversation.add_message(make_message(MessageRole.USER, "question 3"))
+    later = log.to_langchain(2)
+    assert all(a is b for a, b in zip(window, later)), "Earlier rows are not converted again"
+    assert later[-1].content == "question 3" and log.memory_usage()["langchain_cached"] == 7
+
+    log.release_langchain(4)
+    assert log.memory_usage()["langchain_cached"] == 3
+    assert [m.content for m in window] == ["question 1", "answer 1", "question 2", "answer 2"]
+    assert log.to_langchain(4)[0] is later[2], "Kept rows stay cached"
+    assert [m.content for m in log.to_langchain(0, 2)] == ["question 0", "answer 0"]
+
+    log.clear()
+    assert len(log.to_langchain()) == 0 and log.memory_usage()["langchain_cached"] == 0
+    print("✅ LangChain messages converted once and shared")
+
+
+def test_pydantic_round_trip():
+    """Conversations still validate, dump and load like before."""
+    print("\nTesting Pydantic round trip...")
+
+    conversation = make_conversation(2)
+    dumped = conversation.model_dump(mode="json")
+    assert isinstance(dumped["messages"], list) and dumped["messages"][1]["content"] == "answer 0"
+
+    restored = Conversation.model_validate_json(json.dumps(dumped))
+    assert isinstance(restored.messages, MessageLog)
+    assert [m.content for m in restored.messages] == [m.content for m in conversation.messages]
+    assert restored.messages[1].response_time_ms == 12
+
+    copied = Conversation(id="copy", context=conversation.context, messages=conversation.messages[1:3])
+    assert [m.id for m in copied.messages] == [m.id for m in conversation.messages[1:3]]
+    assert isinstance(copied.messages[0], LoggedMessage)
+    assert copied.messages[0].to_chat_message().timestamp == conversation.messages[1].timestamp
+    print("✅ Pydantic round trip working correctly")
+
+
+def test_history_view():
+    """The session's LangChain history reads and writes the conversation log."""
+    print("\nTesting session history view...")
+
+    conversation = make_conversation(1)
+    entry = SessionEntry(conversation, now=0.0)
+    history = entry.history
+    assert [m.content for m in history.messages] == ["question 0", "answer 0"]
+
+    history.add_messages([HumanMessage(content="next"), AIMessage(content="reply")])
+    assert conversation.message_count == 4
+    assert conversation.last_assistant_message.content == "reply"
+    assert entry.measure() > 0
+
+    history.clear()
+    assert conversation.message_count == 0
+    print("✅ Session history is a view of the log")
+
+
+if __name__ == "__main__":
+    test_role_lookups()
+    test_content_stored_once()
+    test_incremental_langchain_cache()
+    test_pydantic_round_trip()
+    test_history_view()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for speculative data prefetch.
+
+Checks that mentioned teams get their fixtures and next-match odds warmed
+after a turn, that prefetched results expire and are bounded in time,
+and that planned tool calls are served from the prefetch.
+"""
+
+import asyncio
+from typing import Any, List, Optional
+
+from langchain_core.tools import tool
+
+from app.core.config import settings
+from app.models.conversation import Conversation, ConversationContext, IntentType
+from app.services.prefetcher import DataPrefetcher
+from app.services.tool_planner import ToolPlanner, merge_entities
+
+
+def make_tools(calls: List[Any], delay: float = 0.0):
+    """Stand-in tools with the real names that record how they were called."""
+
+    @tool
+    async def search_team_matches(team_name: str) -> List[Any]:
+        """Search for upcoming matches for a specific team."""
+        calls.append(("search_team_matches", team_name))
+        await asyncio.sleep(delay)
+        return [
+            "columns: [fixture_id, home, away, start_utc, tournament, tournament_id]",
+            ["777", "Barcelona", "Sevilla", "2025-09-20T19:00:00Z", "La Liga", "545"],
+        ]
+
+    @tool
+    async def get_odds(
+        sport_id: str = "1",
+        tournament_id: Optional[str] = None,
+        fixture_id: Optional[str] = None,
+        amount: float = 100.0
+    ) -> List[Any]:
+        """Get betting odds for matches."""
+        calls.append(("get_odds", fixture_id))
+        return [{"fixture_id": fixture_id, "markets": [["1", 1.8, 55.6, None]]}]
+
+    return [search_team_matches, get_odds]
+
+
+def make_conversation(*teams: str) -> Conversation:
+    conversation = Conversation(id="s1", context=ConversationContext(session_id="s1"))
+    for team in teams:
+        conversation.context.add_mentioned_team(team)
+    return conversation
+
+
+def test_prefetch_after_turn():
+    """Mentioned teams get fixtures and next-match odds warmed."""
+    print("Testing post-turn prefetch...")
+
+    async def run():
+        calls = []
+        prefetcher = DataPrefetcher(make_tools(calls))
+        conversation = make_conversation("barcelona")
+
+        await prefetcher.maybe_schedule(conversation)
+        assert calls == [("search_team_matches", "barcelona"), ("get_odds", "777")]
+        assert conversation.context.mentioned_matches == ["777"]
+        assert prefetcher.maybe_schedule(conversation) is None, "Fresh data is not fetched again"
+
+        # The model's own arguments differ in form but not in meaning
+        odds = await prefetcher.lookup("get_odds", {"sport_id": "1", "fixture_id": 777, "tournament_id": "545"})
+        assert odds and odds[0]["fixture_id"] == "777"
+        assert await prefetcher.lookup("search_team_matches", {"team_name": "Real Madrid"}) is None
+
+        stats = prefetcher.get_stats()
+        assert stats["prefetches"] == 2 and stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_rate_percent"] == 50.0 and stats["used_percent"] == 50.0
+
+    asyncio.run(run())
+    print("✅ Post-turn prefetch working correctly")
+
+
+def test_ttl_and_budget():
+    """Prefetched results expire, and slow prefetches are cut at the budget."""
+    print("\nTesting prefetch TTL and budget...")
+
+    async def run():
+        original = settings.prefetch_ttl_seconds
+        settings.prefetch_ttl_seconds = 0.05
+        try:
+            prefetcher = DataPrefetcher(make_tools([]))
+            await prefetcher.maybe_schedule(make_conversation("barcelona"))
+            assert await prefetcher.lookup("search_team_matches", {"team_name": "barcelona"})
+            await asyncio.sleep(0.1)
+            assert await prefetcher.lookup("search_team_matches", {"team_name": "barcelona"}) is None
+        finally:
+            settings.prefetch_ttl_seconds = original
+
+        calls = []
+        prefetcher = DataPrefetcher(make_tools(calls, delay=1.0), budget_seconds=0.05)
+        await prefetcher.maybe_schedule(make_conversation("barcelona", "sevilla"))
+        stats = prefetcher.get_stats()
+        assert stats["budget_exhausted"] == 1 and stats["entries"] == 0
+        assert not prefetcher._fetching, "Fetches started by the prefetch are cancelled"
+
+    asyncio.run(run())
+    print("✅ Prefetch TTL and budget respected")
+
+
+def test_planner_uses_prefetch():
+    """A follow-up turn's planned calls are served without upstream calls."""
+    print("\nTesting planned calls served from prefetch...")
+
+    async def run():
+        calls = []
+        tools = make_tools(calls, delay=0.05)
+        prefetcher = DataPrefetcher(tools)
+        planner = ToolPlanner(tools, prefetcher)
+
+        # The follow-up arrives while the prefetch is still in flight
+        task = prefetcher.maybe_schedule(make_conversation("barcelona"))
+        await asyncio.sleep(0.01)
+        results = await planner.dispatch(IntentType.ODDS_INFORMATION_QUERY, merge_entities({"team": "Barcelona"}))
+        await task
+
+        assert [r["tool_name"] for r in results] == ["search_team_matches", "get_odds"]
+        assert calls == [("search_team_matches", "barcelona"), ("get_odds", "777")], "No duplicate upstream calls"
+        assert prefetcher.get_stats()["hits"] == 2
+
+    asyncio.run(run())
+    print("✅ Planned calls served from prefetch")
+
+
+if __name__ == "__main__":
+    test_prefetch_after_turn()
+    test_ttl_and_budget()
+    test_planner_uses_prefetch()
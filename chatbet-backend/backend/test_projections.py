@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for the compact LLM-facing projections.
+
+Compares the tool payload the model used to receive (pretty-printed
+model_dump output) with the projected form, in estimated input tokens
+and in the time spent building the payload.
+"""
+
+import json
+import time
+
+from app.models.api_models import FixtureInfo, MatchOdds, Tournament
+from app.utils.projections import (
+    FIXTURE_LEGEND, project_fixtures, project_odds, project_tournaments, implied_probability
+)
+from app.utils.token_budget import TokenBudgeter, estimate_tokens
+
+
+def make_fixtures(count: int):
+    return [
+        FixtureInfo(
+            source=1,
+            id=f"{1000 + i}",
+            startTime="2025-09-20T19:00:00Z",
+            tournament={"name": "La Liga", "id": "545"},
+            sportId="1",
+            homeCompetitor={"name": f"Home {i}", "id": f"h{i}", "jerseyIcon": f"https://cdn.example.com/jerseys/home_{i}.png"},
+            awayCompetitor={"name": f"Away {i}", "id": f"a{i}", "jerseyIcon": f"https://cdn.example.com/jerseys/away_{i}.png"},
+        )
+        for i in range(count)
+    ]
+
+
+SAMPLE_ODDS = MatchOdds(
+    status="active",
+    main_market="result",
+    result={
+        "homeTeam": {"name": "Barcelona", "odds": 1.85, "profit": 85.0},
+        "tie": {"name": "Draw", "odds": 3.6, "profit": 260.0},
+        "awayTeam": {"name": "Sevilla", "odds": 4.2, "profit": 320.0},
+    },
+    over_under=[
+        {"name": "Over", "line": 2.5, "odds": 1.9},
+        {"name": "Under", "line": 2.5, "odds": 1.95},
+    ],
+    both_teams_to_score={"yes": 1.7, "no": 2.1},
+    score={"1-0": {"odds": 7.5}},
+)
+
+
+def test_fixture_projection():
+    """Fixtures become positional rows behind a legend line."""
+    print("Testing fixture projection...")
+
+    fixtures = make_fixtures(15)
+    rows = project_fixtures(fixtures)
+
+    assert rows[0] == FIXTURE_LEGEND
+    assert rows[1] == ["1000", "Home 0", "Away 0", "2025-09-20T19:00:00Z", "La Liga", "545"]
+    assert len(rows) == 16
+
+    tournaments = project_tournaments([Tournament(id="545", name="La Liga", country="Spain")])
+    assert tournaments[1] == ["545", "La Liga", "Spain"]
+    print("✅ Fixture and tournament projections are positional and stable")
+
+
+def test_odds_projection():
+    """Odds markets become implied-probability tuples."""
+    print("\nTesting odds projection...")
+
+    projected = project_odds("1000", SAMPLE_ODDS)
+    markets = projected["markets"]
+
+    assert list(markets) == ["Match Result (1X2)", "Over/Under", "Both Teams to Score"]
+    assert markets["Match Result (1X2)"][0] == ("Barcelona", 1.85, 54.1, None)
+    assert markets["Over/Under"][1] == ("Under", 1.95, 51.3, 2.5)
+    assert markets["Both Teams to Score"] == [("yes", 1.7, 58.8, None), ("no", 2.1, 47.6, None)]
+    assert implied_probability(1.0) is None
+    print("✅ Odds projected to implied-probability tuples")
+
+
+def test_prompt_size_before_after():
+    """Projected payloads should cost a fraction of the raw dumps."""
+    print("\nMeasuring tool payload size before/after projection...")
+
+    fixtures = make_fixtures(15)
+    budgeter = TokenBudgeter(max_prompt_tokens=100000, tool_result_tokens=100000)
+    iterations = 200
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        before_payload = json.dumps([{
+            "tool_call_id": "call_1",
+            "tool_name": "get_fixtures",
+            "result": [f.model_dump() for f in fixtures]
+        }], indent=2)
+    before_ms = (time.perf_counter() - start) * 1000 / iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        after_payload = budgeter.format_tool_results([{
+            "tool_call_id": "call_1",
+            "tool_name": "get_fixtures",
+            "result": project_fixtures(fixtures)
+        }])
+    after_ms = (time.perf_counter() - start) * 1000 / iterations
+
+    before_tokens = estimate_tokens(before_payload)
+    after_tokens = estimate_tokens(after_payload)
+    print(f"   Fixtures: {before_tokens} -> {after_tokens} tokens "
+          f"({(1 - after_tokens / before_tokens):.0%} smaller)")
+    print(f"   Payload build: {before_ms:.3f}ms -> {after_ms:.3f}ms")
+
+    raw_odds = json.dumps(SAMPLE_ODDS.model_dump(), indent=2)
+    projected_odds = budgeter.format_tool_results([{"result": [project_odds("1000", SAMPLE_ODDS)]}])
+    print(f"   Odds: {estimate_tokens(raw_odds)} -> {estimate_tokens(projected_odds)} tokens")
+
+    assert after_tokens < before_tokens / 3
+    print("✅ Projections cut tool payload tokens")
+
+
+if __name__ == "__main__":
+    test_fixture_projection()
+    test_odds_projection()
+    test_prompt_size_before_after()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test script for system prompt assembly.
+
+Checks that every user shares a byte-identical static prefix (needed for
+provider-side context caching) and that per-user context is rendered once.
+"""
+
+import time
+
+from app.services.prompts import SYSTEM_PROMPT, build_system_prompt, get_prompt_cache_stats
+
+
+def test_stable_prefix():
+    """All prompts start with the same static instructions."""
+    print("Testing stable system prompt prefix...")
+
+    anonymous = build_system_prompt(None)
+    fan = build_system_prompt({"preferred_teams": ["Barcelona"], "timezone": "Europe/Madrid"})
+    bettor = build_system_prompt({"is_authenticated": True, "intent": "greeting"})
+
+    assert anonymous is SYSTEM_PROMPT
+    assert build_system_prompt({"intent": "greeting", "query_type": "x"}) is SYSTEM_PROMPT
+    for prompt in (fan, bettor):
+        assert prompt.startswith(SYSTEM_PROMPT)
+    assert fan.endswith("User's favorite teams: Barcelona\nUser timezone: Europe/Madrid")
+    assert bettor.endswith("User is authenticated and can place bets")
+    print(f"✅ Static prefix shared ({len(SYSTEM_PROMPT)} chars)")
+
+
+def test_context_render_cache():
+    """Repeated contexts are served from the render cache."""
+    print("\nTesting user context render cache...")
+
+    context = {"preferred_teams": ["Real Madrid"], "is_authenticated": True}
+    before = get_prompt_cache_stats()
+
+    first = build_system_prompt(context)
+    start = time.perf_counter()
+    for _ in range(1000):
+        again = build_system_prompt(dict(context, intent="odds_information_query"))
+    elapsed_us = (time.perf_counter() - start) * 1e6 / 1000
+
+    after = get_prompt_cache_stats()
+    assert again is first
+    assert after["render_misses"] == before["render_misses"] + 1
+    assert after["render_hits"] == before["render_hits"] + 1000
+    print(f"✅ Context rendered once, {elapsed_us:.1f}µs per cached build")
+
+
+if __name__ == "__main__":
+    test_stable_prefix()
+    test_context_render_cache()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the exact-match LLM response cache.
+
+Checks key normalization, data stamps and hit-rate reporting without
+touching Gemini or Redis.
+"""
+
+import asyncio
+
+from langchain_core.messages import HumanMessage, AIMessage
+
+from app.models.conversation import IntentType
+from app.services.chatbet_api import ChatBetAPIClient
+from app.services.response_cache import LLMResponseCache, data_stamp, normalize_message, is_cacheable_intent
+from app.utils.cache import TieredCache
+
+
+def test_normalization():
+    """Trivial variations of a message should normalize the same way."""
+    print("Testing message normalization...")
+
+    assert normalize_message("What matches are today?") == "what matches are today"
+    assert normalize_message("  what   MATCHES are today ?!") == "what matches are today"
+    assert normalize_message("Help") == "help"
+
+    assert is_cacheable_intent(IntentType.MATCH_SCHEDULE_QUERY.value)
+    assert not is_cacheable_intent(IntentType.USER_BALANCE_QUERY.value)
+    assert not is_cacheable_intent(None)
+
+    print("✅ Normalization and cacheable intents working correctly")
+
+
+def test_cache_hits_and_invalidation():
+    """Cached responses are served until the data they're built on changes."""
+    print("\nTesting response cache hits and invalidation...")
+
+    async def run():
+        cache = LLMResponseCache(TieredCache(namespace="test_llm_responses", maxsize=16, ttl=60))
+        intent = IntentType.MATCH_SCHEDULE_QUERY.value
+
+        key = cache.build_key("What matches are today?", intent, [], {}, "f1")
+        assert await cache.get(key) is None
+
+        await cache.set(key, "Barcelona vs Sevilla at 20:00")
+
+        same_key = cache.build_key("what matches are today", intent, [], {}, "f1")
+        assert same_key == key
+        assert await cache.get(same_key) == "Barcelona vs Sevilla at 20:00"
+
+        # History and intent are part of the key
+        history = [HumanMessage(content="hi"), AIMessage(content="hello!")]
+        assert cache.build_key("What matches are today?", intent, history, {}, "f1") != key
+        assert cache.build_key("What matches are today?", IntentType.GREETING.value, [], {}, "f1") != key
+
+        # New data -> new key; other answers stay cached until their TTL
+        new_key = cache.build_key("What matches are today?", intent, [], {}, "f2")
+        assert new_key != key
+        assert await cache.get(new_key) is None
+        assert cache.cache.get_stats()["local_entries"] == 1
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        print(f"   Stats: {stats['hits']} hits, {stats['misses']} misses, {stats['hit_rate_percent']}% hit rate")
+
+    asyncio.run(run())
+    print("✅ Response cache hits and invalidation working correctly")
+
+
+def test_data_stamps():
+    """Answers are keyed on the data they use, not on every change upstream."""
+    print("\nTesting data stamps...")
+
+    versions = {"fixtures": 3, "odds": 40}
+    moved_odds = {"fixtures": 3, "odds": 41}
+    greeting = IntentType.GREETING.value
+    schedule = IntentType.MATCH_SCHEDULE_QUERY.value
+    odds = IntentType.ODDS_INFORMATION_QUERY.value
+
+    assert data_stamp(greeting, None, versions) == data_stamp(greeting, None, moved_odds) == ""
+    assert data_stamp(schedule, None, versions) == data_stamp(schedule, None, moved_odds) == "f3"
+    assert data_stamp(odds, None, versions) != data_stamp(odds, None, moved_odds)
+
+    planned = [{"tool_name": "get_odds", "result": {"fixture": "1", "home": 1.85}}]
+    assert data_stamp(odds, planned, versions) == data_stamp(odds, planned, moved_odds)
+    changed = [{"tool_name": "get_odds", "result": {"fixture": "1", "home": 1.9}}]
+    assert data_stamp(odds, planned, versions) != data_stamp(odds, changed, versions)
+    print("✅ Data stamps working correctly")
+
+
+def test_data_versions_by_kind():
+    """Odds changes leave the fixtures version alone; fingerprints are bounded."""
+    print("\nTesting data versions...")
+
+    client = ChatBetAPIClient()
+    client._record_data_version("fixtures", "/sports/fixtures?type=today", [{"id": 1}])
+    client._record_data_version("fixtures", "/sports/fixtures?type=today", [{"id": 1}])
+    for fixture in range(client._data_fingerprints.maxsize + 10):
+        client._record_data_version("odds", f"/sports/odds?fixtureId={fixture}", {"home": 1.85})
+    assert client.data_versions["fixtures"] == 1
+    assert len(client._data_fingerprints) == client._data_fingerprints.maxsize
+    print("✅ Data versions tracked by kind")
+
+
+if __name__ == "__main__":
+    test_normalization()
+    test_cache_hits_and_invalidation()
+    test_data_stamps()
+    test_data_versions_by_kind()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Test script for the MinHash/LSH semantic response cache.
+
+Measures precision and recall on a small labeled corpus of paraphrased
+context-free questions. Each group holds questions that should share an
+answer; the first question of a group is cached and the rest are looked up.
+Groups marked as "uncached" act as negatives that must never hit.
+"""
+
+from app.models.conversation import IntentType
+from app.services.semantic_cache import SemanticResponseCache, canonicalize
+
+
+SCHEDULE = IntentType.MATCH_SCHEDULE_QUERY.value
+ODDS = IntentType.ODDS_INFORMATION_QUERY.value
+GREETING = IntentType.GREETING.value
+RECOMMENDATION = IntentType.BETTING_RECOMMENDATION.value
+
+# (group, intent, cached, questions)
+CORPUS = [
+    ("today_matches", SCHEDULE, True, [
+        "What matches are today?",
+        "who plays today",
+        "today's games?",
+        "matches today",
+        "Which games are on today?",
+        "show me today's fixtures",
+        "What games are there today",
+        "partidos hoy",
+        "Any matches tonight?",
+    ]),
+    ("tomorrow_matches", SCHEDULE, True, [
+        "What matches are tomorrow?",
+        "who plays tomorrow",
+        "tomorrow's games",
+        "fixtures for tomorrow please",
+        "any games tomorrow?",
+    ]),
+    ("weekend_matches", SCHEDULE, True, [
+        "What matches are on this weekend?",
+        "weekend fixtures",
+        "who plays this weekend?",
+        "games this weekend",
+    ]),
+    ("barcelona_schedule", SCHEDULE, True, [
+        "When does Barcelona play?",
+        "when is barcelona playing",
+        "Barcelona next match",
+        "barcelona schedule",
+    ]),
+    ("greeting", GREETING, True, [
+        "Hello",
+        "hi",
+        "hey!",
+        "Hello there",
+    ]),
+    ("barcelona_odds", ODDS, True, [
+        "What are the odds for Barcelona?",
+        "barcelona odds",
+        "odds for barcelona please",
+    ]),
+    ("over_goals_odds", ODDS, True, [
+        "over 2.5 goals odds liverpool chelsea",
+        "odds for over 2.5 goals liverpool chelsea",
+    ]),
+    ("home_win_bet", RECOMMENDATION, True, [
+        "should I bet on the home win for Liverpool vs Chelsea",
+    ]),
+    ("man_united_odds", ODDS, True, [
+        "What are the odds for Manchester United vs Liverpool in the Premier League",
+    ]),
+    ("man_united_schedule", SCHEDULE, True, [
+        "when does Manchester United play in the Premier League",
+    ]),
+    # Negatives: similar wording, different meaning, nothing cached
+    ("real_madrid_schedule", SCHEDULE, False, [
+        "When does Real Madrid play?",
+        "real madrid schedule",
+    ]),
+    ("yesterday_matches", SCHEDULE, False, [
+        "What matches were yesterday?",
+        "who played yesterday",
+    ]),
+    ("live_matches", SCHEDULE, False, [
+        "What matches are live now?",
+    ]),
+    ("liverpool_odds", ODDS, False, [
+        "What are the odds for Liverpool?",
+        "liverpool odds",
+    ]),
+    # Negatives: long questions about the same fixture that differ by one word
+    ("under_goals_odds", ODDS, False, [
+        "under 2.5 goals odds liverpool chelsea",
+    ]),
+    ("away_win_bet", RECOMMENDATION, False, [
+        "should I bet on the away win for Liverpool vs Chelsea",
+    ]),
+    ("man_city_odds", ODDS, False, [
+        "What are the odds for Manchester City vs Liverpool in the Premier League",
+    ]),
+    ("man_city_schedule", SCHEDULE, False, [
+        "when does Manchester City play in the Premier League",
+    ]),
+]
+
+
+def evaluate(cache: SemanticResponseCache):
+    """Return (true_positives, false_positives, false_negatives)."""
+    data_version = 1
+    for group, intent, cached, questions in CORPUS:
+        if cached:
+            cache.add(questions[0], f"answer:{group}", intent, data_version)
+
+    true_positives = false_positives = false_negatives = 0
+    for group, intent, cached, questions in CORPUS:
+        probes = questions[1:] if cached else questions
+        for question in probes:
+            result = cache.lookup(question, intent, data_version)
+            if result is None:
+                if cached:
+                    false_negatives += 1
+                    print(f"   miss: '{question}' ({group})")
+            elif result[0] == f"answer:{group}":
+                true_positives += 1
+            else:
+                false_positives += 1
+                print(f"   WRONG: '{question}' ({group}) -> {result[0]} ({result[1]:.2f})")
+
+    return true_positives, false_positives, false_negatives
+
+
+def test_precision_recall():
+    """Near-duplicates should hit; different questions must not."""
+    print("Testing semantic cache precision/recall...")
+
+    cache = SemanticResponseCache(threshold=0.7, num_perm=64, bands=16, max_entries=100)
+    tp, fp, fn = evaluate(cache)
+
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    print(f"   TP={tp} FP={fp} FN={fn}")
+    print(f"   Precision: {precision:.2%}  Recall: {recall:.2%}")
+
+    assert precision == 1.0, "Semantic cache returned an answer for a different question"
+    assert recall >= 0.6, "Semantic cache recall dropped below 60%"
+    print("✅ Semantic cache precision/recall within targets")
+
+
+def test_guards_and_partitions():
+    """Guard tokens and data versions keep answers apart."""
+    print("\nTesting guards and partitions...")
+
+    assert canonicalize("today's games?")[1] == "today"
+    assert canonicalize("who plays today") == canonicalize("matches today")
+    assert canonicalize("over 2.5 goals")[1] == "2,5,over"
+    assert canonicalize("Man City odds")[1] == canonicalize("manchester city odds")[1] == "manchester city"
+
+    cache = SemanticResponseCache(threshold=0.7)
+    cache.add("What matches are today?", "today answer", SCHEDULE, data_version=1)
+
+    assert cache.lookup("matches today", SCHEDULE, data_version=1) is not None
+    assert cache.lookup("matches tomorrow", SCHEDULE, data_version=1) is None
+    assert cache.lookup("matches today", SCHEDULE, data_version=2) is None
+    assert cache.lookup("matches today", ODDS, data_version=1) is None
+    print("✅ Guards, intents and data versions partition the index")
+
+
+def test_bounded_memory():
+    """The index never grows beyond max_entries."""
+    print("\nTesting bounded memory...")
+
+    cache = SemanticResponseCache(max_entries=50)
+    for i in range(500):
+        cache.add(f"fixtures round {i}", f"answer {i}", SCHEDULE, data_version=1)
+
+    stats = cache.get_stats()
+    assert stats["entries"] == 50
+    assert stats["evictions"] == 450
+    assert cache.lookup("fixtures round 499", SCHEDULE, 1) is not None
+    assert cache.lookup("fixtures round 0", SCHEDULE, 1) is None
+    print(f"✅ Index bounded at {stats['entries']} entries ({stats['buckets']} buckets)")
+
+
+if __name__ == "__main__":
+    test_precision_recall()
+    test_guards_and_partitions()
+    test_bounded_memory()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the bounded session store.
+
+Uses a manual clock so idle expiry can be checked without waiting, and
+checks LRU eviction by count and by approximate size.
+"""
+
+import asyncio
+
+from app.models.conversation import ChatMessage, Conversation, ConversationContext, MessageRole
+from app.services.conversation_manager import ConversationManager
+from app.services.session_store import BASE_SESSION_BYTES, SessionStore
+
+
+class ManualClock:
+    """Clock the test moves forward by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_conversation(session_id: str, messages: int = 0, size: int = 10) -> Conversation:
+    conversation = Conversation(id=session_id, context=ConversationContext(session_id=session_id))
+    for i in range(messages):
+        conversation.messages.append(ChatMessage(role=MessageRole.USER, content="x" * size, session_id=session_id))
+    return conversation
+
+
+def store_session(store: SessionStore, session_id: str, **kwargs):
+    return store.put(session_id, make_conversation(session_id, **kwargs))
+
+
+def test_idle_expiry():
+    """Sessions idle past the timeout expire; recently used ones survive."""
+    print("Testing idle expiry...")
+
+    clock = ManualClock()
+    dropped = []
+    store = SessionStore(max_entries=100, max_bytes=10**9, idle_timeout=60, clock=clock)
+    store.on_evict(lambda session_id, entry, reason: dropped.append((session_id, reason)))
+
+    store_session(store, "a")
+    store_session(store, "b")
+    clock.now += 40
+    assert store.get("a") is not None  # a is used again, b is not
+    clock.now += 30
+
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert dropped == [("b", "expired")]
+    assert store.get_stats()["expired"] == 1
+    print("✅ Idle expiry working correctly")
+
+
+def test_lru_and_byte_cap():
+    """The least recently used session goes first, by count and by size."""
+    print("\nTesting LRU eviction and byte cap...")
+
+    clock = ManualClock()
+    store = SessionStore(max_entries=2, max_bytes=10**9, idle_timeout=60, clock=clock)
+    store_session(store, "a")
+    store_session(store, "b")
+    store.get("a")
+    store_session(store, "c")
+    assert "b" not in store and "a" in store and "c" in store
+    assert store.get_stats()["evicted"]["max_entries"] == 1
+
+    store = SessionStore(max_entries=100, max_bytes=BASE_SESSION_BYTES * 3, idle_timeout=60, clock=clock)
+    store_session(store, "small1")
+    store_session(store, "small2")
+    entry = store_session(store, "growing")
+
+    # The session grows after a turn; older sessions make room, the active one stays
+    entry.conversation.messages.append(
+        ChatMessage(role=MessageRole.USER, content="y" * BASE_SESSION_BYTES, session_id="growing")
+    )
+    store.touch("growing")
+    assert "growing" in store and "small1" not in store
+    assert store.get_stats()["evicted"]["max_bytes"] >= 1
+    assert store.get_stats()["bytes"] <= BASE_SESSION_BYTES * 3 or len(store) == 1
+    print("✅ LRU eviction and byte cap working correctly")
+
+
+def test_manager_uses_store():
+    """The conversation manager reports real memory use and frees evicted sessions."""
+    print("\nTesting conversation manager integration...")
+
+    async def run():
+        manager = ConversationManager()
+        manager.store = SessionStore(max_entries=2, max_bytes=10**9, idle_timeout=60)
+        manager.store.on_evict(manager._on_session_evicted)
+
+        for session_id in ("one", "two", "three"):
+            await manager.start_conversation(session_id=session_id)
+        stats = manager.get_performance_stats()
+        assert stats["active_sessions"] == 2
+        assert stats["memory_usage_mb"] > 0
+        assert await manager.get_history_page("one") is None
+
+    asyncio.run(run())
+    print("✅ Conversation manager uses the bounded store")
+
+
+if __name__ == "__main__":
+    test_idle_expiry()
+    test_lru_and_byte_cap()
+    test_manager_uses_store()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for sharing context-free turns across sessions.
+
+Checks that identical first turns of new sessions share one
+classification and answer, that each session still records its own
+copy, and that later turns, personal intents and new fixture data are
+never shared.
+"""
+
+import asyncio
+
+from app.models.conversation import ChatRequest, IntentClassificationResult, IntentType
+from app.services.chatbet_api import get_api_client
+from app.services.conversation_manager import ConversationManager
+from app.services.shared_turns import SharedTurnRegistry
+
+
+def make_manager(intent: IntentType):
+    """Conversation manager with classification and generation faked out."""
+    manager = ConversationManager()
+    calls = {"classify": 0, "generate": 0}
+
+    async def classify_and_plan(message, conversation, user_key=None):
+        calls["classify"] += 1
+        return IntentClassificationResult(intent=intent, confidence=0.9), []
+
+    async def generate(conversation, intent_result, user_context=None, stream=False):
+        calls["generate"] += 1
+        await asyncio.sleep(0.05)
+        return f"Answer for {conversation.last_user_message.content.strip().lower()}"
+
+    manager._classify_and_plan = classify_and_plan
+    manager._generate_contextual_response = generate
+    return manager, calls
+
+
+def test_registry_sharing():
+    """In-flight and just-finished results are shared; unshareable ones are not."""
+    print("Testing shared turn registry...")
+
+    async def run():
+        registry = SharedTurnRegistry(window_seconds=60)
+        runs = []
+
+        async def work(value):
+            runs.append(value)
+            await asyncio.sleep(0.02)
+            return value
+
+        results = await asyncio.gather(*(registry.run("k", lambda i=i: work(i)) for i in range(3)))
+        assert runs == [0] and results == [(0, False), (0, True), (0, True)]
+        assert await registry.run("k", lambda: work(9)) == (0, True), "Finished result reused within the window"
+
+        runs.clear()
+        results = await asyncio.gather(*(
+            registry.run("personal", lambda i=i: work(i), shareable=lambda result: False) for i in range(3)
+        ))
+        assert sorted(runs) == [0, 1, 2] and all(not shared for _, shared in results)
+
+        stats = registry.get_stats()
+        assert stats["joined_in_flight"] == 2 and stats["reused_finished"] == 1
+        assert stats["not_shareable"] == 2 and stats["in_flight"] == 0
+
+        no_window = SharedTurnRegistry(window_seconds=0)
+        await no_window.run("k", lambda: work(1))
+        assert await no_window.run("k", lambda: work(2)) == (2, False)
+
+    asyncio.run(run())
+    print("✅ Shared turn registry working correctly")
+
+
+def test_first_turns_shared():
+    """Concurrent first turns share one pipeline; each session keeps its own copy."""
+    print("\nTesting shared first turns...")
+
+    async def run():
+        manager, calls = make_manager(IntentType.MATCH_SCHEDULE_QUERY)
+        messages = ["What matches are today?", "what matches are today", "  WHAT matches are today?? "]
+        responses = await asyncio.gather(*(
+            manager.process_message(ChatRequest(message=message, session_id=f"kickoff_{i}"))
+            for i, message in enumerate(messages)
+        ))
+        assert calls == {"classify": 1, "generate": 1}
+        assert len({r.message for r in responses}) == 1
+        assert len({r.message_id for r in responses}) == 3, "Each session gets its own messages"
+
+        for i, message in enumerate(messages):
+            conversation = manager.store.peek(f"kickoff_{i}").conversation
+            assert [m.content for m in conversation.messages] == [message.strip(), responses[0].message]
+            assert conversation.last_user_message.detected_intent == IntentType.MATCH_SCHEDULE_QUERY.value
+
+        # A later turn has history, so it is never shared
+        await manager.process_message(ChatRequest(message="And tomorrow?", session_id="kickoff_0"))
+        assert calls["classify"] == 2
+
+        # A new session right after still gets the finished answer
+        await manager.process_message(ChatRequest(message="what matches are today?", session_id="kickoff_late"))
+        assert calls["classify"] == 2
+
+        # New fixture data means a fresh answer
+        (await get_api_client())._data_versions["fixtures"] += 1
+        await manager.process_message(ChatRequest(message="what matches are today?", session_id="kickoff_new_data"))
+        assert calls["classify"] == 3
+
+        stats = manager.get_performance_stats()["shared_turns"]
+        assert stats["joined_in_flight"] == 2 and stats["reused_finished"] == 1
+
+    asyncio.run(run())
+    print("✅ First turns shared across sessions")
+
+
+def test_personal_intents_not_shared():
+    """Account questions are answered per session even when asked at once."""
+    print("\nTesting personal intents...")
+
+    async def run():
+        manager, calls = make_manager(IntentType.USER_BALANCE_QUERY)
+        await asyncio.gather(*(
+            manager.process_message(ChatRequest(message="What is my balance?", session_id=f"balance_{i}", user_id=f"user_{i}"))
+            for i in range(3)
+        ))
+        assert calls["generate"] == 3
+        assert manager.get_performance_stats()["shared_turns"]["not_shareable"] == 2
+
+    asyncio.run(run())
+    print("✅ Personal intents never shared")
+
+
+if __name__ == "__main__":
+    test_registry_sharing()
+    test_first_turns_shared()
+    test_personal_intents_not_shared()
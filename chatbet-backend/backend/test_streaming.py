@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Test script for streamed chat turns.
+
+Checks that `process_message_stream` forwards the model's chunks as they
+are produced, uses the classified intent, puts metadata only on the final
+chunk, and sends tool-calling answers as a single chunk. Streamed turns
+run under the turn deadline and join identical first turns of other
+sessions, and the WebSocket handler forwards the same chunks.
+"""
+
+import asyncio
+
+from app.core import deadline
+from app.models.conversation import ChatRequest, IntentClassificationResult, IntentType
+from app.services.conversation_manager import ConversationManager
+
+
+def make_manager(intent: IntentType, planned_tool_results=None):
+    """Conversation manager with classification and generation faked out."""
+    manager = ConversationManager()
+    calls = []
+
+    async def classify_and_plan(message, conversation, user_key=None):
+        return IntentClassificationResult(intent=intent, confidence=0.9), planned_tool_results or []
+
+    manager._classify_and_plan = classify_and_plan
+    return manager, calls
+
+
+def test_chunks_forwarded_as_generated():
+    """The first chunk reaches the caller before the model finishes."""
+    print("Testing streamed chunks...")
+
+    async def run():
+        manager, calls = make_manager(IntentType.GREETING)
+        first_chunk_seen = asyncio.Event()
+
+        async def tokens():
+            yield "Hello "
+            # Only continues once the caller has the first chunk
+            await asyncio.wait_for(first_chunk_seen.wait(), timeout=1)
+            yield "there!"
+
+        async def generate(conversation, intent_result, user_context=None, stream=False):
+            calls.append((intent_result.intent, stream))
+            return tokens()
+
+        manager._generate_contextual_response = generate
+        chunks = []
+        async for chunk in manager.process_message_stream(ChatRequest(message="hi", session_id="stream_s1")):
+            chunks.append(chunk)
+            first_chunk_seen.set()
+
+        assert [c.chunk for c in chunks[:-1]] == ["Hello ", "there!"]
+        assert all(not c.is_final and c.metadata is None for c in chunks[:-1])
+        final = chunks[-1]
+        assert final.is_final and final.chunk == ""
+        assert final.metadata["detected_intent"] == IntentType.GREETING
+        assert final.metadata["streamed"] and final.metadata["time_to_first_chunk_ms"] >= 0
+        assert calls == [(IntentType.GREETING, True)]
+
+        conversation = manager.store.peek("stream_s1").conversation
+        assert conversation.last_user_message.detected_intent == IntentType.GREETING.value
+        assert conversation.last_assistant_message.content == "Hello there!"
+        assert conversation.last_assistant_message.id == final.metadata["message_id"]
+        assert manager.get_performance_stats()["streaming"]["streams"] == 1
+
+    asyncio.run(run())
+    print("✅ Chunks forwarded as the model produces them")
+
+
+def test_tool_turn_sent_whole():
+    """A data intent with nothing planned runs the tool-calling path, sent as one chunk."""
+    print("\nTesting buffered tool-calling turns...")
+
+    async def run():
+        manager, calls = make_manager(IntentType.ODDS_INFORMATION_QUERY)
+
+        async def generate(conversation, intent_result, user_context=None, stream=False):
+            calls.append(stream)
+            return "" if len(calls) > 1 else "Real Madrid are at 1.85."
+
+        manager._generate_contextual_response = generate
+        chunks = [c async for c in manager.process_message_stream(ChatRequest(message="odds?", session_id="stream_s2"))]
+        assert [c.chunk for c in chunks] == ["Real Madrid are at 1.85.", ""]
+        assert calls == [False] and not chunks[-1].metadata["streamed"]
+
+        # An empty answer still gets the usual fallback
+        chunks = [c async for c in manager.process_message_stream(ChatRequest(message="more odds?", session_id="stream_s2"))]
+        assert "betting odds" in chunks[0].chunk and chunks[-1].is_final
+        assert manager.get_performance_stats()["streaming"]["buffered_tool_turns"] == 2
+
+    asyncio.run(run())
+    print("✅ Tool-calling turns sent as a single chunk")
+
+
+def test_deadline_and_shared_first_turns():
+    """Streamed turns get a deadline; a first turn with an in-flight twin shares it."""
+    print("\nTesting streamed turn deadline and sharing...")
+
+    async def run():
+        manager, calls = make_manager(IntentType.MATCH_SCHEDULE_QUERY)
+        deadlines = []
+
+        async def generate(conversation, intent_result, user_context=None, stream=False):
+            calls.append(stream)
+            deadlines.append(deadline.remaining())
+            await asyncio.sleep(0.05)
+            return "Barcelona vs Sevilla at 20:00"
+
+        manager._generate_contextual_response = generate
+
+        async def stream(session_id):
+            return [c async for c in manager.process_message_stream(ChatRequest(message="What matches are today?", session_id=session_id))]
+
+        leader = asyncio.create_task(manager.process_message(ChatRequest(message="what matches are today", session_id="http_s1")))
+        await asyncio.sleep(0)
+        chunks, no_session = await asyncio.gather(stream("stream_s3"), stream(None))
+
+        assert (await leader).message == "Barcelona vs Sevilla at 20:00"
+        assert [c.chunk for c in chunks] == ["Barcelona vs Sevilla at 20:00", ""]
+        assert [c.chunk for c in no_session][0] == "Barcelona vs Sevilla at 20:00"
+        assert len(calls) == 1, "Both streams joined the in-flight HTTP turn"
+        assert all(remaining is not None for remaining in deadlines)
+        assert deadline.remaining() is None, "The deadline doesn't leak into the caller"
+
+        conversation = manager.store.peek("stream_s3").conversation
+        assert [m.content for m in conversation.messages] == ["What matches are today?", "Barcelona vs Sevilla at 20:00"]
+        assert manager.get_performance_stats()["streaming"]["shared_first_turns"] == 2
+
+        # A later turn of the session streams its own answer under a deadline
+        await stream("stream_s3")
+        assert len(calls) == 2 and deadlines[-1] is not None
+
+    asyncio.run(run())
+    print("✅ Streamed turns use the deadline and shared first turns")
+
+
+def test_websocket_forwards_stream():
+    """WebSocket turns send the streamed chunks, paragraph breaks included."""
+    print("\nTesting WebSocket streaming...")
+
+    from app.api import websocket as websocket_api
+    from app.models.websocket_models import WSUserMessage
+
+    class RecordingConnections:
+        def __init__(self):
+            self.sent = []
+
+        async def send_typing_indicator(self, session_id, is_typing, estimated_time=None):
+            pass
+
+        async def start_streaming_response(self, session_id):
+            self.sent.append(("start",))
+
+        async def send_streaming_chunk(self, session_id, content, full_content, chunk_index, is_final=False):
+            self.sent.append(("chunk", content, chunk_index))
+
+        async def end_streaming_response(self, session_id, final_content, total_chunks, response_time_ms, suggested_actions=None):
+            self.sent.append(("end", final_content, total_chunks))
+
+        async def send_error(self, *args):
+            raise AssertionError(f"Unexpected error: {args}")
+
+    async def run():
+        manager, _ = make_manager(IntentType.GREETING)
+
+        async def tokens():
+            for text in ("Hi!", "\n\n", "How can I help?"):
+                yield text
+
+        async def generate(conversation, intent_result, user_context=None, stream=False):
+            return tokens()
+
+        manager._generate_contextual_response = generate
+        connections = RecordingConnections()
+        originals = websocket_api.get_connection_manager, websocket_api.get_conversation_manager
+        websocket_api.get_connection_manager = lambda: connections
+        websocket_api.get_conversation_manager = lambda: manager
+        try:
+            await websocket_api._handle_user_message("ws_s1", WSUserMessage(content="hi", session_id="ws_s1"))
+        finally:
+            websocket_api.get_connection_manager, websocket_api.get_conversation_manager = originals
+
+        assert connections.sent == [
+            ("start",),
+            ("chunk", "Hi!", 0), ("chunk", "\n\n", 1), ("chunk", "How can I help?", 2),
+            ("end", "Hi!\n\nHow can I help?", 3),
+        ]
+        assert manager.store.peek("ws_s1").conversation.last_assistant_message.content == "Hi!\n\nHow can I help?"
+
+    asyncio.run(run())
+    print("✅ WebSocket turns forward the streamed chunks")
+
+
+if __name__ == "__main__":
+    test_chunks_forwarded_as_generated()
+    test_tool_turn_sent_whole()
+    test_deadline_and_shared_first_turns()
+    test_websocket_forwards_stream()
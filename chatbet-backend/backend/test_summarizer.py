@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for rolling conversation summarization.
+
+Uses a stub summarize call so the folding logic can be checked without
+an LLM: when folds are triggered, what gets folded, and how the summary
+replaces old turns in the prompt.
+"""
+
+import asyncio
+
+from app.core.config import settings
+from app.models.conversation import ChatMessage, Conversation, ConversationContext, MessageRole
+from app.services.conversation_manager import ConversationManager
+from app.services.prompts import with_conversation_summary
+from app.services.summarizer import ConversationSummarizer
+from app.utils.exceptions import LLMBusyError
+
+
+class StubLLMService:
+    """Records summarize calls and returns a canned summary."""
+
+    def __init__(self, busy: bool = False):
+        self.calls = []
+        self.busy = busy
+
+    async def summarize_conversation(self, previous_summary, turns, max_words, user_key=None):
+        if self.busy:
+            raise LLMBusyError("busy", error_code="llm_busy")
+        self.calls.append((previous_summary, list(turns)))
+        return f"summary #{len(self.calls)} of {len(turns)} turns"
+
+
+def make_conversation(turns: int) -> Conversation:
+    context = ConversationContext(session_id="s1", user_id="u1")
+    conversation = Conversation(id="s1", context=context)
+    for i in range(turns):
+        conversation.messages.append(ChatMessage(role=MessageRole.USER, content=f"question {i}", session_id="s1"))
+        conversation.messages.append(ChatMessage(role=MessageRole.ASSISTANT, content=f"answer {i}", session_id="s1"))
+    return conversation
+
+
+def test_fold_old_turns():
+    """Turns outside the recent window are folded once enough accumulate."""
+    print("Testing rolling summary folding...")
+
+    async def run():
+        service = StubLLMService()
+        summarizer = ConversationSummarizer(service, window_messages=4, trigger_messages=4, max_words=50)
+
+        conversation = make_conversation(3)  # 6 messages, only 2 outside the window
+        assert summarizer.maybe_schedule(conversation) is None
+
+        conversation = make_conversation(5)  # 10 messages, 6 outside the window
+        await summarizer.maybe_schedule(conversation)
+        assert conversation.context.summary == "summary #1 of 6 turns"
+        assert conversation.context.summarized_message_count == 6
+        assert service.calls[0][1][0] == "User: question 0"
+
+        # Next fold builds on the previous summary and only sends new turns
+        for i in range(5, 7):
+            conversation.messages.append(ChatMessage(role=MessageRole.USER, content=f"question {i}", session_id="s1"))
+            conversation.messages.append(ChatMessage(role=MessageRole.ASSISTANT, content=f"answer {i}", session_id="s1"))
+        await summarizer.maybe_schedule(conversation)
+        previous, turns = service.calls[1]
+        assert previous == "summary #1 of 6 turns"
+        assert turns == ["User: question 3", "Assistant: answer 3", "User: question 4", "Assistant: answer 4"]
+        assert conversation.context.summarized_message_count == 10
+        assert summarizer.get_stats()["folds"] == 2
+
+    asyncio.run(run())
+    print("✅ Rolling summary folding working correctly")
+
+
+def test_fold_before_history_window():
+    """Turns are folded before they fall out of the prompt's history window."""
+    print("\nTesting folds at the history window...")
+
+    async def run():
+        service = StubLLMService()
+        summarizer = ConversationSummarizer(service, window_messages=4, trigger_messages=10, history_messages=6)
+
+        conversation = make_conversation(2)  # 4 messages, all in the window
+        assert summarizer.maybe_schedule(conversation) is None
+
+        conversation = make_conversation(3)  # 6 messages: the next turn would push one out
+        await summarizer.maybe_schedule(conversation)
+        assert conversation.context.summarized_message_count == 2
+
+        # The window never exceeds the history the prompt carries
+        assert ConversationSummarizer(service, window_messages=20, history_messages=6).window_messages == 6
+
+        manager = ConversationManager()
+        original = settings.max_conversation_history
+        settings.max_conversation_history = 4
+        try:
+            conversation = make_conversation(5)
+            assert len(manager._convert_to_langchain_messages(conversation)) == 4
+            conversation.context.summarized_message_count = 8
+            assert len(manager._convert_to_langchain_messages(conversation)) == 2
+        finally:
+            settings.max_conversation_history = original
+
+    asyncio.run(run())
+    print("✅ Folds keep up with the history window")
+
+
+def test_busy_llm_defers_fold():
+    """A busy scheduler leaves the history untouched for a later retry."""
+    print("\nTesting deferred summarization...")
+
+    async def run():
+        summarizer = ConversationSummarizer(StubLLMService(busy=True), window_messages=2, trigger_messages=2)
+        conversation = make_conversation(4)
+        await summarizer.maybe_schedule(conversation)
+        assert conversation.context.summary is None
+        assert conversation.context.summarized_message_count == 0
+        assert summarizer.get_stats()["in_flight"] == 0
+
+    asyncio.run(run())
+    print("✅ Busy LLM defers summarization")
+
+
+def test_summary_in_prompt():
+    """The summary is appended after the static system prompt."""
+    print("\nTesting summary prompt injection...")
+
+    prompt = with_conversation_summary("SYSTEM", "User backs Barcelona.")
+    assert prompt.startswith("SYSTEM") and prompt.endswith("User backs Barcelona.")
+    assert with_conversation_summary("SYSTEM", None) == "SYSTEM"
+    print("✅ Summary injected into the system prompt")
+
+
+if __name__ == "__main__":
+    test_fold_old_turns()
+    test_fold_before_history_window()
+    test_busy_llm_defers_fold()
+    test_summary_in_prompt()
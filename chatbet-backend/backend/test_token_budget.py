@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for the prompt token budgeter.
+
+Checks that history and tool payloads are trimmed to a fixed budget
+and that low-value fixture fields never reach the prompt.
+"""
+
+import json
+
+from langchain_core.messages import HumanMessage, AIMessage
+
+from app.utils.token_budget import (
+    TokenBudgeter, compact_json, estimate_tokens, estimate_messages_tokens
+)
+
+
+def make_fixture(i: int) -> dict:
+    """Build a fixture dump shaped like FixtureInfo.model_dump()."""
+    return {
+        "source": 1,
+        "id": f"{1000 + i}",
+        "startTime": "2025-09-20T19:00:00Z",
+        "tournament": {"name": "La Liga", "id": "545"},
+        "sportId": "1",
+        "homeCompetitor": {"name": f"Home {i}", "id": f"h{i}", "jerseyIcon": f"https://cdn.example.com/jerseys/home_{i}.png"},
+        "awayCompetitor": {"name": f"Away {i}", "id": f"a{i}", "jerseyIcon": f"https://cdn.example.com/jerseys/away_{i}.png"},
+    }
+
+
+def test_history_trimming():
+    """Oldest turns are dropped first and history starts with a user turn."""
+    print("Testing history trimming...")
+
+    budgeter = TokenBudgeter(max_prompt_tokens=400, tool_result_tokens=100)
+    history = []
+    for i in range(10):
+        history.append(HumanMessage(content=f"question {i} " + "x" * 80))
+        history.append(AIMessage(content=f"answer {i} " + "y" * 160))
+
+    trimmed = budgeter.fit_history("system prompt", history, "latest question")
+
+    assert trimmed, "Some history should survive"
+    assert len(trimmed) < len(history)
+    assert isinstance(trimmed[0], HumanMessage)
+    assert trimmed[-1] is history[-1], "Most recent turn must be kept"
+    assert estimate_messages_tokens(trimmed) <= budgeter.history_budget("system prompt", "latest question")
+
+    stats = budgeter.get_stats()
+    assert stats["history_messages_dropped"] == len(history) - len(trimmed)
+    print(f"✅ Kept {len(trimmed)}/{len(history)} messages within budget")
+
+
+def test_tool_result_budget():
+    """Tool payloads are stripped, compacted and trimmed to the budget."""
+    print("\nTesting tool result budgeting...")
+
+    tool_results = [{
+        "tool_call_id": "call_1",
+        "tool_name": "get_fixtures",
+        "result": [make_fixture(i) for i in range(15)]
+    }]
+    original_tokens = estimate_tokens(json.dumps(tool_results, indent=2))
+
+    budgeter = TokenBudgeter(max_prompt_tokens=4000, tool_result_tokens=3000)
+    payload = budgeter.format_tool_results(tool_results)
+    assert "jerseyIcon" not in payload and "sportId" not in payload
+    assert json.loads(payload)[0]["result"][14]["id"] == "1014"
+    compacted_tokens = estimate_tokens(payload)
+    print(f"   Compaction: {original_tokens} -> {compacted_tokens} tokens")
+    assert compacted_tokens < original_tokens / 2
+
+    tight = TokenBudgeter(max_prompt_tokens=1000, tool_result_tokens=300)
+    payload = tight.format_tool_results(tool_results)
+    parsed = json.loads(payload)
+    assert estimate_tokens(payload) <= 300
+    assert parsed[0]["omitted_items"] == 15 - len(parsed[0]["result"])
+    assert tight.get_stats()["tool_items_dropped"] == parsed[0]["omitted_items"]
+
+    # Input is never mutated
+    assert len(tool_results[0]["result"]) == 15
+    assert compact_json({"a": [1, 2]}) == '{"a":[1,2]}'
+    print(f"✅ Tight budget kept {len(parsed[0]['result'])} fixtures in ~{estimate_tokens(payload)} tokens")
+
+
+def test_oversized_results_stay_valid_json():
+    """Results with no list to trim are shortened or summarized, never cut mid-JSON."""
+    print("\nTesting oversized single results...")
+
+    tool_results = [{
+        "tool_call_id": "call_1",
+        "tool_name": "get_match_details",
+        "result": {"id": "1000", "summary": "Barcelona vs Real Madrid. " * 200, "venue": "Camp Nou"}
+    }]
+
+    budgeter = TokenBudgeter(max_prompt_tokens=1000, tool_result_tokens=200)
+    payload = budgeter.format_tool_results(tool_results)
+    parsed = json.loads(payload)
+    assert estimate_tokens(payload) <= 200
+    assert parsed[0]["result"]["venue"] == "Camp Nou", "Short fields are kept"
+    assert parsed[0]["result"]["summary"].endswith("…")
+    assert budgeter.get_stats()["tool_fields_truncated"] >= 1
+
+    payload = budgeter.format_tool_results(tool_results, max_tokens=5)
+    assert json.loads(payload) == [{"status": "truncated", "tool_name": "get_match_details"}]
+
+    payload = budgeter.format_tool_results([{"result": [make_fixture(0)]}], max_tokens=0)
+    assert json.loads(payload) == [{"status": "truncated"}]
+    print("✅ Oversized results truncated to valid JSON")
+
+
+if __name__ == "__main__":
+    test_history_trimming()
+    test_tool_result_budget()
+    test_oversized_results_stay_valid_json()
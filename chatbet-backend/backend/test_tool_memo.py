@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for per-session tool result memoization.
+
+Checks canonical keys and per-tool TTLs, and that a tool the model asks
+for again on a later turn is served from the memo and shown to the model
+as already retrieved data.
+"""
+
+import asyncio
+from typing import Any, List, Optional
+
+from langchain_core.messages import HumanMessage
+from langchain_core.tools import tool
+
+from app.core.config import settings
+from app.services.llm_providers import FakeChatModel
+from app.services.llm_router import LLMRouter
+from app.services.llm_service import ChatBetLLMService
+from app.services.prefetcher import DataPrefetcher
+from app.services.prompts import with_retrieved_data
+from app.services.tool_memo import SessionToolMemo
+from app.services.tool_planner import ToolPlanner
+
+
+def make_tools(calls: List[Any]):
+    """Stand-in tools with the real names that record how they were called."""
+
+    @tool
+    async def get_tournaments() -> List[Any]:
+        """Get list of available tournaments and competitions."""
+        calls.append(("get_tournaments",))
+        return ["columns: [tournament_id, name, country]", ["545", "La Liga", "Spain"]]
+
+    @tool
+    async def get_fixtures(tournament_id: Optional[str] = None, days_ahead: int = 7) -> List[Any]:
+        """Get upcoming match fixtures."""
+        calls.append(("get_fixtures", tournament_id))
+        if tournament_id == "broken":
+            return [{"status": "error", "message": "upstream down"}]
+        return ["columns: [fixture_id, home, away, start_utc, tournament, tournament_id]"]
+
+    @tool
+    async def get_live_matches(tournament_id: Optional[str] = None) -> List[Any]:
+        """Get currently live matches."""
+        calls.append(("get_live_matches", tournament_id))
+        return []
+
+    return [get_tournaments, get_fixtures, get_live_matches]
+
+
+def test_memo_keys_and_ttls():
+    """Equivalent calls share an entry; TTLs depend on the tool; errors aren't kept."""
+    print("Testing session tool memo...")
+
+    memo = SessionToolMemo(make_tools([]))
+    memo.put("s1", "get_fixtures", {"tournament_id": "La Liga"}, ["fixtures"])
+    assert memo.get("s1", "get_fixtures", {"tournament_id": "la liga ", "days_ahead": 7}) == ["fixtures"]
+    assert memo.get("s2", "get_fixtures", {"tournament_id": "La Liga"}) is None, "Memo is per session"
+
+    memo.put("s1", "get_fixtures", {"tournament_id": "broken"}, [{"status": "error"}])
+    assert memo.get("s1", "get_fixtures", {"tournament_id": "broken"}) is None
+
+    original = settings.tool_memo_ttl_seconds
+    settings.tool_memo_ttl_seconds = {**original, "get_live_matches": 0}
+    try:
+        memo.put("s1", "get_live_matches", {}, ["live"])
+        assert memo.get("s1", "get_live_matches", {}) is None, "TTL 0 disables memoization"
+    finally:
+        settings.tool_memo_ttl_seconds = original
+
+    retrieved = memo.retrieved("s1", exclude=[("get_tournaments", {})])
+    assert [item["tool_name"] for item in retrieved] == ["get_fixtures"]
+    assert memo.retrieved("s1", exclude=[("get_fixtures", {"tournament_id": "LA LIGA"})]) == []
+
+    memo.clear("s1")
+    assert memo.get("s1", "get_fixtures", {"tournament_id": "La Liga"}) is None
+    assert memo.get_stats()["hits"] == 1
+    assert "DATA ALREADY RETRIEVED" in with_retrieved_data("prompt", "[1]")
+    print("✅ Session tool memo working correctly")
+
+
+def test_repeated_tool_call_served_from_memo():
+    """The model's repeated get_tournaments call on a later turn doesn't go upstream."""
+    print("\nTesting repeated tool calls across turns...")
+
+    async def run():
+        calls = []
+        prompts = []
+        service = ChatBetLLMService()
+        service.router = LLMRouter(lambda **kwargs: FakeChatModel(latency_ms=1, latency_distribution="fixed"))
+        service.tools = make_tools(calls)
+        service.prefetcher = DataPrefetcher(service.tools)
+        service.tool_memo = SessionToolMemo(service.tools)
+        service.tool_planner = ToolPlanner(service.tools, service.prefetcher, service.tool_memo)
+
+        original_invoke = service._invoke_llm
+
+        async def recording_invoke(runnable, llm_input, *args, **kwargs):
+            if isinstance(llm_input, list):
+                prompts.append(str(llm_input[0].content))
+            return await original_invoke(runnable, llm_input, *args, **kwargs)
+
+        service._invoke_llm = recording_invoke
+        context = {"intent": "tournament_info_query", "conversation_context": {"session_id": "memo_session"}}
+
+        await service.generate_response("Which tournaments are available?", [], dict(context))
+        history = [HumanMessage(content="Which tournaments are available?")]
+        await service.generate_response("And which leagues are in Spain?", history, dict(context))
+
+        assert calls == [("get_tournaments",)], "Second turn reuses the first turn's result"
+        assert service.tool_memo.get_stats()["hits"] == 1
+        assert "DATA ALREADY RETRIEVED" not in prompts[0]
+        assert "DATA ALREADY RETRIEVED" in prompts[-1] and "La Liga" in prompts[-1]
+
+    asyncio.run(run())
+    print("✅ Repeated tool calls served from the session memo")
+
+
+if __name__ == "__main__":
+    test_memo_keys_and_ttls()
+    test_repeated_tool_call_served_from_memo()
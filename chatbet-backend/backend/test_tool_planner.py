@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for deterministic tool pre-dispatch.
+
+Checks the intent + entities -> tool call mapping, speculative team
+searches started before classification, and that planned data lets the
+answer be generated in a single model call.
+"""
+
+import asyncio
+from typing import Any, List, Optional
+
+from langchain_core.tools import tool
+
+from app.models.conversation import IntentType
+from app.services.llm_providers import FakeChatModel
+from app.services.llm_router import LLMRouter
+from app.services.llm_service import ChatBetLLMService
+from app.services.tool_planner import PlannedCall, ToolPlanner, merge_entities
+from app.utils.parsers import extract_entities_from_text
+
+FIXTURE_ROWS = [
+    "columns: [fixture_id, home, away, start_utc, tournament, tournament_id]",
+    ["777", "Barcelona", "Sevilla", "2025-09-20T19:00:00Z", "La Liga", "545"],
+]
+
+
+def make_tools(calls: List[Any], delay: float = 0.0):
+    """Stand-in tools with the real names that record how they were called."""
+
+    @tool
+    async def search_team_matches(team_name: str) -> List[Any]:
+        """Search for upcoming matches for a specific team."""
+        calls.append(("search_team_matches", team_name))
+        await asyncio.sleep(delay)
+        return FIXTURE_ROWS
+
+    @tool
+    async def get_odds(fixture_id: Optional[str] = None, tournament_id: Optional[str] = None) -> List[Any]:
+        """Get betting odds for matches."""
+        calls.append(("get_odds", fixture_id, tournament_id))
+        return [{"fixture_id": fixture_id, "markets": [["1", 1.8, 55.6, None]]}]
+
+    @tool
+    async def get_fixtures(tournament_id: Optional[str] = None, days_ahead: int = 7) -> List[Any]:
+        """Get upcoming match fixtures."""
+        calls.append(("get_fixtures", tournament_id))
+        return FIXTURE_ROWS
+
+    @tool
+    async def get_tournaments() -> List[Any]:
+        """Get list of available tournaments and competitions."""
+        calls.append(("get_tournaments",))
+        return ["columns: [tournament_id, name, country]", ["545", "La Liga", "Spain"]]
+
+    return [search_team_matches, get_odds, get_fixtures, get_tournaments]
+
+
+def test_plan_mapping():
+    """Intents with enough entities map to tool calls; others leave it to the model."""
+    print("Testing intent -> tool plan mapping...")
+
+    planner = ToolPlanner(make_tools([]))
+    barca = merge_entities({}, extract_entities_from_text("When does Barca play?"))
+    assert barca.teams == ["barcelona"]
+
+    assert planner.plan(IntentType.MATCH_SCHEDULE_QUERY, barca) == [
+        PlannedCall.of("search_team_matches", team_name="barcelona")
+    ]
+    assert planner.plan(IntentType.MATCH_SCHEDULE_QUERY, merge_entities({"league": "La Liga"})) == [
+        PlannedCall.of("get_fixtures", tournament_id="La Liga")
+    ]
+    assert planner.plan("odds_information_query", merge_entities({"fixture_id": 777, "tournament_id": 545})) == [
+        PlannedCall.of("get_odds", fixture_id="777", tournament_id="545")
+    ]
+    assert planner.plan(IntentType.ODDS_INFORMATION_QUERY, barca)[0].follow_odds
+    assert planner.plan(IntentType.TOURNAMENT_INFO_QUERY, merge_entities({}))[0].tool_name == "get_tournaments"
+    assert planner.plan(IntentType.GREETING, barca) == []
+    assert planner.plan(IntentType.ODDS_INFORMATION_QUERY, merge_entities({})) == []
+    assert merge_entities({}, extract_entities_from_text("I really like this")).teams == []
+    print("✅ Tool plan mapping working correctly")
+
+
+def test_speculative_dispatch():
+    """Team searches started before classification are reused or cancelled."""
+    print("\nTesting speculative dispatch...")
+
+    async def run():
+        calls = []
+        planner = ToolPlanner(make_tools(calls, delay=0.01))
+        local = extract_entities_from_text("What are the odds for Barca?")
+
+        speculative = planner.speculate(local)
+        results = await planner.dispatch(IntentType.ODDS_INFORMATION_QUERY, merge_entities({}, local), speculative)
+        assert calls == [("search_team_matches", "barcelona"), ("get_odds", "777", "545")]
+        assert [r["tool_name"] for r in results] == ["search_team_matches", "get_odds"]
+
+        # Classified as a greeting after all: the speculative search is wasted
+        speculative = planner.speculate(local)
+        assert await planner.dispatch(IntentType.GREETING, merge_entities({}, local), speculative) == []
+        await asyncio.sleep(0)
+        assert all(task.cancelled() for task in speculative.values())
+
+        stats = planner.get_stats()
+        assert stats["speculative_calls"] == 2
+        assert stats["speculative_hits"] == 1 and stats["speculative_wasted"] == 1
+        assert stats["planned_calls"] == 2
+
+    asyncio.run(run())
+    print("✅ Speculative dispatch working correctly")
+
+
+def test_single_generation_call():
+    """Planned results go into the prompt and no tools are offered to the model."""
+    print("\nTesting single-call answers with planned data...")
+
+    async def run():
+        service = ChatBetLLMService()
+        service.router = LLMRouter(lambda **kwargs: FakeChatModel(latency_ms=1, latency_distribution="fixed"))
+        service.tool_planner = ToolPlanner(make_tools([]))
+        results = await service.tool_planner.dispatch(
+            IntentType.BET_SIMULATION, merge_entities({"team_name": "Barcelona"})
+        )
+        assert results == [], "Bet simulations are left to the model"
+
+        results = await service.tool_planner.dispatch(
+            IntentType.MATCH_SCHEDULE_QUERY, merge_entities({"team_name": "Barcelona"})
+        )
+        calls_before = service._completed_calls
+        answer = await service.generate_response(
+            "When does Barcelona play?", [],
+            {"intent": IntentType.BET_SIMULATION, "planned_tool_results": results}
+        )
+        assert answer and service._completed_calls - calls_before == 1
+        assert service.get_performance_stats()["tool_planner"]["round_trips_saved"] == 1
+
+    asyncio.run(run())
+    print("✅ Planned data answered in a single call")
+
+
+if __name__ == "__main__":
+    test_plan_mapping()
+    test_speculative_dispatch()
+    test_single_generation_call()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test script for the tournament name resolver.
+
+Loads a small multilingual index directly so matching can be checked
+without the ChatBet API.
+"""
+
+import asyncio
+
+from app.services import tournament_resolver
+from app.services.tournament_resolver import TournamentResolver, normalize_name
+
+
+ENTRIES = [
+    ("La Liga", "545"),
+    ("Premier League", "17"),
+    ("UEFA Champions League", "7"),
+    ("Liga de Campeones de la UEFA", "7"),
+    ("Brasileirão Série A", "325"),
+    ("Copa Libertadores", "384"),
+]
+
+
+def make_resolver() -> TournamentResolver:
+    resolver = TournamentResolver(refresh_seconds=3600)
+    resolver.load(ENTRIES)
+    return resolver
+
+
+def test_normalization_and_aliases():
+    """Accents, case, spacing and known aliases resolve exactly."""
+    print("Testing normalized and alias lookups...")
+
+    assert normalize_name("  Brasileirão  Série-A ") == "brasileirao serie a"
+
+    resolver = make_resolver()
+    cases = {
+        "La Liga": "545",
+        "laliga": "545",
+        "LALIGA!": "545",
+        "spanish league": "545",
+        "premier": "17",
+        "EPL": "17",
+        "liga de campeones": "7",
+        "brasileirao serie a": "325",
+    }
+    for name, expected in cases.items():
+        assert resolver.lookup(name) == expected, name
+    print("✅ Normalized and alias lookups working correctly")
+
+
+def test_exact_names_not_shadowed():
+    """Names containing a well-known name don't take its key or aliases."""
+    print("\nTesting name collisions...")
+
+    resolver = TournamentResolver(refresh_seconds=3600)
+    # Loaded in the "wrong" order: the longer names arrive first
+    resolver.load([
+        ("Russian Premier League", "90"),
+        ("AFC Champions League", "91"),
+        ("La Liga 2", "92"),
+        ("Premier League", "17"),
+        ("UEFA Champions League", "7"),
+        ("La Liga", "545"),
+    ])
+    cases = {
+        "Premier League": "17",
+        "premier": "17",
+        "epl": "17",
+        "Russian Premier League": "90",
+        "Champions League": "7",
+        "ucl": "7",
+        "AFC Champions League": "91",
+        "La Liga": "545",
+        "laliga": "545",
+        "La Liga 2": "92",
+    }
+    for name, expected in cases.items():
+        assert resolver.lookup(name) == expected, name
+    print("✅ Exact names never shadowed")
+
+
+def test_first_refresh_failure_backs_off():
+    """A failed first load is retried after a delay, not on every call."""
+    print("\nTesting refresh failure backoff...")
+
+    class DownClient:
+        calls = 0
+
+        async def get_all_tournaments(self, language, with_active_fixtures):
+            DownClient.calls += 1
+            raise RuntimeError("API down")
+
+    async def get_down_client():
+        return DownClient()
+
+    async def run():
+        original = tournament_resolver.get_api_client
+        tournament_resolver.get_api_client = get_down_client
+        try:
+            resolver = TournamentResolver(refresh_seconds=3600, retry_seconds=60)
+            assert await resolver.resolve("la liga") is None
+            assert await resolver.resolve("premier") is None
+            assert DownClient.calls == 3, "One refresh attempt per language, then back off"
+            assert not resolver.is_stale()
+        finally:
+            tournament_resolver.get_api_client = original
+
+    asyncio.run(run())
+    print("✅ Failed first refresh backs off")
+
+
+def test_prefix_and_fuzzy():
+    """Partial and misspelled names fall back to prefix and trigram matching."""
+    print("\nTesting prefix and fuzzy matching...")
+
+    resolver = make_resolver()
+    assert resolver.lookup("copa liber") == "384"
+    assert resolver.lookup("champions leage") == "7"
+    assert resolver.lookup("premiere legue") == "17"
+    assert resolver.lookup("bundesliga") is None
+    assert resolver.suggest("libertadors")[0] == "copa libertadores"
+
+    stats = resolver.get_stats()
+    assert stats["fuzzy_hits"] == 3 and stats["misses"] == 1
+    print(f"   Stats: {stats}")
+    print("✅ Prefix and fuzzy matching working correctly")
+
+
+def test_other_tiers_not_guessed():
+    """Unindexed competitions close to an indexed league don't resolve to it."""
+    print("\nTesting near-miss competitions...")
+
+    resolver = TournamentResolver(refresh_seconds=3600)
+    resolver.load([
+        ("Serie A", "1"),
+        ("La Liga", "545"),
+        ("Premier League", "17"),
+        ("Ligue 1", "4"),
+        ("Bundesliga", "5"),
+        ("UEFA Champions League", "7"),
+    ])
+    for name in ("Serie B", "Ligue 2", "2. Bundesliga", "Premier League 2", "La Liga 2", "Championship"):
+        assert resolver.lookup(name) is None, name
+
+    # Typos of the indexed names still resolve, and near misses get suggestions
+    assert resolver.lookup("bundesliaga") == "5"
+    assert resolver.lookup("premier leauge") == "17"
+    assert resolver.lookup("ligue") == "4"
+    assert resolver.suggest("Serie B")[0] == "serie a"
+    print("✅ Other tiers are suggested, not guessed")
+
+
+def test_ids_pass_through():
+    """Numeric IDs are returned without touching the index."""
+    print("\nTesting ID passthrough...")
+
+    async def run():
+        resolver = make_resolver()
+        assert await resolver.resolve("545") == "545"
+        assert await resolver.resolve(None) is None
+        assert await resolver.resolve("la liga") == "545"
+
+    asyncio.run(run())
+    print("✅ ID passthrough working correctly")
+
+
+if __name__ == "__main__":
+    test_normalization_and_aliases()
+    test_exact_names_not_shadowed()
+    test_first_refresh_failure_backs_off()
+    test_prefix_and_fuzzy()
+    test_other_tiers_not_guessed()
+    test_ids_pass_through()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for request-scoped cancellation of WebSocket chat turns.
+
+Checks that in-flight turns are cancelled when the client disconnects or
+the session is taken over by a new connection, and that turns of one
+session still run in order.
+"""
+
+import asyncio
+
+from app.models.websocket_models import WebSocketMessageType
+from app.services.websocket_manager import WebSocketConnectionManager
+
+
+class MockWebSocket:
+    """Mock WebSocket for testing."""
+
+    def __init__(self):
+        self.messages_sent = []
+        self.is_closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        if not self.is_closed:
+            self.messages_sent.append(data)
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        self.is_closed = True
+
+
+def test_disconnect_cancels_turn():
+    """A disconnect cancels the turn instead of letting it run to completion."""
+    print("Testing cancellation on disconnect...")
+
+    async def run():
+        manager = WebSocketConnectionManager()
+        websocket = MockWebSocket()
+        session_id = await manager.connect(websocket, session_id="cancel_me")
+        finished = []
+
+        async def slow_turn():
+            await asyncio.sleep(5)
+            finished.append(True)
+
+        task = manager.start_turn(session_id, slow_turn())
+        await asyncio.sleep(0.01)
+        await manager.disconnect(session_id, "client_disconnect", websocket=websocket)
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert task.cancelled() and not finished
+        assert manager.get_statistics()["cancelled_turns"] == 1
+        assert manager.start_turn(session_id, slow_turn()) is None
+        await manager.shutdown()
+
+    asyncio.run(run())
+    print("✅ Disconnect cancels in-flight turns")
+
+
+def test_replacement_cancels_old_turns():
+    """A 4001 takeover cancels the old client's turn, and its cleanup leaves the new one alone."""
+    print("\nTesting cancellation on connection replacement...")
+
+    async def run():
+        manager = WebSocketConnectionManager()
+        old_socket, new_socket = MockWebSocket(), MockWebSocket()
+        await manager.connect(old_socket, session_id="shared")
+        old_turn = manager.start_turn("shared", asyncio.sleep(5))
+        await asyncio.sleep(0.01)
+
+        await manager.connect(new_socket, session_id="shared")
+        await asyncio.gather(old_turn, return_exceptions=True)
+        assert old_turn.cancelled() and old_socket.is_closed
+
+        # The old endpoint's cleanup must not tear down the new connection
+        await manager.disconnect("shared", "connection_closed", websocket=old_socket)
+        assert manager.connections["shared"].websocket is new_socket
+        await manager.shutdown()
+
+    asyncio.run(run())
+    print("✅ Connection replacement cancels the old turn")
+
+
+def test_turns_stay_ordered():
+    """Turns of one session run sequentially; handlers register once."""
+    print("\nTesting turn ordering and handler registration...")
+
+    async def run():
+        manager = WebSocketConnectionManager()
+        await manager.connect(MockWebSocket(), session_id="ordered")
+        order = []
+
+        async def turn(name, delay):
+            await asyncio.sleep(delay)
+            order.append(name)
+
+        tasks = [
+            manager.start_turn("ordered", turn("first", 0.03)),
+            manager.start_turn("ordered", turn("second", 0.0)),
+        ]
+        await asyncio.gather(*tasks)
+        assert order == ["first", "second"]
+
+        async def handler(session_id, message):
+            pass
+
+        for _ in range(3):
+            manager.register_message_handler(WebSocketMessageType.USER_MESSAGE, handler)
+        assert len(manager.message_handlers[WebSocketMessageType.USER_MESSAGE]) == 1
+        await manager.shutdown()
+
+    asyncio.run(run())
+    print("✅ Turns stay ordered and handlers register once")
+
+
+if __name__ == "__main__":
+    test_disconnect_cancels_turn()
+    test_replacement_cancels_old_turns()
+    test_turns_stay_ordered()
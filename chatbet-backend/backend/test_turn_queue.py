@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for per-session turn ordering.
+
+Checks that distinct messages of a session run one after another, that a
+duplicate joins the in-flight turn instead of calling the LLM again, and
+that a turn nobody waits for any more is cancelled.
+"""
+
+import asyncio
+
+from app.models.conversation import ChatRequest, ChatResponse, IntentType
+from app.services.conversation_manager import ConversationManager
+from app.services.turn_queue import SessionTurnQueue
+
+
+def test_turns_run_in_order():
+    """Distinct messages of one session never overlap; other sessions don't wait."""
+    print("Testing per-session turn order...")
+
+    async def run():
+        queue = SessionTurnQueue()
+        events = []
+
+        async def turn(name, delay):
+            events.append(f"start {name}")
+            await asyncio.sleep(delay)
+            events.append(f"end {name}")
+            return name
+
+        results = await asyncio.gather(
+            queue.submit("s1", lambda: turn("first", 0.03), message="first"),
+            queue.submit("s1", lambda: turn("second", 0.0), message="second"),
+            queue.submit("s2", lambda: turn("other", 0.0), message="first"),
+        )
+        assert results == ["first", "second", "other"]
+        assert events.index("end first") < events.index("start second")
+        assert events.index("end other") < events.index("end first"), "Other sessions run concurrently"
+        assert queue.get_stats()["queued_behind_turn"] == 1
+
+    asyncio.run(run())
+    print("✅ Turns run in order per session")
+
+
+def test_duplicates_share_turn():
+    """A duplicate gets the original's response; a later re-send is a new turn."""
+    print("\nTesting duplicate sharing...")
+
+    async def run():
+        queue = SessionTurnQueue(replay_window_seconds=0.05)
+        calls = []
+
+        async def turn(message):
+            calls.append(message)
+            await asyncio.sleep(0.02)
+            return object()
+
+        first, duplicate = await asyncio.gather(
+            queue.submit("s1", lambda: turn("odds?"), message="odds?"),
+            queue.submit("s1", lambda: turn("odds?"), message="  odds? "),
+        )
+        assert first is duplicate and calls == ["odds?"]
+
+        # A double submit right after the turn finished is answered from it
+        assert await queue.submit("s1", lambda: turn("odds?"), message="odds?") is first
+        await asyncio.sleep(0.06)
+        assert await queue.submit("s1", lambda: turn("odds?"), message="odds?") is not first
+        assert calls == ["odds?", "odds?"]
+
+        stats = queue.get_stats()
+        assert stats["shared_in_flight"] == 1 and stats["replayed_finished"] == 1
+        assert stats["in_flight"] == 0 and stats["busy_sessions"] == 0
+
+    asyncio.run(run())
+    print("✅ Duplicates share the in-flight turn")
+
+
+def test_abandoned_turn_cancelled():
+    """A shared turn survives one caller leaving, and is cancelled when all leave."""
+    print("\nTesting cancellation of abandoned turns...")
+
+    async def run():
+        queue = SessionTurnQueue()
+        started = asyncio.Event()
+
+        async def turn():
+            started.set()
+            await asyncio.sleep(5)
+
+        first = asyncio.create_task(queue.submit("s1", turn, message="hi"))
+        await started.wait()
+        second = asyncio.create_task(queue.submit("s1", turn, message="hi"))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0.01)
+        assert queue.get_stats()["in_flight"] == 1, "Still wanted by the duplicate"
+
+        second.cancel()
+        await asyncio.gather(first, second, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert queue.get_stats()["in_flight"] == 0
+
+    asyncio.run(run())
+    print("✅ Abandoned turns are cancelled")
+
+
+def test_manager_shares_duplicate():
+    """process_message returns the original ChatResponse to a concurrent duplicate."""
+    print("\nTesting conversation manager integration...")
+
+    async def run():
+        manager = ConversationManager()
+        calls = []
+
+        async def fake_turn(request):
+            calls.append(request.message)
+            await asyncio.sleep(0.02)
+            return ChatResponse(
+                message=f"answer to {request.message}",
+                session_id=request.session_id,
+                message_id=f"m{len(calls)}",
+                response_time_ms=20,
+                detected_intent=IntentType.GREETING,
+                intent_confidence=1.0
+            )
+
+        manager._process_message = fake_turn
+        request = ChatRequest(message="hi", session_id="dup_session")
+        first, second = await asyncio.gather(manager.process_message(request), manager.process_message(request))
+        assert first is second and calls == ["hi"]
+        assert "still processing" not in first.message
+
+    asyncio.run(run())
+    print("✅ Conversation manager shares duplicate turns")
+
+
+if __name__ == "__main__":
+    test_turns_run_in_order()
+    test_duplicates_share_turn()
+    test_abandoned_turn_cancelled()
+    test_manager_shares_duplicate()
@@ -245,6 +245,21 @@ export interface ConversationSummary {
   isActive: boolean;
 }
 
+/**
+ * Response of GET /api/v1/chat/conversations/{user_id}, as sent by the backend.
+ * Without a session it lists conversations; with one it pages the session's
+ * messages. Pass `next_cursor` as `cursor` for the next page.
+ */
+export interface ConversationHistoryResponse {
+  user_id: string;
+  session_id: string | null;
+  conversations?: Array<Record<string, unknown>>;
+  messages?: Array<Record<string, unknown>>;
+  limit: number;
+  cursor: string;
+  next_cursor: string | null;
+}
+
 export interface IntentClassificationResult {
   intent: IntentType;
   confidence: number;
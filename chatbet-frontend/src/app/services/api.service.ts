@@ -6,7 +6,7 @@ import { environment } from '../../environments/environment';
 import {
   ChatRequest,
   ChatResponse,
-  ConversationSummary,
+  ConversationHistoryResponse,
   Match,
   Tournament,
   OddsComparison,
@@ -53,14 +53,16 @@ export class ApiService {
       userId: string,
       sessionId?: string,
       limit = 20,
-      offset = 0
-    ): Observable<PaginatedResponse<ConversationSummary>> => {
-      const params = new HttpParams()
+      cursor?: string
+    ): Observable<ConversationHistoryResponse> => {
+      let params = new HttpParams()
         .set('limit', limit.toString())
-        .set('offset', offset.toString())
         .set('session_id', sessionId || '');
+      if (cursor) {
+        params = params.set('cursor', cursor);
+      }
 
-      return this.get<PaginatedResponse<ConversationSummary>>(
+      return this.getDirect<ConversationHistoryResponse>(
         `/api/v1/chat/conversations/${userId}`,
         'getConversationHistory',
         { params }
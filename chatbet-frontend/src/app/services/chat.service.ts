@@ -230,11 +230,10 @@ export class ChatService {
       const response = await this.apiService.chat.getConversationHistory(
         userId || 'anonymous',
         sessionId,
-        50,
-        0
+        50
       ).toPromise();
 
-      if (response?.data) {
+      if (response?.messages) {
         // Convert conversation summaries to messages
         // This would need to be implemented based on backend response structure
         // For now, we'll just set the session